@@ -0,0 +1,18 @@
+"""
+Columnar Analytics
+Monthly Arrow snapshots of tasks and EOD summaries, and a pyarrow engine over them
+
+snapshot builds and refreshes the files, engine answers analytics queries
+from them, and parity checks the engine against the Mongo pipelines.
+"""
+
+from app.columnar.engine import ColumnarEngine, columnar_engine
+from app.columnar.snapshot import build_snapshot, read_manifest, snapshot_scheduler
+
+__all__ = [
+    "ColumnarEngine",
+    "columnar_engine",
+    "build_snapshot",
+    "read_manifest",
+    "snapshot_scheduler",
+]
@@ -0,0 +1,242 @@
+"""
+Columnar Analytics Engine
+Answers the overview, per-employee and area analytics from the Arrow snapshot
+
+Partitions for the requested months are memory-mapped (zero copy; cached
+until the file is replaced), filtered and grouped with pyarrow.compute. Each
+query returns the same shape as the Mongo repository method it stands in
+for, so services can switch paths without touching their response code, and
+app.columnar.parity can compare the two.
+"""
+
+import asyncio
+import os
+import threading
+from datetime import date, datetime, time, timezone
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.columnar.snapshot import DATASETS, months_between, partition_path, read_manifest, snapshot_root
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - pyarrow is in requirements
+    pyarrow = None
+
+
+# "first" takes the first row's value like $first, not the first non-null one
+_KEEP_NULLS = pc.ScalarAggregateOptions(skip_nulls=False) if pyarrow else None
+
+
+def _range(start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+    """Inclusive UTC bounds, as the task repository builds them."""
+    return (
+        datetime.combine(start_date, time.min, tzinfo=timezone.utc),
+        datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc),
+    )
+
+
+class ColumnarEngine:
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or snapshot_root()
+        # path -> (mtime_ns, table); a replaced file has a new mtime and is re-mapped
+        self._tables: Dict[str, Tuple[int, "pyarrow.Table"]] = {}
+        self._lock = threading.Lock()
+
+    # -- Snapshot access -------------------------------------------------------
+
+    def as_of(self) -> Optional[datetime]:
+        """When the oldest of the task/EOD partitions was last brought up to date."""
+        datasets = read_manifest(self.root).get("datasets", {})
+        stamps = [datasets.get(name, {}).get("as_of") for name in ("tasks", "eod_summaries", "clients")]
+        if not all(stamps):
+            return None
+        return min(datetime.fromisoformat(s) for s in stamps)
+
+    def covers(self, end_date: date) -> bool:
+        """True when every day up to end_date was complete at the last snapshot."""
+        as_of = self.as_of()
+        return as_of is not None and end_date < as_of.date()
+
+    async def run(self, query: Callable[..., Any], *args: Any) -> Any:
+        """Run a query method on the default executor (pyarrow releases the GIL)."""
+        return await asyncio.get_running_loop().run_in_executor(None, partial(query, *args))
+
+    def _load(self, path: str, dataset: str) -> "pyarrow.Table":
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return DATASETS[dataset].schema().empty_table()
+        with self._lock:
+            cached = self._tables.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            table = pyarrow.ipc.open_file(pyarrow.memory_map(path, "r")).read_all()
+            self._tables[path] = (mtime, table)
+            return table
+
+    def table(self, dataset: str, start_date: Optional[date] = None,
+              end_date: Optional[date] = None) -> "pyarrow.Table":
+        """The partitions of `dataset` overlapping [start_date, end_date], concatenated."""
+        if DATASETS[dataset].month_expr is None:
+            return self._load(partition_path(self.root, dataset), dataset)
+        tables = [self._load(partition_path(self.root, dataset, month), dataset)
+                  for month in months_between(start_date, end_date)]
+        return pyarrow.concat_tables(tables) if tables else DATASETS[dataset].schema().empty_table()
+
+    def tasks(self, start_date: date, end_date: date, employee_id: Optional[str] = None) -> "pyarrow.Table":
+        start, end = _range(start_date, end_date)
+        table = self.table("tasks", start_date, end_date)
+        mask = pc.and_(pc.greater_equal(table["checkin_time"], start), pc.less_equal(table["checkin_time"], end))
+        if employee_id is not None:
+            mask = pc.and_(mask, pc.or_kleene(pc.equal(table["employee_id"], employee_id),
+                                               pc.equal(table["internal_emp_id"], employee_id)))
+        return table.filter(mask)
+
+    def eod(self, start_date: date, end_date: date, employee_id: Optional[str] = None) -> "pyarrow.Table":
+        table = self.table("eod_summaries", start_date, end_date)
+        mask = pc.and_(pc.greater_equal(table["date"], start_date), pc.less_equal(table["date"], end_date))
+        if employee_id is not None:
+            mask = pc.and_(mask, pc.equal(table["employee_id"], str(employee_id)))
+        return table.filter(mask)
+
+    # -- Queries ---------------------------------------------------------------
+
+    def overview(self, start_date: date, end_date: date) -> Dict[str, Any]:
+        """
+        Admin overview inputs: {"totals": summarize_tasks_in_date_range,
+        "tasks_by_employee": aggregate_tasks_by_employee,
+        "hot_schools_by_employee": get_hot_schools_by_employee}.
+        """
+        tasks = self.tasks(start_date, end_date)
+        totals = {
+            "total_tasks": tasks.num_rows,
+            "total_specimens": pc.sum(tasks["specimens_given"]).as_py() or 0,
+        }
+        by_employee = tasks.group_by("employee_id").aggregate([([], "count_all")])
+        task_counts = [{"_id": e, "count": c} for e, c in
+                       zip(by_employee["employee_id"].to_pylist(), by_employee["count_all"].to_pylist())]
+
+        # Latest task per client in range (null clientID is one group, as in $group)
+        latest = tasks.sort_by([("checkin_time", "descending")]).group_by("client_id", use_threads=False).aggregate([
+            ("employee_id", "first", _KEEP_NULLS), ("school_category", "first", _KEEP_NULLS),
+        ])
+        hot = latest.filter(pc.equal(latest["school_category_first"], "Hot"))
+        hot_counts = hot.group_by("employee_id_first").aggregate([([], "count_all")])
+        hot_by_employee = [{"_id": e, "count": c} for e, c in
+                           zip(hot_counts["employee_id_first"].to_pylist(), hot_counts["count_all"].to_pylist())]
+        return {"totals": totals, "tasks_by_employee": task_counts, "hot_schools_by_employee": hot_by_employee}
+
+    @staticmethod
+    def _working_day(eod: "pyarrow.Table") -> "pyarrow.Array":
+        # Mon-Sat only (day_of_week counts Monday as 0, so Sunday is 6)
+        return pc.not_equal(pc.day_of_week(eod["date"]), 6)
+
+    def _present_working(self, eod: "pyarrow.Table") -> "pyarrow.Table":
+        return eod.filter(pc.and_(eod["is_present"], self._working_day(eod)))
+
+    _TOTALS = [
+        ([], "count_all"), ("tasks", "sum"), ("distance", "sum"), ("num_breaks", "sum"),
+        ("break_minutes", "sum"), ("tasks", "mean"), ("distance", "mean"), ("num_breaks", "mean"),
+        ("break_minutes", "mean"),
+    ]
+
+    @staticmethod
+    def _totals_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "present_days": row["count_all"],
+            "total_tasks": row["tasks_sum"],
+            "total_distance": row["distance_sum"],
+            "total_breaks": row["num_breaks_sum"],
+            "total_break_minutes": row["break_minutes_sum"],
+            "avg_tasks": row["tasks_mean"],
+            "avg_distance": row["distance_mean"],
+            "avg_breaks": row["num_breaks_mean"],
+            "avg_break_minutes": row["break_minutes_mean"],
+        }
+
+    def present_totals_by_employee(self, start_date: date, end_date: date) -> Dict[str, Dict[str, Any]]:
+        """Same result as emp_analytics_repository.aggregate_present_totals_by_employee."""
+        present = self._present_working(self.eod(start_date, end_date))
+        grouped = present.group_by("employee_id").aggregate(self._TOTALS)
+        return {row["employee_id"]: {"_id": row["employee_id"], **self._totals_row(row)}
+                for row in grouped.to_pylist()}
+
+    def employee_daily_metrics(self, employee_id: str, start_date: date,
+                               end_date: date) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Same result as emp_analytics_repository.get_employee_daily_metrics."""
+        eod = self.eod(start_date, end_date, employee_id).sort_by("date")
+        working = eod.filter(self._working_day(eod))
+        days = []
+        for row in working.to_pylist():
+            row["employeeID"] = row.pop("employee_id")
+            row["date"] = row["date"].isoformat()
+            row["is_working_day"] = True
+            days.append(row)
+        present = self._present_working(eod)
+        if present.num_rows == 0:
+            return days, None
+        row = {"count_all": present.num_rows}
+        for column, op in self._TOTALS[1:]:
+            row[f"{column}_{op}"] = getattr(pc, op)(present[column]).as_py()
+        return days, {"_id": employee_id, **self._totals_row(row)}
+
+    def employees_daily_metrics(self, employee_ids: List[str], start_date: date, end_date: date
+                                ) -> Dict[str, Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """Same result as emp_analytics_repository.get_employees_daily_metrics."""
+        eod = self.eod(start_date, end_date)
+        eod = eod.filter(pc.is_in(eod["employee_id"], value_set=pyarrow.array([str(e) for e in employee_ids])))
+        eod = eod.sort_by([("employee_id", "ascending"), ("date", "ascending")])
+        metrics: Dict[str, Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]] = {}
+        for row in eod.filter(self._working_day(eod)).to_pylist():
+            row["employeeID"] = row.pop("employee_id")
+            row["date"] = row["date"].isoformat()
+            row["is_working_day"] = True
+            metrics.setdefault(row["employeeID"], ([], None))[0].append(row)
+        grouped = self._present_working(eod).group_by("employee_id").aggregate(self._TOTALS)
+        for row in grouped.to_pylist():
+            days, _ = metrics.get(row["employee_id"], ([], None))
+            metrics[row["employee_id"]] = (days, {"_id": row["employee_id"], **self._totals_row(row)})
+        return metrics
+
+    def area_counts(self, employee_id: str, start_date: date, end_date: date,
+                    client_category: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Per area: unique clients and task count, i.e. the counts of
+        task_repository.aggregate_tasks_area_wise without the documents.
+        """
+        tasks = self.tasks(start_date, end_date, employee_id)
+        clients = self.table("clients")
+        # One row per client ID, like the $lookup's first match
+        clients = clients.group_by("client_id", use_threads=False).aggregate([
+            ("area", "first", _KEEP_NULLS), ("client_category", "first", _KEEP_NULLS),
+        ]).rename_columns(["client_id", "area", "client_category"])
+        clients = clients.append_column("client_key", clients["client_id"])
+        joined = tasks.join(clients, "client_id", join_type="left outer")
+        if client_category and client_category.lower() != "both":
+            joined = joined.filter(pc.equal(joined["client_category"], client_category))
+
+        # Tasks with no matching client share one (null) client, as in the $group on client_info._id
+        per_client = joined.group_by(["area", "client_key"]).aggregate([([], "count_all")])
+        per_area = per_client.group_by("area").aggregate([([], "count_all"), ("count_all", "sum")])
+        return {
+            (row["area"] or "unassigned"): {"unique_clients": row["count_all"], "task_count": row["count_all_sum"]}
+            for row in per_area.to_pylist()
+        }
+
+
+_engine: Optional[ColumnarEngine] = None
+
+
+def columnar_engine() -> Optional[ColumnarEngine]:
+    """The process-wide engine, or None when columnar analytics are off or pyarrow is missing."""
+    global _engine
+    from app.config import get_settings
+
+    if pyarrow is None or not get_settings().columnar_analytics:
+        return None
+    if _engine is None:
+        _engine = ColumnarEngine()
+    return _engine
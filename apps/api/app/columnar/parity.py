@@ -0,0 +1,118 @@
+"""
+Columnar Parity Checks
+Runs each engine query next to the Mongo pipeline it replaces and diffs the results
+
+Used by `scripts/columnar.py parity` before turning on COLUMNAR_ANALYTICS and
+after changing either side, and by tests/test_columnar_parity.py. Counts must match exactly; sums and averages
+within FLOAT_TOLERANCE.
+"""
+
+import math
+from datetime import date, datetime, timezone
+from typing import Any, Collection, Dict, List, Optional
+
+from app.columnar.engine import ColumnarEngine
+from app.repository.emp_analytics_repository import emp_analytics_repository
+from app.repository.task_repository import task_repository
+
+FLOAT_TOLERANCE = 1e-6
+
+
+def _diff(name: str, expected: Any, actual: Any, path: str = "") -> List[str]:
+    """Human-readable differences between a Mongo result and an engine result."""
+    where = f"{name}{path}"
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        problems = []
+        for key in sorted(set(expected) | set(actual), key=str):
+            if key not in actual:
+                problems.append(f"{where}.{key}: missing from columnar")
+            elif key not in expected:
+                problems.append(f"{where}.{key}: missing from Mongo")
+            else:
+                problems.extend(_diff(name, expected[key], actual[key], f"{path}.{key}"))
+        return problems
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        if math.isclose(expected, actual, rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE):
+            return []
+    elif expected == actual:
+        return []
+    return [f"{where}: Mongo {expected!r} != columnar {actual!r}"]
+
+
+def _counts(rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    return {str(row["_id"]): row["count"] for row in rows}
+
+
+def _days(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    # employeeID is an int in Mongo and a string in the snapshot; compare the metrics
+    return {row["date"]: {k: v for k, v in row.items() if k not in ("date", "employeeID")} for row in rows}
+
+
+def _totals(totals: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return None if totals is None else {k: v for k, v in totals.items() if k != "_id"}
+
+
+async def check_parity(engine: ColumnarEngine, start_date: date, end_date: date,
+                       employee_ids: Optional[List[str]] = None,
+                       skip: Collection[str] = ()) -> Dict[str, List[str]]:
+    """
+    Compare every engine query for the range. Returns {check: [differences]};
+    an empty list means the check passed. Checks named in `skip` (repository
+    method names) are left out, e.g. where the database cannot run the pipeline.
+    """
+    results: Dict[str, List[str]] = {}
+    overview = await engine.run(engine.overview, start_date, end_date)
+
+    if "summarize_tasks_in_date_range" not in skip:
+        results["summarize_tasks_in_date_range"] = _diff(
+            "totals", await task_repository.summarize_tasks_in_date_range(start_date, end_date), overview["totals"])
+    if "aggregate_tasks_by_employee" not in skip:
+        results["aggregate_tasks_by_employee"] = _diff(
+            "tasks_by_employee", _counts(await task_repository.aggregate_tasks_by_employee(start_date, end_date)),
+            _counts(overview["tasks_by_employee"]))
+
+    # Ranges reaching today are answered from client_latest_visit, which the engine never serves
+    end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
+    if end_dt < datetime.now(timezone.utc) and "get_hot_schools_by_employee" not in skip:
+        results["get_hot_schools_by_employee"] = _diff(
+            "hot_schools", _counts(await task_repository.get_hot_schools_by_employee(start_date, end_date)),
+            _counts(overview["hot_schools_by_employee"]))
+
+    if "aggregate_present_totals_by_employee" not in skip:
+        mongo_totals = await emp_analytics_repository.aggregate_present_totals_by_employee(start_date, end_date)
+        engine_totals = await engine.run(engine.present_totals_by_employee, start_date, end_date)
+        results["aggregate_present_totals_by_employee"] = _diff(
+            "present_totals", {k: _totals(v) for k, v in mongo_totals.items()},
+            {k: _totals(v) for k, v in engine_totals.items()})
+
+    for employee_id in employee_ids or []:
+        if "get_employee_daily_metrics" not in skip:
+            mongo_days, mongo_day_totals = await emp_analytics_repository.get_employee_daily_metrics(
+                employee_id, start_date, end_date)
+            engine_days, engine_day_totals = await engine.run(
+                engine.employee_daily_metrics, employee_id, start_date, end_date)
+            results[f"get_employee_daily_metrics[{employee_id}]"] = (
+                _diff("days", _days(mongo_days), _days(engine_days))
+                + _diff("day_totals", _totals(mongo_day_totals), _totals(engine_day_totals))
+            )
+
+        if "aggregate_tasks_area_wise" not in skip:
+            areas = await task_repository.aggregate_tasks_area_wise(start_date, employee_id, end_date)
+            mongo_areas = {
+                area: {
+                    "unique_clients": stats["unique_clients"],
+                    "task_count": sum(item["task_count"] for item in stats["clients_with_tasks"]),
+                }
+                for area, stats in areas.items()
+            }
+            results[f"aggregate_tasks_area_wise[{employee_id}]"] = _diff(
+                "areas", mongo_areas, await engine.run(engine.area_counts, employee_id, start_date, end_date))
+
+    if employee_ids and "get_employees_daily_metrics" not in skip:
+        mongo_batch = await emp_analytics_repository.get_employees_daily_metrics(employee_ids, start_date, end_date)
+        engine_batch = await engine.run(engine.employees_daily_metrics, employee_ids, start_date, end_date)
+        results["get_employees_daily_metrics"] = _diff(
+            "batch", {k: {"days": _days(d), "totals": _totals(t)} for k, (d, t) in mongo_batch.items()},
+            {k: {"days": _days(d), "totals": _totals(t)} for k, (d, t) in engine_batch.items()})
+
+    return results
@@ -0,0 +1,389 @@
+"""
+Columnar Snapshot Writer
+Copies tasks, EOD summaries and client dimensions into Arrow files by month
+
+Layout under settings.columnar_dir:
+
+    tasks/month=YYYY-MM.arrow          partitioned by checkinTime (UTC)
+    eod_summaries/month=YYYY-MM.arrow  partitioned by the EOD date
+    clients/clients.arrow              small dimension, rewritten every run
+    manifest.json                      watermarks, months and row counts
+
+Files are uncompressed Arrow IPC, so readers memory-map them instead of
+decoding. Runs are incremental: the months holding any document whose
+updated_at_local is newer than the last watermark are rewritten whole from
+Mongo (which also picks up deletions inside those months). Bulk rewrites
+must set updated_at_local to be picked up, as migration 0001 and the
+typed-field backfill do; after any other rewrite of a snapshot column, run
+`scripts/columnar.py build --full`. Each file is written to a temp name
+and renamed into place, so readers never see a partial file. A file lock
+keeps two processes on one host from building at the same time.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.config import get_settings
+from app.database import db_manager
+from app.utils.durations import parse_duration_seconds, seconds_to_minutes
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - pyarrow is in requirements
+    pyarrow = None
+
+MANIFEST = "manifest.json"
+LOCK_FILE = ".lock"
+READ_BATCH_SIZE = 5000
+# Re-read writes this close to the previous run's start, in case they committed late
+WATERMARK_OVERLAP = timedelta(minutes=1)
+
+# attendanceResultCode values counted as present (as in emp_analytics_repository)
+PRESENT_RESULT_CODES = (0, 1, 6)
+
+
+def snapshot_root() -> str:
+    return get_settings().columnar_dir
+
+
+def month_key(day: date) -> str:
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def month_bounds(month: str) -> Tuple[datetime, datetime]:
+    """[first instant, first instant of the next month) in UTC."""
+    year, mon = map(int, month.split("-"))
+    start = datetime(year, mon, 1, tzinfo=timezone.utc)
+    end = datetime(year + (mon == 12), mon % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+
+def months_between(start: date, end: date) -> List[str]:
+    months = []
+    year, mon = start.year, start.month
+    while (year, mon) <= (end.year, end.month):
+        months.append(f"{year:04d}-{mon:02d}")
+        year, mon = year + (mon == 12), mon % 12 + 1
+    return months
+
+
+def partition_path(root: str, dataset: str, month: Optional[str] = None) -> str:
+    name = f"month={month}.arrow" if month else f"{dataset}.arrow"
+    return os.path.join(root, dataset, name)
+
+
+def read_manifest(root: Optional[str] = None) -> Dict[str, Any]:
+    path = os.path.join(root or snapshot_root(), MANIFEST)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"datasets": {}}
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _write_table(path: str, table: "pyarrow.Table") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with pyarrow.OSFile(tmp, "wb") as sink:
+        with pyarrow.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def build_lock(root: str) -> Iterator[bool]:
+    """Non-blocking per-host lock; yields False when another process is building."""
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), "w") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# ---------------------------------------------------------------------------
+# Row conversion (document -> column values)
+# ---------------------------------------------------------------------------
+
+def _utc(value: Any) -> Optional[datetime]:
+    """Datetimes only (string checkinTimes never match a range query in Mongo either)."""
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _int(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
+def _num(value: Any) -> float:
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+def _eod_day(value: Any) -> Optional[date]:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _task_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    specimens = doc.get("specimens_given")
+    return {
+        "task_id": _str(doc.get("taskID")),
+        "employee_id": _str(doc.get("employeeID")),
+        "internal_emp_id": _str(doc.get("internalEmpID")),
+        "client_id": _str(doc.get("clientID")),
+        "checkin_time": _utc(doc.get("checkinTime")),
+        "school_category": doc.get("school_category"),
+        "specimens_given": specimens if isinstance(specimens, int) else None,
+    }
+
+
+def _eod_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    # The same per-day metrics emp_analytics_repository computes in its $project
+    seconds = doc.get("total_break_time_seconds")
+    if seconds is None:
+        seconds = parse_duration_seconds(doc.get("totalBreakTime"))
+    return {
+        "employee_id": _str(doc.get("employeeID")),
+        "date": _eod_day(doc.get("date")),
+        "is_present": doc.get("attendanceResultCode") in PRESENT_RESULT_CODES,
+        "tasks": _int(doc.get("adminCompletedTasks")) + _int(doc.get("selfCompletedTasks")),
+        "distance": _num(doc.get("distance")),
+        "num_breaks": _int(doc.get("numBreaks")),
+        "break_minutes": seconds_to_minutes(seconds),
+    }
+
+
+def _client_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "client_id": _str(doc.get("unolo_client_id")),
+        "area": doc.get("Division Name new (*)"),
+        "client_category": doc.get("Client Catagory (*)"),
+    }
+
+
+class Dataset:
+    def __init__(self, name: str, collection: str, schema: Callable[[], "pyarrow.Schema"],
+                 projection: Dict[str, int], row: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 month_expr: Any = None, month_query: Callable[[str], Dict[str, Any]] = None,
+                 key: Optional[Tuple[str, str]] = None):
+        self.name = name
+        self.collection = collection
+        self.schema = schema
+        self.projection = projection
+        self.row = row
+        # Mongo expression for a document's partition ("YYYY-MM"); None for unpartitioned
+        self.month_expr = month_expr
+        self.month_query = month_query
+        # (Mongo field, column) identifying a document whose partition can change on update
+        self.key = key
+
+
+def _task_month_query(month: str) -> Dict[str, Any]:
+    start, end = month_bounds(month)
+    return {"checkinTime": {"$gte": start, "$lt": end}}
+
+
+def _eod_month_query(month: str) -> Dict[str, Any]:
+    _, end = month_bounds(month)
+    return {"date": {"$gte": month, "$lt": month_key(end.date())}}
+
+
+DATASETS = {
+    "tasks": Dataset(
+        "tasks", "tasks",
+        lambda: pyarrow.schema([
+            ("task_id", pyarrow.string()),
+            ("employee_id", pyarrow.string()),
+            ("internal_emp_id", pyarrow.string()),
+            ("client_id", pyarrow.string()),
+            ("checkin_time", pyarrow.timestamp("ms", tz="UTC")),
+            ("school_category", pyarrow.string()),
+            ("specimens_given", pyarrow.int64()),
+        ]),
+        {"_id": 0, "taskID": 1, "employeeID": 1, "internalEmpID": 1, "clientID": 1,
+         "checkinTime": 1, "school_category": 1, "specimens_given": 1},
+        _task_row,
+        month_expr={"$cond": [
+            {"$eq": [{"$type": "$checkinTime"}, "date"]},
+            {"$dateToString": {"date": "$checkinTime", "format": "%Y-%m"}},
+            None,
+        ]},
+        month_query=_task_month_query,
+        # An edited checkinTime moves a task to another month
+        key=("taskID", "task_id"),
+    ),
+    "eod_summaries": Dataset(
+        "eod_summaries", "eod_summaries",
+        lambda: pyarrow.schema([
+            ("employee_id", pyarrow.string()),
+            ("date", pyarrow.date32()),
+            ("is_present", pyarrow.bool_()),
+            ("tasks", pyarrow.int64()),
+            ("distance", pyarrow.float64()),
+            ("num_breaks", pyarrow.int64()),
+            ("break_minutes", pyarrow.int64()),
+        ]),
+        {"_id": 0, "employeeID": 1, "date": 1, "attendanceResultCode": 1, "adminCompletedTasks": 1,
+         "selfCompletedTasks": 1, "distance": 1, "numBreaks": 1, "totalBreakTime": 1,
+         "total_break_time_seconds": 1},
+        _eod_row,
+        month_expr={"$cond": [
+            {"$eq": [{"$type": "$date"}, "string"]}, {"$substrCP": ["$date", 0, 7]}, None,
+        ]},
+        month_query=_eod_month_query,
+    ),
+    "clients": Dataset(
+        "clients", "clients",
+        lambda: pyarrow.schema([
+            ("client_id", pyarrow.string()),
+            ("area", pyarrow.string()),
+            ("client_category", pyarrow.string()),
+        ]),
+        {"_id": 0, "unolo_client_id": 1, "Division Name new (*)": 1, "Client Catagory (*)": 1},
+        _client_row,
+    ),
+}
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+async def _months_touched(dataset: Dataset, since: Optional[datetime]) -> List[str]:
+    """Partitions holding documents written after `since` (all partitions when None)."""
+    pipeline: List[Dict[str, Any]] = []
+    if since is not None:
+        pipeline.append({"$match": {"updated_at_local": {"$gt": since.replace(tzinfo=None)}}})
+    pipeline.extend([
+        {"$group": {"_id": dataset.month_expr}},
+        {"$match": {"_id": {"$ne": None}}},
+    ])
+    cursor = db_manager.get_collection(dataset.collection).aggregate(pipeline)
+    return sorted(doc["_id"] async for doc in cursor)
+
+
+def _partitions_holding(dataset: Dataset, root: str, months: List[str], changed: "pyarrow.Array") -> List[str]:
+    """Which of the existing `months` partitions hold one of the `changed` keys."""
+    _, column = dataset.key
+    holding = []
+    for month in months:
+        path = partition_path(root, dataset.name, month)
+        if not os.path.exists(path):
+            continue
+        with pyarrow.memory_map(path, "r") as source:
+            keys = pyarrow.ipc.open_file(source).read_all().column(column)
+            if pyarrow.compute.any(pyarrow.compute.is_in(keys, value_set=changed)).as_py():
+                holding.append(month)
+    return holding
+
+
+async def _months_holding(dataset: Dataset, root: str, months: List[str], since: datetime) -> List[str]:
+    """Existing partitions holding an older copy of a document written after `since`."""
+    field, _ = dataset.key
+    changed = await db_manager.get_collection(dataset.collection).distinct(
+        field, {"updated_at_local": {"$gt": since.replace(tzinfo=None)}}
+    )
+    if not changed:
+        return []
+    changed = pyarrow.array([str(value) for value in changed], pyarrow.string())
+    # Reading the partitions is file I/O; keep it off the event loop (the scheduler runs in the app)
+    return await asyncio.get_running_loop().run_in_executor(
+        None, _partitions_holding, dataset, root, months, changed
+    )
+
+
+async def _read_table(dataset: Dataset, query: Dict[str, Any]) -> "pyarrow.Table":
+    schema = dataset.schema()
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+    cursor = db_manager.get_collection(dataset.collection).find(query, dataset.projection).batch_size(READ_BATCH_SIZE)
+    async for doc in cursor:
+        for name, value in dataset.row(doc).items():
+            columns[name].append(value)
+    return pyarrow.table(columns, schema=schema)
+
+
+async def build_snapshot(full: bool = False, root: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Bring the snapshot up to date. Returns {dataset: {months, rows}} for what
+    was rewritten, or None when another process holds the build lock.
+    """
+    if pyarrow is None:
+        raise RuntimeError("Columnar snapshots need pyarrow installed")
+    root = root or snapshot_root()
+    loop = asyncio.get_running_loop()
+
+    with build_lock(root) as locked:
+        if not locked:
+            print("⟳ Columnar snapshot is being built by another process")
+            return None
+
+        manifest = read_manifest(root)
+        report: Dict[str, Any] = {}
+        for name, dataset in DATASETS.items():
+            state = manifest["datasets"].get(name, {})
+            started = datetime.now(timezone.utc)
+
+            if dataset.month_expr is None:
+                table = await _read_table(dataset, {})
+                await loop.run_in_executor(None, _write_table, partition_path(root, name), table)
+                state["rows"] = table.num_rows
+                report[name] = {"months": [], "rows": table.num_rows}
+            else:
+                since = None if full or "watermark" not in state else datetime.fromisoformat(state["watermark"])
+                months = await _months_touched(dataset, since)
+                if since is not None and dataset.key:
+                    stale = await _months_holding(dataset, root, sorted(set(state.get("months", {})) - set(months)), since)
+                    months = sorted(set(months) | set(stale))
+                partitions = {} if full else dict(state.get("months", {}))
+                written = 0
+                for month in months:
+                    table = await _read_table(dataset, dataset.month_query(month))
+                    await loop.run_in_executor(None, _write_table, partition_path(root, name, month), table)
+                    partitions[month] = table.num_rows
+                    written += table.num_rows
+                state["months"] = partitions
+                state["rows"] = sum(partitions.values())
+                report[name] = {"months": months, "rows": written}
+
+            state["watermark"] = (started - WATERMARK_OVERLAP).isoformat()
+            state["as_of"] = started.isoformat()
+            manifest["datasets"][name] = state
+            _write_json(os.path.join(root, MANIFEST), manifest)
+            print(f"✓ {name}: {len(report[name]['months'])} partitions rewritten, {report[name]['rows']} rows")
+        return report
+
+
+async def snapshot_scheduler(minutes: int) -> None:
+    """Refresh the snapshot every `minutes` until cancelled (app lifespan task)."""
+    while True:
+        try:
+            await build_snapshot()
+        except Exception as e:
+            print(f"✗ Columnar snapshot failed: {e}")
+        await asyncio.sleep(minutes * 60)
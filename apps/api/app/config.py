@@ -30,6 +30,19 @@ class Settings(BaseSettings):
     jwt_secret: str = "your-super-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 7200
+
+    # Password hashing: bcrypt work factor (log2 rounds) for new hashes, and the
+    # threads bcrypt runs on so hashing never blocks the event loop
+    bcrypt_rounds: int = 12
+    bcrypt_max_workers: int = 4
+
+    # Verified JWTs kept per worker so repeat requests skip signature checks (0 disables).
+    # Entries are dropped this many seconds before their exp claim.
+    token_cache_size: int = 10000
+    token_cache_skew_seconds: int = 30
+    # Revocations (users.tokens_valid_after) are re-read per user at most this often per worker,
+    # so a revocation reaches the other workers within this many seconds (0: read on every request)
+    token_revocation_check_seconds: float = 5.0
     
     # Application Settings
     environment: str = "development"
@@ -54,6 +67,47 @@ class Settings(BaseSettings):
     # Webhook Configuration
     webhook_secret: str = os.getenv("WEBHOOK_SECRET", "")
 
+    # API Request Logging
+    # Bytes of POST/PUT/PATCH bodies kept in the log line
+    log_body_max_bytes: int = 1000
+    # Sampling of successful requests: "path_prefix:rate,..." (errors are always logged)
+    log_sample_rates: str = "/api/health:0.05,/api/metrics:0.0"
+
+    # Bearer token required on /api/metrics (empty: open, for an internal-only listener)
+    metrics_token: str = ""
+
+    # MongoDB commands slower than this are logged with their query shape (0 disables)
+    mongo_slow_query_ms: int = 200
+
+    # Request profiling: secret for signed X-Profile headers (admins can always profile)
+    profiling_secret: str = ""
+
+    # Data exports: XLSX workbooks are written in child processes, at most this many at once
+    export_max_processes: int = 2
+
+    # Columnar analytics snapshot (Arrow files per month, see app.columnar)
+    columnar_dir: str = "data/columnar"
+    # Serve analytics ranges that end before the snapshot from it instead of Mongo
+    columnar_analytics: bool = False
+    # Refresh the snapshot from inside the app every N minutes (0: only via scripts/columnar.py)
+    columnar_snapshot_minutes: int = 0
+
+    # Unique-client counts: approximate=true ranges up to this many days are still counted exactly
+    unique_clients_exact_max_days: int = 7
+
+    # Batch analytics endpoints (employee_ids=...): most employees per request
+    analytics_batch_max_employees: int = 50
+
+    # Readiness (/api/health/ready answers 503 when any limit is crossed)
+    ready_max_mongo_ping_ms: float = 500.0
+    # Checked-out connections / maxPoolSize
+    ready_max_pool_utilization: float = 0.9
+    ready_max_loop_lag_ms: float = 500.0
+    # Age of the oldest webhook payload still being processed
+    ready_max_webhook_lag_seconds: float = 120.0
+    # Max hours since the last successful sync: "entity:hours,..." (empty disables)
+    ready_max_sync_age_hours: str = ""
+
     @model_validator(mode='after')
     def _update_mongodb_url(self) -> 'Settings':
         """
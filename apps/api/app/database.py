@@ -4,9 +4,14 @@ Async MongoDB connection using Motor driver
 """
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.errors import CollectionInvalid
 from typing import Optional
 
 from app.config import get_settings
+from app.db_monitoring import CommandMonitor, pool_monitor
+
+# Connections per server in each worker's pool; the readiness check reports usage against it
+MAX_POOL_SIZE = 10
 
 
 class DatabaseManager:
@@ -34,9 +39,10 @@ class DatabaseManager:
         
         self.client = AsyncIOMotorClient(
             settings.mongodb_url,
-            maxPoolSize=10,
+            maxPoolSize=MAX_POOL_SIZE,
             minPoolSize=1,
-            serverSelectionTimeoutMS=5000
+            serverSelectionTimeoutMS=5000,
+            event_listeners=[CommandMonitor(slow_ms=settings.mongo_slow_query_ms), pool_monitor]
         )
         self.db = self.client[settings.database_name]
         
@@ -53,45 +59,31 @@ class DatabaseManager:
     
     async def ensure_indexes(self, models: list) -> None:
         """
-        Create database indexes for provided models.
+        Create collections and missing indexes for provided models.
         Models must have a `MongoMeta` inner class with `collection_name` and `indexes`.
+        Existing indexes are left alone; see app.index_manager for the diff.
         """
         if self.db is None:
             print("⚠ Database not connected, skipping index creation")
             return
-            
+
+        from app.index_manager import print_report, sync_indexes
+
         print("⟳ Verifying database indexes...")
-        
-        for model in models:
-            if not hasattr(model, "MongoMeta"):
-                continue
-                
-            meta = model.MongoMeta
-            if not hasattr(meta, "collection_name") or not hasattr(meta, "indexes"):
-                continue
-                
-            collection_name = meta.collection_name
-            indexes = meta.indexes
-            
-            if not indexes:
-                continue
-                
-            collection = self.db[collection_name]
-            
-            for index in indexes:
-                keys = index.get("keys")
-                if not keys:
-                    continue
-                    
-                kwargs = {k: v for k, v in index.items() if k != "keys"}
-                
-                try:
-                    await collection.create_index(keys, background=True, **kwargs)
-                except Exception as e:
-                    print(f"✗ Failed to create index {keys} on {collection_name}: {e}")
-                    
+        print_report(await sync_indexes(models))
         print("✓ Database indexes verified")
 
+    async def ensure_collection(self, name: str, options: dict) -> None:
+        """Create a collection with options (timeseries, capped...) if it does not exist yet."""
+        try:
+            await self.db.create_collection(name, **options)
+            print(f"✓ Created collection {name}")
+        except CollectionInvalid:
+            # Already exists
+            pass
+        except Exception as e:
+            print(f"✗ Failed to create collection {name}: {e}")
+
     def get_collection(self, name: str):
         """Get a collection from the database."""
         if self.db is None:
@@ -0,0 +1,260 @@
+"""
+MongoDB Command Monitoring
+Metrics, per-request attribution and slow-query logging for every command
+
+The listener is registered on the Motor client in DatabaseManager.connect.
+pymongo calls it from Motor's executor threads; Motor copies the caller's
+contextvars into those threads, so the request that issued a command is known.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from app.metrics import MONGO_COMMAND_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Field holding the filter/pipeline of each command, for the query shape
+SHAPE_FIELDS = {
+    "find": "filter",
+    "aggregate": "pipeline",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+
+# Longest query shape written to the slow-query log
+MAX_SHAPE_LENGTH = 500
+
+
+class QueryStats:
+    """Commands issued within one request (or other tracked scope)."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.duration_micros = 0
+        self.commands: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def add(self, collection: str, command: str, duration_micros: int) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration_micros += duration_micros
+            self.commands.append((collection, command))
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration_micros / 1000, 2)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("mongo_query_stats", default=None)
+
+# Budgets count every command while active, whatever context issued it
+_active_budgets: List[QueryStats] = []
+
+# Read commands kept by capture_commands, for explain
+CAPTURED_COMMANDS = {"find", "aggregate", "count", "distinct"}
+_active_captures: List[List[Tuple[str, str, Dict[str, Any]]]] = []
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """QueryStats of the current request, if one is being tracked."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(label: str = "") -> Iterator[QueryStats]:
+    """Attribute the commands issued inside the block (and its tasks) to one QueryStats."""
+    stats = QueryStats(label)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def count_all_queries(label: str = "") -> Iterator[QueryStats]:
+    """
+    Count every command issued while the block runs, in any context or thread.
+    Used by the query budget test fixture, where requests run on another loop.
+    """
+    stats = QueryStats(label)
+    _active_budgets.append(stats)
+    try:
+        yield stats
+    finally:
+        _active_budgets.remove(stats)
+
+
+@contextmanager
+def capture_commands() -> Iterator[List[Tuple[str, str, Dict[str, Any]]]]:
+    """
+    Collect (database, collection, command) for every read command issued while
+    the block runs, in any context or thread. Used by the index advisor.
+    """
+    captured: List[Tuple[str, str, Dict[str, Any]]] = []
+    _active_captures.append(captured)
+    try:
+        yield captured
+    finally:
+        _active_captures.remove(captured)
+
+
+def query_shape(value: Any) -> Any:
+    """Replace literal values with "?" keeping field names and operators."""
+    if isinstance(value, dict):
+        return {k: query_shape(v) for k, v in value.items()}
+    if isinstance(value, list):
+        if value and all(isinstance(v, dict) for v in value):
+            return [query_shape(v) for v in value]
+        return "?"
+    return "?"
+
+
+def command_shape(command_name: str, command: Dict[str, Any]) -> Any:
+    """Query shape of a command: its filter, pipeline or update/delete selectors."""
+    if command_name in SHAPE_FIELDS:
+        return query_shape(command.get(SHAPE_FIELDS[command_name], {}))
+    if command_name == "update":
+        return [query_shape(u.get("q", {})) for u in command.get("updates", [])[:3]]
+    if command_name == "delete":
+        return [query_shape(d.get("q", {})) for d in command.get("deletes", [])[:3]]
+    return None
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Records metrics for every command, attributes it to the current request,
+    and logs commands slower than `slow_ms` with their query shape.
+
+    Collection names and shapes are only available on the started event, so they
+    are kept per (connection, request id) until the command finishes.
+    """
+
+    def __init__(self, slow_ms: int = 200):
+        self.slow_micros = slow_ms * 1000
+        self._pending: Dict[Tuple[Any, int], Tuple[str, Optional[QueryStats], Any]] = {}
+
+    @staticmethod
+    def _collection(event: monitoring.CommandStartedEvent) -> str:
+        command = event.command
+        if event.command_name == "getMore":
+            return str(command.get("collection", ""))
+        value = command.get(event.command_name)
+        return value if isinstance(value, str) else ""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        collection = self._collection(event)
+        shape = command_shape(event.command_name, event.command) if self.slow_micros else None
+        self._pending[(event.connection_id, event.request_id)] = (
+            collection,
+            _current_stats.get(),
+            shape,
+        )
+        if _active_captures and event.command_name in CAPTURED_COMMANDS:
+            command = dict(event.command)
+            for captured in _active_captures:
+                captured.append((event.database_name, collection, command))
+
+    def _finish(self, event, outcome: str) -> None:
+        collection, stats, shape = self._pending.pop(
+            (event.connection_id, event.request_id), ("", None, None)
+        )
+        duration = event.duration_micros
+
+        MONGO_COMMAND_DURATION.labels(
+            collection=collection,
+            command=event.command_name,
+            outcome=outcome,
+        ).observe(duration / 1e6)
+
+        if stats is not None:
+            stats.add(collection, event.command_name, duration)
+        for budget in _active_budgets:
+            budget.add(collection, event.command_name, duration)
+
+        if self.slow_micros and duration >= self.slow_micros:
+            shape_str = str(shape)
+            if len(shape_str) > MAX_SHAPE_LENGTH:
+                shape_str = shape_str[:MAX_SHAPE_LENGTH] + "...<truncated>"
+            logger.warning(
+                f"Slow Mongo command: {event.command_name} {collection} "
+                f"{duration / 1000:.1f}ms ({outcome}) "
+                f"request={stats.label if stats else '-'} shape={shape_str}"
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, "success")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, "failure")
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Tracks checked-out connections and waiting check-outs per server pool,
+    for the readiness check. Counts are per process (one Motor client each).
+    """
+
+    def __init__(self):
+        self.in_use: Dict[Any, int] = {}
+        self.waiting: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def _adjust(self, counts: Dict[Any, int], address: Any, delta: int) -> None:
+        with self._lock:
+            counts[address] = max(counts.get(address, 0) + delta, 0)
+
+    def max_in_use(self) -> int:
+        """Busiest pool's checked-out connections (maxPoolSize applies per server)."""
+        return max(self.in_use.values(), default=0)
+
+    def total_waiting(self) -> int:
+        return sum(self.waiting.values())
+
+    def connection_check_out_started(self, event) -> None:
+        self._adjust(self.waiting, event.address, 1)
+
+    def connection_check_out_failed(self, event) -> None:
+        self._adjust(self.waiting, event.address, -1)
+
+    def connection_checked_out(self, event) -> None:
+        self._adjust(self.waiting, event.address, -1)
+        self._adjust(self.in_use, event.address, 1)
+
+    def connection_checked_in(self, event) -> None:
+        self._adjust(self.in_use, event.address, -1)
+
+    def pool_cleared(self, event) -> None:
+        with self._lock:
+            self.in_use.pop(event.address, None)
+
+    def pool_closed(self, event) -> None:
+        with self._lock:
+            self.in_use.pop(event.address, None)
+            self.waiting.pop(event.address, None)
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        pass
+
+
+pool_monitor = PoolMonitor()
@@ -5,11 +5,13 @@ Provides async HTTP client for interacting with Unolo's external API.
 """
 
 import logging
+import time
 from typing import Optional, Any, Dict, List
 
 import httpx
 
 from app.config import get_settings
+from app.metrics import UNOLO_REQUEST_DURATION, UNOLO_REQUEST_ERRORS
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +103,7 @@ class UnoloClient:
             UnoloClientError: If the request fails
         """
         client = await self._get_client()
+        started = time.perf_counter()
         
         try:
             logger.info(f"Unolo API Request: {method} {endpoint}")
@@ -114,11 +117,17 @@ class UnoloClient:
             
             # Log response status
             logger.info(f"Unolo API Response: {response.status_code}")
+            UNOLO_REQUEST_DURATION.labels(
+                method=method, endpoint=endpoint, status=str(response.status_code)
+            ).observe(time.perf_counter() - started)
             
             # Check for errors
             if response.status_code >= 400:
                 error_text = response.text
                 logger.error(f"Unolo API Error: {response.status_code} - {error_text}")
+                UNOLO_REQUEST_ERRORS.labels(
+                    method=method, endpoint=endpoint, reason=str(response.status_code)
+                ).inc()
                 raise UnoloClientError(
                     f"Unolo API request failed: {response.status_code}",
                     status_code=response.status_code,
@@ -129,6 +138,9 @@ class UnoloClient:
             
         except httpx.RequestError as e:
             logger.error(f"Unolo API Connection Error: {e}")
+            UNOLO_REQUEST_ERRORS.labels(
+                method=method, endpoint=endpoint, reason=type(e).__name__
+            ).inc()
             raise UnoloClientError(f"Failed to connect to Unolo API: {e}")
     
     # ==================== Employee Master Endpoints ====================
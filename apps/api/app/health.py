@@ -0,0 +1,174 @@
+"""
+Readiness Checks
+Per-worker signals behind /api/health/ready
+
+/api/health only says the process is up. Readiness also fails when this worker
+cannot serve well: Mongo slow or unreachable, its connection pool saturated,
+the event loop blocked, webhook batches stuck, or synced data too old.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+from app.config import get_settings
+from app.database import MAX_POOL_SIZE, db_manager
+from app.db_monitoring import pool_monitor
+from app.repository.sync_status_repository import sync_status_repository
+
+# Longest a readiness ping may take before Mongo counts as unreachable
+PING_TIMEOUT_SECONDS = 2.0
+
+
+class EventLoopLagMonitor:
+    """
+    Sleeps `interval` seconds in a loop and records how late it wakes up.
+    The lag reported is the worst seen over the last `window` seconds.
+    """
+
+    def __init__(self, interval: float = 0.5, window: float = 30.0):
+        self.interval = interval
+        self.window = window
+        self.samples: Deque[Tuple[float, float]] = deque()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.samples.append((now, max(now - expected, 0.0)))
+            while self.samples and self.samples[0][0] < now - self.window:
+                self.samples.popleft()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def max_lag_ms(self) -> float:
+        return round(max((lag for _, lag in self.samples), default=0.0) * 1000, 2)
+
+
+class WebhookLagTracker:
+    """Start times of webhook payloads being processed in this worker."""
+
+    def __init__(self):
+        self._started: Dict[int, float] = {}
+        self._ids = itertools.count()
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        key = next(self._ids)
+        self._started[key] = time.monotonic()
+        try:
+            yield
+        finally:
+            self._started.pop(key, None)
+
+    def oldest_age_seconds(self) -> float:
+        """Age of the oldest payload still in progress (0 when idle)."""
+        if not self._started:
+            return 0.0
+        return round(time.monotonic() - min(self._started.values()), 2)
+
+
+loop_lag_monitor = EventLoopLagMonitor()
+webhook_lag = WebhookLagTracker()
+
+
+def parse_sync_age_limits(value: str) -> Dict[str, float]:
+    """Parse "entity:hours,..." into {entity: hours}. Malformed entries are ignored."""
+    limits = {}
+    for item in value.split(","):
+        entity, _, hours = item.strip().partition(":")
+        try:
+            limits[entity] = float(hours)
+        except ValueError:
+            continue
+    return {k: v for k, v in limits.items() if k}
+
+
+def _check(value: Any, threshold: float, ok: bool, **extra) -> Dict[str, Any]:
+    return {"ok": ok, "value": value, "threshold": threshold, **extra}
+
+
+async def _mongo_ping_ms() -> Optional[float]:
+    if db_manager.client is None:
+        return None
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(db_manager.client.admin.command("ping"), PING_TIMEOUT_SECONDS)
+    except Exception:
+        return None
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+async def check_readiness() -> Tuple[bool, Dict[str, Any]]:
+    """
+    Run every readiness check against its configured threshold.
+    Returns (ready, checks); each check reports ok, value and threshold.
+    """
+    settings = get_settings()
+    checks: Dict[str, Any] = {}
+
+    ping_ms = await _mongo_ping_ms()
+    checks["mongo_ping_ms"] = _check(
+        ping_ms, settings.ready_max_mongo_ping_ms,
+        ping_ms is not None and ping_ms <= settings.ready_max_mongo_ping_ms,
+    )
+
+    in_use = pool_monitor.max_in_use()
+    utilization = round(in_use / MAX_POOL_SIZE, 3)
+    checks["mongo_pool_utilization"] = _check(
+        utilization, settings.ready_max_pool_utilization,
+        utilization <= settings.ready_max_pool_utilization,
+        in_use=in_use, max_pool_size=MAX_POOL_SIZE, waiting=pool_monitor.total_waiting(),
+    )
+
+    lag_ms = loop_lag_monitor.max_lag_ms()
+    checks["event_loop_lag_ms"] = _check(
+        lag_ms, settings.ready_max_loop_lag_ms,
+        lag_ms <= settings.ready_max_loop_lag_ms,
+        monitored=loop_lag_monitor.running,
+    )
+
+    webhook_age = webhook_lag.oldest_age_seconds()
+    checks["webhook_lag_seconds"] = _check(
+        webhook_age, settings.ready_max_webhook_lag_seconds,
+        webhook_age <= settings.ready_max_webhook_lag_seconds,
+    )
+
+    limits = parse_sync_age_limits(settings.ready_max_sync_age_hours)
+    if limits:
+        try:
+            last_success = {s["entity"]: s["last_success_at"] for s in await sync_status_repository.find_all()}
+        except Exception:
+            last_success = {}
+        now = datetime.now(timezone.utc)
+        for entity, max_hours in limits.items():
+            at = last_success.get(entity)
+            if at is not None and at.tzinfo is None:
+                at = at.replace(tzinfo=timezone.utc)
+            age = round((now - at).total_seconds() / 3600, 2) if at else None
+            checks[f"sync_age_hours.{entity}"] = _check(
+                age, max_hours, age is not None and age <= max_hours,
+            )
+
+    return all(c["ok"] for c in checks.values()), checks
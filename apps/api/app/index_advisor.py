@@ -0,0 +1,270 @@
+"""
+Index Advisor
+Explains captured repository queries and flags the ones indexes don't serve
+
+Commands recorded by db_monitoring.capture_commands() are re-run with
+explain("executionStats"). Each distinct shape is reported with its plan
+(COLLSCAN or the index used), docs examined per doc returned, and, when it is
+poorly served, a compound index in ESR order: equality fields first, then the
+sort, then range fields. $indexStats adds the indexes nothing has used.
+
+Explain is not supported by mongomock; this needs a real mongod.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.database import Database
+
+from app.db_monitoring import command_shape
+
+# Fields of a driver command that explain rejects or that carry no query shape
+_SESSION_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "$db",
+                   "$clusterTime", "$readPreference", "readConcern"}
+
+_EQUALITY_OPERATORS = {"$eq", "$in"}
+_RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$exists", "$regex"}
+
+# Docs examined per doc returned above which a query counts as poorly indexed
+DEFAULT_MAX_RATIO = 10.0
+
+
+def _query(command_name: str, command: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """(filter, sort) a command applies before any other stage."""
+    if command_name == "find":
+        return command.get("filter") or {}, command.get("sort") or {}
+    if command_name in ("count", "distinct"):
+        return command.get("query") or {}, {}
+    pipeline = command.get("pipeline") or []
+    match = pipeline[0].get("$match", {}) if pipeline else {}
+    sort = {}
+    following = pipeline[1 if match else 0:2 if match else 1]
+    if following and "$sort" in following[0]:
+        sort = following[0]["$sort"]
+    return match, sort
+
+
+def _classify(query: Dict[str, Any], equality: List[str], ranges: List[str]) -> None:
+    for field, value in query.items():
+        if field == "$and":
+            for clause in value:
+                _classify(clause, equality, ranges)
+            continue
+        if field.startswith("$"):
+            # $or / $expr / $text can't be mapped onto one compound index
+            continue
+        operators = set(value) if isinstance(value, dict) and value and all(
+            str(k).startswith("$") for k in value) else None
+        if operators is None or operators <= _EQUALITY_OPERATORS:
+            target = equality
+        elif operators & _RANGE_OPERATORS:
+            target = ranges
+        else:
+            continue
+        if field not in equality and field not in ranges:
+            target.append(field)
+
+
+def _esr_keys(query: Dict[str, Any], sort: Any) -> List[Tuple[str, int]]:
+    equality: List[str] = []
+    ranges: List[str] = []
+    _classify(query, equality, ranges)
+
+    keys: List[Tuple[str, int]] = [(f, 1) for f in equality]
+    for field, direction in (sort.items() if isinstance(sort, dict) else sort):
+        if field not in equality:
+            keys.append((field, direction if direction in (1, -1) else 1))
+    keys.extend((f, 1) for f in ranges if f not in dict(keys))
+    return keys
+
+
+def recommend_indexes(command_name: str, command: Dict[str, Any]) -> List[List[Tuple[str, int]]]:
+    """
+    Compound indexes for a command's filter and sort, in ESR order: one per $or
+    branch (each branch is planned separately), or a single one without $or.
+    Returns [] when the filter has nothing indexable.
+    """
+    query, sort = _query(command_name, command)
+    base = {k: v for k, v in query.items() if k != "$or"}
+    branches = query.get("$or") or [{}]
+
+    recommendations: List[List[Tuple[str, int]]] = []
+    for branch in branches:
+        keys = _esr_keys({"$and": [base, branch]}, sort)
+        if keys and keys not in recommendations:
+            recommendations.append(keys)
+    return recommendations
+
+
+def _covered(keys: List[Tuple[str, int]], existing: List[Dict[str, Any]]) -> Optional[str]:
+    """Name of an existing index whose key starts with `keys` (direction-insensitive)."""
+    fields = [f for f, _ in keys]
+    for index in existing:
+        index_fields = list(index["key"].keys())
+        if index_fields[:len(fields)] == fields and not index.get("partialFilterExpression"):
+            return index["name"]
+    return None
+
+
+def _plan_nodes(node: Any) -> List[Dict[str, Any]]:
+    """Every stage node under a plan, depth first."""
+    if not isinstance(node, dict):
+        return []
+    found = [node] if "stage" in node else []
+    for key in ("inputStage", "queryPlan", "winningPlan"):
+        found.extend(_plan_nodes(node.get(key)))
+    for child in node.get("inputStages") or []:
+        found.extend(_plan_nodes(child))
+    return found
+
+
+def _explain_parts(explain: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]:
+    """(queryPlanner, executionStats, $lookup stages) from find or aggregate explain output."""
+    if "queryPlanner" in explain:
+        return explain["queryPlanner"], explain.get("executionStats") or {}, [
+            s for s in explain.get("stages") or [] if "$lookup" in s
+        ]
+    stages = explain.get("stages") or []
+    cursor = next((s["$cursor"] for s in stages if "$cursor" in s), {})
+    lookups = [s for s in stages if "$lookup" in s]
+    return cursor.get("queryPlanner") or {}, cursor.get("executionStats") or {}, lookups
+
+
+def analyze_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """Plan stages, indexes used and docs examined/returned from explain output."""
+    planner, stats, lookups = _explain_parts(explain)
+    nodes = _plan_nodes(planner.get("winningPlan") or {})
+    stages = [n["stage"] for n in nodes]
+    indexes = sorted({n["indexName"] for n in nodes if n.get("indexName")})
+
+    examined = stats.get("totalDocsExamined", 0)
+    returned = stats.get("nReturned", 0)
+    lookup_scans = sum(int(s.get("collectionScans") or 0) for s in lookups)
+    for stage in lookups:
+        indexes.extend(i.get("index") for i in stage.get("indexesUsed") or [] if isinstance(i, dict))
+        examined += int(stage.get("totalDocsExamined") or 0)
+
+    return {
+        "stages": stages,
+        "indexes": indexes,
+        "collscan": "COLLSCAN" in stages,
+        "lookup_collscans": lookup_scans,
+        "docs_examined": examined,
+        "keys_examined": stats.get("totalKeysExamined", 0),
+        "returned": returned,
+        "ratio": round(examined / max(returned, 1), 1),
+        "time_ms": stats.get("executionTimeMillis"),
+    }
+
+
+def explain_command(db: Database, command_name: str, command: Dict[str, Any]) -> Dict[str, Any]:
+    body = {k: v for k, v in command.items() if k not in _SESSION_FIELDS}
+    if command_name == "aggregate":
+        body["cursor"] = {}
+    return db.command({"explain": body, "verbosity": "executionStats"})
+
+
+def _explainable(command_name: str, command: Dict[str, Any]) -> bool:
+    if command_name != "aggregate":
+        return True
+    # explain executionStats would run the write
+    return not any("$out" in s or "$merge" in s for s in command.get("pipeline") or [])
+
+
+def explain_commands(
+    client,
+    captured: List[Tuple[str, str, Dict[str, Any]]],
+    max_ratio: float = DEFAULT_MAX_RATIO,
+) -> List[Dict[str, Any]]:
+    """
+    Explain each distinct (collection, command shape) in `captured` once, using the
+    first values seen. `client` is a synchronous pymongo MongoClient.
+    """
+    seen = set()
+    existing: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    reports = []
+    for database, collection, command in captured:
+        command_name = next(iter(command))
+        shape = str(command_shape(command_name, command))
+        _, sort = _query(command_name, command)
+        key = (database, collection, shape, str(sort))
+        if key in seen or not _explainable(command_name, command):
+            continue
+        seen.add(key)
+
+        db = client[database]
+        result = analyze_explain(explain_command(db, command_name, command))
+        query, _ = _query(command_name, command)
+        report = {
+            "collection": collection,
+            "command": command_name,
+            "shape": shape,
+            "filtered": bool(query),
+            **result,
+            "recommendation": None,
+        }
+
+        poorly_served = (result["collscan"] and query) or result["ratio"] > max_ratio
+        if poorly_served:
+            recommendations = recommend_indexes(command_name, command)
+            if recommendations:
+                if (database, collection) not in existing:
+                    existing[(database, collection)] = list(db[collection].list_indexes())
+                report["recommendation"] = [
+                    {"keys": keys, "covered_by": _covered(keys, existing[(database, collection)])}
+                    for keys in recommendations
+                ]
+        reports.append(report)
+    return reports
+
+
+def unused_indexes(db: Database, collections: List[str]) -> List[Dict[str, Any]]:
+    """
+    Indexes with no recorded accesses since the server (or index) started, per $indexStats.
+    Unique indexes are listed too but marked, since they enforce constraints.
+    """
+    unused = []
+    for name in collections:
+        unique = {i["name"] for i in db[name].list_indexes() if i.get("unique")}
+        for stat in db[name].aggregate([{"$indexStats": {}}]):
+            if stat["name"] == "_id_" or stat["accesses"]["ops"]:
+                continue
+            unused.append({
+                "collection": name,
+                "index": stat["name"],
+                "key": dict(stat["key"]),
+                "unique": stat["name"] in unique,
+                "since": stat["accesses"].get("since"),
+            })
+    return unused
+
+
+def print_report(reports: List[Dict[str, Any]], unused: List[Dict[str, Any]]) -> bool:
+    """Print queries and unused indexes; returns True when a filtered query scans its collection."""
+    problems = False
+    for r in sorted(reports, key=lambda r: (-r["ratio"], r["collection"])):
+        plan = "COLLSCAN" if r["collscan"] else ", ".join(r["indexes"]) or "-"
+        if r["collscan"] and r["filtered"]:
+            problems = True
+            mark = "✗"
+        elif r["recommendation"] or r["lookup_collscans"]:
+            mark = "⚠"
+        else:
+            mark = "✓"
+        print(f"{mark} {r['collection']}.{r['command']} {r['shape'][:100]}")
+        print(f"    plan: {plan}  examined {r['docs_examined']} / returned {r['returned']} "
+              f"(ratio {r['ratio']})  {r['time_ms']}ms")
+        if r["lookup_collscans"]:
+            print(f"    $lookup collection scans: {r['lookup_collscans']}")
+        for rec in r["recommendation"] or []:
+            keys = ", ".join(f"{f}: {d}" for f, d in rec["keys"])
+            if rec["covered_by"]:
+                print(f"    existing index {rec['covered_by']} matches {{{keys}}} but was not chosen")
+            else:
+                print(f"    recommend index {{{keys}}}")
+
+    if unused:
+        print("\nIndexes without accesses")
+        for u in unused:
+            note = " (unique, keep)" if u["unique"] else ""
+            print(f"  ⚠ {u['collection']}.{u['index']} {u['key']}{note}")
+    return problems
@@ -0,0 +1,243 @@
+"""
+Index Manager
+Keeps MongoDB indexes in step with the models' `MongoMeta` declarations
+
+MongoMeta is the single source of truth: each run diffs the declared indexes
+against list_indexes(), creates only the missing ones (one create_indexes call
+per collection, collections in parallel) and reports drift: indexes declared
+with different options, and indexes present in the database but not declared.
+
+At startup only one gunicorn worker does this, under a lease stored in the
+`locks` collection; the others start serving straight away.
+"""
+
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import IndexModel
+from pymongo.errors import DuplicateKeyError
+
+from app.database import db_manager
+from app.models.attendance import AttendanceInDB
+from app.models.attendance_event import AttendanceEventsInDB
+from app.models.client import ClientInDB
+from app.models.client_latest_visit import ClientLatestVisitInDB, EmployeeClientLatestVisitInDB
+from app.models.client_sketch import ClientSketchInDB
+from app.models.employee import Employee
+from app.models.eod_summary import EodSummaryInDB
+from app.models.eod_track import EodTrackInDB
+from app.models.import_job import ImportJobErrorInDB, ImportJobInDB
+from app.models.location_event import LocationEventInDB
+from app.models.product import ProductInDB
+from app.models.profile import ProfileInDB
+from app.models.sale import SaleInDB
+from app.models.schema_migration import SchemaMigrationInDB
+from app.models.sync_status import SyncStatusInDB
+from app.models.task import TaskInDB
+from app.models.user import UserInDB
+
+# Every model whose collection and indexes are managed
+INDEXED_MODELS = [
+    UserInDB, ProductInDB, SaleInDB, Employee, ClientInDB, TaskInDB,
+    EodSummaryInDB, AttendanceInDB, ClientLatestVisitInDB, EodTrackInDB,
+    AttendanceEventsInDB, LocationEventInDB, ProfileInDB, SyncStatusInDB,
+    SchemaMigrationInDB, ImportJobInDB, ImportJobErrorInDB, ClientSketchInDB,
+    EmployeeClientLatestVisitInDB,
+]
+
+# Index options that make two indexes with the same keys differ
+COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+LEASE_COLLECTION = "locks"
+LEASE_ID = "index_manager"
+LEASE_SECONDS = 300
+
+
+def _key_tuple(keys: Any) -> Tuple[Tuple[str, Any], ...]:
+    items = keys.items() if isinstance(keys, dict) else keys
+    return tuple((field, direction) for field, direction in items)
+
+
+def _index_name(keys: Tuple[Tuple[str, Any], ...]) -> str:
+    """Default name Mongo gives an index: field_direction pairs joined by underscores."""
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+def _options(index: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: index[k] for k in COMPARED_OPTIONS if k in index and index[k] not in (None, False)}
+
+
+def desired_indexes(model) -> List[Dict[str, Any]]:
+    """Declared indexes of a model, normalized to {name, key, options, spec}."""
+    result = []
+    for index in getattr(model.MongoMeta, "indexes", None) or []:
+        if not index.get("keys"):
+            continue
+        keys = _key_tuple(index["keys"])
+        spec = {k: v for k, v in index.items() if k != "keys"}
+        result.append({
+            "name": spec.get("name") or _index_name(keys),
+            "key": keys,
+            "options": _options(spec),
+            "spec": spec,
+        })
+    return result
+
+
+def diff_indexes(desired: List[Dict[str, Any]], existing: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Compare declared indexes with list_indexes() output.
+    Returns missing (to create), conflicts (same keys or name, different definition)
+    and extra (in the database but not declared) indexes.
+    """
+    existing = [i for i in existing if i["name"] != "_id_"]
+    by_key = {_key_tuple(i["key"]): i for i in existing}
+    by_name = {i["name"]: i for i in existing}
+
+    missing, conflicts, matched = [], [], set()
+    for index in desired:
+        current = by_key.get(index["key"])
+        if current is None:
+            same_name = by_name.get(index["name"])
+            if same_name is not None:
+                matched.add(same_name["name"])
+                conflicts.append({"name": index["name"], "declared": index["key"],
+                                  "existing": _key_tuple(same_name["key"])})
+            else:
+                missing.append(index)
+            continue
+        matched.add(current["name"])
+        if _options(current) != index["options"]:
+            conflicts.append({"name": current["name"], "declared": index["options"],
+                              "existing": _options(current)})
+
+    extra = [i["name"] for i in existing if i["name"] not in matched]
+    return {"missing": missing, "conflicts": conflicts, "extra": extra}
+
+
+def _collection_options(meta) -> Dict[str, Any]:
+    # Time-series and capped collections must be created explicitly before first insert
+    options: Dict[str, Any] = {}
+    if getattr(meta, "timeseries", None):
+        options["timeseries"] = meta.timeseries
+    if getattr(meta, "capped", None):
+        options.update(capped=True, **meta.capped)
+    return options
+
+
+async def _sync_collection(model, create: bool) -> Tuple[str, Dict[str, Any]]:
+    meta = model.MongoMeta
+    name = meta.collection_name
+    options = _collection_options(meta)
+    if options and create:
+        await db_manager.ensure_collection(name, options)
+
+    collection = db_manager.get_collection(name)
+    existing = await collection.list_indexes().to_list(length=None)
+    diff = diff_indexes(desired_indexes(model), existing)
+
+    report = {
+        "missing": [i["name"] for i in diff["missing"]],
+        "created": [],
+        "conflicts": diff["conflicts"],
+        "extra": diff["extra"],
+        "error": None,
+    }
+    if create and diff["missing"]:
+        models = [IndexModel(list(i["key"]), **i["spec"]) for i in diff["missing"]]
+        try:
+            report["created"] = await collection.create_indexes(models)
+        except Exception as e:
+            report["error"] = str(e)
+    return name, report
+
+
+async def sync_indexes(models: Optional[list] = None, create: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Diff (and, if `create`, build the missing) indexes of `models`, all collections in parallel.
+    Returns a per-collection report: missing, created, conflicts, extra, error.
+    """
+    models = [m for m in (INDEXED_MODELS if models is None else models) if hasattr(getattr(m, "MongoMeta", None), "collection_name")]
+    results = await asyncio.gather(*(_sync_collection(m, create) for m in models), return_exceptions=True)
+
+    report = {}
+    for model, result in zip(models, results):
+        if isinstance(result, BaseException):
+            report[model.MongoMeta.collection_name] = {
+                "missing": [], "created": [], "conflicts": [], "extra": [], "error": str(result)
+            }
+        else:
+            name, collection_report = result
+            report[name] = collection_report
+    return report
+
+
+def print_report(report: Dict[str, Dict[str, Any]]) -> bool:
+    """Print created indexes and drift; returns True when there is drift or an error."""
+    drift = False
+    for name, r in sorted(report.items()):
+        if r["created"]:
+            print(f"✓ {name}: created {', '.join(r['created'])}")
+        elif r["missing"]:
+            drift = True
+            print(f"✗ {name}: missing {', '.join(r['missing'])}")
+        for c in r["conflicts"]:
+            drift = True
+            print(f"✗ {name}: {c['name']} differs (declared {c['declared']}, existing {c['existing']})")
+        if r["extra"]:
+            drift = True
+            print(f"⚠ {name}: not declared in MongoMeta: {', '.join(r['extra'])}")
+        if r["error"]:
+            drift = True
+            print(f"✗ {name}: {r['error']}")
+    return drift
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def acquire_lease(owner: str, seconds: int = LEASE_SECONDS) -> bool:
+    """Take (or renew) the index lease unless another live owner holds it."""
+    now = datetime.now(timezone.utc)
+    try:
+        await db_manager.get_collection(LEASE_COLLECTION).find_one_and_update(
+            {"_id": LEASE_ID, "$or": [{"expires_at": {"$lt": now}}, {"owner": owner}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=seconds), "acquired_at": now}},
+            upsert=True,
+        )
+        return True
+    except DuplicateKeyError:
+        # The filter missed (lease held) and the upsert hit the existing _id
+        return False
+
+
+async def release_lease(owner: str) -> None:
+    await db_manager.get_collection(LEASE_COLLECTION).delete_one({"_id": LEASE_ID, "owner": owner})
+
+
+async def sync_indexes_with_lease(models: Optional[list] = None) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Startup entry point: the worker holding the lease syncs indexes and prints drift;
+    the others return None immediately.
+    """
+    if db_manager.db is None:
+        print("⚠ Database not connected, skipping index creation")
+        return None
+
+    owner = _owner()
+    if not await acquire_lease(owner):
+        print("⟳ Indexes are being verified by another worker")
+        return None
+
+    try:
+        print("⟳ Verifying database indexes...")
+        report = await sync_indexes(models)
+        if not print_report(report):
+            print("✓ Database indexes verified")
+        return report
+    finally:
+        await release_lease(owner)
@@ -3,19 +3,23 @@ FastAPI Application Entry Point
 Main application setup with routes, middleware, and lifecycle events
 """
 
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.columnar import snapshot_scheduler
 from app.config import get_settings
 from app.database import db_manager
-from app.routes import auth, products, dashboard, clients, employees, tasks, analytics, webhooks, contact, eod_summary, attendance, sync, emp_analytics, all_emp_analytics
+from app.health import check_readiness, loop_lag_monitor
+from app.index_manager import sync_indexes_with_lease
+from app.metrics import metrics_authorized, render_metrics
+from app.utils.security import shutdown_password_executor
+from app.routes import auth, products, dashboard, clients, employees, tasks, analytics, webhooks, contact, eod_summary, attendance, sync, emp_analytics, all_emp_analytics, profiles
 
-from app.models.employee import Employee
-from app.models.client import ClientInDB
-from app.models.task import TaskInDB
-from app.models.eod_summary import EodSummaryInDB
-from app.models.attendance import AttendanceInDB
 
 # ...
 
@@ -26,11 +30,25 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     await db_manager.connect()
-    # Auto-create indexes based on model definitions
-    await db_manager.ensure_indexes([Employee, ClientInDB, TaskInDB, EodSummaryInDB, AttendanceInDB])
+    # Create missing indexes declared in model MongoMeta (one worker, under a lease)
+    await sync_indexes_with_lease()
+    loop_lag_monitor.start()
+    # Periodic columnar snapshot refresh (the build lock keeps workers from overlapping)
+    snapshot_minutes = get_settings().columnar_snapshot_minutes
+    snapshot_task = asyncio.create_task(snapshot_scheduler(snapshot_minutes)) if snapshot_minutes > 0 else None
     yield
     # Shutdown
+    if snapshot_task:
+        snapshot_task.cancel()
+        try:
+            await snapshot_task
+        except asyncio.CancelledError:
+            pass
+    await loop_lag_monitor.stop()
+    shutdown_password_executor()
     await db_manager.disconnect()
+    from app.middleware.logging import stop_log_listener
+    stop_log_listener()
 
 
 def create_app() -> FastAPI:
@@ -63,6 +81,10 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Profiling Middleware (inside logging, so logged timings include profiling overhead)
+    from app.middleware.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
+
     # API Logging Middleware
     from app.middleware.logging import APILoggingMiddleware
     app.add_middleware(APILoggingMiddleware)
@@ -82,6 +104,36 @@ def create_app() -> FastAPI:
             "version": "1.0.0",
         }
     
+    # Readiness Endpoint
+    @app.get("/api/health/ready", tags=["Health"])
+    async def readiness_check():
+        """
+        Readiness check for load balancers.
+        
+        Reports Mongo ping latency, connection pool utilization, event-loop lag,
+        webhook processing lag and last successful sync age per entity.
+        Returns 503 when any check crosses its configured threshold.
+        """
+        ready, checks = await check_readiness()
+        return JSONResponse(
+            status_code=200 if ready else 503,
+            content={"status": "ready" if ready else "not_ready", "checks": checks},
+        )
+    
+    # Prometheus Metrics Endpoint
+    @app.get("/api/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics(authorization: Optional[str] = Header(None)):
+        """
+        Prometheus text exposition of request, MongoDB, Unolo, sync and webhook metrics.
+        Aggregated across gunicorn workers when PROMETHEUS_MULTIPROC_DIR is set.
+        Requires "Authorization: Bearer <METRICS_TOKEN>" when METRICS_TOKEN is set;
+        nginx does not proxy this path, so scrape the API directly.
+        """
+        if not metrics_authorized(authorization, get_settings().metrics_token):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+    
     # Register Routes
     app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
     app.include_router(products.router, prefix="/api/products", tags=["Products"])
@@ -97,6 +149,7 @@ def create_app() -> FastAPI:
     app.include_router(sync.router, prefix="/api/sync", tags=["Sync"])
     app.include_router(emp_analytics.router, prefix="/api/emp-analytics", tags=["Employee Analytics"])
     app.include_router(all_emp_analytics.router, prefix="/api/all-emp-analytics", tags=["All Employees Analytics"])
+    app.include_router(profiles.router, prefix="/api/profiles", tags=["Profiles"])
     
     return app
 
@@ -0,0 +1,122 @@
+"""
+Prometheus Metrics
+Metric definitions and the /api/metrics exposition
+
+Under gunicorn each worker is a separate process. When PROMETHEUS_MULTIPROC_DIR
+is set (see gunicorn.conf.py), metric values are written to per-process files in
+that directory and merged at scrape time, so any worker can answer /api/metrics.
+"""
+
+import hmac
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Request latencies are mostly tens of ms; the long tail is analytics and sync
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+
+# ==================== HTTP ====================
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# ==================== MongoDB ====================
+
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency by collection and command",
+    ["collection", "command", "outcome"],
+    buckets=DB_BUCKETS,
+)
+
+# ==================== Unolo ====================
+
+UNOLO_REQUEST_DURATION = Histogram(
+    "unolo_request_duration_seconds",
+    "Unolo API call latency by endpoint and status",
+    ["method", "endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+UNOLO_REQUEST_ERRORS = Counter(
+    "unolo_request_errors_total",
+    "Failed Unolo API calls by endpoint and reason",
+    ["method", "endpoint", "reason"],
+)
+
+# ==================== Sync & Webhooks ====================
+
+SYNC_RECORDS = Counter(
+    "sync_records_total",
+    "Records processed by Unolo syncs by entity and outcome",
+    ["entity", "outcome"],
+)
+
+SYNC_DURATION = Histogram(
+    "sync_duration_seconds",
+    "Duration of Unolo sync runs by entity",
+    ["entity"],
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+
+WEBHOOK_ITEMS_PENDING = Gauge(
+    "webhook_items_pending",
+    "Webhook items received and not yet processed",
+    ["kind"],
+    multiprocess_mode="livesum",
+)
+
+WEBHOOK_ITEMS = Counter(
+    "webhook_items_total",
+    "Processed webhook items by kind and outcome",
+    ["kind", "outcome"],
+)
+
+
+def record_sync(entity: str, stats: Dict[str, Any], duration: float) -> None:
+    """Record a finished sync run from its stats dict (created/updated/errors)."""
+    for outcome in ("created", "updated", "errors"):
+        count = stats.get(outcome) or 0
+        if isinstance(count, list):
+            count = len(count)
+        if count:
+            SYNC_RECORDS.labels(entity=entity, outcome=outcome).inc(count)
+    SYNC_DURATION.labels(entity=entity).observe(duration)
+
+
+def metrics_authorized(authorization: Optional[str], token: str) -> bool:
+    """Whether a scrape may read the metrics: any request when no token is configured, else a matching bearer."""
+    if not token:
+        return True
+    return hmac.compare_digest((authorization or "").encode(), f"Bearer {token}".encode())
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Render all metrics in Prometheus text format, merging worker processes if needed."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -5,7 +5,7 @@ JWT token validation and role-based access control
 
 from typing import Callable, List
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.schemas.user import TokenData, UserRole
@@ -16,12 +16,14 @@ security = HTTPBearer()
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> TokenData:
     """
     Dependency to get the current authenticated user from JWT token.
     
     Args:
+        request: Current request; the user is attached to request.state for logging
         credentials: Bearer token from Authorization header
         
     Returns:
@@ -36,11 +38,12 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token_data = decode_access_token(credentials.credentials)
+    token_data = await decode_access_token(credentials.credentials)
     
     if token_data is None:
         raise credentials_exception
     
+    request.state.user = token_data
     return token_data
 
 
@@ -1,165 +1,316 @@
 """
 API Request/Response Logging Middleware
 Logs all API calls with user info, request details, timing, and errors
+
+Pure ASGI: the request body is sampled as the app reads it, and log lines are
+written by a background thread fed through a queue, so the event loop never
+touches the file or console.
 """
 
-import time
-import json
+import atexit
 import logging
 import os
+import queue
+import random
+import re
+import time
 from datetime import datetime, timezone
-from logging.handlers import TimedRotatingFileHandler
-from typing import Callable, Optional
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+from app.db_monitoring import QueryStats, track_queries
+from app.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode("utf-8")
+except ImportError:  # pragma: no cover - orjson is in requirements
+    import json
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str, separators=(",", ":"))
+
+
+# Logs directory: apps/api/logs/ (this file: apps/api/app/middleware/logging.py)
+LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "logs")
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from fastapi import status
+# Methods whose request body is sampled
+BODY_METHODS = {"POST", "PUT", "PATCH"}
+# Upload bodies carry client data: only their size is logged
+SIZE_ONLY_CONTENT_TYPES = ("multipart/", "text/csv")
+
+# Sensitive JSON string fields, masked in the body sample
+MASKED_FIELDS = ["password", "token", "secret", "api_key", "refresh_token"]
+_MASK_RE = re.compile(
+    r'("(?:' + "|".join(MASKED_FIELDS) + r')"\s*:\s*)"(?:[^"\\]|\\.)*"?'
+)
 
 # Configure logger
 logger = logging.getLogger("api_logger")
 logger.setLevel(logging.INFO)
+logger.propagate = False
+
+_listener: Optional[QueueListener] = None
+
+
+class _RecordQueueHandler(QueueHandler):
+    """Enqueue records as-is; formatting happens on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Emit the log entry dict as one compact JSON line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = record.msg if isinstance(record.msg, dict) else {"message": record.getMessage()}
+        return dumps({"level": record.levelname, **entry})
+
+
+def _build_handlers() -> List[logging.Handler]:
+    formatter = JsonLineFormatter()
 
-# Create console handler if not exists
-if not logger.handlers:
     # 1. Console Handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
+    handlers: List[logging.Handler] = [console_handler]
+
     # 2. Daily Rotating File Handler
     try:
-        # Create logs directory: apps/api/logs/
-        # Current file: apps/api/app/middleware/logging.py
-        log_dir = os.path.join(os.path.dirname(__file__), "..", "..", "logs")
-        os.makedirs(log_dir, exist_ok=True)
-        
-        log_file_path = os.path.join(log_dir, "api.log")
-        
+        os.makedirs(LOG_DIR, exist_ok=True)
         file_handler = TimedRotatingFileHandler(
-            filename=log_file_path,
+            filename=os.path.join(LOG_DIR, "api.log"),
             when="midnight",
             interval=1,
             backupCount=30,
             encoding="utf-8"
         )
-        file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(formatter)
         file_handler.suffix = "%Y-%m-%d" # Suffix for rotated files: api.log.2025-01-30
-        
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
     except Exception as e:
         print(f"Failed to setup file logging: {e}")
 
+    return handlers
+
+
+def start_log_listener() -> None:
+    """
+    Route api_logger through a queue drained by a background thread.
+    Idempotent; called when the middleware is created.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    logger.handlers = [_RecordQueueHandler(log_queue)]
 
-class APILoggingMiddleware(BaseHTTPMiddleware):
+    _listener = QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_log_listener)
+
+
+def stop_log_listener() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def parse_sample_rates(value: str) -> List[Tuple[str, float]]:
+    """
+    Parse "path_prefix:rate,..." into (prefix, rate) pairs, longest prefix first.
+    Malformed entries are ignored.
+    """
+    rates = []
+    for item in value.split(","):
+        prefix, _, rate = item.strip().rpartition(":")
+        try:
+            rates.append((prefix, min(max(float(rate), 0.0), 1.0)))
+        except ValueError:
+            continue
+    return sorted((r for r in rates if r[0]), key=lambda r: len(r[0]), reverse=True)
+
+
+def mask_body(text: str) -> str:
+    """Mask sensitive string fields in a (possibly truncated) JSON body."""
+    return _MASK_RE.sub(r'\1"***MASKED***"', text)
+
+
+def _is_upload(scope: Dict[str, Any]) -> bool:
+    """Whether the request body is a multipart or CSV upload."""
+    for name, value in scope.get("headers", []):
+        if name == b"content-type":
+            return value.decode("latin-1").strip().lower().startswith(SIZE_ONLY_CONTENT_TYPES)
+    return False
+
+
+def _user_info(scope: Dict[str, Any]) -> str:
+    """User label from request.state.user, set by the auth dependency."""
+    user = scope.get("state", {}).get("user")
+    if user is None:
+        return "anonymous"
+    if isinstance(user, dict):
+        return user.get("username") or user.get("email") or user.get("sub") or "authenticated"
+    return getattr(user, "username", None) or getattr(user, "email", None) or getattr(user, "user_id", None) or "authenticated"
+
+
+class APILoggingMiddleware:
     """
     Middleware to log all API requests and responses.
-    
+
     Logs:
     - Timestamp
     - HTTP method and path
     - User info (from JWT if authenticated)
-    - Request body (for POST/PUT/PATCH)
+    - Request body prefix (for POST/PUT/PATCH, capped by log_body_max_bytes;
+      only the size for multipart and CSV uploads)
     - Response status code
     - Processing time
+    - MongoDB command count and time spent in the database
     - Errors if any
+
+    Successful requests on paths listed in log_sample_rates are sampled;
+    4xx/5xx responses are always logged. Latency and in-flight metrics are
+    recorded for every request.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Record start time
-        start_time = time.time()
+    def __init__(self, app):
+        self.app = app
+        settings = get_settings()
+        self.body_max_bytes = settings.log_body_max_bytes
+        self.sample_rates = parse_sample_rates(settings.log_sample_rates)
+        start_log_listener()
+
+    def _sample_rate(self, path: str) -> float:
+        for prefix, rate in self.sample_rates:
+            if path.startswith(prefix):
+                return rate
+        return 1.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
         timestamp = datetime.now(timezone.utc).isoformat()
-        
-        # Extract request info
-        method = request.method
-        path = request.url.path
-        query_params = dict(request.query_params)
-        client_ip = request.client.host if request.client else "unknown"
-        
-        # Try to get user info from request state (set by auth middleware)
-        user_info = "anonymous"
-        try:
-            if hasattr(request.state, "user"):
-                user = request.state.user
-                if hasattr(user, "username"):
-                    user_info = user.username
-                elif hasattr(user, "email"):
-                    user_info = user.email
-                elif isinstance(user, dict):
-                    user_info = user.get("username") or user.get("email") or user.get("sub") or "authenticated"
-        except Exception:
-            pass
-        
-        # Try to read request body for POST/PUT/PATCH
-        request_body = None
-        if method in ["POST", "PUT", "PATCH"]:
-            try:
-                body_bytes = await request.body()
-                if body_bytes:
-                    try:
-                        request_body = json.loads(body_bytes.decode("utf-8"))
-                        # Mask sensitive fields
-                        if isinstance(request_body, dict):
-                            for key in ["password", "token", "secret", "api_key", "refresh_token"]:
-                                if key in request_body:
-                                    request_body[key] = "***MASKED***"
-                    except json.JSONDecodeError:
-                        request_body = "<non-json body>"
-            except Exception:
-                request_body = "<body read error>"
-
-        # Process request
-        error_detail = None
+        method = scope["method"]
+
+        body_prefix = bytearray()
+        body_size = 0
+        capture_body = method in BODY_METHODS and self.body_max_bytes > 0
+        prefix_max_bytes = 0 if _is_upload(scope) else self.body_max_bytes
+
+        async def receive_wrapper():
+            nonlocal body_size
+            message = await receive()
+            if capture_body and message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                body_size += len(chunk)
+                room = prefix_max_bytes - len(body_prefix)
+                if room > 0:
+                    body_prefix.extend(chunk[:room])
+            return message
+
         response_status = None
-        
-        try:
-            response = await call_next(request)
-            response_status = response.status_code
-        except Exception as e:
-            error_detail = str(e)
-            response_status = status.HTTP_500_INTERNAL_SERVER_ERROR
-            raise
-        finally:
-            # Calculate processing time
-            process_time = time.time() - start_time
-            process_time_ms = round(process_time * 1000, 2)
-            
-            # Build log entry
-            log_entry = {
-                "timestamp": timestamp,
-                "method": method,
-                "path": path,
-                "query_params": query_params if query_params else None,
-                "user": user_info,
-                "client_ip": client_ip,
-                "status_code": response_status,
-                "process_time_ms": process_time_ms,
-            }
-            
-            # Add request body for non-GET requests (truncate if too large)
-            if request_body:
-                body_str = json.dumps(request_body)
-                if len(body_str) > 1000:
-                    log_entry["request_body"] = body_str[:1000] + "...<truncated>"
-                else:
-                    log_entry["request_body"] = request_body
-            
-            # Add error if present
-            if error_detail:
-                log_entry["error"] = error_detail
-            
-            # Determine log level based on status code
-            if response_status and response_status >= 500:
-                logger.error(json.dumps(log_entry))
-            elif response_status and response_status >= 400:
-                logger.warning(json.dumps(log_entry))
-            else:
-                logger.info(json.dumps(log_entry))
-        
-        return response
+
+        async def send_wrapper(message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method=method)
+        in_flight.inc()
+
+        error_detail = None
+        with track_queries(f"{method} {scope['path']}") as query_stats:
+            try:
+                await self.app(scope, receive_wrapper if capture_body else receive, send_wrapper)
+            except Exception as e:
+                error_detail = str(e)
+                response_status = 500
+                raise
+            finally:
+                in_flight.dec()
+                self._observe(scope, start_ns, response_status)
+                self._log(
+                    scope, timestamp, start_ns, response_status,
+                    body_prefix, body_size, error_detail, query_stats
+                )
+
+    def _observe(self, scope: Dict[str, Any], start_ns: int, response_status: Optional[int]) -> None:
+        # Route template (e.g. /api/tasks/{task_id}) keeps label cardinality bounded
+        route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+        HTTP_REQUEST_DURATION.labels(
+            method=scope["method"],
+            route=route,
+            status=str(response_status or 500),
+        ).observe((time.perf_counter_ns() - start_ns) / 1e9)
+
+    def _log(
+        self,
+        scope: Dict[str, Any],
+        timestamp: str,
+        start_ns: int,
+        response_status: Optional[int],
+        body_prefix: bytearray,
+        body_size: int,
+        error_detail: Optional[str],
+        query_stats: QueryStats
+    ) -> None:
+        process_time_ms = round((time.perf_counter_ns() - start_ns) / 1_000_000, 2)
+        path = scope["path"]
+
+        is_error = response_status is None or response_status >= 400
+        if not is_error:
+            rate = self._sample_rate(path)
+            if rate < 1.0 and random.random() >= rate:
+                return
+
+        client = scope.get("client")
+        query_string = scope.get("query_string", b"").decode("latin-1")
+
+        # Build log entry
+        log_entry = {
+            "timestamp": timestamp,
+            "method": scope["method"],
+            "path": path,
+            "query_params": query_string or None,
+            "user": _user_info(scope),
+            "client_ip": client[0] if client else "unknown",
+            "status_code": response_status,
+            "process_time_ms": process_time_ms,
+            "db_commands": query_stats.count,
+            "db_time_ms": query_stats.duration_ms,
+        }
+
+        if body_prefix:
+            body_str = mask_body(body_prefix.decode("utf-8", errors="replace"))
+            if body_size > len(body_prefix):
+                body_str += f"...<truncated, {body_size} bytes total>"
+            log_entry["request_body"] = body_str
+        elif body_size:
+            log_entry["request_body_bytes"] = body_size
+
+        # Add error if present
+        if error_detail:
+            log_entry["error"] = error_detail
+
+        # Determine log level based on status code
+        if response_status is None or response_status >= 500:
+            logger.error(log_entry)
+        elif response_status >= 400:
+            logger.warning(log_entry)
+        else:
+            logger.info(log_entry)
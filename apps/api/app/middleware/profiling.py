@@ -0,0 +1,195 @@
+"""
+Request Profiling Middleware
+Profiles single requests on demand and stores the report in the `profiles` collection
+
+A request is profiled when it carries `X-Profile: 1` and either an admin Bearer
+token, or a signed header `X-Profile: <expires>.<signature>` where signature is
+hex HMAC-SHA256 of "<expires>:<path>" with `profiling_secret`.
+"""
+
+import cProfile
+import hashlib
+import hmac
+import html
+import io
+import logging
+import pstats
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+
+from app.config import get_settings
+from app.db_monitoring import current_query_stats, track_queries
+from app.repository.profile_repository import profile_repository
+from app.schemas.user import UserRole
+from app.utils.security import decode_access_token
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pragma: no cover - pyinstrument is in requirements
+    Profiler = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+# Reports larger than this (UTF-8) are replaced by a short notice so a profile always fits in a document
+MAX_REPORT_BYTES = 4 * 1024 * 1024
+
+# cProfile hooks the whole thread, so only one request can use it at a time
+_cprofile_lock = threading.Lock()
+
+
+def sign_profile_request(path: str, expires: int, secret: str) -> str:
+    """Build the signed X-Profile value for `path`, valid until `expires` (unix seconds)."""
+    signature = hmac.new(secret.encode(), f"{expires}:{path}".encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def _headers(scope: Dict[str, Any]) -> Dict[bytes, bytes]:
+    return {k.lower(): v for k, v in scope.get("headers", [])}
+
+
+async def _is_admin(headers: Dict[bytes, bytes]) -> Tuple[bool, Optional[str]]:
+    auth = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False, None
+    token_data = await decode_access_token(token)
+    if token_data is None or token_data.role != UserRole.ADMIN:
+        return False, None
+    return True, token_data.email or token_data.user_id
+
+
+def _fit_report(report: str, report_format: str) -> str:
+    """The report, or a short notice in the same format when it is over MAX_REPORT_BYTES."""
+    size = len(report.encode("utf-8"))
+    if size <= MAX_REPORT_BYTES:
+        return report
+    # A cut HTML report would not render, so none of it is kept
+    notice = (f"Profile report not stored: {size} bytes is over the {MAX_REPORT_BYTES} byte limit. "
+              "Profile a narrower request (e.g. a shorter date range).")
+    if report_format == "html":
+        return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Profile report too large</title>"
+                f"</head><body><p>{html.escape(notice)}</p></body></html>")
+    return notice
+
+
+def _valid_signature(value: str, path: str, secret: str) -> bool:
+    expires, _, signature = value.partition(".")
+    if not secret or not expires.isdigit() or int(expires) < time.time():
+        return False
+    expected = sign_profile_request(path, int(expires), secret).partition(".")[2]
+    return hmac.compare_digest(signature, expected)
+
+
+class ProfilingMiddleware:
+    """
+    Runs a sampling profiler (pyinstrument, HTML report) around one request,
+    falling back to cProfile (text report) when pyinstrument is not installed.
+    The response carries `X-Profile-Id`; reports are listed under /api/profiles.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.secret = get_settings().profiling_secret
+
+    async def _should_profile(self, scope: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        headers = _headers(scope)
+        value = headers.get(PROFILE_HEADER)
+        if not value:
+            return False, None
+
+        value_str = value.decode("latin-1")
+        if value_str == "1":
+            return await _is_admin(headers)
+        if _valid_signature(value_str, scope["path"], self.secret):
+            return True, "signed"
+        return False, None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        enabled, user = await self._should_profile(scope)
+        if not enabled:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = ObjectId()
+        response_status = None
+
+        async def send_wrapper(message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", str(profile_id).encode())
+                ]
+            await send(message)
+
+        started = time.perf_counter_ns()
+        error: Optional[BaseException] = None
+        # Reuse the logging middleware's query stats when present
+        outer_stats = current_query_stats()
+        tracker = nullcontext(outer_stats) if outer_stats else track_queries(f"{scope['method']} {scope['path']}")
+        with tracker as query_stats:
+            if Profiler is not None:
+                profiler_name, report_format = "pyinstrument", "html"
+                profiler = Profiler(async_mode="enabled")
+                profiler.start()
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                except Exception as e:
+                    error = e
+                profiler.stop()
+                report = profiler.output_html()
+            elif _cprofile_lock.acquire(blocking=False):
+                # Thread-wide: concurrent requests on this worker show up too
+                profiler_name, report_format = "cProfile", "text"
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                except Exception as e:
+                    error = e
+                finally:
+                    profiler.disable()
+                    _cprofile_lock.release()
+                out = io.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(80)
+                report = out.getvalue()
+            else:
+                # Another request holds cProfile; serve this one unprofiled
+                await self.app(scope, receive, send)
+                return
+
+        duration_ms = round((time.perf_counter_ns() - started) / 1_000_000, 2)
+        report = _fit_report(report, report_format)
+
+        try:
+            await profile_repository.insert({
+                "_id": profile_id,
+                "created_at": datetime.now(timezone.utc),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_string": scope.get("query_string", b"").decode("latin-1") or None,
+                "user": user,
+                "status_code": response_status or (500 if error else None),
+                "duration_ms": duration_ms,
+                "db_commands": query_stats.count,
+                "db_time_ms": query_stats.duration_ms,
+                "profiler": profiler_name,
+                "report_format": report_format,
+                "report": report,
+            })
+        except Exception as e:
+            logger.error(f"Failed to store profile {profile_id}: {e}")
+
+        if error is not None:
+            raise error
@@ -0,0 +1,54 @@
+"""
+Data Migrations
+Versioned, resumable migrations recorded in the schema_migrations collection
+
+Add a migration as a new mNNNN_<name>.py module with a Migration subclass and
+list it in MIGRATIONS. Run them with scripts/migrate.py.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from app.migrations.base import DEFAULT_BATCH_SIZE, Migration, run_migration
+from app.migrations.m0001_normalize_task_dates import NormalizeTaskDates
+from app.repository.schema_migration_repository import schema_migration_repository
+
+MIGRATIONS: List[Migration] = sorted([
+    NormalizeTaskDates(),
+], key=lambda m: m.version)
+
+assert len({m.version for m in MIGRATIONS}) == len(MIGRATIONS), "Duplicate migration version"
+
+
+async def migration_status() -> List[Dict[str, Any]]:
+    """Every known migration with its recorded status (pending when never run)."""
+    recorded = {s["_id"]: s for s in await schema_migration_repository.find_all()}
+    return [
+        {
+            "version": m.version,
+            "name": m.name,
+            "status": recorded.get(m.version, {}).get("status", "pending"),
+            "counts": recorded.get(m.version, {}).get("counts", {}),
+            "completed_at": recorded.get(m.version, {}).get("completed_at"),
+        }
+        for m in MIGRATIONS
+    ]
+
+
+async def run_pending(
+    target: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    ops_per_sec: float = 0,
+    dry_run: bool = False,
+) -> Dict[int, Dict[str, Any]]:
+    """Run every migration not yet completed, in version order, up to `target` if given."""
+    results = {}
+    for migration in MIGRATIONS:
+        if target is not None and migration.version > target:
+            break
+        results[migration.version] = await run_migration(
+            migration, batch_size=batch_size, ops_per_sec=ops_per_sec, dry_run=dry_run
+        )
+    return results
+
+
+__all__ = ["MIGRATIONS", "Migration", "migration_status", "run_migration", "run_pending"]
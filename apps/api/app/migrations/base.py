@@ -0,0 +1,121 @@
+"""
+Migration Runner
+Batched, resumable, throttled document migrations
+
+A migration visits the documents of one collection matching `query` in _id
+order, `batch_size` at a time. `transform` returns the update for each
+document (or None to leave it), and every batch is written with one unordered
+bulk_write. After each batch the last _id is checkpointed in
+schema_migrations, so an interrupted run resumes where it stopped. Writes are
+paced to `ops_per_sec` to leave room for production traffic. A dry run reads
+and transforms but writes nothing, not even progress.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from app.database import db_manager
+from app.repository.schema_migration_repository import schema_migration_repository
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Migration:
+    """Subclasses set version, name and collection, and implement transform()."""
+
+    version: int
+    name: str
+    collection: str
+    # Documents to visit; the runner adds the _id checkpoint condition
+    query: Dict[str, Any] = {}
+    projection: Optional[Dict[str, Any]] = None
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update document for `doc` (e.g. {"$set": {...}}), or None to skip it."""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{self.version:04d}_{self.name}"
+
+
+class Throttle:
+    """Sleeps so that `done` operations take at least done / rate seconds."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.started = time.monotonic()
+
+    async def wait(self, done: int) -> None:
+        if self.rate <= 0:
+            return
+        ahead = done / self.rate - (time.monotonic() - self.started)
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+
+
+async def run_migration(
+    migration: Migration,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    ops_per_sec: float = 0,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run (or resume) one migration. Returns its counts: scanned, updated
+    (updates issued), modified (documents changed) and skipped.
+    """
+    state = await schema_migration_repository.get(migration.version)
+    if state and state.get("status") == "completed":
+        print(f"✓ {migration!r} already applied")
+        return {"status": "completed", **state.get("counts", {})}
+
+    counts = {"scanned": 0, "updated": 0, "modified": 0, "skipped": 0}
+    last_id = None
+    if state and not dry_run:
+        counts.update(state.get("counts") or {})
+        last_id = state.get("last_id")
+        print(f"⟳ Resuming {migration!r} after _id {last_id} ({counts['scanned']} scanned so far)")
+    else:
+        print(f"⟳ Running {migration!r}{' (dry run)' if dry_run else ''}...")
+
+    collection = db_manager.get_collection(migration.collection)
+    throttle = Throttle(ops_per_sec)
+    written = 0
+
+    while True:
+        query = migration.query
+        if last_id is not None:
+            query = {"$and": [migration.query, {"_id": {"$gt": last_id}}]} if migration.query else {"_id": {"$gt": last_id}}
+        cursor = collection.find(query, migration.projection).sort("_id", 1).limit(batch_size)
+        docs = await cursor.to_list(length=batch_size)
+        if not docs:
+            break
+
+        operations: List[UpdateOne] = []
+        for doc in docs:
+            update = migration.transform(doc)
+            if update:
+                operations.append(UpdateOne({"_id": doc["_id"]}, update))
+
+        counts["scanned"] += len(docs)
+        counts["updated"] += len(operations)
+        counts["skipped"] += len(docs) - len(operations)
+        last_id = docs[-1]["_id"]
+
+        if not dry_run:
+            if operations:
+                result = await collection.bulk_write(operations, ordered=False)
+                counts["modified"] += result.modified_count
+            await schema_migration_repository.checkpoint(migration.version, migration.name, last_id, counts)
+
+        print(f"  {counts['scanned']} scanned, {counts['updated']} to update")
+        written += len(operations)
+        await throttle.wait(written)
+
+    if not dry_run:
+        await schema_migration_repository.complete(migration.version, migration.name, counts)
+    print(f"✓ {migration!r}: {counts['scanned']} scanned, {counts['updated']} updated, "
+          f"{counts['modified']} modified, {counts['skipped']} skipped")
+    return {"status": "dry_run" if dry_run else "completed", **counts}
@@ -0,0 +1,43 @@
+"""
+0001 Normalize Task Dates
+Converts string checkinTime / checkoutTime / date on tasks to datetimes
+(ported from the former migrate_dates.py script)
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.migrations.base import Migration
+
+DATE_FIELDS = ("checkinTime", "checkoutTime", "date")
+
+
+def parse_task_date(field: str, value: str) -> datetime:
+    """ISO timestamps (trailing Z allowed); `date` may also be a plain YYYY-MM-DD."""
+    if field == "date" and "T" not in value:
+        return datetime.strptime(value, "%Y-%m-%d")
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class NormalizeTaskDates(Migration):
+    version = 1
+    name = "normalize_task_dates"
+    collection = "tasks"
+    query = {"$or": [{field: {"$type": "string"}} for field in DATE_FIELDS]}
+    projection = {field: 1 for field in ("taskID",) + DATE_FIELDS}
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        updates = {}
+        for field in DATE_FIELDS:
+            value = doc.get(field)
+            if not isinstance(value, str) or not value:
+                continue
+            try:
+                updates[field] = parse_task_date(field, value)
+            except ValueError:
+                print(f"Warning: Could not parse {field} for task {doc.get('taskID', 'unknown')}: {value}")
+        if not updates:
+            return None
+        # A new checkinTime can move the task to another columnar snapshot month
+        updates["updated_at_local"] = datetime.utcnow()
+        return {"$set": updates}
@@ -16,6 +16,10 @@ class AttendanceInDB(UnoloAttendanceResponse):
     created_at_local: datetime = Field(default_factory=datetime.utcnow)
     updated_at_local: datetime = Field(default_factory=datetime.utcnow)
     
+    # Integer seconds derived from the HH:MM:SS duration strings at ingest
+    total_time_tracked_seconds: Optional[int] = None
+    total_time_attendance_seconds: Optional[int] = None
+    
     class Config:
         populate_by_name = True
 
@@ -0,0 +1,24 @@
+"""
+Attendance Events Database Model
+"""
+
+from datetime import datetime
+from pydantic import Field
+
+from app.schemas.unolo import AttendanceEventsResponse
+
+class AttendanceEventsInDB(AttendanceEventsResponse):
+    """
+    Attendance GPS events, selfies and shifts as stored in MongoDB.
+    Kept out of attendance so list reads stay small.
+    """
+    updated_at_local: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "attendance_events"
+        indexes = [
+            {"keys": [("userID", 1), ("date", 1)], "unique": True},
+        ]
@@ -0,0 +1,56 @@
+"""
+Client Latest Visit Database Model
+"""
+
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class ClientLatestVisitInDB(BaseModel):
+    """
+    Materialized latest task per client.
+    Maintained on task ingest (sync + webhook) so that school-category and
+    hot-school views don't need to sort/group the whole tasks collection.
+    Per-employee reads use EmployeeClientLatestVisitInDB instead.
+    """
+    client_id: str
+    task_id: str
+    checkin_time: datetime
+    employee_id: Optional[str] = None
+    internal_emp_id: Optional[str] = None
+    school_category: str = "NoInfo"
+
+    updated_at_local: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "client_latest_visit"
+        indexes = [
+            {"keys": [("client_id", 1)], "unique": True},
+            # Per-employee "not visited in N days" reports
+            {"keys": [("employee_id", 1), ("checkin_time", -1)]},
+            {"keys": [("internal_emp_id", 1), ("checkin_time", -1)]},
+            # Hot-school counts and "not visited in N days" reports
+            {"keys": [("school_category", 1), ("checkin_time", -1)]},
+            {"keys": [("checkin_time", 1)]},
+        ]
+
+
+class EmployeeClientLatestVisitInDB(ClientLatestVisitInDB):
+    """
+    Materialized latest task per (employee, client), for per-employee views:
+    a client stays in an employee's breakdown after someone else visits it.
+    Keyed on both employee IDs, as tasks are matched on either.
+    """
+
+    class MongoMeta:
+        collection_name = "client_latest_visit_by_employee"
+        indexes = [
+            {"keys": [("employee_id", 1), ("internal_emp_id", 1), ("client_id", 1)], "unique": True},
+            # Per-employee category breakdowns over a date range
+            {"keys": [("employee_id", 1), ("checkin_time", -1)]},
+            {"keys": [("internal_emp_id", 1), ("checkin_time", -1)]},
+        ]
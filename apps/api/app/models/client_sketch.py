@@ -0,0 +1,42 @@
+"""
+Client Sketch Database Model
+"""
+
+from typing import Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+# Sketch scopes: clients visited per area per day, by anyone / by one employee
+SCOPE_DAY = "day"
+SCOPE_EMPLOYEE_AREA = "employee_area"
+
+
+class ClientSketchInDB(BaseModel):
+    """
+    HyperLogLog sketch of the distinct clients in one area visited on one
+    UTC day, by anyone or by one employee (see app.utils.hyperloglog).
+    Maintained on task ingest (sync + webhook) so unique-client counts over
+    any range merge a few sketches instead of grouping every task. The area
+    is the client's area at ingest time.
+    """
+    scope: str  # day | employee_area
+    date: str  # YYYY-MM-DD of checkinTime (UTC)
+    area: str  # "Division Name new (*)", or "unassigned"
+    employee_id: Optional[str] = None  # employee_area scope only
+    internal_emp_id: Optional[str] = None
+    registers: Dict[str, int] = Field(default_factory=dict)
+
+    updated_at_local: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "client_sketches"
+        indexes = [
+            # One sketch per key; also serves day-scope range reads
+            {"keys": [("scope", 1), ("date", 1), ("employee_id", 1), ("area", 1)], "unique": True},
+            # Per-employee range reads
+            {"keys": [("employee_id", 1), ("date", 1)]},
+            {"keys": [("internal_emp_id", 1), ("date", 1)]},
+        ]
@@ -16,6 +16,16 @@ class EodSummaryInDB(UnoloEodSummaryResponse):
     created_at_local: datetime = Field(default_factory=datetime.utcnow)
     updated_at_local: datetime = Field(default_factory=datetime.utcnow)
     
+    # Integer seconds derived from the HH:MM:SS duration strings at ingest
+    total_time_tracked_seconds: Optional[int] = None
+    total_time_attendance_seconds: Optional[int] = None
+    total_travel_time_seconds: Optional[int] = None
+    total_time_spent_with_client_seconds: Optional[int] = None
+    total_actual_time_spent_with_client_seconds: Optional[int] = None
+    total_break_time_seconds: Optional[int] = None
+    max_break_time_seconds: Optional[int] = None
+    total_unproductive_time_seconds: Optional[int] = None
+    
     class Config:
         populate_by_name = True
 
@@ -27,4 +37,6 @@ class EodSummaryInDB(UnoloEodSummaryResponse):
             {"keys": [("date", 1)]},
             {"keys": [("employeeID", 1)]},
             {"keys": [("internalEmpID", 1)]},
+            # Incremental columnar snapshots find changed documents by write time
+            {"keys": [("updated_at_local", 1)]},
         ]
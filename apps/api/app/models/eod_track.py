@@ -0,0 +1,24 @@
+"""
+EOD Track Database Model
+"""
+
+from datetime import datetime
+from pydantic import Field
+
+from app.schemas.unolo import EodTrackResponse
+
+class EodTrackInDB(EodTrackResponse):
+    """
+    EOD route polyline as stored in MongoDB.
+    Kept out of eod_summaries so summary reads stay small.
+    """
+    updated_at_local: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "eod_tracks"
+        indexes = [
+            {"keys": [("employeeID", 1), ("date", 1)], "unique": True},
+        ]
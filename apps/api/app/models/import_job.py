@@ -0,0 +1,60 @@
+"""
+Import Job Database Models
+"""
+
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+# Jobs and their error rows are removed this long after the job was created
+IMPORT_JOB_TTL_SECONDS = 7 * 24 * 3600
+
+
+class ImportJobInDB(BaseModel):
+    """
+    A background spreadsheet import (see app.services.client_import).
+    Counters are updated after every chunk so clients can poll progress.
+    """
+    id: Optional[str] = Field(None, alias="_id")
+    kind: str  # e.g. "clients"
+    filename: str
+    file_format: str  # csv | xlsx
+    status: str  # queued | running | completed | failed
+    total_rows: Optional[int] = None  # estimate, known once the file is opened
+    processed: int = 0
+    created_count: int = 0
+    updated_count: int = 0
+    error_count: int = 0
+    error: Optional[str] = None  # why a failed job stopped
+    created_by: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "import_jobs"
+        indexes = [
+            {"keys": [("created_at", 1)], "expireAfterSeconds": IMPORT_JOB_TTL_SECONDS},
+        ]
+
+
+class ImportJobErrorInDB(BaseModel):
+    """One rejected row of an import job, for the downloadable error report."""
+    job_id: str
+    row: int
+    client: Optional[str] = None
+    error: str
+    created_at: datetime
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "import_job_errors"
+        indexes = [
+            {"keys": [("job_id", 1), ("row", 1)]},
+            {"keys": [("created_at", 1)], "expireAfterSeconds": IMPORT_JOB_TTL_SECONDS},
+        ]
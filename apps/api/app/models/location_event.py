@@ -0,0 +1,47 @@
+"""
+Location Event Database Model
+"""
+
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class LocationEventMeta(BaseModel):
+    """Time-series metaField: one bucket series per user per day."""
+    user_id: str = Field(..., alias="userID")
+    employee_id: Optional[int] = Field(None, alias="employeeID")
+    date: str
+
+    class Config:
+        populate_by_name = True
+
+
+class LocationEventInDB(BaseModel):
+    """
+    Attendance GPS event as stored in the location_events time-series collection.
+    """
+    timestamp: datetime
+    employee: LocationEventMeta
+    event_id: Optional[str] = Field(None, alias="eventID")
+    event_type_id: Optional[int] = Field(None, alias="eventTypeID")
+    lat: float
+    lon: float
+    accuracy: Optional[float] = None
+    speed: Optional[float] = None
+    bearing: Optional[float] = None
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "location_events"
+        timeseries = {
+            "timeField": "timestamp",
+            "metaField": "employee",
+            "granularity": "seconds",
+        }
+        indexes = [
+            {"keys": [("employee.userID", 1), ("timestamp", 1)]},
+            {"keys": [("employee.employeeID", 1), ("timestamp", 1)]},
+        ]
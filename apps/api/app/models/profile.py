@@ -0,0 +1,20 @@
+"""
+Request Profile Database Model
+"""
+
+from app.schemas.profile import ProfileSummary
+
+class ProfileInDB(ProfileSummary):
+    """Request profile as stored in MongoDB, with its HTML or text report."""
+    report: str = ""
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "profiles"
+        # Capped: the oldest profiles are evicted once either limit is reached
+        capped = {"size": 64 * 1024 * 1024, "max": 200}
+        indexes = [
+            {"keys": [("created_at", -1)]},
+        ]
@@ -0,0 +1,29 @@
+"""
+Schema Migration Database Model
+"""
+
+from typing import Any, Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class SchemaMigrationInDB(BaseModel):
+    """
+    Progress of one versioned data migration (see app.migrations), keyed by
+    version in `_id`. `last_id` is the checkpoint a resumed run continues after.
+    """
+    version: int = Field(alias="_id")
+    name: str
+    status: str  # running | completed
+    last_id: Optional[Any] = None
+    counts: Dict[str, int] = Field(default_factory=dict)
+    started_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "schema_migrations"
+        indexes = []
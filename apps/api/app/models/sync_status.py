@@ -0,0 +1,27 @@
+"""
+Sync Status Database Model
+"""
+
+from typing import Any, Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class SyncStatusInDB(BaseModel):
+    """
+    Last successful run of each Unolo sync (tasks, employees, eod_summary,
+    attendance, clients). Read by the readiness check to detect stale data.
+    """
+    entity: str
+    last_success_at: datetime
+    duration_seconds: Optional[float] = None
+    stats: Dict[str, Any] = Field(default_factory=dict)
+
+    class Config:
+        populate_by_name = True
+
+    class MongoMeta:
+        collection_name = "sync_status"
+        indexes = [
+            {"keys": [("entity", 1)], "unique": True},
+        ]
@@ -28,12 +28,25 @@ class TaskInDB(TaskBase):
         indexes = [
             {"keys": [("taskID", 1)], "unique": True},
             {"keys": [("date", 1)]},
-            {"keys": [("employeeID", 1)]},
-            {"keys": [("internalEmpID", 1)]},
             {"keys": [("customEntity.customEntityName", 1)]},
             # NEW: Compound indexes for analytics queries
             {"keys": [("checkinTime", 1)]},  # Date range queries
-            {"keys": [("checkinTime", 1), ("employeeID", 1)]},  # Analytics: date + employee
-            {"keys": [("checkinTime", 1), ("internalEmpID", 1)]},  # Analytics: date + internal employee
+            # Equality on the employee, then the checkinTime range (ESR order; one per $or branch).
+            # Also serve employee-only lookups through their prefix.
+            {"keys": [("employeeID", 1), ("checkinTime", 1)]},
+            {"keys": [("internalEmpID", 1), ("checkinTime", 1)]},
             {"keys": [("clientID", 1)]},  # For $lookup joins
+            # Incremental columnar snapshots find changed documents by write time
+            {"keys": [("updated_at_local", 1)]},
+            # Partial indexes for typed metadata filters (admin drill-down / overview)
+            {
+                "keys": [("school_category", 1), ("checkinTime", 1)],
+                "name": "hot_school_checkinTime",
+                "partialFilterExpression": {"school_category": "Hot"},
+            },
+            {
+                "keys": [("specimens_given", 1), ("checkinTime", 1)],
+                "name": "specimens_given_checkinTime",
+                "partialFilterExpression": {"specimens_given": {"$gt": 0}},
+            },
         ]
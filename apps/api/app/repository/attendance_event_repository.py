@@ -0,0 +1,63 @@
+"""
+Attendance Event Repository
+"""
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+from app.database import db_manager
+
+# Fields moved out of attendance into attendance_events
+ATTENDANCE_HEAVY_FIELDS = (
+    "attendanceEvents",
+    "attendanceInSelfies",
+    "attendanceOutSelfies",
+    "shifts",
+    "stretchedShifts",
+)
+
+# Projection used by default attendance reads
+ATTENDANCE_LIGHT_PROJECTION = {field: 0 for field in ATTENDANCE_HEAVY_FIELDS}
+
+class AttendanceEventRepository:
+    def __init__(self):
+        self.collection_name = "attendance_events"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    async def save(self, user_id: str, date: str, fields: Dict[str, Any]) -> Any:
+        """
+        Upsert the heavy fields of one attendance record, keyed by userID + date.
+        """
+        now = datetime.utcnow()
+        return await self.collection.update_one(
+            {"userID": user_id, "date": date},
+            {"$set": {**fields, "updated_at_local": now}},
+            upsert=True
+        )
+
+    async def find_one(self, user_id: str, date: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the events for one user and day.
+        Falls back to the attendance document for days not yet offloaded.
+        """
+        query = {"userID": user_id, "date": date}
+
+        doc = await self.collection.find_one(query, {"_id": 0})
+        if doc:
+            return doc
+
+        projection = {"_id": 0, "userID": 1, "date": 1, **{f: 1 for f in ATTENDANCE_HEAVY_FIELDS}}
+        return await db_manager.get_collection("attendance").find_one(query, projection)
+
+    async def find_track(self, user_id: str, date: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the downsampled location track for one user and day.
+        """
+        return await self.collection.find_one(
+            {"userID": user_id, "date": date},
+            {"_id": 0, "userID": 1, "date": 1, "points": "$lowResTrack"}
+        )
+
+attendance_event_repository = AttendanceEventRepository()
@@ -7,6 +7,10 @@ from datetime import datetime, date
 from app.database import db_manager
 from app.models.attendance import AttendanceInDB
 from app.schemas.unolo import UnoloAttendanceResponse
+from app.repository.attendance_event_repository import attendance_event_repository, ATTENDANCE_HEAVY_FIELDS, ATTENDANCE_LIGHT_PROJECTION
+from app.repository.location_event_repository import location_event_repository
+from app.utils.durations import add_duration_seconds, ATTENDANCE_DURATION_FIELDS
+from app.utils.geo import downsample_track
 
 class AttendanceRepository:
     def __init__(self):
@@ -22,6 +26,9 @@ class AttendanceRepository:
         """
         data_dict = data.model_dump(by_alias=True, exclude_none=True)
         
+        # Integer seconds next to the HH:MM:SS strings for DB-side aggregation
+        add_duration_seconds(data_dict, ATTENDANCE_DURATION_FIELDS)
+        
         now = datetime.utcnow()
         data_dict["updated_at_local"] = now
         
@@ -33,6 +40,19 @@ class AttendanceRepository:
         if "created_at_local" in update_op["$set"]:
             del update_op["$set"]["created_at_local"]
 
+        # Heavy fields live in their own collection; drop any copy left on the main doc
+        heavy = {field: data_dict.pop(field) for field in ATTENDANCE_HEAVY_FIELDS if field in data_dict}
+        if heavy:
+            # GPS events also go to the time-series collection, plus a low-res track for maps
+            events = location_event_repository.build_events(
+                data.user_id, data.date, heavy.get("attendanceEvents"), data.tz
+            )
+            await location_event_repository.replace_day(data.user_id, data.date, events)
+            heavy["lowResTrack"] = downsample_track(events)
+
+            await attendance_event_repository.save(data.user_id, data.date, heavy)
+        update_op["$unset"] = {field: "" for field in ATTENDANCE_HEAVY_FIELDS}
+
         # Unique key: userID + date
         return await self.collection.update_one(
             {
@@ -51,9 +71,10 @@ class AttendanceRepository:
     ) -> Tuple[List[AttendanceInDB], int]:
         """
         Find Attendance records matching query with pagination.
+        Heavy fields are excluded; see attendance_event_repository.
         """
         total_count = await self.collection.count_documents(filters)
-        cursor = self.collection.find(filters).sort("date", -1).skip(skip).limit(limit)
+        cursor = self.collection.find(filters, ATTENDANCE_LIGHT_PROJECTION).sort("date", -1).skip(skip).limit(limit)
         
         results = []
         async for doc in cursor:
@@ -0,0 +1,148 @@
+"""
+Client Latest Visit Repository
+"""
+from typing import List, Any, Dict, Optional
+from datetime import datetime
+
+from pymongo.errors import DuplicateKeyError
+
+from app.database import db_manager
+from app.utils.task_metadata import parse_school_category, parse_checkin_time
+
+class ClientLatestVisitRepository:
+    def __init__(self):
+        self.collection_name = "client_latest_visit"
+        self.employee_collection_name = "client_latest_visit_by_employee"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    @property
+    def employee_collection(self):
+        return db_manager.get_collection(self.employee_collection_name)
+
+    async def record_visit(self, task_doc: Dict[str, Any]) -> bool:
+        """
+        Record a task as the latest visit of its client, and of its client
+        for its employee, where it is newer than the one already stored.
+
+        `task_doc` is a task dict keyed by Unolo aliases (taskID, clientID,
+        employeeID, checkinTime, metadata...). Returns True if the client view changed.
+        """
+        client_id = task_doc.get("clientID")
+        checkin_time = parse_checkin_time(task_doc.get("checkinTime"))
+
+        if not client_id or checkin_time is None:
+            return False
+
+        visit = {
+            "client_id": str(client_id),
+            "task_id": task_doc.get("taskID"),
+            "checkin_time": checkin_time,
+            "employee_id": task_doc.get("employeeID"),
+            "internal_emp_id": task_doc.get("internalEmpID"),
+            "school_category": task_doc.get("school_category") or parse_school_category(task_doc.get("metadata")),
+            "updated_at_local": datetime.utcnow(),
+        }
+
+        await self._record_latest(self.employee_collection, {
+            "employee_id": visit["employee_id"],
+            "internal_emp_id": visit["internal_emp_id"],
+            "client_id": visit["client_id"],
+        }, visit)
+        return await self._record_latest(self.collection, {"client_id": visit["client_id"]}, visit)
+
+    @staticmethod
+    async def _record_latest(collection, key: Dict[str, Any], visit: Dict[str, Any]) -> bool:
+        # Only overwrite when the stored visit is not newer ($max-style write).
+        # If the key is missing, the upsert inserts it; if a newer visit exists
+        # the filter misses and the upsert collides on the unique key.
+        query = {**key, "checkin_time": {"$lte": visit["checkin_time"]}}
+
+        try:
+            result = await collection.update_one(query, {"$set": visit}, upsert=True)
+        except DuplicateKeyError:
+            # Either a newer visit is stored, or a concurrent insert won the race.
+            # Retry without upsert so the newer of the two still wins.
+            result = await collection.update_one(query, {"$set": visit})
+
+        return bool(result.upserted_id or result.modified_count)
+
+    async def find_visits(
+        self,
+        start_dt: datetime,
+        end_dt: datetime,
+        employee_id: Optional[str] = None,
+        school_category: Optional[str] = None,
+        employee_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find clients whose latest visit falls within the range, newest first.
+        Optionally restricted to a school category.
+
+        With `employee_id` (or `employee_ids`, matched on the Unolo employeeID)
+        this reads each employee's own latest visit per client, so a client
+        someone else visited later is still returned. A client can then appear
+        more than once (per employee, and per employeeID/internalEmpID pair);
+        the first row per client is its latest.
+        """
+        query: Dict[str, Any] = {"checkin_time": {"$gte": start_dt, "$lte": end_dt}}
+        collection = self.employee_collection if employee_id or employee_ids else self.collection
+
+        if employee_id:
+            query["$or"] = [
+                {"employee_id": employee_id},
+                {"internal_emp_id": employee_id}
+            ]
+        if employee_ids:
+            query["employee_id"] = {"$in": employee_ids}
+        if school_category:
+            query["school_category"] = school_category
+
+        cursor = collection.find(query, {"_id": 0}).sort("checkin_time", -1)
+        return await cursor.to_list(length=None)
+
+    async def count_by_employee(
+        self,
+        start_dt: datetime,
+        end_dt: datetime,
+        school_category: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Count clients per employee whose latest visit is in range and in the category.
+        Returns: List of {_id: employeeID, count: int}
+        """
+        pipeline = [
+            {"$match": {
+                "school_category": school_category,
+                "checkin_time": {"$gte": start_dt, "$lte": end_dt}
+            }},
+            {"$group": {"_id": "$employee_id", "count": {"$sum": 1}}}
+        ]
+
+        cursor = self.collection.aggregate(pipeline)
+        return await cursor.to_list(length=None)
+
+    async def find_not_visited_since(
+        self,
+        cutoff: datetime,
+        employee_id: Optional[str] = None,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Find clients whose latest visit is older than the cutoff, oldest first.
+        """
+        query: Dict[str, Any] = {"checkin_time": {"$lt": cutoff}}
+
+        if employee_id:
+            query["$or"] = [
+                {"employee_id": employee_id},
+                {"internal_emp_id": employee_id}
+            ]
+
+        cursor = self.collection.find(query, {"_id": 0}).sort("checkin_time", 1).limit(limit)
+        return await cursor.to_list(length=None)
+
+# Global instance
+client_latest_visit_repository = ClientLatestVisitRepository()
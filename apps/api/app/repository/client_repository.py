@@ -1,7 +1,10 @@
 """
 Client Repository
 """
-from typing import List, Tuple, Any, Dict
+from typing import List, Tuple, Any, Dict, Optional, Set
+
+from bson import ObjectId
+
 from app.database import db_manager
 from app.schemas.client import Client
 
@@ -35,6 +38,10 @@ class ClientRepository:
             
         return clients, total_count
 
+    def export_cursor(self, query: Dict[str, Any], projection: Dict[str, Any], batch_size: int):
+        """Cursor over every client matching query, in _id order, for exports."""
+        return self.collection.find(query, projection).sort("_id", 1).batch_size(batch_size)
+
     async def find_clients_by_employee(
         self, 
         employee_id: str, 
@@ -132,5 +139,96 @@ class ClientRepository:
                 
         return groups, unassigned, total_count
 
+    async def count_clients_by_employees(
+        self,
+        employee_ids: List[str],
+        group_field: str
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Count the clients of several employees (empIDs) per value of a field,
+        in one pipeline. Clients missing the field are not counted, as they are
+        the unassigned list of aggregate_clients_grouped.
+        Returns: {empID: {group_key: count}}
+        """
+        pipeline = [
+            {"$match": {
+                "$or": [
+                    {"Visible To (*)": {"$in": employee_ids}},
+                    {"Employee ID": {"$in": employee_ids}}
+                ],
+                group_field: {"$nin": [None, ""]}
+            }},
+            # A client counts for each batch employee it matches through either field
+            {"$project": {
+                "group_key": f"${group_field}",
+                "employee": ["$Visible To (*)", "$Employee ID"]
+            }},
+            {"$unwind": "$employee"},
+            {"$match": {"employee": {"$in": employee_ids}}},
+            {"$group": {
+                "_id": {"employee": "$employee", "group_key": "$group_key"},
+                "clients": {"$addToSet": "$_id"}
+            }}
+        ]
+
+        counts: Dict[str, Dict[str, int]] = {}
+        async for doc in self.collection.aggregate(pipeline):
+            counts.setdefault(doc["_id"]["employee"], {})[doc["_id"]["group_key"]] = len(doc["clients"])
+        return counts
+
+    async def find_by_unolo_ids(self, client_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve task clientIDs to raw client documents in one indexed query.
+        Matches unolo_client_id / ID stored as string or int, and Mongo _id.
+        Returns: {clientID: client_doc}
+        """
+        values: List[Any] = []
+        object_ids = []
+        for cid in client_ids:
+            values.append(cid)
+            if cid.isdigit():
+                values.append(int(cid))
+            if ObjectId.is_valid(cid):
+                object_ids.append(ObjectId(cid))
+
+        query: Dict[str, Any] = {"$or": [
+            {"unolo_client_id": {"$in": values}},
+            {"ID": {"$in": values}},
+        ]}
+        if object_ids:
+            query["$or"].append({"_id": {"$in": object_ids}})
+
+        client_map = {}
+        async for doc in self.collection.find(query):
+            for key in (doc.get("unolo_client_id"), doc.get("ID"), doc.get("_id")):
+                if key is not None:
+                    client_map.setdefault(str(key), doc)
+        return client_map
+
+    async def existing_unolo_ids(self, unolo_ids: List[Any]) -> Set[Any]:
+        """Which of `unolo_ids` already exist, in one indexed $in query."""
+        if not unolo_ids:
+            return set()
+        cursor = self.collection.find(
+            {"unolo_client_id": {"$in": unolo_ids}}, {"_id": 0, "unolo_client_id": 1}
+        )
+        return {doc["unolo_client_id"] async for doc in cursor}
+
+    async def area_by_client_id(self) -> Dict[str, Optional[str]]:
+        """Every client's area ("Division Name new (*)"), keyed like find_by_unolo_ids."""
+        cursor = self.collection.find(
+            {}, {"_id": 1, "unolo_client_id": 1, "ID": 1, "Division Name new (*)": 1}
+        )
+        areas: Dict[str, Optional[str]] = {}
+        async for doc in cursor:
+            for key in (doc.get("unolo_client_id"), doc.get("ID"), doc.get("_id")):
+                if key is not None:
+                    areas.setdefault(str(key), doc.get("Division Name new (*)"))
+        return areas
+
+    async def bulk_write(self, operations: List[Any]) -> Any:
+        """Unordered bulk write: one failing row doesn't stop the rest."""
+        return await self.collection.bulk_write(operations, ordered=False)
+
 # Global instance
 client_repository = ClientRepository()
@@ -0,0 +1,143 @@
+"""
+Client Sketch Repository
+"""
+from typing import List, Any, Dict, Iterable, Optional, Tuple
+from datetime import date, datetime, timezone
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.database import db_manager
+from app.models.client_sketch import SCOPE_DAY, SCOPE_EMPLOYEE_AREA
+from app.repository.client_repository import client_repository
+from app.utils import hyperloglog
+from app.utils.task_metadata import parse_checkin_time
+
+# Area key for clients without a "Division Name new (*)" (as in area-wise analytics)
+UNASSIGNED_AREA = "unassigned"
+WRITE_BATCH_SIZE = 1000
+
+# (sketch key, other fields to $set, sparse registers to $max in)
+SketchUpdate = Tuple[Dict[str, Any], Dict[str, Any], Dict[str, int]]
+
+
+def sketch_updates(task_doc: Dict[str, Any], area: Optional[str]) -> List[SketchUpdate]:
+    """
+    The day and employee/area sketch updates for one task, or [] when it has
+    no client or no parseable checkinTime. `area` is the client's area.
+    """
+    client_id = task_doc.get("clientID")
+    checkin_time = parse_checkin_time(task_doc.get("checkinTime"))
+    if not client_id or checkin_time is None:
+        return []
+
+    registers: Dict[str, int] = {}
+    hyperloglog.add(registers, str(client_id))
+    day = checkin_time.astimezone(timezone.utc).strftime("%Y-%m-%d")
+    employee_id = task_doc.get("employeeID")
+    area = area or UNASSIGNED_AREA
+    return [
+        ({"scope": SCOPE_DAY, "date": day, "employee_id": None, "area": area}, {}, registers),
+        (
+            {"scope": SCOPE_EMPLOYEE_AREA, "date": day,
+             "employee_id": str(employee_id) if employee_id is not None else None,
+             "area": area},
+            {"internal_emp_id": task_doc.get("internalEmpID")},
+            registers,
+        ),
+    ]
+
+
+def collect_sketch_updates(task_docs: Iterable[Dict[str, Any]], areas: Dict[str, Optional[str]]) -> List[SketchUpdate]:
+    """
+    Sketch updates for many tasks, combined per sketch so each is written once.
+    `areas` maps clientID to the client's area (backfills load it up front).
+    """
+    combined: Dict[Tuple, SketchUpdate] = {}
+    for doc in task_docs:
+        for key, fields, registers in sketch_updates(doc, areas.get(str(doc.get("clientID")))):
+            slot = (key["scope"], key["date"], key["employee_id"], key["area"])
+            if slot not in combined:
+                combined[slot] = (key, fields, dict(registers))
+                continue
+            merged = combined[slot][2]
+            for index, rank in registers.items():
+                if merged.get(index, 0) < rank:
+                    merged[index] = rank
+    return list(combined.values())
+
+
+class ClientSketchRepository:
+    def __init__(self):
+        self.collection_name = "client_sketches"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    async def record_task(self, task_doc: Dict[str, Any]) -> None:
+        """
+        Add a task's client to its day and employee/area sketches.
+
+        `task_doc` is a task dict keyed by Unolo aliases (clientID, employeeID,
+        internalEmpID, checkinTime). Re-recording a task changes nothing.
+        """
+        client_id = task_doc.get("clientID")
+        if not client_id:
+            return
+        client = (await client_repository.find_by_unolo_ids([str(client_id)])).get(str(client_id), {})
+        await self.merge(sketch_updates(task_doc, client.get("Division Name new (*)")))
+
+    async def merge(self, updates: List[SketchUpdate]) -> None:
+        """Upsert sketches, raising each register to at least the given rank ($max)."""
+        now = datetime.utcnow()
+        ops = [
+            UpdateOne(
+                key,
+                {
+                    "$max": {f"registers.{index}": rank for index, rank in registers.items()},
+                    "$set": {**fields, "updated_at_local": now},
+                },
+                upsert=True,
+            )
+            for key, fields, registers in updates
+        ]
+        for i in range(0, len(ops), WRITE_BATCH_SIZE):
+            batch = ops[i:i + WRITE_BATCH_SIZE]
+            try:
+                await self.collection.bulk_write(batch, ordered=False)
+            except BulkWriteError as e:
+                # Concurrent upserts of a new sketch collide on the unique key;
+                # $max is idempotent, so running the batch again is safe.
+                if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                    raise
+                await self.collection.bulk_write(batch, ordered=False)
+
+    async def find_sketches(
+        self,
+        start_date: date,
+        end_date: date,
+        employee_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sketches for the days in range: every area's day sketch, or one
+        employee's sketches (matched on employeeID or internalEmpID).
+        Returns: List of {area, registers}
+        """
+        query: Dict[str, Any] = {
+            "date": {"$gte": start_date.strftime("%Y-%m-%d"), "$lte": end_date.strftime("%Y-%m-%d")}
+        }
+        if employee_id:
+            query["scope"] = SCOPE_EMPLOYEE_AREA
+            query["$or"] = [
+                {"employee_id": employee_id},
+                {"internal_emp_id": employee_id}
+            ]
+        else:
+            query["scope"] = SCOPE_DAY
+
+        cursor = self.collection.find(query, {"_id": 0, "area": 1, "registers": 1})
+        return await cursor.to_list(length=None)
+
+# Global instance
+client_sketch_repository = ClientSketchRepository()
@@ -1,7 +1,51 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import date
 from app.database import db_manager
 from app.models.eod_summary import EodSummaryInDB
+from app.repository.eod_track_repository import EOD_LIGHT_PROJECTION
+from app.utils.durations import minutes_expr, stored_seconds_expr
+
+# attendanceResultCode values counted as present (0, 1 = present modes, 6 = seen in data)
+PRESENT_RESULT_CODES = [0, 1, 6]
+
+# Per-day metrics computed in the DB from an EOD summary document
+DAILY_METRICS_PROJECTION = {
+    "_id": 0,
+    "employeeID": 1,
+    "date": 1,
+    "is_present": {"$in": ["$attendanceResultCode", PRESENT_RESULT_CODES]},
+    # Working days are Mon-Sat ($dayOfWeek: 1 = Sunday)
+    "is_working_day": {"$in": [
+        {"$dayOfWeek": {"$dateFromString": {"dateString": "$date", "format": "%Y-%m-%d", "onError": None}}},
+        [2, 3, 4, 5, 6, 7]
+    ]},
+    "tasks": {"$add": [{"$ifNull": ["$adminCompletedTasks", 0]}, {"$ifNull": ["$selfCompletedTasks", 0]}]},
+    "distance": {"$ifNull": ["$distance", 0]},
+    "num_breaks": {"$ifNull": ["$numBreaks", 0]},
+    "break_minutes": minutes_expr(stored_seconds_expr("totalBreakTime", "total_break_time_seconds")),
+}
+
+# Totals over present working days, grouped by employeeID
+PRESENT_TOTALS_STAGES = [
+    {"$match": {"is_present": True, "is_working_day": True}},
+    {"$group": {
+        "_id": "$employeeID",
+        "present_days": {"$sum": 1},
+        "total_tasks": {"$sum": "$tasks"},
+        "total_distance": {"$sum": "$distance"},
+        "total_breaks": {"$sum": "$num_breaks"},
+        "total_break_minutes": {"$sum": "$break_minutes"},
+        "avg_tasks": {"$avg": "$tasks"},
+        "avg_distance": {"$avg": "$distance"},
+        "avg_breaks": {"$avg": "$num_breaks"},
+        "avg_break_minutes": {"$avg": "$break_minutes"},
+    }},
+]
+
+
+def _employee_key(employee_id: str):
+    """EOD summaries store the numeric Unolo employeeID as an int."""
+    return int(employee_id) if employee_id.isdigit() else employee_id
 
 class EmpAnalyticsRepository:
     def __init__(self):
@@ -28,7 +72,7 @@ class EmpAnalyticsRepository:
             }
         }
         
-        cursor = self.collection.find(query).sort("date", 1)
+        cursor = self.collection.find(query, EOD_LIGHT_PROJECTION).sort("date", 1)
         results = []
         
         async for doc in cursor:
@@ -43,4 +87,82 @@ class EmpAnalyticsRepository:
                 
         return results
 
+    async def get_employee_daily_metrics(
+        self,
+        employee_id: str,
+        start_date: date,
+        end_date: date
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Per-day metrics and present-day totals for one employee, in one pipeline.
+        Returns: (daily rows for working days sorted by date, totals or None)
+        """
+        metrics = await self.get_employees_daily_metrics([employee_id], start_date, end_date)
+        return metrics.get(str(_employee_key(employee_id)), ([], None))
+
+    async def get_employees_daily_metrics(
+        self,
+        employee_ids: List[str],
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """
+        Per-day metrics and present-day totals for several employees, in one
+        pipeline matching employeeID with $in.
+        Returns: {str(employeeID): (daily rows for working days sorted by date, totals or None)}
+        """
+        pipeline = [
+            {"$match": {
+                "employeeID": {"$in": [_employee_key(e) for e in employee_ids]},
+                "date": {
+                    "$gte": start_date.strftime("%Y-%m-%d"),
+                    "$lte": end_date.strftime("%Y-%m-%d")
+                }
+            }},
+            {"$project": DAILY_METRICS_PROJECTION},
+            {"$facet": {
+                "days": [
+                    {"$match": {"is_working_day": True}},
+                    {"$sort": {"employeeID": 1, "date": 1}}
+                ],
+                "totals": PRESENT_TOTALS_STAGES
+            }}
+        ]
+
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        metrics: Dict[str, Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]] = {}
+        if not result:
+            return metrics
+        for row in result[0]["days"]:
+            metrics.setdefault(str(row["employeeID"]), ([], None))[0].append(row)
+        for totals in result[0]["totals"]:
+            days, _ = metrics.get(str(totals["_id"]), ([], None))
+            metrics[str(totals["_id"])] = (days, totals)
+        return metrics
+
+    async def aggregate_present_totals_by_employee(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Present-day totals and averages for every employee in one grouped pipeline.
+        Returns: {str(employeeID): totals}
+        """
+        pipeline = [
+            {"$match": {
+                "date": {
+                    "$gte": start_date.strftime("%Y-%m-%d"),
+                    "$lte": end_date.strftime("%Y-%m-%d")
+                }
+            }},
+            {"$project": DAILY_METRICS_PROJECTION},
+            *PRESENT_TOTALS_STAGES
+        ]
+
+        totals = {}
+        async for doc in self.collection.aggregate(pipeline):
+            totals[str(doc["_id"])] = doc
+        return totals
+
 emp_analytics_repository = EmpAnalyticsRepository()
@@ -1,7 +1,7 @@
 """
 Employee Repository
 """
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Tuple, Dict
 from app.database import db_manager
 from app.models.employee import Employee
 
@@ -40,5 +40,31 @@ class EmployeeRepository:
         employee = await self.find_by_name(emp_name)
         return employee.empID if employee else None
 
+    async def find_names(self) -> List[Tuple[str, str]]:
+        """(empName, empID) of every employee with both, in natural order."""
+        cursor = self.collection.find(
+            {"empName": {"$nin": [None, ""]}, "empID": {"$nin": [None, ""]}},
+            {"_id": 0, "empName": 1, "empID": 1},
+        )
+        return [(doc["empName"], str(doc["empID"])) async for doc in cursor]
+
+    async def find_by_ids(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Employees for a list of IDs (empID or numeric employeeID), in one query.
+        Returns: {requested ID: {empID, employeeID, empName}}; unknown IDs are left out.
+        """
+        wanted = set(ids)
+        numeric = [int(i) for i in wanted if i.isdigit()]
+        cursor = self.collection.find(
+            {"$or": [{"empID": {"$in": list(wanted)}}, {"employeeID": {"$in": numeric}}]},
+            {"_id": 0, "empID": 1, "employeeID": 1, "empName": 1},
+        )
+        found = {}
+        async for doc in cursor:
+            for key in (doc.get("empID"), doc.get("employeeID")):
+                if key is not None and str(key) in wanted:
+                    found[str(key)] = doc
+        return found
+
 # Global instance (or can be used via dependency injection)
 employee_repository = EmployeeRepository()
@@ -7,6 +7,8 @@ from datetime import datetime, date
 from app.database import db_manager
 from app.models.eod_summary import EodSummaryInDB
 from app.schemas.unolo import UnoloEodSummaryResponse
+from app.repository.eod_track_repository import eod_track_repository, EOD_HEAVY_FIELDS, EOD_LIGHT_PROJECTION
+from app.utils.durations import add_duration_seconds, EOD_DURATION_FIELDS
 
 class EodSummaryRepository:
     def __init__(self):
@@ -23,6 +25,9 @@ class EodSummaryRepository:
         # Convert Pydantic model to dict
         data_dict = data.model_dump(by_alias=True, exclude_none=True)
         
+        # Integer seconds next to the HH:MM:SS strings for DB-side aggregation
+        add_duration_seconds(data_dict, EOD_DURATION_FIELDS)
+        
         # Add local timestamps
         now = datetime.utcnow()
         data_dict["updated_at_local"] = now
@@ -36,6 +41,12 @@ class EodSummaryRepository:
         if "created_at_local" in update_op["$set"]:
             del update_op["$set"]["created_at_local"]
 
+        # Heavy fields live in their own collection; drop any copy left on the main doc
+        heavy = {field: data_dict.pop(field) for field in EOD_HEAVY_FIELDS if field in data_dict}
+        if heavy:
+            await eod_track_repository.save(data.employee_id, data.date, heavy)
+        update_op["$unset"] = {field: "" for field in EOD_HEAVY_FIELDS}
+
         # Unique key: employeeID + date
         return await self.collection.update_one(
             {
@@ -54,9 +65,10 @@ class EodSummaryRepository:
     ) -> Tuple[List[EodSummaryInDB], int]:
         """
         Find EOD summaries matching query with pagination.
+        Heavy fields are excluded; see eod_track_repository.
         """
         total_count = await self.collection.count_documents(filters)
-        cursor = self.collection.find(filters).sort("date", -1).skip(skip).limit(limit)
+        cursor = self.collection.find(filters, EOD_LIGHT_PROJECTION).sort("date", -1).skip(skip).limit(limit)
         
         results = []
         async for doc in cursor:
@@ -70,4 +82,8 @@ class EodSummaryRepository:
             
         return results, total_count
 
+    def export_cursor(self, query: Dict[str, Any], projection: Dict[str, Any], batch_size: int):
+        """Cursor over every EOD summary matching query, newest first like the list, for exports."""
+        return self.collection.find(query, projection).sort([("date", -1), ("_id", 1)]).batch_size(batch_size)
+
 eod_summary_repository = EodSummaryRepository()
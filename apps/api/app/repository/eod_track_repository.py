@@ -0,0 +1,48 @@
+"""
+EOD Track Repository
+"""
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+from app.database import db_manager
+
+# Fields moved out of eod_summaries into eod_tracks
+EOD_HEAVY_FIELDS = ("rkPolyline",)
+
+# Projection used by default summary reads
+EOD_LIGHT_PROJECTION = {field: 0 for field in EOD_HEAVY_FIELDS}
+
+class EodTrackRepository:
+    def __init__(self):
+        self.collection_name = "eod_tracks"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    async def save(self, employee_id: int, date: str, fields: Dict[str, Any]) -> Any:
+        """
+        Upsert the heavy fields of one EOD summary, keyed by employeeID + date.
+        """
+        now = datetime.utcnow()
+        return await self.collection.update_one(
+            {"employeeID": employee_id, "date": date},
+            {"$set": {**fields, "updated_at_local": now}},
+            upsert=True
+        )
+
+    async def find_one(self, employee_id: int, date: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the track for one employee and day.
+        Falls back to the summary document for days not yet offloaded.
+        """
+        query = {"employeeID": employee_id, "date": date}
+
+        doc = await self.collection.find_one(query, {"_id": 0})
+        if doc:
+            return doc
+
+        projection = {"_id": 0, "employeeID": 1, "date": 1, **{f: 1 for f in EOD_HEAVY_FIELDS}}
+        return await db_manager.get_collection("eod_summaries").find_one(query, projection)
+
+eod_track_repository = EodTrackRepository()
@@ -0,0 +1,87 @@
+"""
+Import Job Repository
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+from app.database import db_manager
+
+class ImportJobRepository:
+    def __init__(self):
+        self.collection_name = "import_jobs"
+        self.errors_collection_name = "import_job_errors"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    @property
+    def errors_collection(self):
+        return db_manager.get_collection(self.errors_collection_name)
+
+    async def create(self, kind: str, filename: str, file_format: str, created_by: Optional[str]) -> str:
+        now = datetime.now(timezone.utc)
+        result = await self.collection.insert_one({
+            "kind": kind,
+            "filename": filename,
+            "file_format": file_format,
+            "status": "queued",
+            "total_rows": None,
+            "processed": 0,
+            "created_count": 0,
+            "updated_count": 0,
+            "error_count": 0,
+            "error": None,
+            "created_by": created_by,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+        })
+        return str(result.inserted_id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not ObjectId.is_valid(job_id):
+            return None
+        doc = await self.collection.find_one({"_id": ObjectId(job_id)})
+        if doc:
+            doc["_id"] = str(doc["_id"])
+        return doc
+
+    async def update(self, job_id: str, **fields) -> Any:
+        fields["updated_at"] = datetime.now(timezone.utc)
+        return await self.collection.update_one({"_id": ObjectId(job_id)}, {"$set": fields})
+
+    async def record_chunk(self, job_id: str, processed: int, created: int, updated: int,
+                           errors: List[Dict[str, Any]]) -> None:
+        """Add one chunk's counts to the job and store its rejected rows."""
+        now = datetime.now(timezone.utc)
+        if errors:
+            await self.errors_collection.insert_many(
+                [{**e, "job_id": job_id, "created_at": now} for e in errors], ordered=False
+            )
+        await self.collection.update_one(
+            {"_id": ObjectId(job_id)},
+            {
+                "$inc": {"processed": processed, "created_count": created,
+                         "updated_count": updated, "error_count": len(errors)},
+                "$set": {"updated_at": now},
+            },
+        )
+
+    async def finish(self, job_id: str, status: str, error: Optional[str] = None) -> Any:
+        now = datetime.now(timezone.utc)
+        return await self.collection.update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {"status": status, "error": error, "updated_at": now, "finished_at": now}},
+        )
+
+    async def iter_errors(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        cursor = self.errors_collection.find(
+            {"job_id": job_id}, {"_id": 0, "row": 1, "client": 1, "error": 1}
+        ).sort("row", 1)
+        async for doc in cursor:
+            yield doc
+
+import_job_repository = ImportJobRepository()
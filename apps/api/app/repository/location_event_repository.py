@@ -0,0 +1,86 @@
+"""
+Location Event Repository
+"""
+from typing import List, Any, Dict, Optional
+from datetime import datetime
+
+from app.database import db_manager
+from app.utils.geo import parse_event_timestamp
+
+class LocationEventRepository:
+    def __init__(self):
+        self.collection_name = "location_events"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    @staticmethod
+    def build_events(
+        user_id: str,
+        date: str,
+        attendance_events: Dict[str, List[Dict[str, Any]]],
+        default_tz: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Flatten an attendance document's `attendanceEvents` (eventTypeID -> events,
+        keyed by Unolo aliases) into time-ordered location_events documents.
+        Events without a parseable timestamp or position are dropped.
+        """
+        events = []
+        for items in (attendance_events or {}).values():
+            for item in items or []:
+                timestamp = parse_event_timestamp(item.get("timestamp"), item.get("tz") or default_tz)
+                if timestamp is None or item.get("lat") is None or item.get("lon") is None:
+                    continue
+
+                events.append({
+                    "timestamp": timestamp,
+                    "employee": {
+                        "userID": user_id,
+                        "employeeID": item.get("employeeID"),
+                        "date": date,
+                    },
+                    "eventID": item.get("id"),
+                    "eventTypeID": item.get("eventTypeID"),
+                    "lat": item["lat"],
+                    "lon": item["lon"],
+                    "accuracy": item.get("accuracy"),
+                    "speed": item.get("speed"),
+                    "bearing": item.get("bearing"),
+                })
+
+        events.sort(key=lambda e: e["timestamp"])
+        return events
+
+    async def replace_day(self, user_id: str, date: str, events: List[Dict[str, Any]]) -> int:
+        """
+        Replace the stored events of one user and day.
+        Time-series collections have no unique keys, so a re-sync rewrites the day;
+        the filter only touches metaField subfields, as Mongo 6 requires for deletes.
+        """
+        await self.collection.delete_many({"employee.userID": user_id, "employee.date": date})
+        if not events:
+            return 0
+
+        result = await self.collection.insert_many(events, ordered=False)
+        return len(result.inserted_ids)
+
+    async def find_in_range(
+        self,
+        user_id: str,
+        start_dt: datetime,
+        end_dt: datetime,
+        limit: int = 5000
+    ) -> List[Dict[str, Any]]:
+        """
+        Find a user's events between two instants, oldest first.
+        """
+        query = {
+            "employee.userID": user_id,
+            "timestamp": {"$gte": start_dt, "$lte": end_dt}
+        }
+        cursor = self.collection.find(query, {"_id": 0}).sort("timestamp", 1).limit(limit)
+        return await cursor.to_list(length=None)
+
+location_event_repository = LocationEventRepository()
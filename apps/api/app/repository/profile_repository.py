@@ -0,0 +1,45 @@
+"""
+Request Profile Repository
+"""
+import re
+from typing import List, Any, Dict, Optional
+
+from bson import ObjectId
+
+from app.database import db_manager
+
+# Summary fields only; reports can be megabytes
+SUMMARY_PROJECTION = {"report": 0}
+
+class ProfileRepository:
+    def __init__(self):
+        self.collection_name = "profiles"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    async def insert(self, doc: Dict[str, Any]) -> Any:
+        return await self.collection.insert_one(doc)
+
+    async def find_recent(self, limit: int = 50, path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Most recent profiles first, optionally for paths starting with `path`.
+        """
+        query: Dict[str, Any] = {}
+        if path:
+            query["path"] = {"$regex": f"^{re.escape(path)}"}
+
+        cursor = self.collection.find(query, SUMMARY_PROJECTION).sort("created_at", -1).limit(limit)
+        results = []
+        async for doc in cursor:
+            doc["_id"] = str(doc["_id"])
+            results.append(doc)
+        return results
+
+    async def find_by_id(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        if not ObjectId.is_valid(profile_id):
+            return None
+        return await self.collection.find_one({"_id": ObjectId(profile_id)})
+
+profile_repository = ProfileRepository()
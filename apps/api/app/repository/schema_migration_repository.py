@@ -0,0 +1,53 @@
+"""
+Schema Migration Repository
+"""
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+
+from app.database import db_manager
+
+class SchemaMigrationRepository:
+    def __init__(self):
+        self.collection_name = "schema_migrations"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    async def get(self, version: int) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"_id": version})
+
+    async def find_all(self) -> List[Dict[str, Any]]:
+        cursor = self.collection.find({}).sort("_id", 1)
+        return await cursor.to_list(length=None)
+
+    async def checkpoint(self, version: int, name: str, last_id: Any, counts: Dict[str, int]) -> Any:
+        """Record progress after a batch; creates the entry on the first one."""
+        now = datetime.now(timezone.utc)
+        return await self.collection.update_one(
+            {"_id": version},
+            {
+                "$set": {"name": name, "status": "running", "last_id": last_id,
+                         "counts": counts, "updated_at": now},
+                "$setOnInsert": {"started_at": now},
+            },
+            upsert=True
+        )
+
+    async def complete(self, version: int, name: str, counts: Dict[str, int]) -> Any:
+        now = datetime.now(timezone.utc)
+        return await self.collection.update_one(
+            {"_id": version},
+            {
+                "$set": {"name": name, "status": "completed", "counts": counts,
+                         "updated_at": now, "completed_at": now},
+                "$setOnInsert": {"started_at": now},
+            },
+            upsert=True
+        )
+
+    async def reset(self, version: int) -> Any:
+        """Forget a migration so the next run starts from the first document."""
+        return await self.collection.delete_one({"_id": version})
+
+schema_migration_repository = SchemaMigrationRepository()
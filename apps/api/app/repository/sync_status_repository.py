@@ -0,0 +1,37 @@
+"""
+Sync Status Repository
+"""
+from typing import Any, Dict, List
+from datetime import datetime, timezone
+
+from app.database import db_manager
+
+class SyncStatusRepository:
+    def __init__(self):
+        self.collection_name = "sync_status"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    async def record_success(self, entity: str, stats: Dict[str, Any], duration: float) -> Any:
+        """
+        Mark a sync run of `entity` as finished successfully now.
+        Error lists are stored as counts to keep the document small.
+        """
+        summary = {k: len(v) if isinstance(v, list) else v for k, v in stats.items()}
+        return await self.collection.update_one(
+            {"entity": entity},
+            {"$set": {
+                "last_success_at": datetime.now(timezone.utc),
+                "duration_seconds": round(duration, 3),
+                "stats": summary,
+            }},
+            upsert=True
+        )
+
+    async def find_all(self) -> List[Dict[str, Any]]:
+        cursor = self.collection.find({}, {"_id": 0})
+        return await cursor.to_list(length=None)
+
+sync_status_repository = SyncStatusRepository()
@@ -7,6 +7,10 @@ from datetime import datetime, date, timezone
 from app.database import db_manager
 from app.models.task import TaskInDB
 from app.schemas.task import TaskCreate
+from app.repository.client_latest_visit_repository import client_latest_visit_repository
+from app.repository.client_repository import client_repository
+from app.repository.client_sketch_repository import client_sketch_repository
+from app.utils.task_metadata import parse_school_category
 
 class TaskRepository:
     def __init__(self):
@@ -63,12 +67,18 @@ class TaskRepository:
         if "created_at_local" in update_op["$set"]:
             del update_op["$set"]["created_at_local"]
 
-        return await self.collection.update_one(
+        result = await self.collection.update_one(
             {"taskID": task_data.task_id},
             update_op,
             upsert=True
         )
 
+        # Keep the per-client latest visit view and unique-client sketches in step with ingest
+        await client_latest_visit_repository.record_visit(task_dict)
+        await client_sketch_repository.record_task(task_dict)
+
+        return result
+
     async def find_with_filters(
         self,  
         filters: Dict[str, Any], 
@@ -98,6 +108,10 @@ class TaskRepository:
             
         return tasks, total_count
 
+    def export_cursor(self, query: Dict[str, Any], projection: Dict[str, Any], batch_size: int):
+        """Cursor over every task matching query, newest first like the list, for exports."""
+        return self.collection.find(query, projection).sort([("date", -1), ("_id", 1)]).batch_size(batch_size)
+
     async def find_tasks_by_employee_with_client_filter(
         self,
         employee_id: str,
@@ -122,7 +136,42 @@ class TaskRepository:
                 {"internalEmpID": employee_id}
             ]
         }
-        
+
+        tasks = await self._find_tasks_with_clients(match_stage, client_category)
+        print(f"[DEBUG] Found {len(tasks)} tasks matching filters")
+        return tasks
+
+    async def find_tasks_by_employees_with_client_filter(
+        self,
+        employee_ids: List[str],
+        start_date: date,
+        end_date: date,
+        client_category: Optional[str] = None
+    ) -> Dict[str, List[TaskInDB]]:
+        """
+        Tasks of several employees (Unolo employeeIDs) within the date range, in one
+        pipeline matching employeeID with $in.
+        Returns: {employeeID: tasks newest first}; employees without tasks are left out.
+        """
+        start_dt = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
+        end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
+
+        match_stage = {
+            "checkinTime": {"$gte": start_dt, "$lte": end_dt},
+            "employeeID": {"$in": employee_ids}
+        }
+
+        by_employee: Dict[str, List[TaskInDB]] = {}
+        for task in await self._find_tasks_with_clients(match_stage, client_category):
+            by_employee.setdefault(task.employee_id, []).append(task)
+        return by_employee
+
+    async def _find_tasks_with_clients(
+        self,
+        match_stage: Dict[str, Any],
+        client_category: Optional[str] = None
+    ) -> List[TaskInDB]:
+        """Matched tasks newest first, each with its client joined in."""
         pipeline = [
             {"$match": match_stage},
             {"$sort": {"checkinTime": -1}}
@@ -182,8 +231,7 @@ class TaskRepository:
             except Exception as e:
                 print(f"Error validating task in analytics: {e}")
                 continue
-        
-        print(f"[DEBUG] Found {len(tasks)} tasks matching filters")
+
         return tasks
 
     async def aggregate_tasks_area_wise(
@@ -208,7 +256,42 @@ class TaskRepository:
                 {"internalEmpID": employee_id}
             ]
         }
-        
+
+        by_employee = await self._aggregate_area_wise(match_stage, client_category)
+        return by_employee.get(None, {})
+
+    async def aggregate_tasks_area_wise_by_employees(
+        self,
+        employee_ids: List[str],
+        start_date: date,
+        end_date: date,
+        client_category: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Area-wise unique clients with their tasks for several employees (Unolo
+        employeeIDs), in one pipeline matching employeeID with $in and grouped
+        by employee as well.
+        Returns: {employeeID: area_stats as in aggregate_tasks_area_wise}
+        """
+        start_dt = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
+        end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
+
+        match_stage = {
+            "checkinTime": {"$gte": start_dt, "$lte": end_dt},
+            "employeeID": {"$in": employee_ids}
+        }
+        return await self._aggregate_area_wise(match_stage, client_category, employee_field="$employeeID")
+
+    async def _aggregate_area_wise(
+        self,
+        match_stage: Dict[str, Any],
+        client_category: Optional[str] = None,
+        employee_field: Optional[str] = None
+    ) -> Dict[Optional[str], Dict[str, Any]]:
+        """
+        Area-wise unique clients with their tasks for the matched tasks, per
+        `employee_field` value (all under None when not given).
+        """
         pipeline = [
             {"$match": match_stage},
             # Join with clients immediately to get area info
@@ -246,6 +329,7 @@ class TaskRepository:
             {
                 "$group": {
                     "_id": {
+                        "employee": employee_field,
                         "area": "$client_info.Division Name new (*)",
                         "client_id": "$client_info._id"  # Use internal _id instead of external ID
                     },
@@ -261,13 +345,15 @@ class TaskRepository:
                     "tasks": 1,
                     "task_count": 1,
                     "_id": 0,
+                    "employee": "$_id.employee",
                     "area": "$_id.area"
                 }
             },
             # Now group by Area to form the final structure
             {
                 "$group": {
-                    "_id": "$area",
+                    # $ifNull: tasks without a client (missing area) share the null area, as before
+                    "_id": {"employee": "$employee", "area": {"$ifNull": ["$area", None]}},
                     "clients_with_tasks": {
                         "$push": {
                             "client": "$client",
@@ -282,11 +368,12 @@ class TaskRepository:
         
         cursor = self.collection.aggregate(pipeline)
         
-        area_stats = {}
+        by_employee: Dict[Optional[str], Dict[str, Any]] = {}
         
         async for doc in cursor:
+            area_stats = by_employee.setdefault(doc["_id"].get("employee"), {})
             # Map None/empty area to "unassigned" to match ClientRepository
-            area = doc["_id"]
+            area = doc["_id"].get("area")
             if not area:
                 area = "unassigned"
             
@@ -312,7 +399,7 @@ class TaskRepository:
                 "clients_with_tasks": clients_with_tasks
             }
             
-        return area_stats
+        return by_employee
 
     async def get_latest_tasks_grouped_by_school_category(
         self,
@@ -324,27 +411,160 @@ class TaskRepository:
         """
         Get latest task per client (school), grouped by schoolCategory (Hot/Cold/Warm/NoInfo).
         Each school appears only once with its most recent task.
+
+        Ranges that reach the present are served from the per-employee side of
+        the client_latest_visit view; historical ranges fall back to grouping
+        the tasks collection.
         """
         # Convert to UTC-aware datetime
         start_dt = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
         end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
-        
+
+        if end_dt >= datetime.now(timezone.utc):
+            visits = await client_latest_visit_repository.find_visits(start_dt, end_dt, employee_id=employee_id)
+            items = await self._latest_tasks_from_view(visits)
+        else:
+            items = await self._latest_tasks_from_tasks({
+                "checkinTime": {"$gte": start_dt, "$lte": end_dt},
+                "$or": [
+                    {"employeeID": employee_id},
+                    {"internalEmpID": employee_id}
+                ]
+            })
+
+        return self._group_by_school_category([item[1:] for item in items], client_category)
+
+    async def get_latest_tasks_grouped_by_school_category_for_employees(
+        self,
+        employee_ids: List[str],
+        start_date: date,
+        end_date: date,
+        client_category: Optional[str] = None
+    ) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        get_latest_tasks_grouped_by_school_category for several employees (Unolo
+        employeeIDs), with one $in read of the per-employee view or one pipeline
+        grouped by employee and client.
+        Returns: {employeeID: {Hot, Cold, Warm, NoInfo}}; employees without visits are left out.
+        """
+        start_dt = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
+        end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
+
+        if end_dt >= datetime.now(timezone.utc):
+            visits = await client_latest_visit_repository.find_visits(start_dt, end_dt, employee_ids=employee_ids)
+            items = await self._latest_tasks_from_view(visits)
+        else:
+            items = await self._latest_tasks_from_tasks(
+                {"checkinTime": {"$gte": start_dt, "$lte": end_dt}, "employeeID": {"$in": employee_ids}},
+                employee_field="$employeeID"
+            )
+
+        by_employee: Dict[str, List[Tuple[Dict, Optional[Dict], str]]] = {}
+        for employee, client, task, category in items:
+            by_employee.setdefault(employee, []).append((client, task, category))
+        return {
+            employee: self._group_by_school_category(employee_items, client_category)
+            for employee, employee_items in by_employee.items()
+        }
+
+    @staticmethod
+    def _group_by_school_category(
+        items: List[Tuple[Dict, Optional[Dict], str]],
+        client_category: Optional[str] = None
+    ) -> Dict[str, List[Dict]]:
+        """Bucket (client, task, school_category) items, newest first, into Hot/Cold/Warm/NoInfo."""
+        results = {"Hot": [], "Cold": [], "Warm": [], "NoInfo": []}
+        seen_clients = set()
+
+        # Items arrive newest first, so the first one per client is its latest visit
+        for client, task, category in items:
+            # Skip if no valid client (tasks without matched clients)
+            if not client or not client.get("_id"):
+                continue
+
+            # Fix ObjectId serialization
+            client["_id"] = str(client["_id"])
+            if client["_id"] in seen_clients:
+                continue
+            seen_clients.add(client["_id"])
+
+            # Filter by client category if specified
+            if client_category and client_category.lower() != "both":
+                if client.get("Client Catagory (*)") != client_category:
+                    continue
+
+            if task and "_id" in task:
+                task["_id"] = str(task["_id"])
+
+            # Format item
+            item = {
+                "client": client,
+                "latest_task": task,
+                "school_category": category
+            }
+
+            if category in results:
+                results[category].append(item)
+            else:
+                results["NoInfo"].append(item)
+
+        return results
+
+    async def _latest_tasks_from_view(
+        self,
+        visits: List[Dict[str, Any]]
+    ) -> List[Tuple[Optional[str], Dict, Optional[Dict], str]]:
+        """
+        Hydrate latest visits from client_latest_visit with their tasks and
+        clients, with one indexed $in query each.
+        Returns: List of (employee_id, client, task, school_category), in visit order.
+        """
+        if not visits:
+            return []
+
+        task_ids = [v["task_id"] for v in visits if v.get("task_id")]
+        task_map = {}
+        async for doc in self.collection.find({"taskID": {"$in": task_ids}}):
+            task_map[doc["taskID"]] = doc
+
+        client_map = await client_repository.find_by_unolo_ids([v["client_id"] for v in visits])
+
+        return [
+            (
+                v.get("employee_id"), client_map.get(v["client_id"]), task_map.get(v.get("task_id")),
+                v.get("school_category", "NoInfo")
+            )
+            for v in visits
+        ]
+
+    async def _latest_tasks_from_tasks(
+        self,
+        match_stage: Dict[str, Any],
+        employee_field: Optional[str] = None
+    ) -> List[Tuple[Optional[str], Dict, Optional[Dict], str]]:
+        """
+        Compute latest task per client (per `employee_field` value, if given)
+        from the matched tasks.
+        Groups by clientID before the client $lookup so the join runs once per client.
+        Returns: List of (employee, client, task, school_category), newest first.
+        """
         pipeline = [
             # 1. Match tasks using checkinTime
+            {"$match": match_stage},
+            # 2. Sort by checkinTime desc (most recent first)
+            {"$sort": {"checkinTime": -1}},
+            # 3. Latest task per clientID
             {
-                "$match": {
-                    "checkinTime": {"$gte": start_dt, "$lte": end_dt},
-                    "$or": [
-                        {"employeeID": employee_id},
-                        {"internalEmpID": employee_id}
-                    ]
+                "$group": {
+                    "_id": {"employee": employee_field, "client": "$clientID"},
+                    "latest_task": {"$first": "$$ROOT"}
                 }
             },
-            # 2. Lookup client info FIRST (before grouping)
+            # 4. Lookup client info for the grouped rows only
             {
                 "$lookup": {
                     "from": "clients",
-                    "let": {"cid": "$clientID"},
+                    "let": {"cid": "$_id.client"},
                     "pipeline": [
                         {"$match": {
                             "$expr": {
@@ -367,67 +587,17 @@ class TaskRepository:
                     "preserveNullAndEmptyArrays": True
                 }
             },
-            # 3. Sort by checkinTime desc (most recent first)
-            {"$sort": {"checkinTime": -1}},
-            # 4. Group by the CLIENT's actual _id (not clientID from task) to ensure unique schools
-            {
-                "$group": {
-                    "_id": "$client_info._id",
-                    "latest_task": {"$first": "$$ROOT"},
-                    "client_info": {"$first": "$client_info"}
-                }
-            }
+            {"$sort": {"latest_task.checkinTime": -1}}
         ]
-        
-        # Filter by client category if specified
-        if client_category and client_category.lower() != "both":
-            pipeline.append({"$match": {"client_info.Client Catagory (*)": client_category}})
-            
+
         cursor = self.collection.aggregate(pipeline)
-        
-        results = {"Hot": [], "Cold": [], "Warm": [], "NoInfo": []}
-        
+
+        items = []
         async for doc in cursor:
             task = doc["latest_task"]
-            client = doc.get("client_info", {}) # Default to empty dict
-            
-            # Skip if no valid client (tasks without matched clients)
-            if not client or not doc.get("_id"):
-                continue
-            
-            # Fix ObjectId serialization
-            if client and "_id" in client:
-                client["_id"] = str(client["_id"])
-            if "_id" in task:
-                task["_id"] = str(task["_id"])
-            
-            # Remove nested client_info from task to avoid duplication
-            if "client_info" in task:
-                del task["client_info"]
-            
-            # Extract schoolCategory from metadata
-            metadata = task.get("metadata", {})
-            cats = metadata.get("schoolCategory", [])
-            
-            category = "NoInfo"
-            if cats and isinstance(cats, list) and len(cats) > 0:
-                val = cats[0] 
-                if val in ["Hot", "Cold", "Warm"]:
-                    category = val
-            
-            # Format item
-            item = {
-                "client": client,
-                "latest_task": task,
-                "school_category": category
-            }
-            
-            if category in results:
-                results[category].append(item)
-            else:
-                results["NoInfo"].append(item)
-                
-        return results
+            category = task.get("school_category") or parse_school_category(task.get("metadata"))
+            items.append((doc["_id"].get("employee"), doc.get("client_info", {}), task, category))
+        return items
 
     async def find_all_tasks_in_date_range(
         self,
@@ -452,6 +622,37 @@ class TaskRepository:
             
         return tasks
 
+    async def summarize_tasks_in_date_range(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, int]:
+        """
+        Count tasks and sum typed specimens_given within date range.
+        Returns: {total_tasks: int, total_specimens: int}
+        """
+        start_dt = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
+        end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
+
+        pipeline = [
+            {"$match": {"checkinTime": {"$gte": start_dt, "$lte": end_dt}}},
+            {
+                "$group": {
+                    "_id": None,
+                    "total_tasks": {"$sum": 1},
+                    "total_specimens": {"$sum": {"$ifNull": ["$specimens_given", 0]}}
+                }
+            }
+        ]
+
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        if not result:
+            return {"total_tasks": 0, "total_specimens": 0}
+        return {
+            "total_tasks": result[0]["total_tasks"],
+            "total_specimens": result[0]["total_specimens"]
+        }
+
     async def aggregate_tasks_by_employee(
         self,
         start_date: date,
@@ -477,6 +678,36 @@ class TaskRepository:
         cursor = self.collection.aggregate(pipeline)
         return await cursor.to_list(length=None)
 
+    async def distinct_clients_in_range(
+        self,
+        start_date: date,
+        end_date: date,
+        employee_id: Optional[str] = None
+    ) -> List[str]:
+        """
+        Distinct clientIDs of tasks in the date range, optionally for one employee.
+        """
+        start_dt = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
+        end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
+
+        match_stage: Dict[str, Any] = {
+            "checkinTime": {"$gte": start_dt, "$lte": end_dt},
+            "clientID": {"$nin": [None, ""]}
+        }
+        if employee_id:
+            match_stage["$or"] = [
+                {"employeeID": employee_id},
+                {"internalEmpID": employee_id}
+            ]
+
+        pipeline = [
+            {"$match": match_stage},
+            {"$group": {"_id": "$clientID"}}
+        ]
+
+        cursor = self.collection.aggregate(pipeline)
+        return [str(doc["_id"]) async for doc in cursor]
+
     async def get_hot_schools_by_employee(
         self,
         start_date: date,
@@ -488,7 +719,12 @@ class TaskRepository:
         """
         start_dt = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
         end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
-        
+
+        # Nothing can be newer than "now", so the materialized latest visit
+        # is exactly the latest visit in range.
+        if end_dt >= datetime.now(timezone.utc):
+            return await client_latest_visit_repository.count_by_employee(start_dt, end_dt, "Hot")
+
         pipeline = [
             # 1. Match tasks in range
             {"$match": {"checkinTime": {"$gte": start_dt, "$lte": end_dt}}},
@@ -508,13 +744,7 @@ class TaskRepository:
             {
                 "$project": {
                     "employeeID": "$latest_task.employeeID",
-                    "school_category": {
-                        "$ifNull": [
-                            {"$arrayElemAt": ["$latest_task.metadata.schoolCategory", 0]},
-                            "$latest_task.metadata.schoolCategory",
-                            "NoInfo"
-                        ]
-                    }
+                    "school_category": {"$ifNull": ["$latest_task.school_category", "NoInfo"]}
                 }
             },
             
@@ -555,28 +785,16 @@ class TaskRepository:
                 {"internalEmpID": employee_id}
             ]
             
+        # Typed fields are part of the first $match so the partial indexes apply
+        if filter_type == 'specimens':
+            match_stage["specimens_given"] = {"$gt": 0}
+        elif filter_type == 'hot_schools':
+            match_stage["school_category"] = "Hot"
+            
         pipeline = [
             {"$match": match_stage},
             {"$sort": {"checkinTime": -1}}
         ]
-        
-        if filter_type == 'specimens':
-             pipeline.append({
-                 "$match": {
-                     "$and": [
-                         {"metadata.specimensGiven": {"$exists": True}},
-                         {"metadata.specimensGiven": {"$ne": "0"}},
-                         {"metadata.specimensGiven": {"$ne": 0}},
-                         {"metadata.specimensGiven": {"$ne": ""}}
-                     ]
-                 }
-             })
-        elif filter_type == 'hot_schools':
-             pipeline.append({
-                 "$match": {
-                     "metadata.schoolCategory": "Hot"
-                 }
-             })
              
         pipeline.extend([
             {
@@ -0,0 +1,164 @@
+"""
+Trends Repository
+"""
+from typing import List, Any, Dict, Optional
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from app.database import db_manager
+from app.repository.emp_analytics_repository import PRESENT_RESULT_CODES
+
+# Buckets follow the business day in India, not UTC
+TRENDS_TIMEZONE = "Asia/Kolkata"
+TRENDS_ZONE = ZoneInfo(TRENDS_TIMEZONE)
+
+
+def local_day_start(day: date) -> datetime:
+    """UTC instant at which `day` starts in TRENDS_TIMEZONE."""
+    return datetime.combine(day, time.min, tzinfo=TRENDS_ZONE).astimezone(timezone.utc)
+
+
+def _bucket_expr(date_expr: Any, unit: str) -> Dict[str, Any]:
+    trunc = {"date": date_expr, "unit": unit, "timezone": TRENDS_TIMEZONE}
+    if unit == "week":
+        trunc["startOfWeek"] = "monday"
+    return {"$dateTrunc": trunc}
+
+
+def _period_expr(date_expr: Any, current_start: Any) -> Dict[str, Any]:
+    return {"$cond": [{"$gte": [date_expr, current_start]}, "current", "previous"]}
+
+
+class TrendsRepository:
+    def __init__(self):
+        self.collection_name = "tasks"
+
+    @property
+    def collection(self):
+        return db_manager.get_collection(self.collection_name)
+
+    async def aggregate_trends(
+        self,
+        start_date: date,
+        end_date: date,
+        unit: str,
+        employee_id: Optional[str] = None,
+        previous_start: Optional[date] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Task and EOD metrics per time bucket (day | week | month, in IST), in
+        one pipeline over tasks with the EOD summaries unioned in.
+
+        Covers [start_date, end_date], or [previous_start, end_date] with every
+        row tagged "previous" or "current" by whether it falls before start_date.
+        Returns: {
+            buckets: [{_id: {period, bucket}, tasks, specimens, present_days, distance, employees}],
+            hot_buckets: [{_id: {period, bucket}, count}],
+            periods: [{_id: period, employees}],
+            hot_periods: [{_id: period, count}],
+        }
+        Hot schools are clients whose latest visit in the bucket (or period) was Hot.
+        """
+        first_day = previous_start or start_date
+        range_start = local_day_start(first_day)
+        range_end = local_day_start(end_date + timedelta(days=1))
+        current_start = local_day_start(start_date)
+
+        task_match: Dict[str, Any] = {"checkinTime": {"$gte": range_start, "$lt": range_end}}
+        eod_match: Dict[str, Any] = {
+            "date": {"$gte": first_day.strftime("%Y-%m-%d"), "$lte": end_date.strftime("%Y-%m-%d")}
+        }
+        if employee_id:
+            task_match["$or"] = [
+                {"employeeID": employee_id},
+                {"internalEmpID": employee_id}
+            ]
+            # EOD summaries store the numeric Unolo employeeID as an int
+            eod_match["employeeID"] = int(employee_id) if employee_id.isdigit() else employee_id
+
+        # EOD dates are local calendar days
+        eod_day = {"$dateFromString": {
+            "dateString": "$date", "format": "%Y-%m-%d", "timezone": TRENDS_TIMEZONE, "onError": None
+        }}
+        period_key = {"period": "$period", "bucket": "$bucket"}
+
+        pipeline = [
+            {"$match": task_match},
+            {"$project": {
+                "_id": 0,
+                "kind": "task",
+                "period": _period_expr("$checkinTime", current_start),
+                "bucket": _bucket_expr("$checkinTime", unit),
+                "checkinTime": 1,
+                "clientID": 1,
+                "school_category": {"$ifNull": ["$school_category", "NoInfo"]},
+                "specimens": {"$ifNull": ["$specimens_given", 0]},
+            }},
+            {"$unionWith": {
+                "coll": "eod_summaries",
+                "pipeline": [
+                    {"$match": eod_match},
+                    {"$project": {"_id": 0, "employeeID": 1, "attendanceResultCode": 1, "distance": 1, "day": eod_day}},
+                    {"$match": {"day": {"$ne": None}}},
+                    {"$project": {
+                        "kind": "eod",
+                        "period": _period_expr("$day", current_start),
+                        "bucket": _bucket_expr("$day", unit),
+                        "employeeID": 1,
+                        # Present on a working day (Mon-Sat; $dayOfWeek 1 = Sunday), as in employee analytics
+                        "present": {"$and": [
+                            {"$in": ["$attendanceResultCode", PRESENT_RESULT_CODES]},
+                            {"$ne": [{"$dayOfWeek": {"date": "$day", "timezone": TRENDS_TIMEZONE}}, 1]},
+                        ]},
+                        "distance": {"$ifNull": ["$distance", 0]},
+                    }},
+                ]
+            }},
+            {"$facet": {
+                "buckets": [
+                    {"$group": {
+                        "_id": period_key,
+                        "tasks": {"$sum": {"$cond": [{"$eq": ["$kind", "task"]}, 1, 0]}},
+                        "specimens": {"$sum": {"$cond": [{"$eq": ["$kind", "task"]}, "$specimens", 0]}},
+                        "present_days": {"$sum": {"$cond": ["$present", 1, 0]}},
+                        "distance": {"$sum": {"$cond": ["$present", "$distance", 0]}},
+                        "employees": {"$addToSet": "$employeeID"},
+                    }},
+                    {"$project": {
+                        "tasks": 1, "specimens": 1, "present_days": 1, "distance": 1,
+                        "employees": {"$size": {"$setDifference": ["$employees", [None]]}},
+                    }},
+                ],
+                "hot_buckets": [
+                    {"$match": {"kind": "task"}},
+                    {"$sort": {"checkinTime": -1}},
+                    {"$group": {
+                        "_id": {"period": "$period", "bucket": "$bucket", "client": "$clientID"},
+                        "school_category": {"$first": "$school_category"},
+                    }},
+                    {"$match": {"school_category": "Hot"}},
+                    {"$group": {"_id": {"period": "$_id.period", "bucket": "$_id.bucket"}, "count": {"$sum": 1}}},
+                ],
+                "periods": [
+                    {"$match": {"kind": "eod"}},
+                    {"$group": {"_id": "$period", "employees": {"$addToSet": "$employeeID"}}},
+                    {"$project": {"employees": {"$size": "$employees"}}},
+                ],
+                "hot_periods": [
+                    {"$match": {"kind": "task"}},
+                    {"$sort": {"checkinTime": -1}},
+                    {"$group": {
+                        "_id": {"period": "$period", "client": "$clientID"},
+                        "school_category": {"$first": "$school_category"},
+                    }},
+                    {"$match": {"school_category": "Hot"}},
+                    {"$group": {"_id": "$_id.period", "count": {"$sum": 1}}},
+                ],
+            }},
+        ]
+
+        result = await self.collection.aggregate(pipeline, allowDiskUse=True).to_list(length=1)
+        return result[0] if result else {"buckets": [], "hot_buckets": [], "periods": [], "hot_periods": []}
+
+# Global instance
+trends_repository = TrendsRepository()
@@ -2,9 +2,10 @@
 Analytics Routes
 """
 
-from typing import Optional
+from typing import List, Optional
 from fastapi import APIRouter, Query, Depends, HTTPException
-from app.middleware.auth import get_any_authenticated_user
+from app.config import get_settings
+from app.middleware.auth import get_any_authenticated_user, get_manager_or_admin
 from datetime import date
 
 from app.schemas.analytics import (
@@ -16,7 +17,14 @@ from app.schemas.analytics import (
     TaskAnalyticsResponse,
     AreaWiseTasksResponse,
     SchoolCategoryResponse,
-    AdminOverviewResponse
+    TaskAnalyticsBatchResponse,
+    AreaWiseTasksBatchResponse,
+    SchoolCategoryBatchResponse,
+    AdminOverviewResponse,
+    NotVisitedClientsResponse,
+    UniqueClientsResponse,
+    TrendInterval,
+    TrendsResponse
 )
 from app.services.analytics import (
     get_clients_for_employee,
@@ -24,6 +32,12 @@ from app.services.analytics import (
     get_all_tasks_for_employee,
     get_area_wise_tasks_with_clients,
     get_clients_by_school_category,
+    get_all_tasks_for_employees,
+    get_area_wise_tasks_for_employees,
+    get_clients_by_school_category_for_employees,
+    get_clients_not_visited,
+    get_unique_clients,
+    get_trends,
     get_admin_dashboard_overview,
     get_admin_tasks_drilldown
 )
@@ -40,6 +54,16 @@ def get_emply_id_from_user(user) -> str:
     # Split by @ and take the first part
     return user.email.split("@")[0]
 
+def get_batch_employee_ids(
+    employee_ids: List[str] = Query(..., description="Employee IDs (repeat the parameter)")
+) -> List[str]:
+    """Distinct employee IDs of a batch request, within analytics_batch_max_employees."""
+    employee_ids = list(dict.fromkeys(e for e in employee_ids if e))
+    max_employees = get_settings().analytics_batch_max_employees
+    if not employee_ids or len(employee_ids) > max_employees:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {max_employees} employee_ids")
+    return employee_ids
+
 def get_employee_id_from_user(user) -> str:
     """Extract employee ID from email (e.g. emp001@brinda.com -> emp001)."""
     if not user.employeeId:
@@ -245,6 +269,130 @@ async def get_tasks_by_school_category(
         target_emp_id, start, end, client_category
     )
 
+# --- Batch Task Analytics Routes (managers comparing several employees) ---
+
+@router.get("/tasks/batch", response_model=TaskAnalyticsBatchResponse)
+async def get_employees_tasks_analytics(
+    start: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: date = Query(..., description="End date (YYYY-MM-DD)"),
+    client_category: Optional[TaskClientCategoryFilter] = Query(
+        None, description="Filter: School, Distributor, or Both"
+    ),
+    employee_ids: List[str] = Depends(get_batch_employee_ids),
+    current_user = Depends(get_manager_or_admin),
+):
+    """
+    API 1 for several employees in one request, keyed by employee ID.
+    """
+    return {"employees": await get_all_tasks_for_employees(employee_ids, start, end, client_category)}
+
+@router.get("/tasks/area-wise/batch", response_model=AreaWiseTasksBatchResponse)
+async def get_employees_area_wise_tasks(
+    start: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: date = Query(..., description="End date (YYYY-MM-DD)"),
+    client_category: Optional[TaskClientCategoryFilter] = Query(
+        None, description="Filter: School, Distributor, or Both"
+    ),
+    employee_ids: List[str] = Depends(get_batch_employee_ids),
+    current_user = Depends(get_manager_or_admin),
+):
+    """
+    API 2 for several employees in one request, keyed by employee ID.
+    """
+    return {"employees": await get_area_wise_tasks_for_employees(employee_ids, start, end, client_category)}
+
+@router.get("/tasks/school-category/batch", response_model=SchoolCategoryBatchResponse)
+async def get_employees_tasks_by_school_category(
+    start: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: date = Query(..., description="End date (YYYY-MM-DD)"),
+    client_category: Optional[TaskClientCategoryFilter] = Query(
+        None, description="Filter: School, Distributor, or Both"
+    ),
+    employee_ids: List[str] = Depends(get_batch_employee_ids),
+    current_user = Depends(get_manager_or_admin),
+):
+    """
+    API 3 for several employees in one request, keyed by employee ID.
+    """
+    return {"employees": await get_clients_by_school_category_for_employees(
+        employee_ids, start, end, client_category
+    )}
+
+@router.get("/tasks/not-visited", response_model=NotVisitedClientsResponse)
+async def get_not_visited_clients(
+    days: int = Query(30, ge=1, le=365, description="Clients not visited in this many days"),
+    employee_id: Optional[str] = Query(None, description="Employee ID (for managers)"),
+    limit: int = Query(1000, ge=1, le=5000),
+    current_user = Depends(get_any_authenticated_user),
+):
+    """
+    Get clients whose latest visit is older than N days, oldest first.
+    Admins without an employee_id get the report across all employees.
+    """
+    target_emp_id = None
+
+    if current_user.role == UserRole.ADMIN:
+        target_emp_id = employee_id
+    elif current_user.role == UserRole.MANAGER and employee_id:
+        target_emp_id = employee_id
+    else:
+        target_emp_id = get_employee_id_from_user(current_user)
+
+    return await get_clients_not_visited(days, target_emp_id, limit)
+
+@router.get("/tasks/unique-clients", response_model=UniqueClientsResponse)
+async def get_unique_clients_route(
+    start: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: date = Query(..., description="End date (YYYY-MM-DD)"),
+    employee_id: Optional[str] = Query(None, description="Employee ID (for managers)"),
+    approximate: bool = Query(
+        False, description="Estimate from HyperLogLog sketches (about ±3% at 95%); short ranges stay exact"
+    ),
+    current_user = Depends(get_any_authenticated_user),
+):
+    """
+    Count unique clients visited in the range, in total and per area.
+    Admins without an employee_id get the count across all employees.
+    """
+    target_emp_id = None
+
+    if current_user.role == UserRole.ADMIN:
+        target_emp_id = employee_id
+    elif current_user.role == UserRole.MANAGER and employee_id:
+        target_emp_id = employee_id
+    else:
+        target_emp_id = get_employee_id_from_user(current_user)
+
+    return await get_unique_clients(start, end, target_emp_id, approximate)
+
+@router.get("/trends", response_model=TrendsResponse)
+async def get_trends_route(
+    start: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: date = Query(..., description="End date (YYYY-MM-DD)"),
+    interval: TrendInterval = Query(TrendInterval.DAY, description="day, week (Monday-based) or month"),
+    employee_id: Optional[str] = Query(None, description="Employee ID (for managers); omit for the whole team"),
+    compare: bool = Query(False, description="Also return the equally long period before start"),
+    current_user = Depends(get_any_authenticated_user),
+):
+    """
+    Time series of tasks, hot schools, specimens, distance and attendance,
+    bucketed by IST day, week or month. Admins and managers without an
+    employee_id get the whole team.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if interval == TrendInterval.DAY and (end - start).days >= 366:
+        raise HTTPException(status_code=400, detail="Use a weekly or monthly interval for ranges over a year")
+
+    target_emp_id = None
+
+    if current_user.role in (UserRole.ADMIN, UserRole.MANAGER):
+        target_emp_id = employee_id
+    else:
+        target_emp_id = get_employee_id_from_user(current_user)
+
+    return await get_trends(start, end, interval, target_emp_id, compare)
+
 @router.get("/admin/overview", response_model=AdminOverviewResponse)
 async def get_admin_dashboard_overview_route(
     start: date = Query(..., description="Start date (YYYY-MM-DD)"),
@@ -2,12 +2,18 @@
 Attendance Routes
 """
 from typing import Optional, Dict, Any
-from datetime import date
+from datetime import date, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app.schemas.unolo import SyncStatsResponse, AttendanceList
-from app.services.attendance import sync_attendance, get_attendance_records
+from app.schemas.unolo import (
+    SyncStatsResponse, AttendanceList, AttendanceEventsResponse,
+    AttendanceTrackResponse, LocationEventList
+)
+from app.services.attendance import (
+    sync_attendance, get_attendance_records, get_attendance_events,
+    get_attendance_track, get_location_events
+)
 from app.external.unolo_client import UnoloClientError
 from app.middleware.auth import get_any_authenticated_user, get_manager_or_admin
 
@@ -36,3 +42,50 @@ async def get_attendance_endpoint(
         skip=skip
     )
     return AttendanceList(**result)
+
+
+@router.get("/events", response_model=AttendanceEventsResponse)
+async def get_attendance_events_endpoint(
+    user_id: str = Query(..., alias="userID"),
+    events_date: date = Query(..., alias="date", description="Day of the events"),
+    current_user = Depends(get_any_authenticated_user)
+):
+    """
+    Get GPS events, selfies and shifts for one user and day.
+    Not included in the attendance list.
+    """
+    events = await get_attendance_events(user_id, events_date)
+    if not events:
+        raise HTTPException(status_code=404, detail="Attendance events not found")
+    return events
+
+
+@router.get("/track", response_model=AttendanceTrackResponse)
+async def get_attendance_track_endpoint(
+    user_id: str = Query(..., alias="userID"),
+    track_date: date = Query(..., alias="date", description="Day of the track"),
+    current_user = Depends(get_any_authenticated_user)
+):
+    """
+    Get the downsampled location track for one user and day, for map rendering.
+    """
+    track = await get_attendance_track(user_id, track_date)
+    if not track:
+        raise HTTPException(status_code=404, detail="Attendance track not found")
+    return track
+
+
+@router.get("/locations", response_model=LocationEventList)
+async def get_location_events_endpoint(
+    user_id: str = Query(..., alias="userID"),
+    start: datetime = Query(..., description="Start instant (ISO 8601)"),
+    end: datetime = Query(..., description="End instant (ISO 8601)"),
+    limit: int = Query(5000, ge=1, le=20000),
+    current_user = Depends(get_any_authenticated_user)
+):
+    """
+    Get raw GPS events for a user over a time range.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    return await get_location_events(user_id, start, end, limit)
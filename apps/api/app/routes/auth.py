@@ -11,7 +11,7 @@ from app.database import get_database
 from app.schemas.user import Token, UserCreate, User, LoginRequest, ChangePasswordRequest, AdminUserUpdate, UserRole
 from app.services.auth import AuthService
 from app.middleware.auth import get_any_authenticated_user, get_manager_or_admin
-from app.utils.security import verify_password
+from app.utils.security import verify_password_async
 
 router = APIRouter()
 
@@ -116,7 +116,7 @@ async def change_password(
     if not user_db:
         raise HTTPException(status_code=404, detail="User not found")
         
-    if not verify_password(password_data.old_password, user_db.password_hash):
+    if not await verify_password_async(password_data.old_password, user_db.password_hash):
         raise HTTPException(status_code=400, detail="Incorrect old password")
         
     success = await auth_service.update_user_credentials(user_id=user_id, password=password_data.new_password)
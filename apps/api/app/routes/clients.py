@@ -4,30 +4,32 @@ Client Routes
 Handles client management and bulk data migration
 """
 
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status, Query
+from fastapi.responses import StreamingResponse
 
-from app.database import get_database
 from app.models.client import ClientInDB
 from app.schemas.client import (
     Client,
-    ClientMigrationRequest,
     ClientMigrationResponse,
     ClientBase,
 )
 from app.external.unolo_client import get_unolo_client, UnoloClient
-from app.services.client import get_clients
-from app.repository.employee_repository import employee_repository
+from app.services.client import build_client_query, get_clients
+from app.services.export import ExportFormat, export_response
+from app.services.client_import import job_progress, start_client_import
+from app.services.client_migration import iter_json_rows, migrate_client_rows
+from app.repository.import_job_repository import import_job_repository
+from app.utils.csv_stream import csv_lines
+from app.utils.uploads import upload_rows
 
 from app.middleware.auth import get_any_authenticated_user, get_admin_user, get_manager_or_admin
 
 router = APIRouter()
 
-@router.get("/")
-async def list_clients(
+def client_filters(
     # Filters
     client_name: Optional[str] = Query(None, description="Filter by Client Name"),
     visible_to: Optional[str] = Query(None, description="Filter by Visible To"),
@@ -59,20 +61,9 @@ async def list_clients(
     created_at_end: Optional[datetime] = Query(None, description="End date for Created At"),
     last_modified_at_start: Optional[datetime] = Query(None, description="Start date for Last Modified At"),
     last_modified_at_end: Optional[datetime] = Query(None, description="End date for Last Modified At"),
-
-    # Pagination
-    limit: int = Query(100, ge=1, le=1000),
-    skip: int = Query(0, ge=0),
-    
-    # Auth
-    current_user = Depends(get_any_authenticated_user),
-):
-    """
-    Get all clients with optional filters.
-    Returns paginated response with total count.
-    Requires authentication.
-    """
-    filters = {
+) -> Dict[str, Any]:
+    """List filters shared by the client list and export endpoints."""
+    return {
         "client_name": client_name,
         "visible_to": visible_to,
         "contact_name": contact_name,
@@ -102,7 +93,24 @@ async def list_clients(
         "last_modified_at_start": last_modified_at_start,
         "last_modified_at_end": last_modified_at_end,
     }
+
+
+@router.get("/")
+async def list_clients(
+    filters: Dict[str, Any] = Depends(client_filters),
+
+    # Pagination
+    limit: int = Query(100, ge=1, le=1000),
+    skip: int = Query(0, ge=0),
     
+    # Auth
+    current_user = Depends(get_any_authenticated_user),
+):
+    """
+    Get all clients with optional filters.
+    Returns paginated response with total count.
+    Requires authentication.
+    """
     clients, total = await get_clients(filters, limit, skip)
     
     return {
@@ -113,10 +121,33 @@ async def list_clients(
     }
 
 
-@router.post("/", response_model=ClientMigrationResponse)
+@router.get("/export")
+async def export_clients(
+    filters: Dict[str, Any] = Depends(client_filters),
+    file_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv, xlsx or parquet"),
+    current_user = Depends(get_manager_or_admin),
+):
+    """
+    Download every client matching the list filters as CSV, XLSX or Parquet.
+    Streamed from the database, so there is no page size limit.
+    """
+    try:
+        return await export_response("clients", build_client_query(filters), file_format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+
+@router.post(
+    "/",
+    response_model=ClientMigrationResponse,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/x-ndjson": {"schema": {"type": "string", "description": "One client object per line"}},
+        "text/csv": {"schema": {"type": "string", "description": "Header row with the client field names"}},
+        "application/json": {"schema": {"type": "object", "description": '{"clients": [...]}'}},
+    }}},
+)
 async def migrate_clients(
-    request: ClientMigrationRequest,
-    db: AsyncIOMotorDatabase = Depends(get_database),
+    request: Request,
     current_user = Depends(get_admin_user),
 ):
     """
@@ -125,85 +156,71 @@ async def migrate_clients(
     - If ID is present and exists in DB -> Update
     - If ID is not present or doesn't exist -> Insert
     - Populates employee_id based on visible_to field
-    """
-    collection = db["clients"]
-    
-    created_count = 0
-    updated_count = 0
-    errors = []
-    
-    now = datetime.now(timezone.utc)
     
-    for item in request.clients:
+    Large uploads should be sent as NDJSON or CSV, which are read as a stream
+    and written in chunks; a {"clients": [...]} JSON body is still accepted.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip().lower() == "application/json":
         try:
-            client_data = item.model_dump(by_alias=True, exclude_none=True)
-            
-            # Look up employee ID from visible_to field
-            visible_to_value = client_data.get("Visible To (*)")
-            employee_id = None
-            if visible_to_value:
-                employee_id = await employee_repository.get_employee_id_by_name(visible_to_value)
-            
-            # Add employee_id to client data
-            if employee_id:
-                client_data["Employee ID"] = employee_id
-            
-            unolo_id = item.unolo_client_id
-            
-            if unolo_id is not None:
-                existing = await collection.find_one({"unolo_client_id": unolo_id})
-                
-                if existing:
-                    # UPDATE
-                    update_data = {
-                        **client_data,
-                        "unolo_client_id": unolo_id,
-                        "Last Modified At": now, 
-                    }
-                    
-                    if "ID" in update_data:
-                        del update_data["ID"]
-                    
-                    if "Created At" not in update_data and "Created At" in existing:
-                         pass 
-                    
-                    await collection.update_one(
-                        {"unolo_client_id": unolo_id},
-                        {"$set": update_data}
-                    )
-                    updated_count += 1
-                    continue
-            
-            # INSERT
-            insert_data = {
-                **client_data,
-                "unolo_client_id": unolo_id, # Can be None
-                "Created At": client_data.get("Created At", now),
-                "Last Modified At": now,
-            }
-            
-            if "ID" in insert_data:
-                del insert_data["ID"]
-            
-            await collection.insert_one(insert_data)
-            created_count += 1
-            
-        except Exception as e:
-            error_msg = f"Error processing client {item.client_name}: {str(e)}"
-            print(error_msg)
-            errors.append(error_msg)
-    
-    print(f"Migration completed. Total: {len(request.clients)}, Created: {created_count}, Updated: {updated_count}, Errors: {len(errors)}")
-    
-    return ClientMigrationResponse(
-        total_processed=len(request.clients),
-        created_count=created_count,
-        updated_count=updated_count,
-        errors=errors
-    )
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+        if not isinstance(body, dict) or not isinstance(body.get("clients"), list):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Expected {"clients": [...]}')
+        rows = iter_json_rows(body)
+    else:
+        try:
+            rows = upload_rows(content_type, request.stream())
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
 
+    return await migrate_client_rows(rows)
 
 
+@router.post("/imports", status_code=status.HTTP_202_ACCEPTED)
+async def start_import(
+    file: UploadFile = File(..., description="Client spreadsheet (.csv or .xlsx)"),
+    current_user = Depends(get_admin_user),
+):
+    """
+    Start a background client import from a CSV or XLSX file.
 
+    Returns a job id straight away; poll GET /imports/{job_id} for progress
+    and download rejected rows from GET /imports/{job_id}/errors.
+    """
+    try:
+        job_id = await start_client_import(file, current_user.user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    return {"job_id": job_id, "status": "queued"}
 
 
+@router.get("/imports/{job_id}")
+async def get_import(
+    job_id: str,
+    current_user = Depends(get_admin_user),
+):
+    """Progress and counts of a client import job."""
+    job = await import_job_repository.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job_progress(job)
+
+
+@router.get("/imports/{job_id}/errors")
+async def download_import_errors(
+    job_id: str,
+    current_user = Depends(get_admin_user),
+):
+    """Rejected rows of an import job as CSV (row, client, error)."""
+    job = await import_job_repository.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+
+    rows = ([e.get("row"), e.get("client"), e.get("error")] async for e in import_job_repository.iter_errors(job_id))
+    return StreamingResponse(
+        csv_lines(["row", "client", "error"], rows),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="import-{job_id}-errors.csv"'},
+    )
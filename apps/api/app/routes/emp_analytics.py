@@ -1,10 +1,11 @@
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Query, HTTPException
 
-from app.middleware.auth import get_any_authenticated_user
-from app.services.emp_analytics import get_employee_analytics
-from app.schemas.emp_analytics import EmployeeAnalyticsResponse
+from app.middleware.auth import get_any_authenticated_user, get_manager_or_admin
+from app.routes.analytics import get_batch_employee_ids
+from app.services.emp_analytics import get_employee_analytics, get_employees_analytics
+from app.schemas.emp_analytics import EmployeeAnalyticsResponse, EmployeeAnalyticsBatchResponse
 
 router = APIRouter()
 
@@ -43,3 +44,16 @@ async def get_employee_dashboard(
         start_date=start,
         end_date=end
     )
+
+@router.get("/dashboard/batch", response_model=EmployeeAnalyticsBatchResponse)
+async def get_employees_dashboard(
+    start: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: date = Query(..., description="End date (YYYY-MM-DD)"),
+    employee_ids: List[str] = Depends(get_batch_employee_ids),
+    current_user = Depends(get_manager_or_admin)
+):
+    """
+    Dashboard data for several employees in one request, keyed by employee ID.
+    Same figures as /dashboard, from one grouped query for the whole batch.
+    """
+    return {"employees": await get_employees_analytics(employee_ids, start, end)}
@@ -4,10 +4,11 @@ EOD Summary Routes
 from typing import Optional, Dict, Any
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.schemas.unolo import SyncStatsResponse, EodSummaryList
-from app.services.eod_summary import sync_eod_summary, get_eod_summaries
+from app.schemas.unolo import SyncStatsResponse, EodSummaryList, EodTrackResponse
+from app.services.eod_summary import sync_eod_summary, get_eod_summaries, get_eod_track, build_eod_query
+from app.services.export import ExportFormat, export_response
 from app.external.unolo_client import UnoloClientError
 from app.middleware.auth import get_any_authenticated_user, get_manager_or_admin
 
@@ -36,3 +37,38 @@ async def get_eod_summaries_endpoint(
         skip=skip
     )
     return EodSummaryList(**result)
+
+
+@router.get("/export")
+async def export_eod_summaries_endpoint(
+    start: Optional[date] = Query(None, description="Filter by start date"),
+    end: Optional[date] = Query(None, description="Filter by end date"),
+    employee_id: Optional[int] = Query(None, alias="employeeID"),
+    file_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv, xlsx or parquet"),
+    current_user = Depends(get_manager_or_admin)
+):
+    """
+    Download every EOD summary matching the list filters as CSV, XLSX or Parquet.
+    Durations are "HH:MM:SS" text in CSV/XLSX and integer seconds in Parquet.
+    """
+    query = build_eod_query(start, end, employee_id)
+    try:
+        return await export_response("eod_summaries", query, file_format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+
+@router.get("/track", response_model=EodTrackResponse)
+async def get_eod_track_endpoint(
+    employee_id: int = Query(..., alias="employeeID"),
+    track_date: date = Query(..., alias="date", description="Day of the track"),
+    current_user = Depends(get_any_authenticated_user)
+):
+    """
+    Get the route polyline for one employee and day.
+    Not included in the EOD summary list.
+    """
+    track = await get_eod_track(employee_id, track_date)
+    if not track:
+        raise HTTPException(status_code=404, detail="EOD track not found")
+    return track
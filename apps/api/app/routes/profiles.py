@@ -0,0 +1,46 @@
+"""
+Request Profile Routes
+Admin access to profiles captured by the profiling middleware
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse
+
+from app.middleware.auth import get_admin_user
+from app.repository.profile_repository import profile_repository
+from app.schemas.profile import ProfileList, ProfileSummary
+
+router = APIRouter()
+
+
+@router.get("/", response_model=ProfileList)
+async def list_profiles(
+    limit: int = Query(50, ge=1, le=200),
+    path: Optional[str] = Query(None, description="Only paths starting with this prefix"),
+    current_user = Depends(get_admin_user)
+):
+    """
+    List recent request profiles, newest first.
+    Profile a request by sending `X-Profile: 1` with an admin token.
+    """
+    docs = await profile_repository.find_recent(limit, path)
+    data = [ProfileSummary(**doc) for doc in docs]
+    return ProfileList(data=data, total=len(data))
+
+
+@router.get("/{profile_id}")
+async def get_profile_report(
+    profile_id: str,
+    current_user = Depends(get_admin_user)
+):
+    """
+    Get the report of one profile (HTML for pyinstrument, text for cProfile).
+    """
+    doc = await profile_repository.find_by_id(profile_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if doc.get("report_format") == "html":
+        return HTMLResponse(doc.get("report", ""))
+    return PlainTextResponse(doc.get("report", ""))
@@ -130,8 +130,11 @@ async def sync_attendance_endpoint(
 # or import it if I can make it importable.
 # But wait, I can just copy the logic here. It's safe.
 
+import time
 from datetime import datetime, timezone
 from app.schemas.unolo import UnoloClientResponse
+from app.metrics import record_sync
+from app.repository.sync_status_repository import sync_status_repository
 from app.repository.employee_repository import employee_repository
 
 @router.post("/clients", response_model=ClientMigrationResponse)
@@ -155,6 +158,7 @@ async def sync_clients_endpoint(
     errors = []
     
     now = datetime.now(timezone.utc)
+    started = time.perf_counter()
     
     for item_raw in clients_data_raw:
         try:
@@ -242,6 +246,11 @@ async def sync_clients_endpoint(
         except Exception as e:
             error_msg = f"Error syncing client ID {item_raw.get('clientID')}: {str(e)}"
             errors.append(error_msg)
+    
+    sync_stats = {"created": created_count, "updated": updated_count, "errors": errors}
+    duration = time.perf_counter() - started
+    record_sync("clients", sync_stats, duration)
+    await sync_status_repository.record_success("clients", sync_stats, duration)
             
     return ClientMigrationResponse(
         total_processed=len(clients_data_raw),
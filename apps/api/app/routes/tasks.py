@@ -8,7 +8,8 @@ from datetime import date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.schemas.task import TaskSyncResponse, TaskList
-from app.services.task import sync_tasks, get_tasks
+from app.services.task import sync_tasks, get_tasks, build_task_query
+from app.services.export import ExportFormat, export_response
 from app.external.unolo_client import UnoloClientError
 from app.middleware.auth import get_any_authenticated_user, get_manager_or_admin
 
@@ -39,3 +40,22 @@ async def get_tasks_endpoint(
         skip=skip
     )
     return TaskList(**result)
+
+
+@router.get("/export")
+async def export_tasks_endpoint(
+    start: Optional[date] = Query(None, description="Filter by start date"),
+    end: Optional[date] = Query(None, description="Filter by end date"),
+    custom_task_name: Optional[str] = Query(None, alias="customTaskName", description="Filter by task name"),
+    employee_id: Optional[int] = Query(None, alias="employeeID"),
+    file_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv, xlsx or parquet"),
+    current_user = Depends(get_manager_or_admin)
+):
+    """
+    Download every task matching the list filters as CSV, XLSX or Parquet.
+    """
+    query = build_task_query(start, end, custom_task_name, employee_id)
+    try:
+        return await export_response("tasks", query, file_format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
@@ -12,8 +12,13 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.database import get_database
 from app.database import get_database
+from app.repository.client_latest_visit_repository import client_latest_visit_repository
+from app.repository.client_sketch_repository import client_sketch_repository
 from app.schemas.unolo import UnoloClientResponse, UnoloTaskWebhook
+from app.utils.task_metadata import extract_typed_fields
 from app.config import get_settings
+from app.health import webhook_lag
+from app.metrics import WEBHOOK_ITEMS, WEBHOOK_ITEMS_PENDING
 from pydantic import ValidationError
 
 router = APIRouter()
@@ -247,6 +252,9 @@ async def process_task_webhook_data(task_data: Dict[str, Any], db) -> Dict[str,
     
     # Ensure date is stored as needed, usually string YYYY-MM-DD is fine for "date" field
     
+    # Typed, indexable copies of hot metadata fields
+    task_doc.update(extract_typed_fields(item.metadata))
+    
     # Add local timestamps
     task_doc["updated_at_local"] = now
     
@@ -258,6 +266,8 @@ async def process_task_webhook_data(task_data: Dict[str, Any], db) -> Dict[str,
             {"taskID": task_id},
             {"$set": task_doc}
         )
+        await client_latest_visit_repository.record_visit(task_doc)
+        await client_sketch_repository.record_task(task_doc)
         logger.info(f"Webhook: Updated task {task_id}")
         return {"success": True, "action": "updated", "task_id": task_id}
     else:
@@ -270,6 +280,8 @@ async def process_task_webhook_data(task_data: Dict[str, Any], db) -> Dict[str,
         # So we'll rely on Mongo's _id and keep taskID as a field.
         
         await collection.insert_one(task_doc)
+        await client_latest_visit_repository.record_visit(task_doc)
+        await client_sketch_repository.record_task(task_doc)
         logger.info(f"Webhook: Created task {task_id}")
         return {"success": True, "action": "created", "task_id": task_id}
 
@@ -319,9 +331,18 @@ async def receive_client_webhook(
     
     # Handle list of clients
     if isinstance(payload, list):
-        for item in payload:
-            res = await process_client_webhook_data(item, db)
-            results.append(res)
+        pending = WEBHOOK_ITEMS_PENDING.labels(kind="clients")
+        pending.inc(len(payload))
+        try:
+            # Oldest batch still in progress feeds the readiness check
+            with webhook_lag.track():
+                for item in payload:
+                    res = await process_client_webhook_data(item, db)
+                    results.append(res)
+                    pending.dec()
+        finally:
+            # Items left unprocessed by an exception
+            pending.dec(len(payload) - len(results))
     elif isinstance(payload, dict):
         # Handle single client
         res = await process_client_webhook_data(payload, db)
@@ -337,6 +358,9 @@ async def receive_client_webhook(
     failures = [r for r in results if not r["success"]]
     successes = [r for r in results if r["success"]]
     
+    WEBHOOK_ITEMS.labels(kind="clients", outcome="success").inc(len(successes))
+    WEBHOOK_ITEMS.labels(kind="clients", outcome="failure").inc(len(failures))
+    
     if failures:
         logger.warning(f"Client webhook processed with {len(failures)} errors out of {len(results)} items.")
         pass # Return success if at least some processed or to avoid indefinite retries of bad data
@@ -377,9 +401,18 @@ async def receive_task_webhook(
     
     # Handle list of tasks
     if isinstance(payload, list):
-        for item in payload:
-            res = await process_task_webhook_data(item, db)
-            results.append(res)
+        pending = WEBHOOK_ITEMS_PENDING.labels(kind="tasks")
+        pending.inc(len(payload))
+        try:
+            # Oldest batch still in progress feeds the readiness check
+            with webhook_lag.track():
+                for item in payload:
+                    res = await process_task_webhook_data(item, db)
+                    results.append(res)
+                    pending.dec()
+        finally:
+            # Items left unprocessed by an exception
+            pending.dec(len(payload) - len(results))
     elif isinstance(payload, dict):
         # Handle single task
         res = await process_task_webhook_data(payload, db)
@@ -392,6 +425,9 @@ async def receive_task_webhook(
     failures = [r for r in results if not r["success"]]
     successes = [r for r in results if r["success"]]
     
+    WEBHOOK_ITEMS.labels(kind="tasks", outcome="success").inc(len(successes))
+    WEBHOOK_ITEMS.labels(kind="tasks", outcome="failure").inc(len(failures))
+    
     if failures:
         logger.warning(f"Task webhook processed with {len(failures)} errors out of {len(results)} items.")
         # If all failed, return error? Or partial success?
@@ -2,21 +2,17 @@
 Analytics Schemas
 """
 
+from datetime import date, datetime
 from enum import Enum
 from typing import List, Dict, Optional
 from pydantic import BaseModel
 from app.schemas.client import Client
+from app.schemas.task import SchoolCategory
 
 class ClientCategoryFilter(str, Enum):
     SCHOOL = "School"
     DISTRIBUTOR = "Distributor"
 
-class SchoolCategory(str, Enum):
-    HOT = "Hot"
-    COLD = "Cold"
-    WARM = "Warm"
-    NO_INFO = "NoInfo"
-
 class TaskClientCategoryFilter(str, Enum):
     SCHOOLS = "School"
     DISTRIBUTOR = "Distributor"
@@ -81,6 +77,18 @@ class SchoolCategoryResponse(BaseModel):
     no_info: List[ClientWithLatestTask]
     summary: CategorySummary
 
+class TaskAnalyticsBatchResponse(BaseModel):
+    """Response for GET /analytics/tasks/batch"""
+    employees: Dict[str, TaskAnalyticsResponse]  # requested employee ID -> tasks
+
+class AreaWiseTasksBatchResponse(BaseModel):
+    """Response for GET /analytics/tasks/area-wise/batch"""
+    employees: Dict[str, AreaWiseTasksResponse]
+
+class SchoolCategoryBatchResponse(BaseModel):
+    """Response for GET /analytics/tasks/school-category/batch"""
+    employees: Dict[str, SchoolCategoryResponse]
+
 class EmployeeTaskStat(BaseModel):
     employee_id: str
     employee_name: str
@@ -97,3 +105,60 @@ class AdminOverviewResponse(BaseModel):
     total_specimens: int
     tasks_by_employee: List[EmployeeTaskStat]
     schools_by_employee: List[EmployeeSchoolStat]
+
+class NotVisitedClient(BaseModel):
+    client_id: str
+    client_name: Optional[str] = None
+    area: Optional[str] = None
+    employee_id: Optional[str] = None
+    last_task_id: Optional[str] = None
+    last_visit: datetime
+    days_since_visit: int
+    school_category: SchoolCategory
+
+class NotVisitedClientsResponse(BaseModel):
+    """Response for GET /analytics/tasks/not-visited"""
+    days: int
+    data: List[NotVisitedClient]
+    total: int
+
+class UniqueClientsResponse(BaseModel):
+    """Response for GET /analytics/tasks/unique-clients"""
+    total_unique_clients: int
+    areas: Dict[str, int]  # area -> unique clients visited
+    approximate: bool
+    # Relative standard error of approximate counts (~95% are within twice this)
+    relative_error: Optional[float] = None
+
+class TrendInterval(str, Enum):
+    DAY = "day"
+    WEEK = "week"      # Monday-based
+    MONTH = "month"
+
+class TrendTotals(BaseModel):
+    tasks: int
+    hot_schools: int  # clients whose latest visit in the bucket was Hot
+    specimens: int
+    distance_km: float  # over present working days
+    present_days: int
+    working_days: int  # Mon-Sat days of the bucket inside the period
+    # present_days / (working_days * employees with EOD summaries)
+    attendance_percentage: float
+
+class TrendPoint(TrendTotals):
+    period_start: date  # first day of the bucket (IST)
+
+class TrendPeriod(BaseModel):
+    start_date: date
+    end_date: date
+    totals: TrendTotals
+    series: List[TrendPoint]
+
+class TrendsResponse(BaseModel):
+    """Response for GET /analytics/trends"""
+    interval: TrendInterval
+    employee_id: Optional[str] = None  # None: whole team
+    current: TrendPeriod
+    previous: Optional[TrendPeriod] = None  # equally long period right before, when compare=true
+    # Percent change of each current total vs previous (None when previous is 0)
+    change: Optional[Dict[str, Optional[float]]] = None
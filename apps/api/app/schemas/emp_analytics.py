@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 from datetime import date
 
@@ -36,3 +36,7 @@ class EmployeeAnalyticsResponse(BaseModel):
     
     # Daily Breakdown
     daily_breakdown: List[DailyAnalytics]
+
+class EmployeeAnalyticsBatchResponse(BaseModel):
+    """Response for GET /emp-analytics/dashboard/batch"""
+    employees: Dict[str, EmployeeAnalyticsResponse]  # requested employee ID -> dashboard
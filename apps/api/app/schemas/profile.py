@@ -0,0 +1,31 @@
+"""
+Request Profile Schemas
+"""
+
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class ProfileSummary(BaseModel):
+    """A stored request profile, without its report."""
+    id: str = Field(..., alias="_id")
+    created_at: datetime
+    method: str
+    path: str
+    query_string: Optional[str] = None
+    user: Optional[str] = None
+    status_code: Optional[int] = None
+    duration_ms: float
+    db_commands: int = 0
+    db_time_ms: float = 0.0
+    profiler: str
+    report_format: str
+
+    class Config:
+        populate_by_name = True
+
+
+class ProfileList(BaseModel):
+    data: List[ProfileSummary]
+    total: int
@@ -4,10 +4,19 @@ Pydantic models for Task entities from Unolo API
 """
 
 from datetime import datetime, date
+from enum import Enum
 from typing import Optional, List, Dict, Any, Union
 
 from pydantic import BaseModel, Field
 
+
+class SchoolCategory(str, Enum):
+    HOT = "Hot"
+    COLD = "Cold"
+    WARM = "Warm"
+    NO_INFO = "NoInfo"
+
+
 class TaskBase(BaseModel):
     """Base Task model with common fields."""
     task_id: str = Field(..., alias="taskID", description="Unique Task ID")
@@ -31,8 +40,13 @@ class TaskBase(BaseModel):
     last_modified_by_name: Optional[str] = Field(None, alias="lastModifiedByName")
     metadata: Optional[Dict[str, Any]] = Field(None, alias="metadata")
 
+    # Typed copies of hot metadata fields, extracted at ingest
+    specimens_given: Optional[int] = None
+    school_category: Optional[SchoolCategory] = None
+
     class Config:
         populate_by_name = True
+        use_enum_values = True
 
 
 class TaskCreate(TaskBase):
@@ -1,4 +1,5 @@
 from typing import List, Optional, Any, Dict, Union
+from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
 
 class UnoloVisibility(BaseModel):
@@ -239,6 +240,67 @@ class AttendanceList(BaseModel):
     skip: int
 
 
+class EodTrackResponse(BaseModel):
+    """Route polyline of one employee's day, served apart from the EOD summary."""
+    employee_id: int = Field(..., alias="employeeID")
+    date: str
+    rk_polyline: Optional[str] = Field(None, alias="rkPolyline")
+
+    class Config:
+        populate_by_name = True
+
+
+class AttendanceEventsResponse(BaseModel):
+    """GPS events, selfies and shifts of one user's day, served apart from attendance."""
+    user_id: str = Field(..., alias="userID")
+    date: str
+    shifts: List[AttendanceShift] = []
+    stretched_shifts: List[AttendanceShift] = Field(default=[], alias="stretchedShifts")
+    attendance_events: Dict[str, List[AttendanceEvent]] = Field(default={}, alias="attendanceEvents")
+    attendance_in_selfies: List[Any] = Field(default=[], alias="attendanceInSelfies")
+    attendance_out_selfies: List[Any] = Field(default=[], alias="attendanceOutSelfies")
+
+    class Config:
+        populate_by_name = True
+
+
+class TrackPoint(BaseModel):
+    lat: float
+    lon: float
+    timestamp: datetime
+
+
+class AttendanceTrackResponse(BaseModel):
+    """Downsampled location track of one user's day, for map rendering."""
+    user_id: str = Field(..., alias="userID")
+    date: str
+    points: List[TrackPoint] = []
+
+    class Config:
+        populate_by_name = True
+
+
+class LocationEventResponse(BaseModel):
+    """One GPS event from the location_events time-series collection."""
+    timestamp: datetime
+    user_id: str = Field(..., alias="userID")
+    employee_id: Optional[int] = Field(None, alias="employeeID")
+    event_type_id: Optional[int] = Field(None, alias="eventTypeID")
+    lat: float
+    lon: float
+    accuracy: Optional[float] = None
+    speed: Optional[float] = None
+    bearing: Optional[float] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class LocationEventList(BaseModel):
+    data: List[LocationEventResponse]
+    total: int
+
+
 class UnoloTaskWebhook(BaseModel):
     """Schema for Task Webhook payload from Unolo."""
     task_id: str = Field(..., alias="taskID")
@@ -1,9 +1,10 @@
 from datetime import date, timedelta
 from typing import List
+from app.columnar import columnar_engine
 from app.repository.emp_analytics_repository import emp_analytics_repository
 from app.schemas.all_emp_analytics import AllEmployeesOverviewResponse, EmployeeSummary
 from app.services.employee import get_all_employees
-from app.services.emp_analytics import get_working_days, parse_break_time
+from app.services.emp_analytics import get_working_days
 
 async def get_all_employees_overview(
     start_date: date,
@@ -23,9 +24,14 @@ async def get_all_employees_overview(
     grand_total_distance = 0.0
     total_attendance_sum = 0.0
     
-    # 3. Iterate employees and calculate stats
-    # Optimization note: In a real-world high-scale app, we would do a single aggregated DB query.
-    # For now, looping is acceptable given the definition of get_employee_eod_data.
+    # 3. Present-day totals for every employee in a single grouped pipeline
+    engine = columnar_engine()
+    if engine and engine.covers(end_date):
+        totals_by_employee = await engine.run(engine.present_totals_by_employee, start_date, end_date)
+    else:
+        totals_by_employee = await emp_analytics_repository.aggregate_present_totals_by_employee(
+            start_date, end_date
+        )
     
     for emp in all_employees:
         emp_id = str(emp.get('employeeID', ''))
@@ -40,40 +46,15 @@ async def get_all_employees_overview(
         if not emp_id:
             continue
             
-        # Fetch EOD data
-        eod_data = await emp_analytics_repository.get_employee_eod_data(emp_id, start_date, end_date)
-        
-        total_present = 0
-        emp_tasks = 0
-        emp_distance = 0.0
-        emp_total_breaks = 0
-        emp_break_time = 0
-        
-        # We need to map data to check against working days properly, 
-        # or just iterate eod_data if we trust it only contains relevant records.
-        # However, to calculate attendance %, we need valid working days.
-        
-        # Quick map for O(1) lookup
-        data_map = {item.date: item for item in eod_data}
-        
-        for day in working_days:
-            day_str = day.strftime("%Y-%m-%d")
-            record = data_map.get(day_str)
-            
-            if record:
-                # Presence logic matches emp_analytics service
-                if record.attendance_result_code in [0, 1, 6]:
-                    total_present += 1
-                    
-                    # Add metrics
-                    emp_tasks += (record.admin_completed_tasks or 0) + (record.self_completed_tasks or 0)
-                    emp_distance += (record.distance or 0.0)
-                    emp_total_breaks += (record.num_breaks or 0)
-                    emp_break_time += parse_break_time(record.total_break_time)
+        totals = totals_by_employee.get(emp_id, {})
+        total_present = totals.get("present_days", 0)
+        emp_tasks = totals.get("total_tasks", 0)
+        emp_distance = totals.get("total_distance", 0.0)
+        emp_total_breaks = totals.get("total_breaks", 0)
+        avg_break = totals.get("avg_break_minutes") or 0.0
         
         # Metrics Calculation
         att_pct = (total_present / total_working_days * 100) if total_working_days > 0 else 0.0
-        avg_break = (emp_break_time / total_present) if total_present > 0 else 0.0
         
         summary = EmployeeSummary(
             employee_id=emp_id,
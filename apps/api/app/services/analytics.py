@@ -2,10 +2,14 @@
 Analytics Service
 """
 
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional, Tuple, List, Dict
+from app.columnar import columnar_engine
 from app.repository.client_repository import client_repository
 from app.repository.task_repository import task_repository
+from app.repository.client_latest_visit_repository import client_latest_visit_repository
+from app.repository.client_sketch_repository import UNASSIGNED_AREA, client_sketch_repository
+from app.repository.trends_repository import TRENDS_ZONE, trends_repository
 from app.schemas.client import Client
 from app.schemas.task import Task
 from app.schemas.analytics import (
@@ -16,9 +20,15 @@ from app.schemas.analytics import (
     AreaWiseTasksResponse,
     SchoolCategoryResponse,
     CategorySummary,
-    AdminOverviewResponse
+    AdminOverviewResponse,
+    NotVisitedClientsResponse,
+    UniqueClientsResponse,
+    TrendInterval,
+    TrendsResponse
 )
-from app.services.employee import get_all_employees
+from app.services.employee import get_all_employees, resolve_employees
+from app.config import get_settings
+from app.utils import hyperloglog
 
 # Mapping ENUMs to actual DB field names
 CLIENT_CATEGORY_FIELD = "Client Catagory (*)"
@@ -116,7 +126,9 @@ async def get_all_tasks_for_employee(
         end_date=end_date,
         client_category=category_val
     )
-    
+    return _tasks_response(tasks)
+
+def _tasks_response(tasks: List[Task]) -> TaskAnalyticsResponse:
     # Handle missing clients
     for task in tasks:
         if not task.client and task.client_id:
@@ -152,6 +164,19 @@ async def get_area_wise_tasks_with_clients(
         client_category=category_val
     )
     
+    # Aggregation for total clients in area
+    _, _, _ = await get_clients_grouped(resolved_id, GroupByField.AREA_WISE, None)
+    
+    grouped_clients, _, _ = await client_repository.aggregate_clients_grouped(
+        employee_id=resolved_id,
+        group_field=GROUP_FIELD_MAPPING[GroupByField.AREA_WISE],
+        client_category=None 
+    )
+    clients_in_area = {area: len(clients) for area, clients in grouped_clients.items()}
+
+    return _area_wise_response(area_stats, clients_in_area)
+
+def _area_wise_response(area_stats: Dict[str, Dict], clients_in_area: Dict[str, int]) -> AreaWiseTasksResponse:
     # Handle missing areas/clients
     if None in area_stats:
         area_stats["Unknown Area"] = area_stats.pop(None)
@@ -167,22 +192,9 @@ async def get_area_wise_tasks_with_clients(
         for s in area_stats.values()
     )
     
-    # Aggregation for total clients in area
-    _, _, _ = await get_clients_grouped(resolved_id, GroupByField.AREA_WISE, None)
-    
-    grouped_clients, _, _ = await client_repository.aggregate_clients_grouped(
-        employee_id=resolved_id,
-        group_field=GROUP_FIELD_MAPPING[GroupByField.AREA_WISE],
-        client_category=None 
-    )
-    
     # Update area_stats with total_clients_in_area
     for area, stats in area_stats.items():
-        total_in_area = 0
-        if area in grouped_clients:
-            total_in_area = len(grouped_clients[area])
-            
-        stats["total_clients_in_area"] = total_in_area
+        stats["total_clients_in_area"] = clients_in_area.get(area, 0)
         
     return {
         "areas": area_stats,
@@ -207,7 +219,9 @@ async def get_clients_by_school_category(
         end_date=end_date,
         client_category=category_val
     )
-    
+    return _school_category_response(results)
+
+def _school_category_response(results: Dict[str, List[Dict]]) -> SchoolCategoryResponse:
     # Ensure missing client tasks land in NoInfo or handled
     # The aggregation might already put them in NoInfo if category is missing
     # We can check specific buckets if needed, but assuming aggregation handles null category -> NoInfo
@@ -232,6 +246,118 @@ async def get_clients_by_school_category(
         }
     }
 
+# --- Batch variants: one request and one grouped query for several employees ---
+# Requested IDs (empID or employeeID) are resolved from the synced employees
+# collection in one query; tasks are then matched on the Unolo employeeID with $in.
+
+async def get_all_tasks_for_employees(
+    employee_ids: List[str],
+    start_date: date,
+    end_date: date,
+    client_category: Optional[TaskClientCategoryFilter] = None
+) -> Dict[str, TaskAnalyticsResponse]:
+    """
+    API 1 for several employees, keyed by the requested IDs.
+    """
+    resolved = await resolve_employees(employee_ids)
+    by_employee = await task_repository.find_tasks_by_employees_with_client_filter(
+        employee_ids=sorted({r["employee_id"] for r in resolved.values()}),
+        start_date=start_date,
+        end_date=end_date,
+        client_category=client_category.value if client_category else None
+    )
+    return {
+        requested: _tasks_response(by_employee.get(employee["employee_id"], []))
+        for requested, employee in resolved.items()
+    }
+
+async def get_area_wise_tasks_for_employees(
+    employee_ids: List[str],
+    start_date: date,
+    end_date: date,
+    client_category: Optional[TaskClientCategoryFilter] = None
+) -> Dict[str, AreaWiseTasksResponse]:
+    """
+    API 2 for several employees, keyed by the requested IDs.
+    """
+    resolved = await resolve_employees(employee_ids)
+    by_employee = await task_repository.aggregate_tasks_area_wise_by_employees(
+        employee_ids=sorted({r["employee_id"] for r in resolved.values()}),
+        start_date=start_date,
+        end_date=end_date,
+        client_category=client_category.value if client_category else None
+    )
+    clients_in_area = await client_repository.count_clients_by_employees(
+        sorted({r["emp_id"] for r in resolved.values()}),
+        GROUP_FIELD_MAPPING[GroupByField.AREA_WISE]
+    )
+    return {
+        requested: _area_wise_response(
+            by_employee.get(employee["employee_id"], {}),
+            clients_in_area.get(employee["emp_id"], {})
+        )
+        for requested, employee in resolved.items()
+    }
+
+async def get_clients_by_school_category_for_employees(
+    employee_ids: List[str],
+    start_date: date,
+    end_date: date,
+    client_category: Optional[TaskClientCategoryFilter] = None
+) -> Dict[str, SchoolCategoryResponse]:
+    """
+    API 3 for several employees, keyed by the requested IDs.
+    """
+    resolved = await resolve_employees(employee_ids)
+    by_employee = await task_repository.get_latest_tasks_grouped_by_school_category_for_employees(
+        employee_ids=sorted({r["employee_id"] for r in resolved.values()}),
+        start_date=start_date,
+        end_date=end_date,
+        client_category=client_category.value if client_category else None
+    )
+    empty = {"Hot": [], "Cold": [], "Warm": [], "NoInfo": []}
+    return {
+        requested: _school_category_response(by_employee.get(employee["employee_id"], empty))
+        for requested, employee in resolved.items()
+    }
+
+async def get_clients_not_visited(
+    days: int,
+    employee_id: Optional[str] = None,
+    limit: int = 1000
+) -> NotVisitedClientsResponse:
+    """
+    Get clients whose latest visit is older than `days` days, oldest first.
+    Served from the client_latest_visit view.
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=days)
+
+    visits = await client_latest_visit_repository.find_not_visited_since(
+        cutoff, employee_id=employee_id, limit=limit
+    )
+    client_map = await client_repository.find_by_unolo_ids([v["client_id"] for v in visits])
+
+    data = []
+    for visit in visits:
+        client = client_map.get(visit["client_id"], {})
+        last_visit = visit["checkin_time"]
+        if last_visit.tzinfo is None:
+            last_visit = last_visit.replace(tzinfo=timezone.utc)
+
+        data.append({
+            "client_id": visit["client_id"],
+            "client_name": client.get("Client Name (*)"),
+            "area": client.get("Division Name new (*)"),
+            "employee_id": visit.get("employee_id"),
+            "last_task_id": visit.get("task_id"),
+            "last_visit": last_visit,
+            "days_since_visit": (now - last_visit).days,
+            "school_category": visit.get("school_category", "NoInfo"),
+        })
+
+    return {"days": days, "data": data, "total": len(data)}
+
 async def get_admin_dashboard_overview(
     start_date: date,
     end_date: date
@@ -239,31 +365,27 @@ async def get_admin_dashboard_overview(
     """
     Get admin dashboard overview with aggregated stats and per-employee breakdowns.
     """
-    # 1. Fetch all tasks in date range for total counts and specimen calc
-    all_tasks = await task_repository.find_all_tasks_in_date_range(start_date, end_date)
-    
-    total_tasks = len(all_tasks)
-    
-    # Calculate total specimens
-    total_specimens = 0
-    for task in all_tasks:
-        if task.metadata:
-            # metadata is a dict, use .get()
-            specimens = task.metadata.get("specimensGiven")
-            if specimens:
-                try:
-                    val = int(specimens)
-                    total_specimens += val
-                except (ValueError, TypeError):
-                    pass
-
-    # 2. Fetch Aggregated Task Counts by Employee
-    task_counts = await task_repository.aggregate_tasks_by_employee(start_date, end_date)
+    engine = columnar_engine()
+    if engine and engine.covers(end_date):
+        # Closed range: all three come from one pass over the columnar snapshot
+        overview = await engine.run(engine.overview, start_date, end_date)
+        totals = overview["totals"]
+        task_counts = overview["tasks_by_employee"]
+        hot_school_counts = overview["hot_schools_by_employee"]
+    else:
+        # 1. Total task count and specimens (typed specimens_given summed in DB)
+        totals = await task_repository.summarize_tasks_in_date_range(start_date, end_date)
+        # 2. Fetch Aggregated Task Counts by Employee
+        task_counts = await task_repository.aggregate_tasks_by_employee(start_date, end_date)
+        # 3. Fetch Hot Schools Counts by Employee
+        hot_school_counts = await task_repository.get_hot_schools_by_employee(start_date, end_date)
+
+    total_tasks = totals["total_tasks"]
+    total_specimens = totals["total_specimens"]
+
     # Map to dict for easy lookup
     task_map = {item["_id"]: item["count"] for item in task_counts if item["_id"]}
     
-    # 3. Fetch Hot Schools Counts by Employee
-    hot_school_counts = await task_repository.get_hot_schools_by_employee(start_date, end_date)
     # Map to dict
     hot_school_map = {item["_id"]: item["count"] for item in hot_school_counts if item["_id"]}
     
@@ -335,3 +457,154 @@ async def get_admin_tasks_drilldown(
         total=len(data),
         data=data
     )
+
+async def get_unique_clients(
+    start_date: date,
+    end_date: date,
+    employee_id: Optional[str] = None,
+    approximate: bool = False
+) -> UniqueClientsResponse:
+    """
+    Count distinct clients visited in the range, in total and per area.
+
+    Exact counts group the range's tasks. With `approximate`, ranges longer
+    than unique_clients_exact_max_days merge the per-day HyperLogLog sketches
+    instead (relative standard error hyperloglog.RELATIVE_ERROR); areas are
+    then the client's area when each task was ingested.
+    """
+    days = (end_date - start_date).days + 1
+    if not approximate or days <= get_settings().unique_clients_exact_max_days:
+        client_ids = await task_repository.distinct_clients_in_range(start_date, end_date, employee_id)
+        client_map = await client_repository.find_by_unolo_ids(client_ids)
+        areas: Dict[str, int] = {}
+        for cid in client_ids:
+            area = client_map.get(cid, {}).get("Division Name new (*)") or UNASSIGNED_AREA
+            areas[area] = areas.get(area, 0) + 1
+        return UniqueClientsResponse(total_unique_clients=len(client_ids), areas=areas, approximate=False)
+
+    sketches = await client_sketch_repository.find_sketches(start_date, end_date, employee_id)
+    by_area: Dict[str, List[Dict[str, int]]] = {}
+    for sketch in sketches:
+        by_area.setdefault(sketch["area"], []).append(sketch["registers"])
+
+    return UniqueClientsResponse(
+        total_unique_clients=hyperloglog.estimate(hyperloglog.merge(s["registers"] for s in sketches)),
+        areas={area: hyperloglog.estimate(hyperloglog.merge(registers)) for area, registers in by_area.items()},
+        approximate=True,
+        relative_error=round(hyperloglog.RELATIVE_ERROR, 4)
+    )
+
+# Totals compared period over period in the trends response
+TREND_METRICS = ["tasks", "hot_schools", "specimens", "distance_km", "present_days", "attendance_percentage"]
+
+
+def _bucket_start(day: date, interval: TrendInterval) -> date:
+    if interval == TrendInterval.WEEK:
+        return day - timedelta(days=day.weekday())
+    if interval == TrendInterval.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, interval: TrendInterval) -> date:
+    if interval == TrendInterval.WEEK:
+        return start + timedelta(days=7)
+    if interval == TrendInterval.MONTH:
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _working_days(start: date, end: date) -> int:
+    """Mon-Sat days in [start, end]."""
+    days = (end - start).days + 1
+    if days <= 0:
+        return 0
+    sundays = (days + start.weekday()) // 7
+    return days - sundays
+
+
+def _trend_values(row: Dict, hot: int, employees: int, working_days: int) -> Dict:
+    present_days = row.get("present_days", 0)
+    capacity = working_days * employees
+    return {
+        "tasks": row.get("tasks", 0),
+        "hot_schools": hot,
+        "specimens": row.get("specimens", 0),
+        "distance_km": round(row.get("distance", 0.0), 2),
+        "present_days": present_days,
+        "working_days": working_days,
+        "attendance_percentage": round(present_days / capacity * 100, 1) if capacity else 0.0,
+    }
+
+
+def _trend_period(result: Dict, period: str, start_date: date, end_date: date, interval: TrendInterval) -> Dict:
+    """Zero-filled series and totals of one period from the aggregate_trends result."""
+    def local_day(bucket: datetime) -> date:
+        return bucket.replace(tzinfo=timezone.utc).astimezone(TRENDS_ZONE).date()
+
+    rows = {local_day(r["_id"]["bucket"]): r for r in result["buckets"] if r["_id"]["period"] == period}
+    hot = {local_day(r["_id"]["bucket"]): r["count"] for r in result["hot_buckets"] if r["_id"]["period"] == period}
+
+    series = []
+    bucket = _bucket_start(start_date, interval)
+    while bucket <= end_date:
+        next_bucket = _next_bucket(bucket, interval)
+        row = rows.get(bucket, {})
+        working_days = _working_days(max(bucket, start_date), min(next_bucket - timedelta(days=1), end_date))
+        series.append({
+            "period_start": bucket,
+            **_trend_values(row, hot.get(bucket, 0), row.get("employees", 0), working_days),
+        })
+        bucket = next_bucket
+
+    totals_row = {
+        key: sum(row.get(key, 0) for row in rows.values())
+        for key in ("tasks", "specimens", "present_days", "distance")
+    }
+    employees = next((r["employees"] for r in result["periods"] if r["_id"] == period), 0)
+    hot_total = next((r["count"] for r in result["hot_periods"] if r["_id"] == period), 0)
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "totals": _trend_values(totals_row, hot_total, employees, _working_days(start_date, end_date)),
+        "series": series,
+    }
+
+
+async def get_trends(
+    start_date: date,
+    end_date: date,
+    interval: TrendInterval,
+    employee_id: Optional[str] = None,
+    compare: bool = False
+) -> TrendsResponse:
+    """
+    Daily, weekly or monthly series of tasks, hot schools, specimens, distance
+    and attendance for one employee or the whole team, bucketed by IST day.
+
+    With `compare`, the equally long period ending the day before start_date
+    is computed in the same aggregation and the totals are compared.
+    """
+    previous_end = start_date - timedelta(days=1)
+    previous_start = previous_end - (end_date - start_date) if compare else None
+
+    result = await trends_repository.aggregate_trends(
+        start_date, end_date, interval.value, employee_id, previous_start
+    )
+
+    current = _trend_period(result, "current", start_date, end_date, interval)
+    previous = change = None
+    if compare:
+        previous = _trend_period(result, "previous", previous_start, previous_end, interval)
+        change = {}
+        for metric in TREND_METRICS:
+            before, now = previous["totals"][metric], current["totals"][metric]
+            change[metric] = round((now - before) / before * 100, 1) if before else None
+
+    return TrendsResponse(
+        interval=interval,
+        employee_id=employee_id,
+        current=current,
+        previous=previous,
+        change=change
+    )
@@ -2,12 +2,20 @@
 Attendance Service
 """
 import logging
+import time
 from typing import List, Dict, Any, Optional
-from datetime import date
+from datetime import date, datetime
 
 from app.external.unolo_client import UnoloClient
-from app.schemas.unolo import UnoloAttendanceResponse, SyncStatsResponse, AttendanceList
+from app.schemas.unolo import (
+    UnoloAttendanceResponse, SyncStatsResponse, AttendanceList, AttendanceEventsResponse,
+    AttendanceTrackResponse, LocationEventResponse, LocationEventList
+)
 from app.repository.attendance_repository import attendance_repository
+from app.repository.attendance_event_repository import attendance_event_repository
+from app.repository.location_event_repository import location_event_repository
+from app.metrics import record_sync
+from app.repository.sync_status_repository import sync_status_repository
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +28,7 @@ async def sync_attendance(
     """
     client = UnoloClient()
     stats = {"total_fetched": 0, "created": 0, "updated": 0, "errors": 0}
+    started = time.perf_counter()
     
     try:
         start_str = start_date.strftime("%Y-%m-%d")
@@ -67,6 +76,9 @@ async def sync_attendance(
                 logger.error(f"Error processing Attendance for {item.get('userID', 'unknown')}: {e}")
                 stats["errors"] += 1
                 
+        duration = time.perf_counter() - started
+        record_sync("attendance", stats, duration)
+        await sync_status_repository.record_success("attendance", stats, duration)
         logger.info(f"Attendance sync completed: {stats}")
         return SyncStatsResponse(**stats)
         
@@ -108,3 +120,44 @@ async def get_attendance_records(
         "limit": limit,
         "skip": skip
     }
+
+
+async def get_attendance_events(user_id: str, events_date: date) -> Optional[AttendanceEventsResponse]:
+    """
+    Get GPS events, selfies and shifts for one user and day.
+    """
+    doc = await attendance_event_repository.find_one(user_id, events_date.strftime("%Y-%m-%d"))
+    if not doc:
+        return None
+    return AttendanceEventsResponse(**doc)
+
+
+async def get_attendance_track(user_id: str, track_date: date) -> Optional[AttendanceTrackResponse]:
+    """
+    Get the downsampled location track for one user and day.
+    """
+    doc = await attendance_event_repository.find_track(user_id, track_date.strftime("%Y-%m-%d"))
+    if not doc:
+        return None
+    return AttendanceTrackResponse(**{**doc, "points": doc.get("points") or []})
+
+
+async def get_location_events(
+    user_id: str,
+    start: datetime,
+    end: datetime,
+    limit: int = 5000
+) -> LocationEventList:
+    """
+    Get raw GPS events for a user between two instants.
+    """
+    docs = await location_event_repository.find_in_range(user_id, start, end, limit)
+    data = [
+        LocationEventResponse(
+            **{k: v for k, v in doc.items() if k != "employee"},
+            userID=doc["employee"]["userID"],
+            employeeID=doc["employee"].get("employeeID")
+        )
+        for doc in docs
+    ]
+    return LocationEventList(data=data, total=len(data))
@@ -10,7 +10,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.models.user import UserInDB
 from app.schemas.user import User, UserCreate, Token
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.utils.security import hash_password_async, verify_password_async, create_access_token, revoke_user_tokens
 
 
 class AuthService:
@@ -62,7 +62,7 @@ class AuthService:
         
         user_doc = {
             "email": user_data.email.lower(),
-            "password_hash": hash_password(user_data.password),
+            "password_hash": await hash_password_async(user_data.password),
             "full_name": user_data.full_name,
             "role": user_data.role.value,
             "is_active": user_data.is_active,
@@ -101,7 +101,7 @@ class AuthService:
         if not user.is_active:
             return None
         
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
         
         # Create access token
@@ -163,7 +163,7 @@ class AuthService:
             update_data["email"] = email.lower()
             
         if password:
-            update_data["password_hash"] = hash_password(password)
+            update_data["password_hash"] = await hash_password_async(password)
             
         if role:
             update_data["role"] = role
@@ -175,5 +175,9 @@ class AuthService:
             {"_id": ObjectId(user_id)},
             {"$set": update_data}
         )
+
+        # Tokens carry the old email/role (or outlive the old password); revoke them in every worker
+        if result.modified_count > 0 and (email or password or role):
+            await revoke_user_tokens(user_id)
         
         return result.modified_count > 0
@@ -34,16 +34,8 @@ FIELD_MAPPING = {
     "to_delete": "To Delete"
 }
 
-async def get_clients(
-    # db: AsyncIOMotorDatabase, # DB dependency removed
-    filters: Dict[str, Any],
-    limit: int = 100,
-    skip: int = 0
-) -> Tuple[List[Client], int]:
-    """
-    Retrieve clients with filters.
-    Returns tuple of (clients list, total count).
-    """
+def build_client_query(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Mongo query for the client list filters (shared by list and export)."""
     query = {}
     
     # Process standard fields
@@ -76,6 +68,20 @@ async def get_clients(
             date_query["$lte"] = modified_end
         query["Last Modified At"] = date_query
 
+    return query
+
+
+async def get_clients(
+    # db: AsyncIOMotorDatabase, # DB dependency removed
+    filters: Dict[str, Any],
+    limit: int = 100,
+    skip: int = 0
+) -> Tuple[List[Client], int]:
+    """
+    Retrieve clients with filters.
+    Returns tuple of (clients list, total count).
+    """
+    query = build_client_query(filters)
+
     # Use Repository
     return await client_repository.find_with_filters(query, skip, limit)
-
@@ -0,0 +1,214 @@
+"""
+Client Import Jobs
+Background CSV/XLSX client imports with progress polling and an error report
+
+The upload is spooled to a temporary file and the request returns a job id
+straight away. A background task then reads the file a chunk at a time in a
+thread (csv.reader, or openpyxl's read-only streaming workbook), validates and
+writes each chunk through client_migration.migrate_chunk, and updates the job
+document after every chunk. Rejected rows go to import_job_errors for the
+downloadable report.
+
+Jobs run in the worker that received the upload; a job whose worker stops
+stays "running" with a stale updated_at.
+"""
+
+import asyncio
+import csv
+import logging
+import os
+import tempfile
+from datetime import date, datetime, timezone
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+
+from fastapi import UploadFile
+
+from app.repository.employee_repository import employee_repository
+from app.repository.import_job_repository import import_job_repository
+from app.services.client_migration import CHUNK_SIZE, EmployeeNameIndex, migrate_chunk
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - openpyxl is in requirements
+    openpyxl = None
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_READ_BYTES = 1024 * 1024
+# Imports running at once in one worker; later uploads wait as "queued"
+MAX_CONCURRENT_IMPORTS = 2
+
+FORMATS = {".csv": "csv", ".xlsx": "xlsx"}
+
+_running: Set[asyncio.Task] = set()
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def detect_format(filename: str) -> str:
+    """csv or xlsx from the file extension; ValueError for anything else."""
+    file_format = FORMATS.get(os.path.splitext(filename or "")[1].lower())
+    if file_format is None:
+        raise ValueError("Upload a .csv or .xlsx file")
+    if file_format == "xlsx" and openpyxl is None:
+        raise ValueError("XLSX uploads need openpyxl installed")
+    return file_format
+
+
+async def save_upload(upload: UploadFile, suffix: str) -> str:
+    """Copy an upload to a temporary file in 1 MB reads; returns its path."""
+    loop = asyncio.get_running_loop()
+    fd, path = tempfile.mkstemp(prefix="client-import-", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                data = await upload.read(UPLOAD_READ_BYTES)
+                if not data:
+                    break
+                await loop.run_in_executor(None, f.write, data)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _record(header: List[str], values: Any) -> Dict[str, Any]:
+    return {h: v for h, v in zip(header, values) if h and v is not None and v != ""}
+
+
+def _csv_rows(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader, [])]
+        row = 0
+        for values in reader:
+            if not any(values):
+                continue
+            row += 1
+            yield row, _record(header, values)
+
+
+def _cell_text(value: Any) -> Any:
+    """Spreadsheet cells as the text a CSV export would hold."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        # The format ClientBase parses for Created At / Last Modified At
+        return value.strftime("%d-%m-%Y %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def _xlsx_rows(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        row = 0
+        for values in rows:
+            if not any(v is not None and v != "" for v in values):
+                continue
+            row += 1
+            yield row, _record(header, (_cell_text(v) for v in values))
+    finally:
+        workbook.close()
+
+
+def count_rows(path: str, file_format: str) -> Optional[int]:
+    """Data rows in the file, for progress; approximate for CSV with multi-line cells."""
+    if file_format == "xlsx":
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        try:
+            max_row = workbook.worksheets[0].max_row
+        finally:
+            workbook.close()
+        return max(max_row - 1, 0) if max_row else None
+    lines = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(UPLOAD_READ_BYTES), b""):
+            lines += block.count(b"\n")
+    return max(lines - 1, 0)
+
+
+async def _batches_in_thread(rows: Iterator[Any], size: int) -> AsyncIterator[List[Any]]:
+    """Pull `size` items at a time from a blocking iterator on the default executor."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = await loop.run_in_executor(None, lambda: list(islice(rows, size)))
+        if not batch:
+            return
+        yield batch
+
+
+async def run_client_import(job_id: str, path: str, file_format: str) -> None:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(MAX_CONCURRENT_IMPORTS)
+    loop = asyncio.get_running_loop()
+    try:
+        async with _slots:
+            total = await loop.run_in_executor(None, count_rows, path, file_format)
+            await import_job_repository.update(job_id, status="running", total_rows=total)
+
+            names = EmployeeNameIndex(await employee_repository.find_names())
+            now = datetime.now(timezone.utc)
+            rows = _xlsx_rows(path) if file_format == "xlsx" else _csv_rows(path)
+            async for chunk in _batches_in_thread(rows, CHUNK_SIZE):
+                result = await migrate_chunk(chunk, names, now)
+                await import_job_repository.record_chunk(
+                    job_id, len(chunk), result["created_count"], result["updated_count"], result["errors"]
+                )
+        await import_job_repository.finish(job_id, "completed")
+        logger.info(f"Client import {job_id} completed")
+    except Exception as e:
+        logger.error(f"Client import {job_id} failed: {e}")
+        await import_job_repository.finish(job_id, "failed", error=str(e))
+    finally:
+        os.unlink(path)
+
+
+async def start_client_import(upload: UploadFile, created_by: Optional[str]) -> str:
+    """Save the upload, create its job and start it in the background; returns the job id."""
+    file_format = detect_format(upload.filename)
+    path = await save_upload(upload, f".{file_format}")
+    try:
+        job_id = await import_job_repository.create("clients", upload.filename, file_format, created_by)
+    except BaseException:
+        # No job will ever read the spooled file
+        os.unlink(path)
+        raise
+
+    task = asyncio.create_task(run_client_import(job_id, path, file_format))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return job_id
+
+
+def job_progress(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Job document as returned to pollers, with a 0-1 progress fraction."""
+    total = job.get("total_rows")
+    if job["status"] == "completed":
+        progress = 1.0
+    elif total:
+        progress = round(min(job["processed"] / total, 1.0), 3)
+    else:
+        progress = 0.0
+    return {
+        "job_id": job["_id"],
+        "status": job["status"],
+        "filename": job["filename"],
+        "total_rows": total,
+        "processed": job["processed"],
+        "created_count": job["created_count"],
+        "updated_count": job["updated_count"],
+        "error_count": job["error_count"],
+        "progress": progress,
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "finished_at": job.get("finished_at"),
+    }
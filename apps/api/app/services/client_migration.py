@@ -0,0 +1,226 @@
+"""
+Client Migration Service
+Bulk import of client rows (spreadsheet exports) into the clients collection
+
+Rows are processed in chunks: employee names are resolved from a map loaded
+once, existing clients are found with one $in query per chunk, and each chunk
+is written with one unordered bulk_write.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.repository.client_repository import client_repository
+from app.repository.employee_repository import employee_repository
+from app.schemas.client import ClientMigrationItem, ClientMigrationResponse
+from app.utils.uploads import UploadError
+
+CHUNK_SIZE = 1000
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    """Case-folded, punctuation stripped, whitespace collapsed."""
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", name.casefold())).strip()
+
+
+class EmployeeNameIndex:
+    """
+    Resolves the "Visible To (*)" value to an empID in memory. Tries an exact
+    name, then the normalized name, then (like the old case-insensitive regex
+    lookup) the first employee whose name contains the value.
+    """
+
+    def __init__(self, names: List[Tuple[str, str]]):
+        self.names = names
+        self.exact: Dict[str, str] = {}
+        self.normalized: Dict[str, str] = {}
+        for name, emp_id in names:
+            self.exact.setdefault(name, emp_id)
+            self.normalized.setdefault(normalize_name(name), emp_id)
+        self._resolved: Dict[str, Optional[str]] = {}
+
+    def resolve(self, value: Optional[str]) -> Optional[str]:
+        if not value:
+            return None
+        if value in self.exact:
+            return self.exact[value]
+        if value not in self._resolved:
+            self._resolved[value] = self._lookup(value)
+        return self._resolved[value]
+
+    def _lookup(self, value: str) -> Optional[str]:
+        normalized = normalize_name(value)
+        if normalized in self.normalized:
+            return self.normalized[normalized]
+        folded = value.casefold()
+        for name, emp_id in self.names:
+            if folded in name.casefold():
+                return emp_id
+        if normalized:
+            for name, emp_id in self.names:
+                if normalized in normalize_name(name):
+                    return emp_id
+        return None
+
+
+def _row_label(raw: Dict[str, Any], row: int) -> str:
+    return str(raw.get("Client Name (*)") or f"row {row}")
+
+
+def format_error(error: Dict[str, Any]) -> str:
+    return f"Error processing client {error['client']}: {error['error']}"
+
+
+class _ChunkPlan:
+    """Writes for one chunk; rows sharing an ID are merged into one write."""
+
+    def __init__(self):
+        # {"filter": update filter or None for an insert, "doc": fields, "rows": [(kind, row, client name)]}
+        self.writes: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, key: Optional[str], kind: str, row: int, label: str, doc: Dict[str, Any],
+            filter: Optional[Dict[str, Any]] = None) -> None:
+        write = {"filter": filter, "doc": doc, "rows": [(kind, row, label)]}
+        self.writes.append(write)
+        if key is not None:
+            self._by_id[key] = write
+
+    def merge(self, key: Optional[str], row: int, label: str, data: Dict[str, Any]) -> bool:
+        """Fold a repeated ID into its earlier write (the later row overrides fields)."""
+        write = self._by_id.get(key) if key is not None else None
+        if write is None:
+            return False
+        write["doc"].update(data)
+        write["rows"].append(("updated", row, label))
+        return True
+
+    def operations(self) -> List[Any]:
+        return [
+            InsertOne(w["doc"]) if w["filter"] is None else UpdateOne(w["filter"], {"$set": w["doc"]})
+            for w in self.writes
+        ]
+
+
+async def migrate_chunk(
+    chunk: List[Tuple[int, Dict[str, Any]]],
+    names: EmployeeNameIndex,
+    now: datetime,
+) -> Dict[str, Any]:
+    """
+    Validate and write one chunk of (row number, raw row) pairs.
+    Returns created_count, updated_count and errors ({row, client, error}).
+    """
+    result: Dict[str, Any] = {"created_count": 0, "updated_count": 0, "errors": []}
+    items = []
+    for row, raw in chunk:
+        try:
+            item = ClientMigrationItem.model_validate(raw)
+        except ValidationError as e:
+            fields = ", ".join(".".join(str(p) for p in err["loc"]) for err in e.errors())
+            result["errors"].append({"row": row, "client": _row_label(raw, row), "error": f"invalid {fields}"})
+            continue
+        client_data = item.model_dump(by_alias=True, exclude_none=True)
+        client_data.pop("ID", None)
+        employee_id = names.resolve(client_data.get("Visible To (*)"))
+        if employee_id:
+            client_data["Employee ID"] = employee_id
+        items.append((row, item, client_data))
+
+    # IDs may be stored as int or string; look up both forms and write back the stored one
+    lookup: List[Any] = []
+    for _, item, _ in items:
+        uid = item.unolo_client_id
+        if uid is not None:
+            lookup.append(str(uid))
+            if str(uid).isdigit():
+                lookup.append(int(uid))
+    stored = {str(v): v for v in await client_repository.existing_unolo_ids(lookup)}
+
+    plan = _ChunkPlan()
+    for row, item, client_data in items:
+        uid = item.unolo_client_id
+        label = item.client_name
+        key = str(uid) if uid is not None else None
+        if plan.merge(key, row, label, {**client_data, "Last Modified At": now}):
+            continue
+        if key is not None and key in stored:
+            plan.add(key, "updated", row, label,
+                     {**client_data, "unolo_client_id": stored[key], "Last Modified At": now},
+                     filter={"unolo_client_id": stored[key]})
+        else:
+            plan.add(key, "created", row, label, {
+                **client_data,
+                "unolo_client_id": uid,  # Can be None
+                "Created At": client_data.get("Created At", now),
+                "Last Modified At": now,
+            })
+
+    failed: Dict[int, str] = {}
+    if plan.writes:
+        try:
+            await client_repository.bulk_write(plan.operations())
+        except BulkWriteError as e:
+            failed = {err["index"]: err.get("errmsg", "write failed") for err in e.details.get("writeErrors", [])}
+
+    for index, write in enumerate(plan.writes):
+        for kind, row, label in write["rows"]:
+            if index in failed:
+                result["errors"].append({"row": row, "client": label, "error": failed[index]})
+            else:
+                result[f"{kind}_count"] += 1
+    return result
+
+
+async def migrate_client_rows(
+    rows: AsyncIterator[Tuple[int, Dict[str, Any]]],
+    chunk_size: int = CHUNK_SIZE,
+) -> ClientMigrationResponse:
+    """
+    Insert or update clients from (row number, raw row) pairs.
+
+    - If ID is present and exists in DB -> Update
+    - If ID is not present or doesn't exist -> Insert
+    - Populates Employee ID from the Visible To field
+    """
+    names = EmployeeNameIndex(await employee_repository.find_names())
+    now = datetime.now(timezone.utc)
+    result: Dict[str, Any] = {"total_processed": 0, "created_count": 0, "updated_count": 0, "errors": []}
+
+    async def write(chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        written = await migrate_chunk(chunk, names, now)
+        result["total_processed"] += len(chunk)
+        result["created_count"] += written["created_count"]
+        result["updated_count"] += written["updated_count"]
+        result["errors"].extend(format_error(e) for e in written["errors"])
+
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+    try:
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                await write(chunk)
+                chunk = []
+    except UploadError as e:
+        # Rows before the unparseable one are still written
+        result["errors"].append(str(e))
+    if chunk:
+        await write(chunk)
+
+    print(f"Migration completed. Total: {result['total_processed']}, Created: {result['created_count']}, "
+          f"Updated: {result['updated_count']}, Errors: {len(result['errors'])}")
+    return ClientMigrationResponse(**result)
+
+
+async def iter_json_rows(body: Any) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """Rows of a {"clients": [...]} JSON body."""
+    for row, raw in enumerate(body.get("clients") or [], start=1):
+        yield row, raw if isinstance(raw, dict) else {}
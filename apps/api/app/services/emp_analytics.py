@@ -1,8 +1,10 @@
 from datetime import date, timedelta, datetime
 from typing import List, Dict, Any, Optional
+from app.columnar import columnar_engine
 from app.repository.emp_analytics_repository import emp_analytics_repository
 from app.schemas.emp_analytics import EmployeeAnalyticsResponse, DailyAnalytics
-from app.services.employee import get_all_employees
+from app.services.employee import get_all_employees, resolve_employees
+from app.utils.durations import parse_duration_seconds, seconds_to_minutes
 
 def get_working_days(start_date: date, end_date: date) -> List[date]:
     """Generates a list of working days (Mon-Sat) between start and end date (inclusive)."""
@@ -17,16 +19,7 @@ def get_working_days(start_date: date, end_date: date) -> List[date]:
 
 def parse_break_time(time_str: Optional[str]) -> int:
     """Parses 'HH:MM:SS' string to minutes. Returns 0 if invalid or None."""
-    if not time_str:
-        return 0
-    try:
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            h, m, s = map(int, parts)
-            return h * 60 + m + round(s / 60)
-        return 0
-    except ValueError:
-        return 0
+    return seconds_to_minutes(parse_duration_seconds(time_str))
 
 async def get_employee_analytics(
     employee_id: str,
@@ -50,68 +43,91 @@ async def get_employee_analytics(
                 employee_id = e_id_str
             break
 
-    # 2. Fetch EOD Data
-    eod_data = await emp_analytics_repository.get_employee_eod_data(employee_id, start_date, end_date)
-    
+    # 2. Fetch per-day metrics and present-day totals (computed in the DB)
+    engine = columnar_engine()
+    if engine and engine.covers(end_date):
+        daily_rows, totals = await engine.run(engine.employee_daily_metrics, employee_id, start_date, end_date)
+    else:
+        daily_rows, totals = await emp_analytics_repository.get_employee_daily_metrics(
+            employee_id, start_date, end_date
+        )
+
+    return _build_employee_analytics(employee_id, employee_name, start_date, end_date, daily_rows, totals)
+
+async def get_employees_analytics(
+    employee_ids: List[str],
+    start_date: date,
+    end_date: date
+) -> Dict[str, EmployeeAnalyticsResponse]:
+    """
+    Dashboard analytics for several employees, keyed by the requested IDs.
+    IDs are resolved from the synced employees collection in one query and the
+    metrics of all of them come from one grouped pipeline.
+    """
+    resolved = await resolve_employees(employee_ids)
+    keys = sorted({r["employee_id"] for r in resolved.values()})
+
+    engine = columnar_engine()
+    if engine and engine.covers(end_date):
+        metrics = await engine.run(engine.employees_daily_metrics, keys, start_date, end_date)
+    else:
+        metrics = await emp_analytics_repository.get_employees_daily_metrics(keys, start_date, end_date)
+
+    results = {}
+    for requested, employee in resolved.items():
+        daily_rows, totals = metrics.get(employee["employee_id"], ([], None))
+        results[requested] = _build_employee_analytics(
+            employee["employee_id"], employee["name"], start_date, end_date, daily_rows, totals
+        )
+    return results
+
+def _build_employee_analytics(
+    employee_id: str,
+    employee_name: str,
+    start_date: date,
+    end_date: date,
+    daily_rows: List[Dict[str, Any]],
+    totals: Optional[Dict[str, Any]]
+) -> EmployeeAnalyticsResponse:
+    """Dashboard response from the per-day rows and present-day totals of one employee."""
     # Index data by date string for easy lookup
-    data_map = {item.date: item for item in eod_data}
+    data_map = {row["date"]: row for row in daily_rows}
     
     # 3. Generate Date Range (Working Days Only)
     working_days = get_working_days(start_date, end_date)
     
     daily_analytics = []
     
-    total_present = 0
-    total_tasks = 0
-    total_distance = 0.0
-    total_breaks = 0
-    total_break_time = 0
-    
     for day in working_days:
         day_str = day.strftime("%Y-%m-%d")
         record = data_map.get(day_str)
         
-        is_present = False
-        tasks = 0
-        distance = 0.0
-        num_breaks = 0
-        break_time = 0
-        
-        if record:
-            # Presence check: 
-            # 0, 1 = Present (various modes)
-            # 6 = Often seen in data (User confirmed data exists with code 6) - treating as Present for now
-            if record.attendance_result_code in [0, 1, 6]:
-                is_present = True
-                
-                # Metrics only counted if present
-                tasks = record.admin_completed_tasks + record.self_completed_tasks
-                distance = record.distance or 0.0
-                num_breaks = record.num_breaks or 0
-                break_time = parse_break_time(record.total_break_time)
+        # Presence check: attendanceResultCode 0, 1 or 6 (evaluated in the pipeline)
+        is_present = bool(record and record["is_present"])
 
         daily_analytics.append(DailyAnalytics(
             date=day,
             is_present=is_present,
-            tasks_done=tasks,
-            distance_km=distance,
-            num_breaks=num_breaks,
-            break_time_minutes=break_time,
+            # Metrics only counted if present
+            tasks_done=record["tasks"] if is_present else 0,
+            distance_km=record["distance"] if is_present else 0.0,
+            num_breaks=record["num_breaks"] if is_present else 0,
+            break_time_minutes=int(record["break_minutes"]) if is_present else 0,
             is_working_day=True
         ))
-        
-        if is_present:
-            total_present += 1
-            total_tasks += tasks
-            total_distance += distance
-            total_breaks += num_breaks
-            total_break_time += break_time
 
-    # 4. Calculate Averages
-    avg_tasks = total_tasks / total_present if total_present > 0 else 0
-    avg_distance = total_distance / total_present if total_present > 0 else 0
-    avg_breaks = total_breaks / total_present if total_present > 0 else 0
-    avg_break_time = total_break_time / total_present if total_present > 0 else 0
+    # 4. Totals and averages over present days
+    totals = totals or {}
+    total_present = totals.get("present_days", 0)
+    total_tasks = totals.get("total_tasks", 0)
+    total_distance = totals.get("total_distance", 0.0)
+    total_breaks = totals.get("total_breaks", 0)
+    total_break_time = int(totals.get("total_break_minutes", 0))
+
+    avg_tasks = totals.get("avg_tasks") or 0
+    avg_distance = totals.get("avg_distance") or 0
+    avg_breaks = totals.get("avg_breaks") or 0
+    avg_break_time = totals.get("avg_break_minutes") or 0
     
     attendance_pct = (total_present / len(working_days)) * 100 if working_days else 0.0
 
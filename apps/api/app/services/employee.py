@@ -6,12 +6,15 @@ Uses Unolo external API to fetch employee master data.
 """
 
 import logging
+import time
 from typing import List, Dict, Any
 
 from app.external.unolo_client import UnoloClient, UnoloClientError
 from app.models.employee import Employee
 from app.repository.employee_repository import employee_repository
-from app.services.user import create_user_if_not_exists
+from app.services.user import create_user_if_not_exists, default_password_hash
+from app.metrics import record_sync
+from app.repository.sync_status_repository import sync_status_repository
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +54,27 @@ async def get_employee_count() -> int:
         return len(employees)
 
 
+async def resolve_employees(employee_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolve a batch of employee IDs (empID or numeric employeeID) from the
+    synced employees collection, in one query instead of a Unolo call each.
+
+    Returns:
+        {requested ID: {"employee_id": numeric employeeID, "emp_id": empID, "name": empName}}.
+        IDs not found keep the requested ID for both, as the single-employee paths do.
+    """
+    found = await employee_repository.find_by_ids(employee_ids)
+    resolved = {}
+    for requested in employee_ids:
+        doc = found.get(requested, {})
+        resolved[requested] = {
+            "employee_id": str(doc.get("employeeID") or requested),
+            "emp_id": str(doc.get("empID") or requested),
+            "name": doc.get("empName", "Unknown"),
+        }
+    return resolved
+
+
 async def sync_employees() -> Dict[str, Any]:
     """
     Sync employees from Unolo API to local MongoDB.
@@ -60,6 +84,7 @@ async def sync_employees() -> Dict[str, Any]:
     """
     client = UnoloClient()
     stats = {"total_fetched": 0, "created": 0, "updated": 0, "errors": 0}
+    started = time.perf_counter()
     
     try:
         # 1. Fetch from Unolo
@@ -67,6 +92,9 @@ async def sync_employees() -> Dict[str, Any]:
         stats["total_fetched"] = len(external_employees)
         logger.info(f"Starting sync for {len(external_employees)} employees")
         
+        # New users all get the default password; bcrypt it once for the whole run
+        password_hash = await default_password_hash()
+
         # 2. Process and Upsert
         for emp_data in external_employees:
             try:
@@ -81,12 +109,15 @@ async def sync_employees() -> Dict[str, Any]:
                     stats["updated"] += 1
                 
                 # Sync User Account
-                await create_user_if_not_exists(employee)
+                await create_user_if_not_exists(employee, password_hash=password_hash)
                 
             except Exception as e:
                 logger.error(f"Error syncing employee {emp_data.get('empID', 'unknown')}: {e}")
                 stats["errors"] += 1
                 
+        duration = time.perf_counter() - started
+        record_sync("employees", stats, duration)
+        await sync_status_repository.record_success("employees", stats, duration)
         logger.info(f"Employee sync completed: {stats}")
         return stats
         
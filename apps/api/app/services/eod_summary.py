@@ -2,12 +2,16 @@
 EOD Summary Service
 """
 import logging
+import time
 from typing import List, Dict, Any, Optional
 from datetime import date, datetime
 
 from app.external.unolo_client import UnoloClient
-from app.schemas.unolo import UnoloEodSummaryResponse, SyncStatsResponse, EodSummaryList
+from app.schemas.unolo import UnoloEodSummaryResponse, SyncStatsResponse, EodSummaryList, EodTrackResponse
 from app.repository.eod_summary_repository import eod_summary_repository
+from app.repository.eod_track_repository import eod_track_repository
+from app.metrics import record_sync
+from app.repository.sync_status_repository import sync_status_repository
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,7 @@ async def sync_eod_summary(
     """
     client = UnoloClient()
     stats = {"total_fetched": 0, "created": 0, "updated": 0, "errors": 0}
+    started = time.perf_counter()
     
     try:
         start_str = start_date.strftime("%Y-%m-%d")
@@ -54,6 +59,9 @@ async def sync_eod_summary(
                 logger.error(f"Error processing EOD summary for emp {item.get('employeeID', 'unknown')}: {e}")
                 stats["errors"] += 1
                 
+        duration = time.perf_counter() - started
+        record_sync("eod_summary", stats, duration)
+        await sync_status_repository.record_success("eod_summary", stats, duration)
         logger.info(f"EOD summary sync completed: {stats}")
         return SyncStatsResponse(**stats)
         
@@ -61,16 +69,12 @@ async def sync_eod_summary(
         await client.close()
 
 
-async def get_eod_summaries(
+def build_eod_query(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     employee_id: Optional[int] = None,
-    limit: int = 100,
-    skip: int = 0
 ) -> Dict[str, Any]:
-    """
-    Get EOD summaries from DB with filters.
-    """
+    """Mongo query for the EOD summary list filters (shared by list and export)."""
     query: Dict[str, Any] = {}
     
     if start_date or end_date:
@@ -85,6 +89,21 @@ async def get_eod_summaries(
     if employee_id:
         query["employeeID"] = employee_id
 
+    return query
+
+
+async def get_eod_summaries(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    employee_id: Optional[int] = None,
+    limit: int = 100,
+    skip: int = 0
+) -> Dict[str, Any]:
+    """
+    Get EOD summaries from DB with filters.
+    """
+    query = build_eod_query(start_date, end_date, employee_id)
+
     items, total = await eod_summary_repository.find_with_filters(query, limit, skip)
     
     # Convert InDB model to Response model
@@ -97,3 +116,13 @@ async def get_eod_summaries(
         "limit": limit,
         "skip": skip
     }
+
+
+async def get_eod_track(employee_id: int, track_date: date) -> Optional[EodTrackResponse]:
+    """
+    Get the route polyline for one employee and day.
+    """
+    doc = await eod_track_repository.find_one(employee_id, track_date.strftime("%Y-%m-%d"))
+    if not doc:
+        return None
+    return EodTrackResponse(**doc)
@@ -0,0 +1,436 @@
+"""
+Export Service
+Streams clients, tasks and EOD summaries as CSV, XLSX or Parquet
+
+Rows are read straight from a Motor cursor in batches, using only the fields
+the chosen format needs:
+
+- CSV is encoded and sent a batch at a time while the cursor is still open.
+- XLSX is written by a child process (app.xlsx_writer) into an openpyxl
+  write-only workbook, fed batches over a pipe; the finished file is then
+  streamed back. The zip container can only be sent once complete.
+- Parquet is written with pyarrow, one record batch (row group) per cursor
+  batch, and each row group is sent as soon as it is written.
+
+Text formats carry the values as shown in the app (e.g. "HH:MM:SS"
+durations); Parquet carries typed columns instead (integer seconds,
+timestamps).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.background import BackgroundTask
+from fastapi.responses import StreamingResponse
+
+from app.config import get_settings
+from app.repository.client_repository import client_repository
+from app.repository.eod_summary_repository import eod_summary_repository
+from app.repository.task_repository import task_repository
+from app.utils.csv_stream import csv_lines
+from app.utils.durations import EOD_DURATION_FIELDS
+from app.xlsx_writer import write_xlsx
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - openpyxl is in requirements
+    openpyxl = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - pyarrow is in requirements
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+# Documents per cursor batch, CSV chunk, pipe message and Parquet row group
+BATCH_SIZE = 2000
+FILE_READ_BYTES = 1024 * 1024
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+TEXT_FORMATS = (ExportFormat.CSV, ExportFormat.XLSX)
+ALL_FORMATS = tuple(ExportFormat)
+
+
+class Column:
+    """One exported column: header, dotted document path and value kind."""
+
+    def __init__(self, header: str, path: Optional[str] = None, kind: str = "str",
+                 formats: Sequence[ExportFormat] = ALL_FORMATS):
+        self.header = header
+        self.path = path or header
+        self.kind = kind  # str | int | float | bool | date | datetime
+        self.formats = formats
+
+
+class ExportSpec:
+    def __init__(self, name: str, columns: List[Column],
+                 cursor: Callable[[Dict[str, Any], Dict[str, Any], int], Any]):
+        self.name = name
+        self.all_columns = columns
+        self.cursor = cursor
+
+    def columns(self, file_format: ExportFormat) -> List[Column]:
+        return [c for c in self.all_columns if file_format in c.formats]
+
+    def projection(self, file_format: ExportFormat) -> Dict[str, int]:
+        projection = {"_id": 0}
+        projection.update({c.path: 1 for c in self.columns(file_format)})
+        return projection
+
+
+# ---------------------------------------------------------------------------
+# Datasets
+# ---------------------------------------------------------------------------
+
+# Headers match the migration spreadsheet, so an export can be edited and re-imported
+CLIENT_COLUMNS = [
+    Column("ID", "unolo_client_id"),
+    Column("Client Name (*)"),
+    Column("Visible To (*)"),
+    Column("Employee ID"),
+    Column("Contact Name (*)"),
+    Column("Country Code (*)"),
+    Column("Contact Number (*)"),
+    Column("Address (*)"),
+    Column("Can exec change location (*)", kind="bool"),
+    Column("Latitude", kind="float"),
+    Column("Longitude", kind="float"),
+    Column("Radius(m)", kind="float"),
+    Column("Otp Verified", kind="bool"),
+    Column("Created By"),
+    Column("Created At", kind="datetime"),
+    Column("Last Modified At", kind="datetime"),
+    Column("Client Catagory (*)"),
+    Column("Division Name old"),
+    Column("Division Name new (*)"),
+    Column("Correspondent Name"),
+    Column("Corresponded Phone Number"),
+    Column("Head Master"),
+    Column("HM Phone Number"),
+    Column("Distributor Name"),
+    Column("Using Material (*)"),
+    Column("Currently Used Brand"),
+    Column("Time of Order(Class 10)"),
+    Column("Time of Order(Class 6-9)"),
+    Column("School Strength", kind="int"),
+    Column("Using IIT (*)"),
+    Column("Using AI (*)"),
+    Column("Question Papers"),
+    Column("Branches Places"),
+    Column("Building"),
+    Column("To Delete", kind="bool"),
+]
+
+# Raw metadata and custom field blobs are left out
+TASK_COLUMNS = [
+    Column("taskID"),
+    Column("date", kind="date"),
+    Column("employeeID"),
+    Column("internalEmpID"),
+    Column("clientID"),
+    Column("customEntityName", "customEntity.customEntityName"),
+    Column("checkinTime", kind="datetime"),
+    Column("checkoutTime", kind="datetime"),
+    Column("lat", kind="float"),
+    Column("lon", kind="float"),
+    Column("taskDescription"),
+    Column("address"),
+    Column("school_category"),
+    Column("specimens_given", kind="int"),
+    Column("createdByName"),
+    Column("lastModifiedByName"),
+]
+
+# The route polyline (rkPolyline) is never exported
+EOD_COLUMNS = [
+    Column("employeeID", kind="int"),
+    Column("internalEmpID"),
+    Column("date", kind="date"),
+    Column("attendanceResultCode", kind="int"),
+    Column("firstSignIn"),
+    Column("lastSignOut"),
+    Column("totalClientVisits", kind="int"),
+    Column("totalNumPhotos", kind="int"),
+    Column("distance", kind="float"),
+    Column("odoDistance", kind="float"),
+    Column("adminAssignedTasks", kind="int"),
+    Column("adminCompletedTasks", kind="int"),
+    Column("selfAssignedTasks", kind="int"),
+    Column("selfCompletedTasks", kind="int"),
+    Column("numBreaks", kind="int"),
+    Column("totalForms", kind="int"),
+    Column("clientsCreated", kind="int"),
+    Column("setupRating"),
+    Column("complianceRating"),
+    # Durations: "HH:MM:SS" text for spreadsheets, integer seconds for Parquet
+    *[Column(alias, formats=TEXT_FORMATS) for alias in EOD_DURATION_FIELDS],
+    *[Column(seconds, kind="int", formats=(ExportFormat.PARQUET,)) for seconds in EOD_DURATION_FIELDS.values()],
+]
+
+EXPORTS = {
+    "clients": ExportSpec("clients", CLIENT_COLUMNS, client_repository.export_cursor),
+    "tasks": ExportSpec("tasks", TASK_COLUMNS, task_repository.export_cursor),
+    "eod_summaries": ExportSpec("eod_summaries", EOD_COLUMNS, eod_summary_repository.export_cursor),
+}
+
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+
+def _get(doc: Dict[str, Any], path: str) -> Any:
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if isinstance(value, str) and value:
+        try:
+            return _to_datetime(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            return None
+    return None
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """Stored value as `kind`; None when missing or not convertible."""
+    if value is None or value == "":
+        return None
+    try:
+        if kind == "str":
+            return value if isinstance(value, str) else str(value)
+        if kind == "int":
+            return int(float(value)) if not isinstance(value, bool) else int(value)
+        if kind == "float":
+            return float(value)
+        if kind == "bool":
+            if isinstance(value, bool):
+                return value
+            return str(value).strip().lower() in ("true", "yes", "1")
+        if kind == "datetime":
+            return _to_datetime(value)
+        if kind == "date":
+            dt = _to_datetime(value)
+            return dt.date() if dt else None
+    except (TypeError, ValueError):
+        return None
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def _xlsx_value(value: Any) -> Any:
+    # Excel has no time zones; datetimes are written as naive UTC
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+async def _row_batches(spec: ExportSpec, query: Dict[str, Any],
+                       file_format: ExportFormat) -> AsyncIterator[List[Tuple[Any, ...]]]:
+    columns = spec.columns(file_format)
+    cursor = spec.cursor(query, spec.projection(file_format), BATCH_SIZE)
+    batch: List[Tuple[Any, ...]] = []
+    async for doc in cursor:
+        batch.append(tuple(_coerce(_get(doc, c.path), c.kind) for c in columns))
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Formats
+# ---------------------------------------------------------------------------
+
+def _csv_stream(spec: ExportSpec, query: Dict[str, Any]) -> AsyncIterator[bytes]:
+    async def rows() -> AsyncIterator[Iterable[Any]]:
+        async for batch in _row_batches(spec, query, ExportFormat.CSV):
+            for row in batch:
+                yield [_csv_value(v) for v in row]
+
+    header = [c.header for c in spec.columns(ExportFormat.CSV)]
+    return csv_lines(header, rows(), rows_per_chunk=BATCH_SIZE)
+
+
+_xlsx_slots: Optional[asyncio.Semaphore] = None
+
+
+async def build_xlsx(spec: ExportSpec, query: Dict[str, Any]) -> str:
+    """Write the export to a temporary .xlsx in a child process; returns its path."""
+    global _xlsx_slots
+    if _xlsx_slots is None:
+        _xlsx_slots = asyncio.Semaphore(max(get_settings().export_max_processes, 1))
+
+    loop = asyncio.get_running_loop()
+    header = [c.header for c in spec.columns(ExportFormat.XLSX)]
+    fd, path = tempfile.mkstemp(prefix=f"export-{spec.name}-", suffix=".xlsx")
+    os.close(fd)
+
+    async with _xlsx_slots:
+        # spawn, not fork: the parent has Motor and executor threads running
+        context = multiprocessing.get_context("spawn")
+        parent, child = context.Pipe()
+        process = context.Process(target=write_xlsx, args=(path, spec.name, header, child), daemon=True)
+        started = False
+        try:
+            process.start()
+            started = True
+            child.close()
+            try:
+                async for batch in _row_batches(spec, query, ExportFormat.XLSX):
+                    rows = [tuple(_xlsx_value(v) for v in row) for row in batch]
+                    await loop.run_in_executor(None, parent.send, rows)
+                await loop.run_in_executor(None, parent.send, None)
+            except OSError:
+                pass  # the writer stopped early (broken pipe, connection reset); its reply below says why
+            try:
+                status, detail = await loop.run_in_executor(None, parent.recv)
+            except EOFError:
+                await loop.run_in_executor(None, process.join, 10)
+                status, detail = "error", f"writer process exited with code {process.exitcode}"
+            if status != "ok":
+                raise RuntimeError(f"XLSX export failed: {detail}")
+        except BaseException:
+            os.unlink(path)
+            raise
+        finally:
+            parent.close()
+            child.close()
+            if started:
+                await loop.run_in_executor(None, process.join, 10)
+                if process.is_alive():
+                    process.kill()
+    return path
+
+
+async def _file_stream(path: str) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    with open(path, "rb") as f:
+        while True:
+            data = await loop.run_in_executor(None, f.read, FILE_READ_BYTES)
+            if not data:
+                return
+            yield data
+
+
+_ARROW_TYPES = {
+    "str": lambda: pyarrow.string(),
+    "int": lambda: pyarrow.int64(),
+    "float": lambda: pyarrow.float64(),
+    "bool": lambda: pyarrow.bool_(),
+    "date": lambda: pyarrow.date32(),
+    "datetime": lambda: pyarrow.timestamp("ms", tz="UTC"),
+}
+
+
+class _Sink:
+    """Write-only file object whose contents are drained after each row group."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+        self.position = 0
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+async def _parquet_stream(spec: ExportSpec, query: Dict[str, Any]) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    columns = spec.columns(ExportFormat.PARQUET)
+    schema = pyarrow.schema([(c.header, _ARROW_TYPES[c.kind]()) for c in columns])
+    sink = _Sink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd")
+
+    def write(batch: List[Tuple[Any, ...]]) -> bytes:
+        arrays = [pyarrow.array([row[i] for row in batch], type=field.type) for i, field in enumerate(schema)]
+        writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=schema))
+        return sink.drain()
+
+    try:
+        async for batch in _row_batches(spec, query, ExportFormat.PARQUET):
+            data = await loop.run_in_executor(None, write, batch)
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def check_available(file_format: ExportFormat) -> None:
+    """ValueError when the library a format needs is not installed."""
+    if file_format == ExportFormat.XLSX and openpyxl is None:
+        raise ValueError("XLSX export needs openpyxl installed")
+    if file_format == ExportFormat.PARQUET and pyarrow is None:
+        raise ValueError("Parquet export needs pyarrow installed")
+
+
+async def export_response(dataset: str, query: Dict[str, Any], file_format: ExportFormat) -> StreamingResponse:
+    """Streaming download of every `dataset` document matching `query`."""
+    check_available(file_format)
+    spec = EXPORTS[dataset]
+    filename = f"{dataset}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{file_format.value}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    logger.info(f"Exporting {dataset} as {file_format.value}: {query}")
+
+    if file_format == ExportFormat.XLSX:
+        path = await build_xlsx(spec, query)
+        return StreamingResponse(_file_stream(path), media_type=MEDIA_TYPES[file_format], headers=headers,
+                                 background=BackgroundTask(os.unlink, path))
+    body = _csv_stream(spec, query) if file_format == ExportFormat.CSV else _parquet_stream(spec, query)
+    return StreamingResponse(body, media_type=MEDIA_TYPES[file_format], headers=headers)
@@ -3,12 +3,16 @@ Task Service
 Business logic for Task operations
 """
 import logging
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
 
 from app.external.unolo_client import UnoloClient, UnoloClientError
 from app.schemas.task import TaskCreate, TaskSyncResponse, Task
 from app.repository.task_repository import task_repository
+from app.utils.task_metadata import extract_typed_fields
+from app.metrics import record_sync
+from app.repository.sync_status_repository import sync_status_repository
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +26,7 @@ async def sync_tasks(
     """
     client = UnoloClient()
     stats = {"total_fetched": 0, "created": 0, "updated": 0, "errors": 0}
+    started = time.perf_counter()
     
     try:
         # 1. Fetch from Unolo
@@ -62,6 +67,8 @@ async def sync_tasks(
                         metadata[key] = value
                 
                 item["metadata"] = metadata
+                # Typed, indexable copies of hot metadata fields
+                item.update(extract_typed_fields(metadata))
                     
                 # Create Pydantic model
                 task = TaskCreate(**item)
@@ -78,6 +85,9 @@ async def sync_tasks(
                 logger.error(f"Error processing task {item.get('taskID', 'unknown')}: {e}")
                 stats["errors"] += 1
                 
+        duration = time.perf_counter() - started
+        record_sync("tasks", stats, duration)
+        await sync_status_repository.record_success("tasks", stats, duration)
         logger.info(f"Task sync completed: {stats}")
         return TaskSyncResponse(**stats)
         
@@ -85,17 +95,13 @@ async def sync_tasks(
         await client.close()
 
 
-async def get_tasks(
+def build_task_query(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     custom_task_name: Optional[str] = None,
     employee_id: Optional[int] = None,
-    limit: int = 100,
-    skip: int = 0
 ) -> Dict[str, Any]:
-    """
-    Get tasks from DB with filters.
-    """
+    """Mongo query for the task list filters (shared by list and export)."""
     query: Dict[str, Any] = {}
     
     # Date filtering on 'date' field
@@ -126,6 +132,22 @@ async def get_tasks(
     if employee_id:
         query["employeeID"] = employee_id
 
+    return query
+
+
+async def get_tasks(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    custom_task_name: Optional[str] = None,
+    employee_id: Optional[int] = None,
+    limit: int = 100,
+    skip: int = 0
+) -> Dict[str, Any]:
+    """
+    Get tasks from DB with filters.
+    """
+    query = build_task_query(start_date, end_date, custom_task_name, employee_id)
+
     tasks, total = await task_repository.find_with_filters(query, limit, skip)
     
     # Convert TaskInDB to Task response model (handles alias mapping)
@@ -8,14 +8,23 @@ import logging
 from app.models.employee import Employee
 from app.schemas.user import User, UserRole
 from app.repository.user_repository import user_repository
-from app.utils.security import hash_password
+from app.utils.security import hash_password_async
 
 logger = logging.getLogger(__name__)
 
-async def create_user_if_not_exists(employee: Employee) -> Optional[User]:
+DEFAULT_USER_PASSWORD = "admin123"
+
+
+async def default_password_hash() -> str:
+    """Hash of the default password; hash once per sync and pass it to every new user."""
+    return await hash_password_async(DEFAULT_USER_PASSWORD)
+
+
+async def create_user_if_not_exists(employee: Employee, password_hash: Optional[str] = None) -> Optional[User]:
     """
     Create a new user for the employee if one does not exist.
     Uses default password 'admin123' and role 'sales_rep'.
+    `password_hash` is a precomputed default_password_hash(), so bulk callers pay for bcrypt once.
     """
     if not employee.empID:
         logger.warning(f"Employee has no empID, skipping user creation.")
@@ -34,7 +43,7 @@ async def create_user_if_not_exists(employee: Employee) -> Optional[User]:
     
     user_doc = {
         "email": email,
-        "password_hash": hash_password("admin123"),
+        "password_hash": password_hash or await default_password_hash(),
         "full_name": employee.empName or "Unknown",
         "role": UserRole.SALES_REP.value,
         "empId": employee.empID,
@@ -0,0 +1,102 @@
+"""
+Test Helpers
+pytest fixtures for API tests. Enable in a conftest.py with:
+
+    pytest_plugins = ["app.testing"]
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+
+from app.db_monitoring import QueryStats, capture_commands, count_all_queries
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fail the test when a block issues more MongoDB commands than allowed.
+
+    Usage:
+        def test_overview(client, query_budget):
+            with query_budget(5):
+                client.get("/api/all-emp-analytics/overview")
+    """
+    @contextmanager
+    def budget(max_commands: int, label: str = "") -> Iterator[QueryStats]:
+        with count_all_queries(label) as stats:
+            yield stats
+
+        if stats.count > max_commands:
+            issued = ", ".join(f"{command} {collection}" for collection, command in stats.commands[:20])
+            pytest.fail(
+                f"Query budget exceeded{f' for {label}' if label else ''}: "
+                f"{stats.count} commands (budget {max_commands}, {stats.duration_ms}ms): {issued}",
+                pytrace=False
+            )
+
+    return budget
+
+
+@pytest.fixture
+def no_collscan():
+    """
+    Fail the test when a filtered query issued inside the block scans its whole
+    collection. Queries are explained after the block, so this needs a real
+    mongod at settings.mongodb_url; the test is skipped when explain fails.
+
+    Usage:
+        def test_task_filters(client, no_collscan):
+            with no_collscan():
+                client.get("/api/tasks/", params={"employee_id": "180001"})
+    """
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    from app.config import get_settings
+    from app.index_advisor import explain_commands
+
+    @contextmanager
+    def guard(label: str = "", allow: Tuple[str, ...] = ()) -> Iterator[List[Tuple[str, str, Dict[str, Any]]]]:
+        with capture_commands() as captured:
+            yield captured
+
+        client = MongoClient(get_settings().mongodb_url, serverSelectionTimeoutMS=2000)
+        try:
+            reports = explain_commands(client, captured)
+        except (PyMongoError, NotImplementedError) as e:
+            pytest.skip(f"explain unavailable: {e}")
+        finally:
+            client.close()
+
+        scans = [r for r in reports if r["collscan"] and r["filtered"] and r["collection"] not in allow]
+        if scans:
+            issued = "; ".join(f"{r['command']} {r['collection']} {r['shape'][:120]}" for r in scans)
+            pytest.fail(f"Collection scan{f' in {label}' if label else ''}: {issued}", pytrace=False)
+
+    return guard
+
+
+@pytest.fixture
+def mock_db():
+    """
+    Point db_manager at an in-memory mongomock database for the test and
+    return it. mongomock has no explain and only part of the aggregation
+    language; tests of pipelines it lacks need a real mongod.
+
+    Usage:
+        async def test_revoke(mock_db):
+            await mock_db.users.insert_one({...})
+    """
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+
+    from app.database import db_manager
+
+    saved = db_manager.client, db_manager.db
+    db_manager.client = mongomock_motor.AsyncMongoMockClient()
+    db_manager.db = db_manager.client["test"]
+    try:
+        yield db_manager.db
+    finally:
+        db_manager.client, db_manager.db = saved
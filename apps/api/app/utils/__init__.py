@@ -5,13 +5,19 @@ Utility Functions Package
 from app.utils.security import (
     hash_password,
     verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     decode_access_token,
+    revoke_user_tokens,
 )
 
 __all__ = [
     "hash_password",
     "verify_password", 
+    "hash_password_async",
+    "verify_password_async",
     "create_access_token",
     "decode_access_token",
+    "revoke_user_tokens",
 ]
@@ -0,0 +1,32 @@
+"""
+CSV Streaming
+Encode rows to CSV incrementally for StreamingResponse bodies
+"""
+
+import csv
+import io
+from typing import Any, AsyncIterator, Iterable, Sequence
+
+# Rows encoded per yielded chunk
+ROWS_PER_CHUNK = 500
+
+
+async def csv_lines(
+    header: Sequence[str],
+    rows: AsyncIterator[Iterable[Any]],
+    rows_per_chunk: int = ROWS_PER_CHUNK,
+) -> AsyncIterator[bytes]:
+    """UTF-8 CSV bytes: the header, then `rows` a chunk at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    pending = 0
+    async for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,106 @@
+"""
+Duration Utilities
+Convert Unolo "HH:MM:SS" duration strings to integer seconds, in Python and in Mongo
+"""
+
+from typing import Any, Dict, Optional
+
+# Unolo alias -> integer seconds field stored alongside it
+EOD_DURATION_FIELDS = {
+    "totalTimeTracked": "total_time_tracked_seconds",
+    "totalTimeAttendance": "total_time_attendance_seconds",
+    "totalTravelTime": "total_travel_time_seconds",
+    "totalTimeSpentWithClient": "total_time_spent_with_client_seconds",
+    "totalActualTimeSpentWithClient": "total_actual_time_spent_with_client_seconds",
+    "totalBreakTime": "total_break_time_seconds",
+    "maxBreakTime": "max_break_time_seconds",
+    "totalUnproductiveTime": "total_unproductive_time_seconds",
+}
+
+ATTENDANCE_DURATION_FIELDS = {
+    "totalTimeTracked": "total_time_tracked_seconds",
+    "totalTimeAttendance": "total_time_attendance_seconds",
+}
+
+
+def parse_duration_seconds(value: Optional[str]) -> Optional[int]:
+    """Parses 'HH:MM:SS' string to seconds. Returns None if invalid or None."""
+    if not value or not isinstance(value, str):
+        return None
+    parts = value.split(':')
+    if len(parts) != 3:
+        return None
+    try:
+        h, m, s = map(int, parts)
+    except ValueError:
+        return None
+    return h * 3600 + m * 60 + s
+
+
+def seconds_to_minutes(seconds: Optional[int]) -> int:
+    """
+    Convert seconds to whole minutes, rounding the leftover seconds the way
+    the original HH:MM:SS parser did (round-half-even, so 30s rounds down).
+    """
+    if not seconds:
+        return 0
+    minutes, rest = divmod(seconds, 60)
+    return minutes + (1 if rest > 30 else 0)
+
+
+def add_duration_seconds(doc: Dict[str, Any], fields: Dict[str, str]) -> Dict[str, Any]:
+    """Add `*_seconds` integer fields next to the duration strings present in doc."""
+    for source, target in fields.items():
+        seconds = parse_duration_seconds(doc.get(source))
+        if seconds is not None:
+            doc[target] = seconds
+    return doc
+
+
+def duration_seconds_expr(field: str) -> Dict[str, Any]:
+    """
+    Mongo expression parsing a "HH:MM:SS" field (e.g. "$totalBreakTime") to seconds.
+    Evaluates to null for missing or malformed values.
+    """
+    def part(index: int) -> Dict[str, Any]:
+        return {"$convert": {
+            "input": {"$arrayElemAt": ["$$parts", index]},
+            "to": "int",
+            "onError": None,
+            "onNull": None
+        }}
+
+    return {
+        "$cond": [
+            {"$eq": [{"$type": field}, "string"]},
+            {"$let": {
+                "vars": {"parts": {"$split": [field, ":"]}},
+                "in": {"$cond": [
+                    {"$eq": [{"$size": "$$parts"}, 3]},
+                    {"$add": [
+                        {"$multiply": [part(0), 3600]},
+                        {"$multiply": [part(1), 60]},
+                        part(2)
+                    ]},
+                    None
+                ]}
+            }},
+            None
+        ]
+    }
+
+
+def stored_seconds_expr(source: str, target: str) -> Dict[str, Any]:
+    """
+    Mongo expression reading the stored `*_seconds` field, falling back to
+    parsing the string field for documents that predate the backfill.
+    """
+    return {"$ifNull": [f"${target}", duration_seconds_expr(f"${source}"), 0]}
+
+
+def minutes_expr(seconds: Any) -> Dict[str, Any]:
+    """Mongo counterpart of seconds_to_minutes."""
+    return {"$add": [
+        {"$floor": {"$divide": [seconds, 60]}},
+        {"$cond": [{"$gt": [{"$mod": [seconds, 60]}, 30]}, 1, 0]}
+    ]}
@@ -0,0 +1,114 @@
+"""
+Geo Utilities
+Parse Unolo GPS events and downsample location tracks for map rendering
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+# Mean Earth radius, for the local equirectangular projection
+EARTH_RADIUS_M = 6_371_000.0
+
+# Defaults for the stored low-resolution track
+TRACK_EPSILON_M = 25.0
+TRACK_MAX_POINTS = 500
+
+
+def parse_event_timestamp(value: Optional[str], tz: Optional[str] = None) -> Optional[datetime]:
+    """
+    Parse an event timestamp ("YYYY-MM-DD HH:MM:SS", local to `tz`) to an aware UTC datetime.
+    Returns None if it cannot be parsed.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is None:
+        try:
+            parsed = parsed.replace(tzinfo=ZoneInfo(tz or "UTC"))
+        except (ZoneInfoNotFoundError, ValueError):
+            parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _project(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Project lat/lon to metres on a plane centred on the track (fine at city scale)."""
+    lat0 = np.radians(lats.mean())
+    x = np.radians(lons) * np.cos(lat0) * EARTH_RADIUS_M
+    y = np.radians(lats) * EARTH_RADIUS_M
+    return np.column_stack((x, y))
+
+
+def douglas_peucker(points: np.ndarray, epsilon: float) -> np.ndarray:
+    """
+    Douglas-Peucker simplification of an (n, 2) array of planar points.
+    Returns a boolean mask of the points to keep.
+
+    Iterative, with the point-to-segment distances of each span computed in one
+    vectorized pass.
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        segment = points[end] - points[start]
+        inner = points[start + 1:end] - points[start]
+        length = np.hypot(segment[0], segment[1])
+
+        if length == 0.0:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+
+        index = int(np.argmax(distances))
+        if distances[index] > epsilon:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return keep
+
+
+def downsample_track(
+    events: List[Dict[str, Any]],
+    epsilon_m: float = TRACK_EPSILON_M,
+    max_points: int = TRACK_MAX_POINTS
+) -> List[Dict[str, Any]]:
+    """
+    Reduce time-ordered location events ({lat, lon, timestamp}) to a low-resolution track.
+
+    Douglas-Peucker with `epsilon_m` tolerance, then evenly thinned to at most
+    `max_points`. First and last points are always kept.
+    """
+    if len(events) <= 2:
+        return [{"lat": e["lat"], "lon": e["lon"], "timestamp": e["timestamp"]} for e in events]
+
+    lats = np.fromiter((e["lat"] for e in events), dtype=float, count=len(events))
+    lons = np.fromiter((e["lon"] for e in events), dtype=float, count=len(events))
+
+    keep = douglas_peucker(_project(lats, lons), epsilon_m)
+    indices = np.flatnonzero(keep)
+
+    if len(indices) > max_points:
+        picks = np.unique(np.linspace(0, len(indices) - 1, max_points).round().astype(int))
+        indices = indices[picks]
+
+    return [
+        {"lat": events[i]["lat"], "lon": events[i]["lon"], "timestamp": events[i]["timestamp"]}
+        for i in indices.tolist()
+    ]
@@ -0,0 +1,65 @@
+"""
+HyperLogLog Utilities
+Distinct-count sketches stored as sparse {register: rank} maps in Mongo
+
+A sketch has 2**PRECISION registers. Adding a value sets one register to
+the max of its current rank and the value's rank, so sketches are updated
+with an atomic `$max` on "registers.<index>" and merged by taking the
+register-wise max. Only registers that were ever set are stored, which
+keeps small sketches (one employee's clients in one area on one day) tiny.
+
+With PRECISION = 12 the estimate's relative standard error is
+1.04 / sqrt(4096) ~= 1.6%: about 95% of estimates fall within ±3.3% of the
+true count and 99.7% within ±4.9%. Small counts use linear counting and are
+typically exact or off by one.
+"""
+
+import hashlib
+import math
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+PRECISION = 12
+NUM_REGISTERS = 1 << PRECISION
+RELATIVE_ERROR = 1.04 / math.sqrt(NUM_REGISTERS)
+
+_RANK_BITS = 64 - PRECISION
+_RANK_MASK = (1 << _RANK_BITS) - 1
+_ALPHA = 0.7213 / (1 + 1.079 / NUM_REGISTERS)
+
+
+def register_for(value: str) -> Tuple[int, int]:
+    """(register index, rank) for a value: 64-bit blake2b, top bits pick the register."""
+    h = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+    rest = h & _RANK_MASK
+    return h >> _RANK_BITS, _RANK_BITS - rest.bit_length() + 1
+
+
+def add(registers: Dict[str, int], value: str) -> None:
+    """Add a value to an in-memory sparse sketch."""
+    index, rank = register_for(value)
+    key = str(index)
+    if registers.get(key, 0) < rank:
+        registers[key] = rank
+
+
+def merge(sketches: Iterable[Dict[str, int]]) -> np.ndarray:
+    """Register-wise max of sparse sketches, as a dense uint8 array."""
+    dense = np.zeros(NUM_REGISTERS, dtype=np.uint8)
+    for sketch in sketches:
+        if sketch:
+            indexes = np.fromiter((int(k) for k in sketch), dtype=np.intp, count=len(sketch))
+            ranks = np.fromiter(sketch.values(), dtype=np.uint8, count=len(sketch))
+            np.maximum.at(dense, indexes, ranks)
+    return dense
+
+
+def estimate(dense: np.ndarray) -> int:
+    """Cardinality estimate of a dense register array."""
+    raw = _ALPHA * NUM_REGISTERS ** 2 / float(np.sum(np.ldexp(1.0, -dense.astype(np.int32))))
+    zeros = int(np.count_nonzero(dense == 0))
+    if raw <= 2.5 * NUM_REGISTERS and zeros:
+        # Linear counting is far more accurate while many registers are empty
+        return round(NUM_REGISTERS * math.log(NUM_REGISTERS / zeros))
+    return round(raw)
@@ -3,8 +3,14 @@ Security Utilities
 Password hashing and JWT token management
 """
 
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional, Set, Tuple
 
 import bcrypt
 from jose import JWTError, jwt
@@ -25,7 +31,7 @@ def hash_password(password: str) -> str:
     """
     # Encode password and truncate to 72 bytes (bcrypt limit)
     password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=get_settings().bcrypt_rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -47,6 +53,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+# bcrypt releases the GIL, so hashes run in parallel on these threads while
+# the event loop keeps serving; the bound caps CPU spent on logins at once
+_password_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=get_settings().bcrypt_max_workers, thread_name_prefix="bcrypt"
+        )
+    return _password_executor
+
+
+def shutdown_password_executor() -> None:
+    """Stop the bcrypt threads (application shutdown)."""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False)
+        _password_executor = None
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bcrypt thread pool; use this from request handlers."""
+    return await asyncio.get_running_loop().run_in_executor(_executor(), hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt thread pool; use this from request handlers."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _executor(), verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(
     user_id: str,
     email: str,
@@ -103,16 +143,148 @@ def create_access_token(
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[TokenData]:
+class TokenCache:
     """
-    Decode and validate a JWT access token.
-    
-    Args:
-        token: JWT token string
-        
-    Returns:
-        TokenData if valid, None if invalid or expired
+    Bounded LRU of verified tokens: sha256(token) -> (TokenData, iat, wall
+    deadline, monotonic deadline). An entry is served only while both clocks
+    are before exp minus `skew` seconds, so a wall clock stepping backwards
+    cannot stretch a token's life and a slow clock cannot serve it past exp.
+    Revocation is checked on every decode, cached or not (see decode_access_token).
+    """
+
+    def __init__(self, maxsize: int, skew: float = 30.0):
+        self.maxsize = maxsize
+        self.skew = skew
+        self._entries: "OrderedDict[bytes, Tuple[TokenData, float, float, float]]" = OrderedDict()
+        self._by_user: Dict[str, Set[bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[Tuple[TokenData, float]]:
+        """(TokenData, iat) of a cached token, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            data, issued_at, wall_deadline, mono_deadline = entry
+            if time.time() >= wall_deadline or time.monotonic() >= mono_deadline:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data, issued_at
+
+    def put(self, key: bytes, data: TokenData, issued_at: float, exp: float) -> None:
+        remaining = exp - self.skew - time.time()
+        if self.maxsize <= 0 or remaining <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (data, issued_at, exp - self.skew, time.monotonic() + remaining)
+            self._entries.move_to_end(key)
+            self._by_user.setdefault(data.user_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: bytes) -> None:
+        data = self._entries.pop(key)[0]
+        keys = self._by_user.get(data.user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[data.user_id]
+
+    def evict_user(self, user_id: str) -> int:
+        """Drop every cached token of `user_id`; returns how many were dropped."""
+        with self._lock:
+            keys = list(self._by_user.get(user_id, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_token_cache: Optional[TokenCache] = None
+
+
+def token_cache() -> TokenCache:
+    global _token_cache
+    if _token_cache is None:
+        settings = get_settings()
+        _token_cache = TokenCache(settings.token_cache_size, settings.token_cache_skew_seconds)
+    return _token_cache
+
+
+# user_id -> (users.tokens_valid_after as epoch seconds, monotonic time it was read)
+_valid_after: Dict[str, Tuple[float, float]] = {}
+
+
+async def _load_tokens_valid_after(user_id: str) -> float:
+    from bson import ObjectId
+
+    from app.database import db_manager
+
+    if not ObjectId.is_valid(user_id):
+        return 0.0
+    doc = await db_manager.get_collection("users").find_one(
+        {"_id": ObjectId(user_id)}, {"_id": 0, "tokens_valid_after": 1}
+    )
+    valid_after = (doc or {}).get("tokens_valid_after")
+    # Mongo returns naive UTC datetimes
+    return valid_after.replace(tzinfo=timezone.utc).timestamp() if valid_after else 0.0
+
+
+async def tokens_valid_after(user_id: str) -> float:
     """
+    Epoch seconds before which the user's tokens are revoked (0 if never).
+    Read from the user document at most every token_revocation_check_seconds
+    per worker, so a revocation made in another worker applies within that delay.
+    """
+    entry = _valid_after.get(user_id)
+    if entry is not None and time.monotonic() - entry[1] < get_settings().token_revocation_check_seconds:
+        return entry[0]
+    value = await _load_tokens_valid_after(user_id)
+    _valid_after[user_id] = (value, time.monotonic())
+    return value
+
+
+async def revoke_user_tokens(user_id: str) -> datetime:
+    """
+    Revoke every token issued to the user so far (password changes and role
+    updates): stores users.tokens_valid_after, which every worker checks on
+    decode, and drops the user's cached tokens in this worker.
+
+    iat has whole-second precision, so the cut-off is truncated to the second:
+    a token issued later in the same second (a fresh login) stays valid.
+    """
+    from bson import ObjectId
+
+    from app.database import db_manager
+
+    user_id = str(user_id)
+    valid_after = datetime.now(timezone.utc).replace(microsecond=0)
+    await db_manager.get_collection("users").update_one(
+        {"_id": ObjectId(user_id)}, {"$set": {"tokens_valid_after": valid_after}}
+    )
+    _valid_after[user_id] = (valid_after.timestamp(), time.monotonic())
+    token_cache().evict_user(user_id)
+    return valid_after
+
+
+def _decode_token(token: str) -> Optional[Tuple[TokenData, float, float]]:
     settings = get_settings()
     
     try:
@@ -134,7 +306,7 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         
         role = UserRole(role_str) if role_str else None
         
-        return TokenData(
+        token_data = TokenData(
             user_id=user_id,
             email=email,
             full_name=full_name,
@@ -142,6 +314,38 @@ def decode_access_token(token: str) -> Optional[TokenData]:
             empId=empId,
             employeeId=employeeId
         )
+        return token_data, float(payload.get("iat") or 0), float(payload.get("exp") or 0)
         
     except JWTError:
         return None
+
+
+async def decode_access_token(token: str) -> Optional[TokenData]:
+    """
+    Decode and validate a JWT access token.
+    
+    Verified tokens are cached (see TokenCache) until shortly before they
+    expire; the returned TokenData is shared and must not be modified.
+    Tokens issued before the user's revocation time are rejected, cached or not.
+    
+    Args:
+        token: JWT token string
+        
+    Returns:
+        TokenData if valid, None if invalid, expired or revoked
+    """
+    cache = token_cache()
+    key = cache.key(token)
+    cached = cache.get(key)
+    if cached is not None:
+        token_data, issued_at = cached
+    else:
+        decoded = _decode_token(token)
+        if decoded is None:
+            return None
+        token_data, issued_at, exp = decoded
+        cache.put(key, token_data, issued_at, exp)
+
+    if issued_at < await tokens_valid_after(token_data.user_id):
+        return None
+    return token_data
@@ -0,0 +1,85 @@
+"""
+Task Metadata Utilities
+Helpers for reading loosely-typed Unolo task fields
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.schemas.task import SchoolCategory
+
+# Categories Unolo can report; anything else is treated as NoInfo
+KNOWN_SCHOOL_CATEGORIES = {
+    SchoolCategory.HOT.value,
+    SchoolCategory.COLD.value,
+    SchoolCategory.WARM.value,
+}
+
+
+def parse_school_category(metadata: Optional[Dict[str, Any]]) -> str:
+    """
+    Extract schoolCategory from task metadata.
+
+    Unolo sends it either as a list (["Hot"]) or as a plain string.
+    Returns one of Hot/Cold/Warm/NoInfo.
+    """
+    if not metadata:
+        return SchoolCategory.NO_INFO.value
+
+    value = metadata.get("schoolCategory")
+    if isinstance(value, list):
+        value = value[0] if value else None
+
+    if value in KNOWN_SCHOOL_CATEGORIES:
+        return value
+    return SchoolCategory.NO_INFO.value
+
+
+def parse_specimens_given(metadata: Optional[Dict[str, Any]]) -> int:
+    """
+    Extract specimensGiven from task metadata as a non-negative int.
+
+    Unolo sends numbers, numeric strings, "" or a single-item list.
+    Anything unparseable counts as 0.
+    """
+    if not metadata:
+        return 0
+
+    value = metadata.get("specimensGiven")
+    if isinstance(value, list):
+        value = value[0] if value else None
+
+    if value is None or isinstance(value, bool):
+        return 0
+    try:
+        count = int(value) if isinstance(value, (int, float)) else int(str(value).strip())
+    except (ValueError, OverflowError):
+        return 0
+    return max(count, 0)
+
+
+def extract_typed_fields(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the typed top-level task fields derived from metadata.
+    Applied to every task on ingest (sync and webhook) and by the backfill.
+    """
+    return {
+        "specimens_given": parse_specimens_given(metadata),
+        "school_category": parse_school_category(metadata),
+    }
+
+
+def parse_checkin_time(value: Any) -> Optional[datetime]:
+    """
+    Coerce a checkinTime value (datetime or ISO string) to an aware datetime.
+    Returns None if it cannot be parsed.
+    """
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return None
@@ -0,0 +1,88 @@
+"""
+Streaming Upload Parsing
+Turns a request body stream into rows without holding the whole upload
+
+NDJSON yields one dict per line. CSV yields one dict per record keyed by the
+header row, with empty cells dropped (like a spreadsheet export to JSON);
+quoted fields may span lines. Rows come out with their 1-based row number.
+"""
+
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-seq"}
+CSV_TYPES = {"text/csv", "application/csv"}
+
+
+class UploadError(ValueError):
+    """A row that cannot be parsed; `row` is its 1-based number."""
+
+    def __init__(self, row: int, message: str):
+        super().__init__(f"Row {row}: {message}")
+        self.row = row
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decoded text lines (without line endings) from a byte stream."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """(row number, object) per non-blank line; raises UploadError on bad JSON."""
+    row = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            value = json.loads(line)
+        except ValueError as e:
+            raise UploadError(row, f"invalid JSON ({e})")
+        if not isinstance(value, dict):
+            raise UploadError(row, "expected a JSON object")
+        yield row, value
+
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """(row number, {header: value}) per CSV record; row 1 is the first after the header."""
+    header: List[str] = []
+    record = ""
+    row = 0
+    async for line in iter_lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        # An odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if not header:
+            header = [h.strip() for h in values]
+            continue
+        row += 1
+        yield row, {h: v for h, v in zip(header, values) if h and v != ""}
+    if record:
+        raise UploadError(row + 1, "unterminated quoted field")
+
+
+def upload_rows(content_type: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """Row iterator for an NDJSON or CSV body; ValueError for other content types."""
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in NDJSON_TYPES:
+        return iter_ndjson(chunks)
+    if media_type in CSV_TYPES:
+        return iter_csv(chunks)
+    raise ValueError(f"Unsupported content type: {media_type or 'none'}")
+
@@ -0,0 +1,37 @@
+"""
+XLSX Writer Process
+Builds a workbook from row batches received over a pipe, in its own process
+
+Lives outside app.utils, whose __init__ loads security and settings: the
+spawned child imports only this module (app/__init__ defines nothing but
+__version__), so it starts quickly. The parent sends lists of row tuples and then None; the child
+appends them to an openpyxl write-only worksheet (rows are flushed to a temp
+file as they arrive, so memory stays flat), saves the workbook to `path` and
+answers ("ok", rows) or ("error", message).
+"""
+
+from multiprocessing.connection import Connection
+from typing import Sequence
+
+
+def write_xlsx(path: str, title: str, header: Sequence[str], conn: Connection) -> None:
+    rows = 0
+    try:
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=title)
+        sheet.append(list(header))
+        while True:
+            batch = conn.recv()
+            if batch is None:
+                break
+            for row in batch:
+                sheet.append(row)
+            rows += len(batch)
+        workbook.save(path)
+        conn.send(("ok", rows))
+    except Exception as e:  # reported to the parent, which fails the export
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
@@ -0,0 +1,29 @@
+"""
+Benchmark Suite
+Synthetic data, a load driver and baseline comparison for the API
+
+Usage (from apps/api, against a local mongod and a running API):
+    python -m bench.generate --scale small --database brinda_bench --drop
+    DATABASE_NAME=brinda_bench uvicorn app.main:app --port 8000
+    python -m bench.load --base-url http://localhost:8000 --save-baseline bench/baseline.json
+    python -m bench.load --base-url http://localhost:8000 --compare bench/baseline.json
+
+Sync and webhook paths run offline against the fake Unolo server:
+    python -m bench.fake_unolo serve --port 9000 --latency-ms 150
+    python -m bench.fake_unolo fire --target http://localhost:8000 --kind tasks --count 5000
+
+Production request logs (logs/api.log*, gzipped or not) are summarized with:
+    python -m bench.log_report logs/
+
+Queries the API issues are explained against the bench data, with index advice, by:
+    python -m bench.index_advisor --database brinda_bench
+
+bcrypt cost, its effect on event loop latency, and JWT auth overhead (no server needed):
+    python -m bench.login_bench --rounds 10,12
+    python -m bench.auth_bench
+
+Exact vs approximate (HyperLogLog) unique-client counts, in a scratch database:
+    python -m bench.unique_clients_bench --tasks 1000000 --keep
+
+The generator is seeded, so the same --seed and --scale always produce the same data.
+"""
@@ -0,0 +1,83 @@
+"""
+Auth Dependency Microbenchmark
+Per-request cost of get_current_user with and without the verified-token cache
+
+Times --iterations calls of the get_current_user dependency for one token,
+first with the cache disabled (every call verifies the HMAC and builds
+TokenData, as before the cache) and then with it enabled. Dashboards send
+the same token 5-10 times per page view, which is the cached case.
+
+Usage (from apps/api):
+    python -m bench.auth_bench
+    python -m bench.auth_bench --iterations 50000 --json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict
+
+
+async def time_dependency(token: str, iterations: int, cache_size: int) -> Dict[str, Any]:
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from app.middleware.auth import get_current_user
+    from app.utils import security
+
+    security._token_cache = security.TokenCache(cache_size)
+    # No database here: the token was never revoked
+    async def never_revoked(user_id: str) -> float:
+        return 0.0
+
+    security._load_tokens_valid_after = never_revoked
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    request = SimpleNamespace(state=SimpleNamespace())
+
+    await get_current_user(request, credentials)  # warm up (and fill the cache)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await get_current_user(request, credentials)
+    elapsed = time.perf_counter() - started
+    return {
+        "cache": "enabled" if cache_size else "disabled",
+        "iterations": iterations,
+        "us_per_call": round(elapsed / iterations * 1e6, 2),
+        "calls_per_second": round(iterations / elapsed),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the JWT auth dependency")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    from app.schemas.user import UserRole
+    from app.utils.security import create_access_token
+
+    token = create_access_token(
+        user_id="65b000000000000000000001", email="bench-admin@brinda.com",
+        role=UserRole.ADMIN, full_name="Bench Admin", empId="100000", employeeId="180000",
+    )
+    results = [
+        asyncio.run(time_dependency(token, args.iterations, 0)),
+        asyncio.run(time_dependency(token, args.iterations, 10000)),
+    ]
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return 0
+
+    for r in results:
+        print(f"cache {r['cache']:<9} {r['us_per_call']:>9} µs/call  {r['calls_per_second']:>9} calls/s")
+    speedup = results[0]["us_per_call"] / results[1]["us_per_call"] if results[1]["us_per_call"] else 0
+    print(f"\n{speedup:.1f}x faster with the cache")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Fake Unolo Server
+Local stand-in for the Unolo external API, plus a webhook burst driver
+
+Serves the endpoints UnoloClient calls from a SyntheticDataset, with injectable
+latency, errors and throttling. In record mode requests are proxied to the real
+API and the responses saved; replay mode serves those recordings instead.
+
+Usage (from apps/api):
+    python -m bench.fake_unolo serve --port 9000 --scale small --latency-ms 150 --error-rate 0.02
+    UNOLO_BASE_URL=http://localhost:9000 UNOLO_ID=bench UNOLO_TOKEN=bench uvicorn app.main:app
+
+    python -m bench.fake_unolo serve --record recordings/ --upstream https://api-lb-ext.unolo.com
+    python -m bench.fake_unolo serve --replay recordings/
+
+    python -m bench.fake_unolo fire --target http://localhost:8000 --kind tasks --count 5000 --batch 20
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from bench.synthetic import SCALES, SyntheticDataset
+
+# Longest range served per request, like the real API's limits
+MAX_RANGE_DAYS = 31
+
+
+@dataclass
+class FaultConfig:
+    # Added to every response: latency_ms +/- jitter_ms
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Fraction of requests answered with a 500
+    error_rate: float = 0.0
+    # Requests per second allowed before answering 429 (0 = unlimited)
+    rate_limit: float = 0.0
+
+
+class Throttle:
+    """Token bucket shared by all endpoints."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def allow(self) -> bool:
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class Recorder:
+    """Stores and looks up responses by method, path and query string."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _file(self, method: str, path: str, query: str) -> str:
+        params = "&".join(sorted(query.split("&"))) if query else ""
+        digest = hashlib.sha1(f"{method} {path}?{params}".encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{path.strip('/').replace('/', '_')}-{digest}.json")
+
+    def save(self, method: str, path: str, query: str, status: int, body: Any) -> None:
+        with open(self._file(method, path, query), "w") as f:
+            json.dump({"method": method, "path": path, "query": query, "status": status, "body": body}, f)
+
+    def load(self, method: str, path: str, query: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._file(method, path, query)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+
+def _date_range(request: Request) -> List[date]:
+    try:
+        start = date.fromisoformat(request.query_params["start"])
+        end = date.fromisoformat(request.query_params["end"])
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=400, detail="start and end (YYYY-MM-DD) are required")
+    if end < start or (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range must be 1-{MAX_RANGE_DAYS} days")
+    return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+def create_app(
+    dataset: SyntheticDataset,
+    faults: FaultConfig = FaultConfig(),
+    recorder: Optional[Recorder] = None,
+    replay: bool = False,
+    upstream: Optional[str] = None,
+) -> FastAPI:
+    app = FastAPI(title="Fake Unolo API")
+    throttle = Throttle(faults.rate_limit)
+    stats: Dict[str, int] = {"requests": 0, "throttled": 0, "errors": 0}
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if not request.url.path.startswith("/api/protected"):
+            return await call_next(request)
+
+        stats["requests"] += 1
+        if not request.headers.get("id") or not request.headers.get("token"):
+            return JSONResponse({"error": "Missing id/token headers"}, status_code=401)
+        if not throttle.allow():
+            stats["throttled"] += 1
+            return JSONResponse({"error": "Too many requests"}, status_code=429, headers={"Retry-After": "1"})
+
+        delay = faults.latency_ms + random.uniform(-faults.jitter_ms, faults.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if faults.error_rate and random.random() < faults.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": "Injected failure"}, status_code=500)
+
+        query = request.url.query
+        if replay and recorder:
+            recorded = recorder.load(request.method, request.url.path, query)
+            if recorded is None:
+                return JSONResponse({"error": "No recording for this request"}, status_code=404)
+            return JSONResponse(recorded["body"], status_code=recorded["status"])
+
+        if upstream:
+            async with httpx.AsyncClient(base_url=upstream, timeout=60.0) as client:
+                response = await client.request(
+                    request.method, request.url.path, params=request.query_params,
+                    headers={"id": request.headers["id"], "token": request.headers["token"]},
+                )
+            body = response.json()
+            if recorder:
+                recorder.save(request.method, request.url.path, query, response.status_code, body)
+            return JSONResponse(body, status_code=response.status_code)
+
+        return await call_next(request)
+
+    @app.get("/api/protected/employeeMaster")
+    async def employee_master():
+        return [{k: v for k, v in e.items() if k != "userID"} for e in dataset.employees()]
+
+    @app.get("/api/protected/v2/clients")
+    async def clients():
+        return dataset.clients()
+
+    @app.get("/api/protected/tasksDetail/v2")
+    async def tasks_detail(request: Request):
+        name = request.query_params.get("customTaskName", "").lower()
+        return [
+            t for day in _date_range(request) for t in dataset.tasks_for_day(day)
+            if not name or t["customEntity"]["customEntityName"].lower() == name
+        ]
+
+    @app.get("/api/protected/eodSummary")
+    async def eod_summary(request: Request):
+        return [r for day in _date_range(request) for r in dataset.eod_summaries_for_day(day)]
+
+    @app.get("/api/protected/getAttendance")
+    async def get_attendance(request: Request):
+        return [r for day in _date_range(request) for r in dataset.attendance_for_day(day)]
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+async def fire_webhooks(
+    target: str,
+    kind: str,
+    dataset: SyntheticDataset,
+    count: int,
+    batch: int,
+    concurrency: int,
+    secret: str,
+) -> Dict[str, Any]:
+    """POST `count` tasks or clients to /api/webhooks/<kind> in batches; returns throughput stats."""
+    if kind == "tasks":
+        records: List[Dict[str, Any]] = []
+        for day in dataset.days():
+            records.extend(dataset.tasks_for_day(day))
+            if len(records) >= count:
+                break
+    else:
+        records = list(dataset.clients())
+    records = records[:count]
+    batches = [records[i:i + batch] for i in range(0, len(records), batch)]
+
+    latencies: List[float] = []
+    failures = 0
+    queue: "asyncio.Queue[List[Dict[str, Any]]]" = asyncio.Queue()
+    for b in batches:
+        queue.put_nowait(b)
+
+    async with httpx.AsyncClient(base_url=target, timeout=120.0) as client:
+        async def worker():
+            nonlocal failures
+            while not queue.empty():
+                payload = queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        f"/api/webhooks/{kind}", json=payload, headers={"X-Webhook-Secret": secret}
+                    )
+                    if response.status_code >= 400:
+                        failures += 1
+                except httpx.HTTPError:
+                    failures += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "kind": kind,
+        "records": len(records),
+        "requests": len(batches),
+        "failed_requests": failures,
+        "seconds": round(elapsed, 2),
+        "records_per_second": round(len(records) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(latencies[len(latencies) // 2], 2) if latencies else 0.0,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)], 2) if latencies else 0.0,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fake Unolo API and webhook driver")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for p in (sub.add_parser("serve"), sub.add_parser("fire")):
+        p.add_argument("--scale", choices=sorted(SCALES), default="small")
+        p.add_argument("--seed", type=int, default=42)
+        p.add_argument("--end", type=date.fromisoformat, default=date(2026, 1, 31))
+
+    serve = sub.choices["serve"]
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=9000)
+    serve.add_argument("--latency-ms", type=float, default=0.0)
+    serve.add_argument("--jitter-ms", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--rate-limit", type=float, default=0.0, help="Requests/second before 429s")
+    serve.add_argument("--record", metavar="DIR", help="Proxy to --upstream and save responses")
+    serve.add_argument("--upstream", help="Real Unolo base URL for --record")
+    serve.add_argument("--replay", metavar="DIR", help="Serve saved responses")
+
+    fire = sub.choices["fire"]
+    fire.add_argument("--target", default="http://localhost:8000")
+    fire.add_argument("--kind", choices=["tasks", "clients"], default="tasks")
+    fire.add_argument("--count", type=int, default=1000)
+    fire.add_argument("--batch", type=int, default=20)
+    fire.add_argument("--concurrency", type=int, default=10)
+    fire.add_argument("--webhook-secret", default=os.getenv("WEBHOOK_SECRET", ""))
+
+    args = parser.parse_args(argv)
+    dataset = SyntheticDataset(SCALES[args.scale], seed=args.seed, end=args.end)
+
+    if args.command == "fire":
+        result = asyncio.run(fire_webhooks(
+            args.target, args.kind, dataset, args.count, args.batch, args.concurrency, args.webhook_secret
+        ))
+        print(json.dumps(result, indent=2))
+        return 1 if result["failed_requests"] else 0
+
+    if args.record and not args.upstream:
+        parser.error("--record needs --upstream")
+    import uvicorn
+
+    faults = FaultConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit)
+    directory = args.record or args.replay
+    app = create_app(
+        dataset, faults,
+        recorder=Recorder(directory) if directory else None,
+        replay=bool(args.replay),
+        upstream=args.upstream if args.record else None,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
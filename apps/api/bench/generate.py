@@ -0,0 +1,238 @@
+"""
+Benchmark Data Loader
+Loads a synthetic dataset into a local MongoDB database
+
+Tasks and clients are converted exactly as the sync does and bulk inserted;
+EOD summaries and attendance go through the repositories, so heavy fields,
+duration seconds and location events are stored the way production stores them.
+
+Usage (from apps/api):
+    python -m bench.generate --scale small --database brinda_bench --drop
+    python -m bench.generate --scale large --seed 7 --mongodb-url mongodb://localhost:27017
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List
+
+from bench.synthetic import SCALES, SyntheticDataset
+
+# Documents per insert_many / concurrent upserts per day
+BATCH_SIZE = 5000
+UPSERT_CONCURRENCY = 8
+# Tasks sketched in memory per write round of the client sketch backfill
+SKETCH_BATCH_SIZE = 100_000
+
+# Password of every bench user (employees and bench-admin@brinda.com)
+BENCH_PASSWORD = "admin123"
+BENCH_ADMIN_EMAIL = "bench-admin@brinda.com"
+
+KNOWN_TASK_FIELDS = {
+    "taskID", "clientID", "employeeID", "internalEmpID", "date",
+    "checkinTime", "checkoutTime", "lat", "lon", "taskDescription",
+    "address", "customFieldsComplex", "customEntity",
+    "createdBy", "createdByName", "lastModifiedBy", "lastModifiedByName"
+}
+
+
+def task_document(item: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Convert a raw Unolo task the way sync_tasks + task_repository.upsert do."""
+    from app.schemas.task import TaskCreate
+    from app.utils.task_metadata import extract_typed_fields
+
+    item = dict(item)
+    item["clientID"] = str(item["clientID"])
+    item["employeeID"] = str(item["employeeID"])
+    metadata = {k: v for k, v in item.items() if k not in KNOWN_TASK_FIELDS}
+    item["metadata"] = metadata
+    item.update(extract_typed_fields(metadata))
+
+    doc = TaskCreate(**item).model_dump(by_alias=True, exclude_none=True)
+    d = doc["date"]
+    doc["date"] = datetime(d.year, d.month, d.day)
+    for field in ("checkinTime", "checkoutTime"):
+        if isinstance(doc.get(field), str):
+            doc[field] = datetime.fromisoformat(doc[field])
+    doc["created_at_local"] = now
+    doc["updated_at_local"] = now
+    return doc
+
+
+def client_document(item: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Convert a raw Unolo client the way the clients sync inserts it."""
+    contact_name, _, contact_number = (item.get("contact") or "").partition(" @ ")
+    doc = {
+        "Client Name (*)": item["clientName"],
+        "Address (*)": item["address"],
+        "Latitude": item["lat"],
+        "Longitude": item["lng"],
+        "unolo_client_id": item["clientID"],
+        "Contact Name (*)": contact_name or "N/A",
+        "Contact Number (*)": contact_number or "N/A",
+        "Country Code (*)": "+91",
+        "Visible To (*)": str(item["createdByEmpID"]),
+        "Employee ID": str(item["createdByEmpID"]),
+        "Can exec change location (*)": True,
+        "Client Catagory (*)": item["clientCatagory"],
+        "Division Name new (*)": item["divisionNameNew"],
+        "Using Material (*)": item["usingMaterial"],
+        "School Strength": item.get("schoolStrength"),
+        "Using IIT (*)": item["usingIIT"],
+        "Using AI (*)": "No",
+        "Radius(m)": item.get("radius"),
+        "Otp Verified": bool(item.get("otpVerified")),
+        "Created At": now,
+        "Last Modified At": now,
+    }
+    return {k: v for k, v in doc.items() if v is not None}
+
+
+async def _insert_batches(collection, docs, label: str) -> int:
+    total = 0
+    batch: List[Dict[str, Any]] = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= BATCH_SIZE:
+            await collection.insert_many(batch, ordered=False)
+            total += len(batch)
+            batch = []
+            print(f"  {label}: {total}", end="\r", flush=True)
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+        total += len(batch)
+    print(f"  {label}: {total}")
+    return total
+
+
+async def _upsert_concurrently(upsert, records) -> None:
+    semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
+
+    async def run(record):
+        async with semaphore:
+            await upsert(record)
+
+    await asyncio.gather(*(run(r) for r in records))
+
+
+async def load(dataset: SyntheticDataset, drop: bool) -> Dict[str, int]:
+    from app.database import db_manager
+    from app.index_manager import sync_indexes
+    from app.models.employee import Employee
+    from app.repository.attendance_repository import attendance_repository
+    from app.repository.eod_summary_repository import eod_summary_repository
+    from app.schemas.unolo import UnoloAttendanceResponse, UnoloEodSummaryResponse
+    from app.schemas.user import UserRole
+    from app.utils.security import hash_password
+    from scripts.backfill_client_latest_visit import backfill as backfill_latest_visits
+    from scripts.backfill_client_sketches import backfill as backfill_client_sketches
+
+    await db_manager.connect()
+    counts: Dict[str, int] = {}
+    now = datetime.now(timezone.utc)
+
+    try:
+        if drop:
+            print(f"Dropping database {db_manager.db.name}...")
+            await db_manager.client.drop_database(db_manager.db.name)
+        # Same collections and indexes as the app creates at startup, before the bulk load
+        await sync_indexes()
+
+        started = time.perf_counter()
+        employees = [
+            Employee(**e).model_dump(exclude_none=True) for e in dataset.employees()
+        ]
+        counts["employees"] = await _insert_batches(
+            db_manager.get_collection("employees"), employees, "employees"
+        )
+
+        # One hash for every bench user: bcrypt cost would dominate otherwise
+        password_hash = hash_password(BENCH_PASSWORD)
+        users = [{
+            "email": f"{e['empID']}@brinda.com",
+            "password_hash": password_hash,
+            "full_name": e["empName"],
+            "role": UserRole.SALES_REP.value,
+            "empId": e["empID"],
+            "employeeId": e["employeeID"],
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        } for e in employees]
+        users.append({
+            "email": BENCH_ADMIN_EMAIL,
+            "password_hash": password_hash,
+            "full_name": "Bench Admin",
+            "role": UserRole.ADMIN.value,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        })
+        counts["users"] = await _insert_batches(db_manager.get_collection("users"), users, "users")
+
+        counts["clients"] = await _insert_batches(
+            db_manager.get_collection("clients"),
+            (client_document(c, now) for c in dataset.clients()),
+            "clients"
+        )
+        counts["tasks"] = await _insert_batches(
+            db_manager.get_collection("tasks"),
+            (task_document(t, now) for t in dataset.tasks()),
+            "tasks"
+        )
+
+        counts["eod_summaries"] = 0
+        counts["attendance"] = 0
+        for day in dataset.days():
+            eods = [UnoloEodSummaryResponse(**r) for r in dataset.eod_summaries_for_day(day)]
+            await _upsert_concurrently(eod_summary_repository.upsert, eods)
+            attendance = [UnoloAttendanceResponse(**r) for r in dataset.attendance_for_day(day)]
+            await _upsert_concurrently(attendance_repository.upsert, attendance)
+            counts["eod_summaries"] += len(eods)
+            counts["attendance"] += len(attendance)
+            print(f"  eod/attendance: {day.isoformat()}", end="\r", flush=True)
+        print(f"  eod_summaries: {counts['eod_summaries']}, attendance: {counts['attendance']}")
+
+        print(f"✓ Loaded in {time.perf_counter() - started:.1f}s")
+    finally:
+        await db_manager.disconnect()
+
+    # Derived collections, built the same way as in production
+    await backfill_latest_visits()
+    await backfill_client_sketches(SKETCH_BATCH_SIZE)
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load a synthetic dataset into MongoDB")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2026, 1, 31),
+                        help="Last day of data (YYYY-MM-DD)")
+    parser.add_argument("--database", default="brinda_bench")
+    parser.add_argument("--mongodb-url", default=None, help="Defaults to MONGODB_URL")
+    parser.add_argument("--drop", action="store_true", help="Drop the database first")
+    args = parser.parse_args(argv)
+
+    if args.database in ("brinda_web",):
+        print("Refusing to load synthetic data into the application database", file=sys.stderr)
+        return 2
+
+    # Settings are read on first use, so the target must be set before app imports
+    os.environ["DATABASE_NAME"] = args.database
+    if args.mongodb_url:
+        os.environ["MONGODB_URL"] = args.mongodb_url
+
+    dataset = SyntheticDataset(SCALES[args.scale], seed=args.seed, end=args.end)
+    print(f"Generating scale={args.scale} seed={args.seed} "
+          f"{dataset.start.isoformat()}..{dataset.end.isoformat()} into {args.database}")
+    counts = asyncio.run(load(dataset, args.drop))
+    print(", ".join(f"{k}={v}" for k, v in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Index Advisor Run
+Drives every load scenario once in-process and explains the queries it issued
+
+Requests go straight to the ASGI app (no server needed) while
+capture_commands() records each read command; app.index_advisor then explains
+them against the synthetic dataset and lists collection scans, high
+examined/returned ratios, recommended indexes and indexes nothing used.
+
+Usage (from apps/api, against data loaded by bench.generate):
+    python -m bench.index_advisor --database brinda_bench
+    python -m bench.index_advisor --database brinda_bench --json > advice.json
+    python -m bench.index_advisor --fail-on-collscan   # exit 1 on a filtered COLLSCAN
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from bench.generate import BENCH_ADMIN_EMAIL
+from bench.synthetic import SCALES, SyntheticDataset
+
+
+async def capture(dataset: SyntheticDataset, rounds: int, seed: int) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Run each non-sync scenario `rounds` times against the in-process app."""
+    from app.database import db_manager
+    from app.db_monitoring import capture_commands
+    from app.main import app
+    from bench.load import SCENARIOS, RunContext, login
+
+    await db_manager.connect()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://advisor", timeout=300.0) as client:
+            employee = dataset.employees()[0]
+            tokens = {
+                "admin": await login(client, BENCH_ADMIN_EMAIL),
+                "employee": await login(client, f"{employee['empID']}@brinda.com"),
+            }
+            ctx = RunContext(dataset, tokens, os.getenv("WEBHOOK_SECRET", ""))
+            with capture_commands() as captured:
+                for scenario in SCENARIOS:
+                    if scenario.sync or scenario.name.startswith("webhook"):
+                        continue
+                    auth = {"Authorization": f"Bearer {tokens[scenario.role]}"} if scenario.role in tokens else {}
+                    rng = random.Random(f"{seed}:{scenario.name}")
+                    for _ in range(rounds):
+                        spec = scenario.build(ctx, rng)
+                        response = await client.request(
+                            spec.method, spec.path, params=spec.params, json=spec.json,
+                            headers={**auth, **spec.headers},
+                        )
+                        status = "✓" if response.status_code < 400 else "✗"
+                        print(f"{status} {scenario.name} {response.status_code}", file=sys.stderr)
+        return list(captured)
+    finally:
+        await db_manager.disconnect()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Explain the API's queries and recommend indexes")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small",
+                        help="Scale the data was generated with (ids and dates must match)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2026, 1, 31))
+    parser.add_argument("--database", default="brinda_bench")
+    parser.add_argument("--mongodb-url", default=None)
+    parser.add_argument("--rounds", type=int, default=2, help="Requests per scenario")
+    parser.add_argument("--max-ratio", type=float, default=10.0,
+                        help="Docs examined per doc returned above which a query is flagged")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of text")
+    parser.add_argument("--fail-on-collscan", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so point them at the bench database first
+    os.environ["DATABASE_NAME"] = args.database
+    if args.mongodb_url:
+        os.environ["MONGODB_URL"] = args.mongodb_url
+
+    from pymongo import MongoClient
+
+    from app.config import get_settings
+    from app.index_advisor import explain_commands, print_report, unused_indexes
+
+    dataset = SyntheticDataset(SCALES[args.scale], seed=args.seed, end=args.end)
+    captured = asyncio.run(capture(dataset, args.rounds, args.seed))
+
+    client = MongoClient(get_settings().mongodb_url)
+    try:
+        reports = explain_commands(client, captured, max_ratio=args.max_ratio)
+        collections = sorted({r["collection"] for r in reports})
+        unused = unused_indexes(client[args.database], collections)
+    finally:
+        client.close()
+
+    if args.json:
+        json.dump({"queries": reports, "unused_indexes": unused}, sys.stdout, indent=2, default=str)
+        print()
+        problems = any(r["collscan"] and r["filtered"] for r in reports)
+    else:
+        problems = print_report(reports, unused)
+    return 1 if problems and args.fail_on_collscan else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
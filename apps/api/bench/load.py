@@ -0,0 +1,345 @@
+"""
+Benchmark Load Driver
+Runs request scenarios against a running API and reports latency percentiles
+
+Each scenario runs on its own for --duration seconds with --concurrency workers.
+Results are printed as a table and can be saved as a baseline; --compare flags
+scenarios whose p95 or throughput regressed beyond --threshold and exits 1.
+
+Usage (from apps/api, against data loaded by bench.generate):
+    python -m bench.load --base-url http://localhost:8000 --save-baseline bench/baseline.json
+    python -m bench.load --scenarios analytics_overview,tasks_list --compare bench/baseline.json
+    python -m bench.load --include-sync   # needs UNOLO_BASE_URL pointing at a fake Unolo server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from bench.generate import BENCH_ADMIN_EMAIL, BENCH_PASSWORD
+from bench.synthetic import SCALES, SyntheticDataset
+
+
+@dataclass
+class RequestSpec:
+    method: str
+    path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    json: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Scenario:
+    name: str
+    # Builds the next request; receives the run context and a per-worker RNG
+    build: Callable[["RunContext", random.Random], RequestSpec]
+    role: str = "admin"
+    sync: bool = False
+
+
+@dataclass
+class RunContext:
+    dataset: SyntheticDataset
+    tokens: Dict[str, str]
+    webhook_secret: str
+    # Date window queried by the analytics scenarios
+    window_days: int = 30
+
+    def window(self, rng: random.Random) -> Dict[str, str]:
+        latest_start = max(0, (self.dataset.end - self.dataset.start).days - self.window_days)
+        start = self.dataset.start + timedelta(days=rng.randrange(latest_start + 1))
+        end = min(start + timedelta(days=self.window_days), self.dataset.end)
+        return {"start": start.isoformat(), "end": end.isoformat()}
+
+    def employee(self, rng: random.Random) -> Dict[str, Any]:
+        return rng.choice(self.dataset.employees())
+
+
+def _employee_window(path: str, **extra) -> Callable[[RunContext, random.Random], RequestSpec]:
+    def build(ctx: RunContext, rng: random.Random) -> RequestSpec:
+        params = {**ctx.window(rng), "employee_id": str(ctx.employee(rng)["employeeID"]), **extra}
+        return RequestSpec("GET", path, params)
+    return build
+
+
+def _window(path: str) -> Callable[[RunContext, random.Random], RequestSpec]:
+    return lambda ctx, rng: RequestSpec("GET", path, ctx.window(rng))
+
+
+def _task_webhook(ctx: RunContext, rng: random.Random) -> RequestSpec:
+    # Replays a few real-shaped tasks; upserts keep the collection size stable
+    day = ctx.dataset.start + timedelta(days=rng.randrange(ctx.dataset.scale.days))
+    tasks = ctx.dataset.tasks_for_day(day)[:rng.randint(1, 10)] or ctx.dataset.tasks_for_day(ctx.dataset.end - timedelta(days=1))[:5]
+    return RequestSpec("POST", "/api/webhooks/tasks", json=tasks,
+                       headers={"X-Webhook-Secret": ctx.webhook_secret})
+
+
+def _client_webhook(ctx: RunContext, rng: random.Random) -> RequestSpec:
+    clients = ctx.dataset.clients()
+    start = rng.randrange(len(clients))
+    return RequestSpec("POST", "/api/webhooks/clients", json=clients[start:start + 5],
+                       headers={"X-Webhook-Secret": ctx.webhook_secret})
+
+
+def _sync_window(path: str, **extra) -> Callable[[RunContext, random.Random], RequestSpec]:
+    def build(ctx: RunContext, rng: random.Random) -> RequestSpec:
+        day = ctx.dataset.end - timedelta(days=rng.randrange(7))
+        return RequestSpec("POST", path, {"start": day.isoformat(), "end": day.isoformat(), **extra})
+    return build
+
+
+SCENARIOS: List[Scenario] = [
+    # Analytics
+    Scenario("analytics_overview", _window("/api/analytics/admin/overview")),
+    Scenario("analytics_admin_tasks", _window("/api/analytics/admin/tasks")),
+    Scenario("analytics_emp_tasks", _employee_window("/api/analytics/tasks")),
+    Scenario("analytics_area_wise", _employee_window("/api/analytics/tasks/area-wise")),
+    Scenario("analytics_school_category", _employee_window("/api/analytics/tasks/school-category")),
+    Scenario("analytics_not_visited", lambda ctx, rng: RequestSpec(
+        "GET", "/api/analytics/tasks/not-visited", {"employee_id": str(ctx.employee(rng)["employeeID"])})),
+    Scenario("emp_dashboard", _employee_window("/api/emp-analytics/dashboard")),
+    Scenario("all_emp_overview", _window("/api/all-emp-analytics/overview")),
+    # Lists
+    Scenario("tasks_list", lambda ctx, rng: RequestSpec(
+        "GET", "/api/tasks/", {**ctx.window(rng), "limit": 100, "skip": rng.randrange(0, 500, 100)})),
+    Scenario("clients_list", lambda ctx, rng: RequestSpec(
+        "GET", "/api/clients/", {"limit": 100, "skip": rng.randrange(0, 1000, 100)})),
+    Scenario("eod_list", lambda ctx, rng: RequestSpec("GET", "/api/eod-summary/", {**ctx.window(rng), "limit": 100})),
+    Scenario("attendance_list", lambda ctx, rng: RequestSpec("GET", "/api/attendance/", {**ctx.window(rng), "limit": 100})),
+    # Auth (bcrypt bound)
+    Scenario("login", lambda ctx, rng: RequestSpec(
+        "POST", "/api/auth/login", json={"email": f"{ctx.employee(rng)['empID']}@brinda.com", "password": BENCH_PASSWORD}),
+        role="none"),
+    # Webhooks
+    Scenario("webhook_tasks", _task_webhook, role="none"),
+    Scenario("webhook_clients", _client_webhook, role="none"),
+    # Syncs call Unolo; only run against a fake Unolo server
+    Scenario("sync_tasks", _sync_window("/api/sync/tasks", customTaskName="School Visit"), sync=True),
+    Scenario("sync_eod", _sync_window("/api/sync/eod-summary"), sync=True),
+    Scenario("sync_attendance", _sync_window("/api/sync/attendance"), sync=True),
+]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    duration_s: float
+    latencies_ms: List[float]
+    rss_mb_before: Optional[float] = None
+    rss_mb_after: Optional[float] = None
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return round(ordered[index], 2)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "throughput_rps": round(self.requests / self.duration_s, 2) if self.duration_s else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(max(self.latencies_ms), 2) if self.latencies_ms else 0.0,
+            "rss_mb_before": self.rss_mb_before,
+            "rss_mb_after": self.rss_mb_after,
+        }
+
+
+_RSS_RE = re.compile(r"^process_resident_memory_bytes\s+(\S+)", re.MULTILINE)
+
+
+async def server_rss_mb(client: httpx.AsyncClient, pid: Optional[int]) -> Optional[float]:
+    """Resident memory of the server: from /proc when its pid is known, else from /api/metrics."""
+    if pid:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return round(int(line.split()[1]) / 1024, 1)
+        except OSError:
+            return None
+    try:
+        token = os.getenv("METRICS_TOKEN")
+        response = await client.get("/api/metrics", headers={"Authorization": f"Bearer {token}"} if token else None)
+        match = _RSS_RE.search(response.text)
+        return round(float(match.group(1)) / 1024 / 1024, 1) if match else None
+    except httpx.HTTPError:
+        return None
+
+
+async def login(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/api/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: RunContext,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+    seed: int,
+    pid: Optional[int],
+) -> ScenarioResult:
+    result = ScenarioResult(scenario.name, 0, 0, 0.0, [])
+    result.rss_mb_before = await server_rss_mb(client, pid)
+    auth = {"Authorization": f"Bearer {ctx.tokens[scenario.role]}"} if scenario.role in ctx.tokens else {}
+    deadline = time.perf_counter() + duration
+
+    async def worker(n: int):
+        rng = random.Random(f"{seed}:{scenario.name}:{n}")
+        while time.perf_counter() < deadline:
+            spec = scenario.build(ctx, rng)
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    spec.method, spec.path, params=spec.params, json=spec.json,
+                    headers={**auth, **spec.headers},
+                )
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+            result.requests += 1
+            if not ok:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    result.duration_s = time.perf_counter() - started
+    result.rss_mb_after = await server_rss_mb(client, pid)
+    return result
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Scenarios whose p95 grew or throughput dropped by more than `threshold` (0.2 = 20%)."""
+    regressions = []
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+        if before["throughput_rps"] and now["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {before['throughput_rps']} -> {now['throughput_rps']} rps")
+        if now["error_rate"] > before["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {before['error_rate']} -> {now['error_rate']}")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    header = f"{'scenario':<28}{'reqs':>7}{'err%':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'rss MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<28}{r['requests']:>7}{r['error_rate'] * 100:>6.1f}%{r['throughput_rps']:>9}"
+            f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{str(r['rss_mb_after'] or '-'):>9}"
+        )
+
+
+async def run(args) -> Dict[str, Any]:
+    dataset = SyntheticDataset(SCALES[args.scale], seed=args.seed, end=args.end)
+    selected = [s for s in SCENARIOS if (args.include_sync or not s.sync)]
+    if args.scenarios:
+        names = set(args.scenarios.split(","))
+        selected = [s for s in SCENARIOS if s.name in names]
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        employee = dataset.employees()[0]
+        tokens = {
+            "admin": await login(client, BENCH_ADMIN_EMAIL),
+            "employee": await login(client, f"{employee['empID']}@brinda.com"),
+        }
+        ctx = RunContext(dataset, tokens, args.webhook_secret, window_days=args.window_days)
+
+        results = {}
+        for scenario in selected:
+            print(f"▶ {scenario.name}...", flush=True)
+            result = await run_scenario(
+                client, ctx, scenario, args.concurrency, args.duration, args.seed, args.server_pid
+            )
+            results[scenario.name] = result.summary()
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "base_url": args.base_url,
+        "scale": args.scale,
+        "seed": args.seed,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "scenarios": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run load scenarios against the API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small",
+                        help="Scale the data was generated with (ids and dates must match)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2026, 1, 31))
+    parser.add_argument("--scenarios", default="", help="Comma separated names (default: all non-sync)")
+    parser.add_argument("--include-sync", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per scenario")
+    parser.add_argument("--window-days", type=int, default=30)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--server-pid", type=int, default=None, help="Read server RSS from /proc")
+    parser.add_argument("--webhook-secret", default=os.getenv("WEBHOOK_SECRET", ""))
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--save-baseline", help="Write results JSON as the new baseline")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression (0.2 = 20%%)")
+    parser.add_argument("--list", action="store_true", help="List scenarios and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for s in SCENARIOS:
+            print(f"{s.name}{' (sync)' if s.sync else ''}")
+        return 0
+
+    report = asyncio.run(run(args))
+    print()
+    print_table(report["scenarios"])
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Results written to {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) vs {args.compare}:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n✓ No regressions vs {args.compare} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
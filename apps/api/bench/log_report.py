@@ -0,0 +1,333 @@
+"""
+API Log Report
+Latency percentiles, error rates and throughput from the request logs
+
+Streams any number of log files (logs/api.log, rotated api.log.YYYY-MM-DD,
+gzipped copies) line by line. Latencies go into t-digest sketches, so memory
+stays bounded however many lines are read. Both line formats are understood:
+    2026-01-30 19:23:57 - INFO - {"timestamp": ..., "path": ..., "process_time_ms": ...}
+    {"level":"INFO","timestamp":...,"path":...,"process_time_ms":...,"db_commands":3,"db_time_ms":1.2}
+
+Usage (from apps/api):
+    python -m bench.log_report logs/api.log*
+    python -m bench.log_report logs/ --since 2026-01-30 --json > report.json
+"""
+
+import argparse
+import glob
+import gzip
+import heapq
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+# Path segments replaced by {id} so routes group by template
+_ID_SEGMENT = re.compile(
+    r"^(?:[0-9a-f]{24}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)$",
+    re.IGNORECASE,
+)
+
+
+class TDigest:
+    """
+    Merging t-digest: values are buffered, then merged into centroids whose
+    size shrinks towards the tails, so extreme quantiles stay accurate.
+    Memory is O(compression) regardless of how many values are added.
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.centroids: List[List[float]] = []  # [mean, weight], sorted by mean
+        self.buffer: List[float] = []
+        self.count = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.buffer.append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self.buffer) >= self.compression * 5:
+            self._merge()
+
+    def _merge(self) -> None:
+        if not self.buffer:
+            return
+        points = sorted(self.centroids + [[v, 1.0] for v in self.buffer])
+        self.buffer = []
+        total = sum(w for _, w in points)
+
+        merged = [list(points[0])]
+        seen = 0.0
+        for mean, weight in points[1:]:
+            current = merged[-1]
+            q = (seen + current[1] + weight / 2) / total
+            limit = 4 * total * q * (1 - q) / self.compression
+            if current[1] + weight <= max(limit, 1.0):
+                current[0] += (mean - current[0]) * weight / (current[1] + weight)
+                current[1] += weight
+            else:
+                seen += current[1]
+                merged.append([mean, weight])
+        self.centroids = merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        self._merge()
+        if not self.centroids:
+            return None
+        if len(self.centroids) == 1 or q <= 0:
+            return self.min if q <= 0 else self.centroids[0][0]
+        if q >= 1:
+            return self.max
+
+        target = q * self.count
+        seen = 0.0
+        for i, (mean, weight) in enumerate(self.centroids):
+            if seen + weight / 2 >= target:
+                if i == 0:
+                    # Between the minimum and the first centroid's centre
+                    return self.min + (mean - self.min) * target / (weight / 2)
+                prev_mean, prev_weight = self.centroids[i - 1]
+                start = seen - prev_weight / 2
+                return prev_mean + (mean - prev_mean) * (target - start) / ((prev_weight + weight) / 2)
+            seen += weight
+        last_mean, last_weight = self.centroids[-1]
+        start = self.count - last_weight / 2
+        return last_mean + (self.max - last_mean) * (target - start) / (last_weight / 2)
+
+
+class RouteStats:
+    def __init__(self):
+        self.latency = TDigest()
+        self.errors = 0
+        self.server_errors = 0
+        self.total_ms = 0.0
+        self.db_commands = 0
+        self.db_time_ms = 0.0
+        self.db_samples = 0
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    def add(self, entry: Dict[str, Any], ms: float) -> None:
+        self.latency.add(ms)
+        self.total_ms += ms
+        status = entry.get("status_code") or 500
+        if status >= 400:
+            self.errors += 1
+        if status >= 500:
+            self.server_errors += 1
+        if entry.get("db_commands") is not None:
+            self.db_samples += 1
+            self.db_commands += entry["db_commands"]
+            self.db_time_ms += entry.get("db_time_ms") or 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        def q(p):
+            value = self.latency.quantile(p)
+            return round(value, 2) if value is not None else None
+
+        return {
+            "count": self.count,
+            "error_rate": round(self.errors / self.count, 4) if self.count else 0.0,
+            "server_errors": self.server_errors,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": q(0.5),
+            "p95_ms": q(0.95),
+            "p99_ms": q(0.99),
+            "max_ms": round(self.latency.max, 2) if self.count else None,
+            "avg_db_commands": round(self.db_commands / self.db_samples, 1) if self.db_samples else None,
+            "avg_db_time_ms": round(self.db_time_ms / self.db_samples, 2) if self.db_samples else None,
+        }
+
+
+def route_template(path: str) -> str:
+    """Replace id-like segments (ObjectId, UUID, digits) with {id}."""
+    return "/".join("{id}" if _ID_SEGMENT.match(s) else s for s in path.split("/"))
+
+
+def query_shape(query_params: Any) -> str:
+    """Parameter names only, sorted: "end&employee_id&start"."""
+    if isinstance(query_params, dict):
+        names = query_params.keys()
+    elif isinstance(query_params, str) and query_params:
+        names = (k for k, _ in parse_qsl(query_params, keep_blank_values=True))
+    else:
+        return ""
+    return "&".join(sorted(set(names)))
+
+
+def parse_line(line: str) -> Optional[Dict[str, Any]]:
+    """A request log entry from either line format, or None for other lines."""
+    line = line.strip()
+    if not line:
+        return None
+    if not line.startswith("{"):
+        # "asctime - LEVEL - {json}"
+        parts = line.split(" - ", 2)
+        if len(parts) != 3 or not parts[2].startswith("{"):
+            return None
+        line = parts[2]
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or "path" not in entry or "process_time_ms" not in entry:
+        return None
+    return entry
+
+
+def expand_paths(paths: Iterable[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "api.log*"))))
+        else:
+            files.extend(sorted(glob.glob(path)) or [path])
+    return files
+
+
+def read_lines(files: Iterable[str]) -> Iterator[str]:
+    for path in files:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            yield from f
+
+
+class LogReport:
+    def __init__(self, top: int = 10, since: Optional[str] = None, until: Optional[str] = None):
+        self.top = top
+        self.since = since
+        self.until = until
+        self.routes: Dict[Tuple[str, str], RouteStats] = defaultdict(RouteStats)
+        self.users: Dict[str, RouteStats] = defaultdict(RouteStats)
+        self.hourly: Dict[str, int] = defaultdict(int)
+        # Min-heap of the slowest requests seen: (ms, seq, details)
+        self.slowest: List[Tuple[float, int, Dict[str, Any]]] = []
+        self.lines = 0
+        self.entries = 0
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        timestamp = str(entry.get("timestamp") or "")
+        if (self.since and timestamp < self.since) or (self.until and timestamp >= self.until):
+            return
+        try:
+            ms = float(entry["process_time_ms"])
+        except (TypeError, ValueError):
+            return
+
+        self.entries += 1
+        route = route_template(entry["path"])
+        self.routes[(entry.get("method") or "-", route)].add(entry, ms)
+        self.users[str(entry.get("user") or "anonymous")].add(entry, ms)
+        if len(timestamp) >= 13:
+            self.hourly[timestamp[:13].replace("T", " ")] += 1
+
+        item = (ms, self.entries, {
+            "timestamp": timestamp,
+            "method": entry.get("method"),
+            "route": route,
+            "query": query_shape(entry.get("query_params")),
+            "user": entry.get("user"),
+            "status_code": entry.get("status_code"),
+            "process_time_ms": ms,
+            "db_commands": entry.get("db_commands"),
+            "db_time_ms": entry.get("db_time_ms"),
+        })
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, item)
+        elif ms > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+
+    def consume(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.lines += 1
+            entry = parse_line(line)
+            if entry is not None:
+                self.add(entry)
+
+    def result(self) -> Dict[str, Any]:
+        routes = sorted(
+            ({"method": m, "route": r, **s.summary()} for (m, r), s in self.routes.items()),
+            key=lambda r: r["count"], reverse=True,
+        )
+        users = sorted(
+            ({"user": u, **s.summary()} for u, s in self.users.items()),
+            key=lambda u: (u["p95_ms"] or 0), reverse=True,
+        )[:self.top]
+        return {
+            "lines": self.lines,
+            "requests": self.entries,
+            "routes": routes,
+            "slowest_users": users,
+            "slowest_requests": [d for _, _, d in sorted(self.slowest, reverse=True)],
+            "hourly_requests": dict(sorted(self.hourly.items())),
+        }
+
+
+def print_tables(result: Dict[str, Any]) -> None:
+    print(f"{result['requests']} requests from {result['lines']} lines\n")
+
+    header = f"{'method':<7}{'route':<44}{'count':>8}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'db cmds':>8}{'db ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in result["routes"]:
+        print(
+            f"{r['method']:<7}{r['route'][:43]:<44}{r['count']:>8}{r['error_rate'] * 100:>6.1f}%"
+            f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['max_ms']:>9}"
+            f"{str(r['avg_db_commands'] or '-'):>8}{str(r['avg_db_time_ms'] or '-'):>8}"
+        )
+
+    print("\nSlowest users (by p95)")
+    for u in result["slowest_users"]:
+        print(f"  {u['user'][:40]:<42}{u['count']:>8} reqs  p95 {u['p95_ms']}ms  max {u['max_ms']}ms")
+
+    print("\nSlowest requests")
+    for r in result["slowest_requests"]:
+        query = f"?{r['query']}" if r["query"] else ""
+        print(f"  {r['process_time_ms']:>10.1f}ms  {r['method']} {r['route']}{query}  {r['user']}  {r['timestamp']}")
+
+    print("\nRequests per hour")
+    hourly = result["hourly_requests"]
+    peak = max(hourly.values(), default=0)
+    for hour, count in hourly.items():
+        bar = "#" * (40 * count // peak) if peak else ""
+        print(f"  {hour}  {count:>7}  {bar}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize API request logs")
+    parser.add_argument("paths", nargs="*", default=["logs"], help="Log files, globs or directories")
+    parser.add_argument("--since", help="Only entries at or after this ISO timestamp prefix")
+    parser.add_argument("--until", help="Only entries before this ISO timestamp prefix")
+    parser.add_argument("--top", type=int, default=10, help="Rows in the slowest users/requests lists")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of tables")
+    args = parser.parse_args(argv)
+
+    files = expand_paths(args.paths)
+    if not files:
+        print("No log files found", file=sys.stderr)
+        return 1
+
+    report = LogReport(top=args.top, since=args.since, until=args.until)
+    report.consume(read_lines(files))
+    result = report.result()
+
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        print_tables(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
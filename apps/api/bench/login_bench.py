@@ -0,0 +1,115 @@
+"""
+Login Throughput Benchmark
+bcrypt cost per work factor, and what verifying on the event loop costs other requests
+
+For each work factor, runs --logins concurrent password checks twice: calling
+verify_password inline (as handlers used to) and through verify_password_async
+on the bcrypt thread pool. Alongside, a ticker coroutine measures how late the
+event loop wakes up, i.e. the stall every other in-flight request would see.
+No database or server needed. End-to-end login latency is the "login" scenario
+of bench.load.
+
+Usage (from apps/api):
+    python -m bench.login_bench
+    python -m bench.login_bench --rounds 10,12 --logins 64 --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+PASSWORD = "admin123"
+
+
+async def _measure(check: Callable[[], Awaitable[bool]], logins: int, tick_ms: float = 5.0) -> Dict[str, Any]:
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + tick_ms / 1000
+            await asyncio.sleep(tick_ms / 1000)
+            lags.append(max(time.perf_counter() - expected, 0.0) * 1000)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(check() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+
+    lags.sort()
+    assert all(results), "password check failed"
+    return {
+        "logins": logins,
+        "seconds": round(elapsed, 3),
+        "logins_per_second": round(logins / elapsed, 1),
+        "loop_lag_max_ms": round(lags[-1], 1) if lags else 0.0,
+        "loop_lag_p95_ms": round(lags[int(len(lags) * 0.95)], 1) if lags else 0.0,
+    }
+
+
+async def bench_rounds(rounds: int, logins: int) -> Dict[str, Any]:
+    from app.config import get_settings
+    from app.utils.security import hash_password, verify_password, verify_password_async
+
+    get_settings().bcrypt_rounds = rounds
+    hashed = hash_password(PASSWORD)
+
+    started = time.perf_counter()
+    verify_password(PASSWORD, hashed)
+    single_ms = (time.perf_counter() - started) * 1000
+
+    async def inline() -> bool:
+        await asyncio.sleep(0)
+        return verify_password(PASSWORD, hashed)
+
+    async def pooled() -> bool:
+        return await verify_password_async(PASSWORD, hashed)
+
+    return {
+        "rounds": rounds,
+        "verify_ms": round(single_ms, 1),
+        "inline": await _measure(inline, logins),
+        "thread_pool": await _measure(pooled, logins),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt login checks")
+    parser.add_argument("--rounds", default="10,11,12", help="Comma separated bcrypt work factors")
+    parser.add_argument("--logins", type=int, default=32, help="Concurrent password checks per run")
+    parser.add_argument("--workers", type=int, default=None, help="bcrypt threads (default: settings)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.workers:
+        os.environ["BCRYPT_MAX_WORKERS"] = str(args.workers)
+    from app.config import get_settings
+
+    results = [asyncio.run(bench_rounds(int(r), args.logins)) for r in args.rounds.split(",")]
+
+    if args.json:
+        json.dump({"workers": get_settings().bcrypt_max_workers, "results": results}, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print(f"bcrypt threads: {get_settings().bcrypt_max_workers}, {args.logins} concurrent logins\n")
+    header = f"{'rounds':>6}{'verify ms':>11}{'mode':>13}{'logins/s':>10}{'loop lag max':>14}{'p95':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        for mode in ("inline", "thread_pool"):
+            m = r[mode]
+            print(f"{r['rounds']:>6}{r['verify_ms']:>11}{mode:>13}{m['logins_per_second']:>10}"
+                  f"{m['loop_lag_max_ms']:>12}ms{m['loop_lag_p95_ms']:>8}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
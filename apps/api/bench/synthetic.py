@@ -0,0 +1,396 @@
+"""
+Synthetic Unolo Data
+Deterministic generator of employees, clients, tasks, EOD summaries and attendance
+
+Records are shaped like Unolo API responses (see scripts/sample_json.txt), so they
+can be fed through the same conversion code as a real sync, or served by a fake
+Unolo server. Every day is generated from its own seeded RNG: any date range can
+be produced on its own, in any order, and always yields the same records.
+"""
+
+import random
+import string
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+CITIES = [
+    "Hyderabad", "Warangal", "Nizamabad", "Karimnagar", "Khammam",
+    "Vijayawada", "Guntur", "Nellore", "Kurnool", "Tirupati",
+]
+FIRST_NAMES = [
+    "Sandeep", "Raj", "Anil", "Kiran", "Suresh", "Ravi", "Praveen",
+    "Srinivas", "Mahesh", "Venkat", "Lakshmi", "Divya", "Swathi", "Priya",
+]
+SCHOOL_WORDS = ["Sky", "Vibrant", "Sri", "Chaitanya", "Narayana", "Vidya", "Bharathi", "Little", "Flowers", "Model"]
+SCHOOL_SUFFIXES = ["High School", "Public School", "Vidyalaya", "EM School", "Concept School"]
+SCHOOL_CATEGORIES = ["Hot", "Warm", "Cold"]
+PURPOSES = ["Order Enquiry", "Specimen Distribution", "Payment Collection", "Follow Up"]
+MANAGEMENT = ["Correspondent", "Principal", "Academic Coordinator"]
+TASK_TYPES = ["School Visit", "Distributor Visit"]
+
+# Unolo location event types in attendanceEvents (8 = tracking point, 9 = task checkin)
+LOCATION_EVENT_TYPES = ("8", "9")
+
+IST_TZ = "Asia/Kolkata"
+
+
+@dataclass(frozen=True)
+class Scale:
+    employees: int
+    clients: int
+    days: int
+    tasks: int
+    # GPS points per attendance day (kept small: they dominate document size)
+    track_points: int = 40
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(employees=10, clients=200, days=14, tasks=1_000, track_points=10),
+    "small": Scale(employees=50, clients=2_000, days=90, tasks=10_000),
+    "medium": Scale(employees=200, clients=20_000, days=365, tasks=500_000),
+    "large": Scale(employees=500, clients=100_000, days=730, tasks=5_000_000),
+}
+
+
+def _hms(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _epoch_ms(dt: datetime) -> int:
+    # Unolo timestamps are IST wall-clock; MSE values are the matching UTC epoch
+    return int((dt - timedelta(hours=5, minutes=30) - datetime(1970, 1, 1)).total_seconds() * 1000)
+
+
+class SyntheticDataset:
+    """
+    Seeded synthetic dataset ending at `end` (inclusive) and spanning `scale.days` days.
+
+    Entities reference each other the way Unolo data does: tasks carry the
+    numeric employeeID and internalEmpID (empID) of an employee and the
+    clientID of one of the clients visible to that employee.
+    """
+
+    def __init__(self, scale: Scale, seed: int = 42, end: date = date(2026, 1, 31)):
+        self.scale = scale
+        self.seed = seed
+        self.end = end
+        self.start = end - timedelta(days=scale.days - 1)
+        self.tasks_per_day = max(1, scale.tasks // scale.days)
+        self._employees = [self._employee(i) for i in range(scale.employees)]
+        self._clients = [self._client(i) for i in range(scale.clients)]
+
+    def _rng(self, *key: Any) -> random.Random:
+        return random.Random(f"{self.seed}:" + ":".join(str(k) for k in key))
+
+    def _uuid(self, rng: random.Random) -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    # ==================== Reference data ====================
+
+    def _employee(self, i: int) -> Dict[str, Any]:
+        rng = self._rng("employee", i)
+        first = rng.choice(FIRST_NAMES)
+        city = CITIES[i % len(CITIES)]
+        return {
+            "empName": f"{first} {city.lower()}",
+            "firstName": first,
+            "lastName": city.lower(),
+            "empID": str(100000 + i),
+            "employeeID": 180000 + i,
+            "empEmail": f"{100000 + i}@brinda.com",
+            "empPhoneNumber": f"+9199{rng.randrange(10**8):08d}",
+            "managerName": f"Manager {i // 10}",
+            "profileID": 27600 + i // 10,
+            "designationID": 1,
+            "city": city,
+            # Attendance is keyed by Unolo's short userID
+            "userID": "".join(rng.choice(string.ascii_lowercase) for _ in range(8)),
+        }
+
+    def _client(self, i: int) -> Dict[str, Any]:
+        rng = self._rng("client", i)
+        owner = self._employees[i % len(self._employees)]
+        is_school = rng.random() < 0.85
+        name = f"{rng.choice(SCHOOL_WORDS)} {rng.choice(SCHOOL_WORDS)} {rng.choice(SCHOOL_SUFFIXES)}"
+        created = datetime.combine(self.start, datetime.min.time()) - timedelta(days=rng.randrange(365))
+        return {
+            "clientID": self._uuid(rng),
+            "clientName": name if is_school else f"{name.split()[0]} Distributors",
+            "lat": round(17.0 + rng.random() * 2, 7),
+            "lng": round(78.0 + rng.random() * 2, 7),
+            "address": f"{rng.randrange(1, 999)}, Main Road, {owner['city']}",
+            "city": owner["city"],
+            "pinCode": str(500000 + rng.randrange(1000)),
+            "contact": f"{rng.choice(FIRST_NAMES)} @ 9{rng.randrange(10**9):09d}",
+            "createdByEmpID": owner["employeeID"],
+            "createdTs": _epoch_ms(created),
+            "lastModifiedTs": _epoch_ms(created),
+            "clientCatagory": "School" if is_school else "Distributor",
+            "divisionNameNew": f"{owner['city']} {rng.choice(['North', 'South', 'East', 'West'])}",
+            "usingMaterial": rng.choice(["Yes", "No"]),
+            "usingIIT": rng.choice(["Yes", "No"]),
+            "schoolStrength": rng.randrange(100, 3000) if is_school else None,
+            "radius": 200,
+            "otpVerified": rng.choice([0, 1]),
+        }
+
+    def employees(self) -> List[Dict[str, Any]]:
+        """Employee master records (plus the attendance userID)."""
+        return self._employees
+
+    def clients(self) -> List[Dict[str, Any]]:
+        """Client records in the Unolo v2 clients API shape."""
+        return self._clients
+
+    def days(self) -> Iterator[date]:
+        day = self.start
+        while day <= self.end:
+            yield day
+            day += timedelta(days=1)
+
+    def is_working_day(self, day: date) -> bool:
+        return day.weekday() != 6
+
+    # ==================== Tasks ====================
+
+    def tasks_for_day(self, day: date) -> List[Dict[str, Any]]:
+        """Tasks checked in on `day`; none on Sundays (volume moves to working days)."""
+        if not self.is_working_day(day):
+            return []
+
+        rng = self._rng("tasks", day.isoformat())
+        count = int(self.tasks_per_day * 7 / 6 * rng.uniform(0.8, 1.2))
+        employees = self._employees
+        per_employee = max(1, len(self._clients) // len(employees))
+        tasks = []
+        for n in range(count):
+            emp_index = rng.randrange(len(employees))
+            emp = employees[emp_index]
+            # Clients are round-robin assigned, so emp i owns clients i, i+E, i+2E...
+            client = self._clients[(emp_index + len(employees) * rng.randrange(per_employee)) % len(self._clients)]
+            is_school = client["clientCatagory"] == "School"
+
+            checkin = datetime.combine(day, datetime.min.time()) + timedelta(
+                hours=9, seconds=rng.randrange(9 * 3600)
+            )
+            checkout = checkin + timedelta(seconds=rng.randrange(300, 3600))
+            category = rng.choices(SCHOOL_CATEGORIES + [None], weights=[2, 3, 4, 1])[0]
+            specimens = rng.choice([0, 0, 1, 2, 3, 5, "2", ""])
+
+            tasks.append({
+                "taskID": self._uuid(rng),
+                "clientID": client["clientID"],
+                "employeeID": emp["employeeID"],
+                "internalEmpID": emp["empID"],
+                "date": day.isoformat(),
+                "adminAssigned": 0,
+                "checkinTime": checkin.strftime("%Y-%m-%d %H:%M:%S"),
+                "checkoutTime": checkout.strftime("%Y-%m-%d %H:%M:%S"),
+                "exitTime": _epoch_ms(checkout),
+                "lat": round(client["lat"] + rng.uniform(-0.001, 0.001), 7),
+                "lon": round(client["lng"] + rng.uniform(-0.001, 0.001), 7),
+                "taskDescription": TASK_TYPES[0] if is_school else TASK_TYPES[1],
+                "address": client["address"],
+                "userInfo": {
+                    "firstName": emp["firstName"],
+                    "lastName": emp["lastName"],
+                    "profileName": "abc",
+                    "profileID": emp["profileID"],
+                },
+                "createdByEmpID": emp["employeeID"],
+                "lastModifiedByEmpID": emp["employeeID"],
+                "createdTs": _epoch_ms(checkin),
+                "lastModifiedTs": _epoch_ms(checkout),
+                "customEntity": {
+                    "customEntityID": "bc45575e-a7c0-44da-a096-6a81ce4a2ff9",
+                    "customEntityName": TASK_TYPES[0] if is_school else TASK_TYPES[1],
+                    "active": "ACTIVE",
+                },
+                "customFieldsComplex": [
+                    {"fieldName": "Purpose Of Visit", "fieldType": "DROPDOWN", "value": rng.choice(PURPOSES)},
+                    {"fieldName": "Remarks", "fieldType": "TEXT", "value": "synthetic visit"},
+                ],
+                "type": "meeting",
+                "clientName": client["clientName"],
+                "city": client["city"],
+                "schoolName": client["clientName"].lower(),
+                "revisitDate": (day + timedelta(days=7)).isoformat(),
+                "meetingWithManagement": [rng.choice(MANAGEMENT)],
+                "purposeOfVisit": [rng.choice(PURPOSES)],
+                "schoolCategory": [category] if category else [],
+                "specimensGiven": specimens,
+                "selfieWithSchoolNameBoard": [f"https://example.invalid/selfies/{n}.jpg"],
+                "assignmentSource": "Self Assigned",
+                "status": "Completed",
+            })
+        return tasks
+
+    def tasks(self) -> Iterator[Dict[str, Any]]:
+        """All tasks, oldest day first."""
+        for day in self.days():
+            yield from self.tasks_for_day(day)
+
+    # ==================== EOD & Attendance ====================
+
+    def _day_presence(self, emp_index: int, day: date) -> bool:
+        if not self.is_working_day(day):
+            return False
+        return self._rng("presence", emp_index, day.isoformat()).random() < 0.9
+
+    def eod_summaries_for_day(self, day: date) -> List[Dict[str, Any]]:
+        """One EOD summary per employee and day, in the eodSummary API shape."""
+        records = []
+        for i, emp in enumerate(self._employees):
+            rng = self._rng("eod", i, day.isoformat())
+            present = self._day_presence(i, day)
+            tracked = rng.randrange(6 * 3600, 10 * 3600) if present else 0
+            breaks = rng.randrange(0, 5) if present else 0
+            completed = rng.randrange(0, 12) if present else 0
+            records.append({
+                "employeeID": emp["employeeID"],
+                "internalEmpID": emp["empID"],
+                "date": day.isoformat(),
+                "attendanceResultCode": 1 if present else 2,
+                "firstSignIn": "09:00:00" if present else None,
+                "lastSignOut": _hms(9 * 3600 + tracked) if present else None,
+                "totalClientVisits": completed,
+                "totalNumPhotos": None,
+                "totalTimeTracked": _hms(tracked),
+                "totalTimeAttendance": _hms(tracked),
+                "setupRating": "A",
+                "rkPolyline": "[\"" + "".join(rng.choice(string.ascii_letters) for _ in range(800)) + "\"]" if present else None,
+                "complianceRating": "A",
+                "distance": round(rng.uniform(5, 80), 2) if present else 0,
+                "odoDistance": 0,
+                "totalTravelTime": _hms(rng.randrange(0, 7200) if present else 0),
+                "adminAssignedTasks": 0,
+                "adminCompletedTasks": 0,
+                "selfAssignedTasks": completed,
+                "selfCompletedTasks": completed,
+                "totalTimeSpentWithClient": None,
+                "totalActualTimeSpentWithClient": None,
+                "numBreaks": breaks,
+                "totalBreakTime": _hms(breaks * rng.randrange(600, 3600)),
+                "maxBreakTime": _hms(rng.randrange(600, 3600) if breaks else 0),
+                "totalForms": 0,
+                "totalUnproductiveTime": _hms(rng.randrange(0, 3 * 3600)),
+                "clientsCreated": rng.choice([0, 0, 0, 1]),
+            })
+        return records
+
+    def attendance_for_day(self, day: date) -> List[Dict[str, Any]]:
+        """One attendance record per employee and day, in the getAttendance API shape."""
+        records = []
+        for i, emp in enumerate(self._employees):
+            rng = self._rng("attendance", i, day.isoformat())
+            present = self._day_presence(i, day)
+            record = {
+                "firstName": emp["firstName"],
+                "lastName": emp["lastName"],
+                "internalEmpID": emp["empID"],
+                "managerName": emp["managerName"],
+                "parentAdminID": 29996,
+                "mobileNumber": emp["empPhoneNumber"],
+                "userID": emp["userID"],
+                "profileID": emp["profileID"],
+                "teamName": "abc",
+                "active": 1,
+                "tz": IST_TZ,
+                "totalDays": 30,
+                "totalDaysPresent": 26,
+                "totalDaysAbsent": 4,
+                "totalDaysPenalty": 0,
+                "totalWeeklyOff": 4,
+                "totalHolidays": 0,
+                "totalDaysOnLeave": 0,
+                "totalPendingApproval": 0,
+                "date": day.isoformat(),
+                "shifts": [],
+                "stretchedShifts": [],
+                "attendanceEvents": {},
+                "attendanceInSelfies": [],
+                "attendanceOutSelfies": [],
+                "attendanceHours": 0.0,
+                "odoDistance": 0,
+                "totalTimeTrackedMSE": 0,
+                "totalTimeTracked": "00:00:00",
+                "totalTimeAttendance": "00:00:00",
+                "totalTimeAttendanceMSE": 0,
+                "attendanceResultCode": 2,
+                "hoursOnDuty": 0.0,
+                "attendanceCounted": 0,
+            }
+            if present:
+                start = datetime.combine(day, datetime.min.time()) + timedelta(
+                    hours=8, seconds=rng.randrange(3600)
+                )
+                duration = rng.randrange(7 * 3600, 10 * 3600)
+                end = start + timedelta(seconds=duration)
+                shift = {
+                    "start": start.strftime("%Y-%m-%d %H:%M:%S"),
+                    "startMSE": _epoch_ms(start),
+                    "end": end.strftime("%Y-%m-%d %H:%M:%S"),
+                    "endMSE": _epoch_ms(end),
+                    "duration": _hms(duration),
+                    "durationMS": duration * 1000,
+                }
+                record.update({
+                    "shifts": [shift],
+                    "stretchedShifts": [shift],
+                    "attendanceEvents": self._track(rng, emp, day, start, duration),
+                    "firstSignIn": shift["start"][11:],
+                    "lastSignOut": shift["end"][11:],
+                    "firstSignInMSE": shift["startMSE"],
+                    "lastSignOutMSE": shift["endMSE"],
+                    "attendanceHours": round(duration / 3600, 2),
+                    "totalTimeTrackedMSE": duration * 1000,
+                    "totalTimeTracked": _hms(duration),
+                    "totalTimeAttendance": _hms(duration),
+                    "totalTimeAttendanceMSE": duration * 1000,
+                    "attendanceResultCode": 1,
+                    "hoursOnDuty": round(duration / 3600, 2),
+                    "attendanceCounted": 1,
+                })
+            records.append(record)
+        return records
+
+    def _track(
+        self,
+        rng: random.Random,
+        emp: Dict[str, Any],
+        day: date,
+        start: datetime,
+        duration: int
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """A random-walk GPS track spread over the shift."""
+        points = self.scale.track_points
+        lat, lon = 17.0 + rng.random() * 2, 78.0 + rng.random() * 2
+        events: Dict[str, List[Dict[str, Any]]] = {t: [] for t in LOCATION_EVENT_TYPES}
+        for n in range(points):
+            lat += rng.uniform(-0.002, 0.002)
+            lon += rng.uniform(-0.002, 0.002)
+            ts = start + timedelta(seconds=duration * n // points)
+            event_type = LOCATION_EVENT_TYPES[1] if n % 10 == 5 else LOCATION_EVENT_TYPES[0]
+            events[event_type].append({
+                "id": f"{emp['userID']}-{day.isoformat()}-{n}",
+                "employeeID": emp["employeeID"],
+                "eventTypeID": int(event_type),
+                "lat": round(lat, 7),
+                "lon": round(lon, 7),
+                "accuracy": round(rng.uniform(3, 30), 1),
+                "timestamp": ts.strftime("%Y-%m-%d %H:%M:%S"),
+                "insertTime": ts.strftime("%Y-%m-%d %H:%M:%S"),
+                "better": 1,
+                "speed": round(rng.uniform(0, 12), 2),
+                "bearing": round(rng.uniform(0, 360), 1),
+                "age": 0,
+                "src": 1,
+                "date": day.isoformat(),
+                "processingDate": day.isoformat(),
+                "tz": IST_TZ,
+                "elapsedRealTime": n * 1000,
+                "elapsedRealTimeAge": 0,
+            })
+        return events
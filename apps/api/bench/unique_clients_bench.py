@@ -0,0 +1,150 @@
+"""
+Unique Clients Benchmark
+Compares exact and approximate (HyperLogLog) unique-client counts on a
+synthetic dataset in a scratch database (<DATABASE_NAME>_bench by default).
+
+Seeds N tasks over D days with skewed client popularity, builds their
+sketches, then times GET /analytics/tasks/unique-clients both ways for
+several range lengths, for all employees and for one employee, and reports
+the approximate error. The scratch database is dropped afterwards unless
+--keep is given; a kept dataset is reused by the next run with --reuse.
+
+Usage (from apps/api):
+    python -m bench.unique_clients_bench                       # 1M tasks
+    python -m bench.unique_clients_bench --tasks 3000000 --clients 50000 --keep
+    python -m bench.unique_clients_bench --reuse --repeat 5
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+INSERT_BATCH = 10_000
+RANGES_DAYS = [7, 30, 90, 180, 365]
+
+
+async def seed(args, end: date) -> None:
+    from app.database import db_manager
+    from app.models.client_sketch import ClientSketchInDB
+    from app.models.task import TaskInDB
+    from app.repository.client_sketch_repository import client_sketch_repository, collect_sketch_updates
+
+    rng = random.Random(args.seed)
+    clients = db_manager.get_collection("clients")
+    tasks = db_manager.get_collection("tasks")
+    await db_manager.ensure_indexes([TaskInDB, ClientSketchInDB])
+
+    areas = [f"Area {i}" for i in range(args.areas)]
+    client_area = {str(100000 + i): rng.choice(areas) for i in range(args.clients)}
+    await clients.insert_many([
+        {"unolo_client_id": int(cid), "Division Name new (*)": area} for cid, area in client_area.items()
+    ])
+
+    client_ids = list(client_area)
+    # Zipf-like popularity: a few schools get most visits
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(len(client_ids))]
+    start = datetime(end.year, end.month, end.day, tzinfo=timezone.utc) - timedelta(days=args.days - 1)
+
+    started = time.perf_counter()
+    written = 0
+    while written < args.tasks:
+        n = min(INSERT_BATCH, args.tasks - written)
+        picks = rng.choices(client_ids, weights=weights, k=n)
+        batch = []
+        for i, cid in enumerate(picks):
+            employee = rng.randrange(args.employees)
+            batch.append({
+                "taskID": f"bench-{written + i}",
+                "clientID": cid,
+                "employeeID": str(employee),
+                "internalEmpID": f"E{employee:03d}",
+                "checkinTime": start + timedelta(seconds=rng.randrange(args.days * 86400)),
+            })
+        await tasks.insert_many(batch, ordered=False)
+        await client_sketch_repository.merge(collect_sketch_updates(batch, client_area))
+        written += n
+        if written % 100_000 == 0 or written == args.tasks:
+            print(f"⟳ {written} tasks seeded and sketched ({time.perf_counter() - started:.0f}s)")
+
+    sketches = await client_sketch_repository.collection.count_documents({})
+    print(f"✓ Seeded {args.tasks} tasks, {args.clients} clients, {sketches} sketches")
+
+
+async def timed(repeat: int, *call_args):
+    from app.services.analytics import get_unique_clients
+
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await get_unique_clients(*call_args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+async def run(args) -> None:
+    from app.config import get_settings
+    from app.database import db_manager
+    from app.utils import hyperloglog
+
+    settings = get_settings()
+    settings.database_name = args.database
+    # Every approximate request in the benchmark uses the sketches
+    settings.unique_clients_exact_max_days = 0
+    await db_manager.connect()
+
+    end = date.today() - timedelta(days=1)
+    try:
+        if not args.reuse:
+            await db_manager.client.drop_database(settings.database_name)
+            await seed(args, end)
+
+        print(f"\nRelative standard error {hyperloglog.RELATIVE_ERROR:.2%} "
+              f"(95% within ±{2 * hyperloglog.RELATIVE_ERROR:.1%}); median of {args.repeat} runs\n")
+        print(f"{'scope':<10}{'days':>6}{'exact':>10}{'approx':>10}{'error':>9}"
+              f"{'exact ms':>11}{'approx ms':>11}{'speedup':>9}")
+        for employee_id in (None, "0"):
+            for days in RANGES_DAYS:
+                start = end - timedelta(days=days - 1)
+                exact_ms, exact = await timed(args.repeat, start, end, employee_id, False)
+                approx_ms, approx = await timed(args.repeat, start, end, employee_id, True)
+                truth = exact.total_unique_clients
+                error = (approx.total_unique_clients - truth) / truth if truth else 0.0
+                print(f"{employee_id or 'all':<10}{days:>6}{truth:>10}{approx.total_unique_clients:>10}"
+                      f"{error:>+9.2%}{exact_ms:>11.1f}{approx_ms:>11.1f}{exact_ms / approx_ms:>8.1f}x")
+    finally:
+        if not args.keep:
+            await db_manager.client.drop_database(settings.database_name)
+        await db_manager.disconnect()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark exact vs approximate unique-client counts")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--clients", type=int, default=20_000)
+    parser.add_argument("--employees", type=int, default=50)
+    parser.add_argument("--areas", type=int, default=12)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per query (median reported)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database", default=None, help="Scratch database (default <DATABASE_NAME>_bench)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database afterwards")
+    parser.add_argument("--reuse", action="store_true", help="Benchmark a kept database without reseeding")
+    args = parser.parse_args(argv)
+
+    from app.config import get_settings
+
+    app_database = get_settings().database_name
+    args.database = args.database or f"{app_database}_bench"
+    if args.database == app_database:
+        print("Refusing to benchmark in the application database", file=sys.stderr)
+        return 2
+
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""
+Gunicorn Configuration
+Loaded automatically by gunicorn from the working directory.
+
+Prepares the Prometheus multiprocess directory so /api/metrics can merge the
+metrics of all workers (see app/metrics.py).
+"""
+
+import os
+import shutil
+
+
+def on_starting(server):
+    """Start each master run with an empty metrics directory."""
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of a dead worker."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,107 @@
+"""
+Client Latest Visit Backfill Script
+Builds the client_latest_visit and client_latest_visit_by_employee collections
+from existing tasks. Run it once after deploying a new latest-visit collection.
+
+Safe to re-run: rows are merged and a stored visit is only replaced by a newer one.
+Usage (from apps/api): python scripts/backfill_client_latest_visit.py
+"""
+import asyncio
+import os
+import sys
+from typing import Any, Dict, List
+
+# Add app directory to path
+sys.path.append(os.path.join(os.getcwd()))
+
+from app.database import db_manager
+from app.models.client_latest_visit import ClientLatestVisitInDB, EmployeeClientLatestVisitInDB
+
+# Mirrors app.utils.task_metadata.parse_school_category
+SCHOOL_CATEGORY_EXPR = {
+    "$let": {
+        "vars": {
+            "cat": {
+                "$cond": [
+                    {"$isArray": "$latest.metadata.schoolCategory"},
+                    {"$arrayElemAt": ["$latest.metadata.schoolCategory", 0]},
+                    "$latest.metadata.schoolCategory"
+                ]
+            }
+        },
+        "in": {"$cond": [{"$in": ["$$cat", ["Hot", "Cold", "Warm"]]}, "$$cat", "NoInfo"]}
+    }
+}
+
+
+def _latest_visit_pipeline(group_key: Dict[str, Any], into: str, on: List[str]) -> List[Dict[str, Any]]:
+    """Latest task per `group_key`, merged into `into` unless a newer visit is stored."""
+    return [
+        {"$match": {
+            "checkinTime": {"$type": "date"},
+            "clientID": {"$nin": [None, ""]}
+        }},
+        {"$sort": {"checkinTime": -1}},
+        {"$group": {"_id": group_key, "latest": {"$first": "$$ROOT"}}},
+        {"$project": {
+            "_id": 0,
+            "client_id": {"$toString": "$latest.clientID"},
+            "task_id": "$latest.taskID",
+            "checkin_time": "$latest.checkinTime",
+            # null rather than missing: both can be $merge keys
+            "employee_id": {"$ifNull": ["$latest.employeeID", None]},
+            "internal_emp_id": {"$ifNull": ["$latest.internalEmpID", None]},
+            "school_category": SCHOOL_CATEGORY_EXPR,
+            "updated_at_local": "$$NOW",
+        }},
+        {"$merge": {
+            "into": into,
+            "on": on,
+            "whenMatched": [
+                {"$replaceWith": {
+                    "$cond": [
+                        {"$gte": ["$$new.checkin_time", "$checkin_time"]},
+                        {"$mergeObjects": ["$$ROOT", "$$new"]},
+                        "$$ROOT"
+                    ]
+                }}
+            ],
+            "whenNotMatched": "insert"
+        }}
+    ]
+
+
+async def backfill():
+    print("Connecting to DB...")
+    await db_manager.connect()
+
+    try:
+        # $merge needs the unique index on its keys
+        await db_manager.ensure_indexes([ClientLatestVisitInDB, EmployeeClientLatestVisitInDB])
+
+        tasks = db_manager.get_collection("tasks")
+
+        print("Building client_latest_visit from tasks...")
+        await tasks.aggregate(_latest_visit_pipeline(
+            "$clientID", ClientLatestVisitInDB.MongoMeta.collection_name, ["client_id"]
+        ), allowDiskUse=True).to_list(length=None)
+
+        print("Building client_latest_visit_by_employee from tasks...")
+        await tasks.aggregate(_latest_visit_pipeline(
+            {"employee": "$employeeID", "internal": "$internalEmpID", "client": "$clientID"},
+            EmployeeClientLatestVisitInDB.MongoMeta.collection_name,
+            ["employee_id", "internal_emp_id", "client_id"]
+        ), allowDiskUse=True).to_list(length=None)
+
+        total = await db_manager.get_collection(ClientLatestVisitInDB.MongoMeta.collection_name).count_documents({})
+        print(f"✓ client_latest_visit now holds {total} clients")
+        total = await db_manager.get_collection(
+            EmployeeClientLatestVisitInDB.MongoMeta.collection_name
+        ).count_documents({})
+        print(f"✓ client_latest_visit_by_employee now holds {total} (employee, client) pairs")
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
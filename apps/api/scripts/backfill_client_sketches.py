@@ -0,0 +1,65 @@
+"""
+Client Sketch Backfill Script
+Builds the client_sketches collection (unique-client HyperLogLog sketches)
+from existing tasks. New tasks are sketched on ingest.
+
+Safe to re-run: registers are only ever raised ($max), so tasks already
+sketched change nothing.
+Usage (from apps/api): python scripts/backfill_client_sketches.py [--batch-size 100000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Add app directory to path
+sys.path.append(os.path.join(os.getcwd()))
+
+from app.database import db_manager
+from app.models.client_sketch import ClientSketchInDB
+from app.repository.client_repository import client_repository
+from app.repository.client_sketch_repository import client_sketch_repository, collect_sketch_updates
+
+TASK_PROJECTION = {"_id": 0, "clientID": 1, "employeeID": 1, "internalEmpID": 1, "checkinTime": 1}
+
+
+async def backfill(batch_size: int):
+    print("Connecting to DB...")
+    await db_manager.connect()
+
+    try:
+        # Upserts rely on the unique sketch key
+        await db_manager.ensure_indexes([ClientSketchInDB])
+
+        areas = await client_repository.area_by_client_id()
+        print(f"✓ Loaded areas for {len(areas)} client keys")
+
+        tasks = db_manager.get_collection("tasks")
+        cursor = tasks.find(
+            {"checkinTime": {"$type": "date"}, "clientID": {"$nin": [None, ""]}}, TASK_PROJECTION
+        ).batch_size(5000)
+
+        # Sketch a batch of tasks in memory, then write each touched sketch once
+        batch, total = [], 0
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                await client_sketch_repository.merge(collect_sketch_updates(batch, areas))
+                total += len(batch)
+                batch = []
+                print(f"⟳ {total} tasks sketched")
+        if batch:
+            await client_sketch_repository.merge(collect_sketch_updates(batch, areas))
+            total += len(batch)
+
+        sketches = await client_sketch_repository.collection.count_documents({})
+        print(f"✓ {total} tasks sketched into {sketches} sketches")
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build unique-client sketches from existing tasks")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Tasks sketched per write round")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size))
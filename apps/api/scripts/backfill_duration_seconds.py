@@ -0,0 +1,69 @@
+"""
+Duration Seconds Backfill Script
+Adds integer `*_seconds` fields next to the "HH:MM:SS" duration strings on
+existing EOD summary and attendance documents.
+
+Runs as server-side updates (no documents are pulled into Python).
+Usage (from apps/api): python scripts/backfill_duration_seconds.py [--all]
+    --all   recompute every document, not only those missing the fields
+"""
+import asyncio
+import os
+import sys
+
+# Add app directory to path
+sys.path.append(os.path.join(os.getcwd()))
+
+from app.database import db_manager
+from app.utils.durations import (
+    duration_seconds_expr,
+    EOD_DURATION_FIELDS,
+    ATTENDANCE_DURATION_FIELDS,
+)
+
+TARGETS = {
+    "eod_summaries": EOD_DURATION_FIELDS,
+    "attendance": ATTENDANCE_DURATION_FIELDS,
+}
+
+
+async def backfill_collection(name: str, fields: dict, recompute_all: bool) -> None:
+    collection = db_manager.get_collection(name)
+
+    # totalTimeTracked is the sentinel; documents without it are re-checked
+    # on each run, which is harmless
+    query = {} if recompute_all else {"total_time_tracked_seconds": {"$exists": False}}
+
+    set_stage = {target: duration_seconds_expr(f"${source}") for source, target in fields.items()}
+    # Leave fields absent (rather than null) when the source string is missing
+    unset_nulls = {
+        "$replaceWith": {
+            "$arrayToObject": {
+                "$filter": {
+                    "input": {"$objectToArray": "$$ROOT"},
+                    "cond": {"$or": [
+                        {"$not": [{"$in": ["$$this.k", list(fields.values())]}]},
+                        {"$ne": ["$$this.v", None]}
+                    ]}
+                }
+            }
+        }
+    }
+
+    result = await collection.update_many(query, [{"$set": set_stage}, unset_nulls])
+    print(f"✓ {name}: matched {result.matched_count}, updated {result.modified_count}")
+
+
+async def backfill(recompute_all: bool = False):
+    print("Connecting to DB...")
+    await db_manager.connect()
+
+    try:
+        for name, fields in TARGETS.items():
+            await backfill_collection(name, fields, recompute_all)
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill(recompute_all="--all" in sys.argv))
@@ -0,0 +1,55 @@
+"""
+Location Events Backfill Script
+Fills the location_events time-series collection and the low-resolution
+tracks from GPS events already stored in attendance_events.
+
+Run scripts/offload_heavy_fields.py first so that older attendance
+documents have their events in attendance_events.
+Usage (from apps/api): python scripts/backfill_location_events.py [--all]
+    --all   rebuild every day, not only those without a low-res track
+"""
+import asyncio
+import os
+import sys
+
+# Add app directory to path
+sys.path.append(os.path.join(os.getcwd()))
+
+from app.database import db_manager
+from app.models.location_event import LocationEventInDB
+from app.repository.attendance_event_repository import attendance_event_repository
+from app.repository.location_event_repository import location_event_repository
+from app.utils.geo import downsample_track
+
+
+async def backfill(rebuild_all: bool = False):
+    print("Connecting to DB...")
+    await db_manager.connect()
+
+    try:
+        # Creates the time-series collection on first run
+        await db_manager.ensure_indexes([LocationEventInDB])
+
+        query = {} if rebuild_all else {"lowResTrack": {"$exists": False}}
+        projection = {"userID": 1, "date": 1, "attendanceEvents": 1}
+
+        days = 0
+        total_events = 0
+        async for doc in attendance_event_repository.collection.find(query, projection):
+            events = location_event_repository.build_events(
+                doc["userID"], doc["date"], doc.get("attendanceEvents")
+            )
+            total_events += await location_event_repository.replace_day(doc["userID"], doc["date"], events)
+            await attendance_event_repository.collection.update_one(
+                {"_id": doc["_id"]},
+                {"$set": {"lowResTrack": downsample_track(events)}}
+            )
+            days += 1
+
+        print(f"✓ Backfilled {total_events} events over {days} user-days")
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill(rebuild_all="--all" in sys.argv))
@@ -0,0 +1,93 @@
+"""
+Task Typed Fields Backfill Script
+Populates top-level specimens_given / school_category on existing tasks
+from their free-form metadata, then ensures the partial indexes exist.
+
+Runs as a single server-side update (no documents are pulled into Python).
+Usage (from apps/api): python scripts/backfill_task_typed_fields.py [--all]
+    --all   recompute every task, not only those missing the typed fields
+"""
+import asyncio
+import os
+import sys
+
+# Add app directory to path
+sys.path.append(os.path.join(os.getcwd()))
+
+from app.database import db_manager
+from app.models.task import TaskInDB
+
+
+def first_value(field: str) -> dict:
+    """Unwrap single-item lists, which Unolo uses for some custom fields."""
+    return {"$cond": [{"$isArray": field}, {"$arrayElemAt": [field, 0]}, field]}
+
+
+# Mirrors app.utils.task_metadata.parse_specimens_given
+SPECIMENS_GIVEN_EXPR = {
+    "$let": {
+        "vars": {"v": first_value("$metadata.specimensGiven")},
+        "in": {
+            "$cond": [
+                {"$eq": [{"$type": "$$v"}, "bool"]},
+                0,
+                {"$max": [
+                    {"$convert": {
+                        "input": {"$cond": [
+                            {"$eq": [{"$type": "$$v"}, "string"]},
+                            {"$trim": {"input": "$$v"}},
+                            "$$v"
+                        ]},
+                        "to": "int",
+                        "onError": 0,
+                        "onNull": 0
+                    }},
+                    0
+                ]}
+            ]
+        }
+    }
+}
+
+# Mirrors app.utils.task_metadata.parse_school_category
+SCHOOL_CATEGORY_EXPR = {
+    "$let": {
+        "vars": {"cat": first_value("$metadata.schoolCategory")},
+        "in": {"$cond": [{"$in": ["$$cat", ["Hot", "Cold", "Warm"]]}, "$$cat", "NoInfo"]}
+    }
+}
+
+
+async def backfill(recompute_all: bool = False):
+    print("Connecting to DB...")
+    await db_manager.connect()
+
+    try:
+        tasks = db_manager.get_collection(TaskInDB.MongoMeta.collection_name)
+
+        query = {} if recompute_all else {
+            "$or": [
+                {"specimens_given": {"$exists": False}},
+                {"school_category": {"$exists": False}}
+            ]
+        }
+
+        print("Backfilling specimens_given / school_category...")
+        result = await tasks.update_many(query, [
+            {"$set": {
+                "specimens_given": SPECIMENS_GIVEN_EXPR,
+                "school_category": SCHOOL_CATEGORY_EXPR,
+                # Both are columnar snapshot columns; the next incremental build rewrites these months
+                "updated_at_local": "$$NOW",
+            }}
+        ])
+        print(f"✓ Matched {result.matched_count}, updated {result.modified_count} tasks")
+
+        # Partial indexes on the typed fields
+        await db_manager.ensure_indexes([TaskInDB])
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill(recompute_all="--all" in sys.argv))
@@ -0,0 +1,82 @@
+"""
+Columnar Snapshot Script
+Builds the Arrow analytics snapshot (see app.columnar) and checks the engine
+against Mongo. Run `build` from cron, or set COLUMNAR_SNAPSHOT_MINUTES to
+refresh from the app instead; run `parity` before enabling COLUMNAR_ANALYTICS.
+
+Usage (from apps/api):
+    python scripts/columnar.py build            # rewrite months changed since the last run
+    python scripts/columnar.py build --full     # rewrite everything
+    python scripts/columnar.py status
+    python scripts/columnar.py parity --start 2025-01-01 --end 2025-03-31 --employee 12345
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import date
+
+# Add app directory to path
+sys.path.append(os.path.join(os.getcwd()))
+
+from app.columnar import ColumnarEngine, build_snapshot, read_manifest
+from app.columnar.parity import check_parity
+from app.database import db_manager
+
+
+def status() -> int:
+    datasets = read_manifest().get("datasets", {})
+    if not datasets:
+        print("✗ No snapshot yet; run `python scripts/columnar.py build`")
+        return 1
+    for name, state in sorted(datasets.items()):
+        months = state.get("months", {})
+        span = f"{min(months)}..{max(months)}" if months else "-"
+        print(f"✓ {name:<14} {state.get('rows', 0):>9} rows  months {span:<17} as of {state.get('as_of')}")
+    return 0
+
+
+async def main(args) -> int:
+    if args.command == "status":
+        return status()
+
+    await db_manager.connect()
+    try:
+        if args.command == "build":
+            report = await build_snapshot(full=args.full)
+            return 0 if report is not None else 1
+
+        engine = ColumnarEngine()
+        if not engine.covers(args.end):
+            print(f"⚠ Snapshot is older than {args.end}; recent writes will show up as mismatches")
+        results = await check_parity(engine, args.start, args.end, args.employee)
+        failed = 0
+        for check, problems in results.items():
+            print(f"{'✗' if problems else '✓'} {check}")
+            for problem in problems[:20]:
+                print(f"    {problem}")
+            if len(problems) > 20:
+                print(f"    ... {len(problems) - 20} more")
+            failed += bool(problems)
+        print(f"{'✗' if failed else '✓'} {len(results) - failed}/{len(results)} checks match")
+        return 1 if failed else 0
+    except Exception as e:
+        print(f"✗ Columnar {args.command} failed: {e}")
+        return 1
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and verify the columnar analytics snapshot")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Bring the snapshot up to date")
+    build.add_argument("--full", action="store_true", help="Rewrite every partition")
+    sub.add_parser("status", help="Show snapshot partitions and freshness")
+    parity = sub.add_parser("parity", help="Compare engine results with the Mongo pipelines")
+    parity.add_argument("--start", type=date.fromisoformat, required=True)
+    parity.add_argument("--end", type=date.fromisoformat, required=True)
+    parity.add_argument("--employee", action="append", default=[],
+                        help="Also check per-employee metrics and areas (repeatable)")
+
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -1,67 +1,47 @@
 """
 Index Initialization Script
 Run this script to create all necessary MongoDB indexes.
+
+Indexes are declared in each model's MongoMeta (see app.index_manager); this
+script creates the missing ones and reports drift. With --check nothing is
+created and the exit status is 1 when the database differs from the models.
+
+Usage (from apps/api):
+    python scripts/init_indexes.py
+    python scripts/init_indexes.py --check
 """
+import argparse
 import asyncio
+import os
+import sys
+
+# Add app directory to path
+sys.path.append(os.path.join(os.getcwd()))
+
 from app.database import db_manager
+from app.index_manager import print_report, sync_indexes
 
-async def create_indexes():
-    """Create all indexes for optimal query performance."""
+async def create_indexes(check: bool) -> int:
+    """Create all missing indexes (or only report drift with `check`)."""
     
     print("Database Index Initialization Started...")
+    await db_manager.connect()
+
+    try:
+        report = await sync_indexes(create=not check)
+        drift = print_report(report)
+    finally:
+        await db_manager.disconnect()
+
+    if check:
+        print("\n✗ Indexes differ from the models" if drift else "\n✅ Indexes match the models")
+        return 1 if drift else 0
 
-    # Tasks Collection
-    tasks = db_manager.get_collection("tasks")
-    await tasks.create_index([("taskID", 1)], unique=True)
-    await tasks.create_index([("date", 1)])
-    await tasks.create_index([("employeeID", 1)])
-    await tasks.create_index([("internalEmpID", 1)])
-    await tasks.create_index([("customEntity.customEntityName", 1)])
-    await tasks.create_index([("checkinTime", 1)])
-    await tasks.create_index([("checkinTime", 1), ("employeeID", 1)])
-    await tasks.create_index([("checkinTime", 1), ("internalEmpID", 1)])
-    await tasks.create_index([("clientID", 1)])
-    print("✓ Tasks indexes created")
-    
-    # Clients Collection
-    clients = db_manager.get_collection("clients")
-    await clients.create_index([("ID", 1)])
-    await clients.create_index([("Visible To (*)", 1)])
-    await clients.create_index([("Employee ID", 1)])
-    await clients.create_index([("Client Catagory (*)", 1)])
-    await clients.create_index([("Division Name new (*)", 1)])
-    await clients.create_index([("Visible To (*)", 1), ("Client Catagory (*)", 1)])
-    await clients.create_index([("unolo_client_id", 1)])
-    await clients.create_index([("Created At", 1)])
-    await clients.create_index([("Last Modified At", 1)])
-    print("✓ Clients indexes created")
-    
-    # Users Collection
-    users = db_manager.get_collection("users")
-    await users.create_index([("email", 1)], unique=True)
-    await users.create_index([("empId", 1)])
-    await users.create_index([("employeeId", 1)])
-    print("✓ Users indexes created")
-    
-    # Employees Collection
-    employees = db_manager.get_collection("employees")
-    await employees.create_index([("empID", 1)], unique=True)
-    await employees.create_index([("employeeID", 1)])
-    await employees.create_index([("empName", 1)])
-    print("✓ Employees indexes created")
-    
-    # Products Collection
-    products = db_manager.get_collection("products")
-    await products.create_index([("created_at", 1)])
-    await products.create_index([("updated_at", 1)])
-    print("✓ Products indexes created")
-    
-    # Sales Collection
-    sales = db_manager.get_collection("sales")
-    await sales.create_index([("created_at", 1)])
-    print("✓ Sales indexes created")
-    
     print("\n✅ All indexes created successfully!")
+    return 0
 
 if __name__ == "__main__":
-    asyncio.run(create_indexes())
+    parser = argparse.ArgumentParser(description="Create MongoDB indexes declared in the models")
+    parser.add_argument("--check", action="store_true", help="Only report drift; exit 1 if any")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(create_indexes(args.check)))
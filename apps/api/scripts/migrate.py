@@ -0,0 +1,63 @@
+"""
+Data Migration Script
+Runs the versioned migrations in app.migrations, recording progress in the
+schema_migrations collection. Interrupted runs resume from their checkpoint.
+
+Usage (from apps/api):
+    python scripts/migrate.py status
+    python scripts/migrate.py up --dry-run
+    python scripts/migrate.py up --ops-per-sec 500 --batch-size 1000
+    python scripts/migrate.py up --to 1
+    python scripts/migrate.py reset 1     # forget progress so version 1 runs again
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Add app directory to path
+sys.path.append(os.path.join(os.getcwd()))
+
+from app.database import db_manager
+from app.migrations import migration_status, run_pending
+from app.migrations.base import DEFAULT_BATCH_SIZE
+from app.repository.schema_migration_repository import schema_migration_repository
+
+
+async def main(args) -> int:
+    await db_manager.connect()
+    try:
+        if args.command == "status":
+            for m in await migration_status():
+                mark = {"completed": "✓", "running": "⟳"}.get(m["status"], " ")
+                counts = ", ".join(f"{k} {v}" for k, v in m["counts"].items())
+                print(f"{mark} {m['version']:04d} {m['name']:<32} {m['status']:<10} {counts}")
+        elif args.command == "reset":
+            await schema_migration_repository.reset(args.version)
+            print(f"✓ Migration {args.version} reset")
+        else:
+            await run_pending(
+                target=args.to, batch_size=args.batch_size,
+                ops_per_sec=args.ops_per_sec, dry_run=args.dry_run,
+            )
+        return 0
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return 1
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run versioned data migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="List migrations and their progress")
+    up = sub.add_parser("up", help="Run pending migrations")
+    up.add_argument("--to", type=int, default=None, help="Stop after this version")
+    up.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    up.add_argument("--ops-per-sec", type=float, default=0, help="Write rate limit (0 = unlimited)")
+    up.add_argument("--dry-run", action="store_true", help="Read and transform only; write nothing")
+    reset = sub.add_parser("reset", help="Forget a migration's progress")
+    reset.add_argument("version", type=int)
+
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,70 @@
+"""
+Heavy Field Offload Script
+Moves EOD rkPolyline and attendance events/selfies/shifts out of the main
+documents into the eod_tracks and attendance_events collections.
+
+Runs server-side: a $merge copies the fields, then an update removes them.
+Usage (from apps/api): python scripts/offload_heavy_fields.py
+"""
+import asyncio
+import os
+import sys
+
+# Add app directory to path
+sys.path.append(os.path.join(os.getcwd()))
+
+from app.database import db_manager
+from app.models.eod_track import EodTrackInDB
+from app.models.attendance_event import AttendanceEventsInDB
+from app.repository.eod_track_repository import EOD_HEAVY_FIELDS
+from app.repository.attendance_event_repository import ATTENDANCE_HEAVY_FIELDS
+
+# source collection -> (side collection, key fields, heavy fields)
+TARGETS = {
+    "eod_summaries": ("eod_tracks", ["employeeID", "date"], EOD_HEAVY_FIELDS),
+    "attendance": ("attendance_events", ["userID", "date"], ATTENDANCE_HEAVY_FIELDS),
+}
+
+
+async def offload_collection(name: str, side: str, keys: list, fields: tuple) -> None:
+    collection = db_manager.get_collection(name)
+    has_heavy = {"$or": [{field: {"$exists": True}} for field in fields]}
+
+    # Copy; documents already in the side collection were written by a newer sync
+    await collection.aggregate([
+        {"$match": has_heavy},
+        {"$project": {
+            "_id": 0,
+            **{key: 1 for key in keys},
+            **{field: 1 for field in fields},
+            "updated_at_local": "$$NOW",
+        }},
+        {"$merge": {
+            "into": side,
+            "on": keys,
+            "whenMatched": "keepExisting",
+            "whenNotMatched": "insert",
+        }}
+    ]).to_list(length=None)
+
+    # updated_at_local is left alone: no heavy field is in the columnar snapshot
+    result = await collection.update_many(has_heavy, {"$unset": {field: "" for field in fields}})
+    print(f"✓ {name} -> {side}: offloaded {result.modified_count} documents")
+
+
+async def offload():
+    print("Connecting to DB...")
+    await db_manager.connect()
+
+    try:
+        # $merge "on" needs the unique (key, date) indexes
+        await db_manager.ensure_indexes([EodTrackInDB, AttendanceEventsInDB])
+
+        for name, (side, keys, fields) in TARGETS.items():
+            await offload_collection(name, side, keys, fields)
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(offload())
@@ -0,0 +1,42 @@
+import pytest
+
+from app.config import get_settings
+
+pytest_plugins = ["app.testing"]
+
+
+@pytest.fixture(scope="session")
+def mongod():
+    """Skip the test unless a real mongod answers at settings.mongodb_url."""
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    client = MongoClient(get_settings().mongodb_url, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError as e:
+        pytest.skip(f"no mongod at settings.mongodb_url: {e}")
+    finally:
+        client.close()
+
+
+@pytest.fixture
+async def scratch_db(mongod):
+    """
+    Point db_manager at an empty scratch database on the real mongod, with
+    every index from app.index_manager; dropped afterwards.
+    """
+    from app.database import db_manager
+    from app.index_manager import sync_indexes
+
+    saved = db_manager.client, db_manager.db
+    await db_manager.connect()
+    db_manager.db = db_manager.client[f"{get_settings().database_name}_tests"]
+    try:
+        await db_manager.client.drop_database(db_manager.db.name)
+        await sync_indexes()
+        yield db_manager.db
+    finally:
+        await db_manager.client.drop_database(db_manager.db.name)
+        await db_manager.disconnect()
+        db_manager.client, db_manager.db = saved
@@ -0,0 +1,26 @@
+"""
+Client imports: the spooled upload does not outlive a job that could not be
+created.
+"""
+
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.services import client_import
+
+
+async def test_upload_is_deleted_when_the_job_cannot_be_created(monkeypatch, tmp_path):
+    monkeypatch.setattr(client_import.tempfile, "tempdir", str(tmp_path))
+
+    async def fail_create(*args, **kwargs):
+        raise RuntimeError("primary unavailable")
+
+    monkeypatch.setattr(client_import.import_job_repository, "create", fail_create)
+    upload = UploadFile(io.BytesIO(b"Client Name (*),ID\nSchool 1,5001\n"), filename="clients.csv")
+
+    with pytest.raises(RuntimeError, match="primary unavailable"):
+        await client_import.start_client_import(upload, created_by=None)
+
+    assert list(tmp_path.iterdir()) == []
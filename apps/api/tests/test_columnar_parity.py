@@ -0,0 +1,128 @@
+"""
+Columnar parity: the engine over a built snapshot must answer exactly what
+the Mongo pipelines it replaces answer (app.columnar.parity).
+
+The mongomock tests stand in Python for the few operators mongomock lacks
+(see mongomock_pipelines) and leave out the area-wise check, whose $lookup
+mongomock cannot run; test_parity_on_mongod runs every check unchanged.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.columnar import ColumnarEngine, build_snapshot, snapshot
+from app.columnar.parity import check_parity
+from app.database import db_manager
+from app.repository.emp_analytics_repository import DAILY_METRICS_PROJECTION
+from app.utils.durations import minutes_expr
+
+EMPLOYEES = ["180001", "180002", "180003"]
+START, END = date(2026, 1, 1), date(2026, 2, 28)
+
+
+async def seed(db) -> None:
+    """Two months of tasks and EOD summaries for three employees, plus their clients."""
+    # Written well before any build, outside the watermark overlap
+    written = datetime.utcnow() - timedelta(hours=1)
+    await db.clients.insert_many([
+        {"unolo_client_id": 5000 + i, "Division Name new (*)": f"Area {i % 3}" if i % 5 else None,
+         "Client Catagory (*)": ("School", "Hospital")[i % 2]}
+        for i in range(12)
+    ])
+    tasks = []
+    for i in range(90):
+        checkin = datetime(2026, 1, 1, 8, tzinfo=timezone.utc) + timedelta(hours=15 * i)
+        tasks.append({
+            "taskID": f"t{i}", "employeeID": EMPLOYEES[i % 3], "internalEmpID": f"int-{EMPLOYEES[i % 3]}",
+            "clientID": str(5000 + i % 14),  # 5012 and 5013 have no client document
+            "checkinTime": checkin, "school_category": ("Hot", "Cold", "Warm", None)[i % 4],
+            "specimens_given": i % 5, "updated_at_local": written,
+        })
+    tasks.append({"taskID": "t-bad", "employeeID": EMPLOYEES[0], "clientID": "5001",
+                  "checkinTime": "not a date", "updated_at_local": written})
+    await db.tasks.insert_many(tasks)
+
+    # Mon-Sat only: mongomock cannot compute the working-day flag (see mongomock_pipelines)
+    days = [START + timedelta(days=n) for n in range((END - START).days + 1)]
+    await db.eod_summaries.insert_many([
+        {"employeeID": int(employee), "date": day.isoformat(), "attendanceResultCode": (1, 0, 2, 6)[n % 4],
+         "adminCompletedTasks": n % 6, "selfCompletedTasks": n % 2, "distance": 3.25 * (n % 7),
+         "numBreaks": n % 3, "totalBreakTime": f"00:{n % 50:02d}:10", "total_break_time_seconds": (n % 50) * 60 + 10,
+         "updated_at_local": written}
+        for e, employee in enumerate(EMPLOYEES)
+        for n, day in enumerate(days) if day.weekday() != 6 and (n + e) % 9
+    ])
+
+
+async def _months_touched(dataset, since):
+    """snapshot._months_touched in Python (mongomock has no $type or $substrCP)."""
+    query = {} if since is None else {"updated_at_local": {"$gt": since.replace(tzinfo=None)}}
+    months = set()
+    async for doc in db_manager.get_collection(dataset.collection).find(query):
+        row = dataset.row(doc)
+        day = row.get("checkin_time") or row.get("date")
+        if day is not None:
+            months.add(snapshot.month_key(day))
+    return sorted(months)
+
+
+@pytest.fixture
+def mongomock_pipelines(monkeypatch):
+    """
+    Replace the expressions mongomock cannot evaluate with ones that give the
+    same result on the seeded data: no EOD falls on a Sunday, and every EOD
+    has total_break_time_seconds.
+    """
+    monkeypatch.setattr(snapshot, "_months_touched", _months_touched)
+    monkeypatch.setitem(DAILY_METRICS_PROJECTION, "is_working_day", {"$literal": True})
+    monkeypatch.setitem(DAILY_METRICS_PROJECTION, "break_minutes", minutes_expr("$total_break_time_seconds"))
+
+
+MONGOMOCK_SKIP = ("aggregate_tasks_area_wise",)
+
+
+def _assert_no_diffs(results):
+    assert results
+    assert {check: problems for check, problems in results.items() if problems} == {}
+
+
+async def test_parity_on_full_snapshot(mock_db, mongomock_pipelines, tmp_path):
+    await seed(mock_db)
+    await build_snapshot(full=True, root=str(tmp_path))
+
+    results = await check_parity(ColumnarEngine(str(tmp_path)), START, END, EMPLOYEES, skip=MONGOMOCK_SKIP)
+
+    _assert_no_diffs(results)
+    assert "get_employees_daily_metrics" in results
+
+
+async def test_parity_after_incremental_build(mock_db, mongomock_pipelines, tmp_path):
+    await seed(mock_db)
+    await build_snapshot(full=True, root=str(tmp_path))
+
+    # A task moved to the other month must leave its old partition, and a deleted EOD must disappear
+    await mock_db.tasks.update_one({"taskID": "t3"}, {"$set": {
+        "checkinTime": datetime(2026, 2, 20, 10, tzinfo=timezone.utc), "updated_at_local": datetime.utcnow(),
+    }})
+    await mock_db.eod_summaries.delete_one({"employeeID": int(EMPLOYEES[0]), "date": "2026-01-02"})
+    await mock_db.eod_summaries.update_one({"employeeID": int(EMPLOYEES[1]), "date": "2026-01-03"}, {"$set": {
+        "distance": 99.0, "updated_at_local": datetime.utcnow(),
+    }})
+    report = await build_snapshot(root=str(tmp_path))
+
+    # February from the moved task, January because it held the old copy
+    assert report["tasks"]["months"] == ["2026-01", "2026-02"]
+    assert report["eod_summaries"]["months"] == ["2026-01"]
+    results = await check_parity(ColumnarEngine(str(tmp_path)), START, END, EMPLOYEES, skip=MONGOMOCK_SKIP)
+    _assert_no_diffs(results)
+
+
+async def test_parity_on_mongod(scratch_db, tmp_path):
+    await seed(scratch_db)
+    await build_snapshot(full=True, root=str(tmp_path))
+
+    results = await check_parity(ColumnarEngine(str(tmp_path)), START, END, EMPLOYEES)
+
+    _assert_no_diffs(results)
+    assert any(check.startswith("aggregate_tasks_area_wise") for check in results)
@@ -0,0 +1,47 @@
+"""
+XLSX export: the workbook is written by a spawned writer process, and a
+writer that dies mid-stream fails the export with a clean error.
+"""
+
+import os
+
+import pytest
+
+from app.services import export
+
+
+def exit_after_first_batch(path, title, header, conn):
+    """Writer stand-in that dies with unread batches left in the pipe."""
+    conn.recv()
+    os._exit(3)
+
+
+@pytest.fixture
+async def clients(mock_db, monkeypatch):
+    # Many small batches, so the parent is still sending when a writer dies
+    monkeypatch.setattr(export, "BATCH_SIZE", 20)
+    await mock_db.clients.insert_many([
+        {"unolo_client_id": 5000 + i, "Client Name (*)": f"School {i}", "Division Name new (*)": f"Area {i % 3}"}
+        for i in range(2000)
+    ])
+
+
+async def test_xlsx_export_writes_every_row(clients):
+    openpyxl = pytest.importorskip("openpyxl")
+
+    path = await export.build_xlsx(export.EXPORTS["clients"], {})
+    try:
+        sheet = openpyxl.load_workbook(path, read_only=True).active
+        rows = list(sheet.iter_rows(values_only=True))
+    finally:
+        os.unlink(path)
+
+    assert len(rows) == 2001
+    assert rows[0] == tuple(c.header for c in export.EXPORTS["clients"].columns(export.ExportFormat.XLSX))
+
+
+async def test_writer_dying_mid_stream_fails_cleanly(clients, monkeypatch):
+    monkeypatch.setattr(export, "write_xlsx", exit_after_first_batch)
+
+    with pytest.raises(RuntimeError, match="writer process exited with code 3"):
+        await export.build_xlsx(export.EXPORTS["clients"], {})
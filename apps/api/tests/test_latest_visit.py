@@ -0,0 +1,82 @@
+"""
+client_latest_visit: per-employee school-category breakdowns keep clients
+that another employee visited later, whichever path serves the range.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.database import db_manager
+from app.models.client_latest_visit import ClientLatestVisitInDB, EmployeeClientLatestVisitInDB
+from app.repository.client_latest_visit_repository import client_latest_visit_repository
+from app.repository.task_repository import task_repository
+
+TODAY = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _task(task_id: str, employee_id: str, client_id: str, checkin_time: datetime, category: str):
+    return {
+        "taskID": task_id, "employeeID": employee_id, "internalEmpID": f"int-{employee_id}",
+        "clientID": client_id, "checkinTime": checkin_time, "school_category": category,
+    }
+
+
+@pytest.fixture
+async def visits(mock_db):
+    await db_manager.ensure_indexes([ClientLatestVisitInDB, EmployeeClientLatestVisitInDB])
+    await mock_db.clients.insert_many([
+        {"unolo_client_id": "c1", "Client Catagory (*)": "School"},
+        {"unolo_client_id": "c2", "Client Catagory (*)": "School"},
+    ])
+    # e1 visits c1 (Hot) and c2; e2 visits c1 later (Cold). Days ago, so both paths see the same data.
+    tasks = [
+        _task("t1", "e1", "c1", TODAY - timedelta(days=3, hours=-9), "Hot"),
+        _task("t2", "e1", "c2", TODAY - timedelta(days=3, hours=-10), "Warm"),
+        _task("t3", "e2", "c1", TODAY - timedelta(days=2, hours=-9), "Cold"),
+    ]
+    await mock_db.tasks.insert_many([dict(t) for t in tasks])
+    for task in tasks:
+        await client_latest_visit_repository.record_visit(task)
+    return tasks
+
+
+async def test_client_view_keeps_the_overall_latest_visit(visits):
+    start, end = TODAY - timedelta(days=7), TODAY + timedelta(days=1)
+
+    latest = {v["client_id"]: v["employee_id"] for v in await client_latest_visit_repository.find_visits(start, end)}
+
+    assert latest == {"c1": "e2", "c2": "e1"}
+
+
+async def test_employee_keeps_clients_visited_later_by_someone_else(visits):
+    start = (TODAY - timedelta(days=7)).date()
+
+    # Range reaching today: served from the view
+    current = await task_repository.get_latest_tasks_grouped_by_school_category("e1", start, date.today())
+
+    assert [item["latest_task"]["taskID"] for item in current["Hot"]] == ["t1"]
+    assert [item["latest_task"]["taskID"] for item in current["Warm"]] == ["t2"]
+    assert current["Cold"] == []
+
+
+async def test_batch_keeps_clients_visited_later_by_someone_else(visits):
+    start = (TODAY - timedelta(days=7)).date()
+
+    batch = await task_repository.get_latest_tasks_grouped_by_school_category_for_employees(
+        ["e1", "e2"], start, date.today()
+    )
+
+    assert [item["latest_task"]["taskID"] for item in batch["e1"]["Hot"]] == ["t1"]
+    assert [item["latest_task"]["taskID"] for item in batch["e2"]["Cold"]] == ["t3"]
+
+
+async def test_older_visit_does_not_replace_a_newer_one(visits):
+    await client_latest_visit_repository.record_visit(
+        _task("t0", "e1", "c1", TODAY - timedelta(days=5), "Cold")
+    )
+    start, end = TODAY - timedelta(days=7), TODAY + timedelta(days=1)
+
+    mine = await client_latest_visit_repository.find_visits(start, end, employee_id="e1")
+
+    assert {v["client_id"]: v["task_id"] for v in mine} == {"c1": "t1", "c2": "t2"}
@@ -0,0 +1,42 @@
+"""
+/api/metrics: open when no METRICS_TOKEN is configured, otherwise only to a
+matching bearer token.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.main import create_app
+
+
+@pytest.fixture
+def client():
+    # No context manager: the lifespan (Mongo, schedulers) is not needed here
+    return TestClient(create_app())
+
+
+def test_metrics_open_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "metrics_token", "")
+
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert "http_request" in response.text
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", "scrape-secret"])
+def test_metrics_rejects_a_missing_or_wrong_token(client, monkeypatch, authorization):
+    monkeypatch.setattr(get_settings(), "metrics_token", "scrape-secret")
+
+    response = client.get("/api/metrics", headers={"Authorization": authorization} if authorization else {})
+
+    assert response.status_code == 401
+
+
+def test_metrics_accepts_the_bearer_token(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "metrics_token", "scrape-secret")
+
+    response = client.get("/api/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+    assert response.status_code == 200
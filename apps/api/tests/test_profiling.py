@@ -0,0 +1,31 @@
+"""
+Profile reports are stored whole, or replaced by a short valid notice when
+their UTF-8 size is over the limit.
+"""
+
+from app.middleware import profiling
+
+
+def test_report_under_the_limit_is_kept(monkeypatch):
+    monkeypatch.setattr(profiling, "MAX_REPORT_BYTES", 100)
+    report = "<html><body>" + "x" * 60 + "</body></html>"
+
+    assert profiling._fit_report(report, "html") == report
+
+
+def test_limit_counts_bytes_not_characters(monkeypatch):
+    monkeypatch.setattr(profiling, "MAX_REPORT_BYTES", 100)
+    report = "<html><body>" + "→" * 60 + "</body></html>"  # 86 characters, 206 bytes
+
+    notice = profiling._fit_report(report, "html")
+
+    assert notice.startswith("<!DOCTYPE html>") and notice.endswith("</html>")
+    assert "206 bytes" in notice
+
+
+def test_text_report_over_the_limit_is_replaced(monkeypatch):
+    monkeypatch.setattr(profiling, "MAX_REPORT_BYTES", 100)
+
+    notice = profiling._fit_report("ncalls tottime\n" * 20, "text")
+
+    assert notice.startswith("Profile report not stored")
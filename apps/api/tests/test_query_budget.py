@@ -0,0 +1,74 @@
+"""
+Query budgets: the paths that used to issue one query per employee or client
+(the all-employees overview, client lookups for tasks and sync) must cost the
+same number of MongoDB commands whatever the number of employees or clients.
+
+Needs a real mongod at settings.mongodb_url (the command listener does not
+fire under mongomock); skipped otherwise.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.repository.client_repository import client_repository
+from app.repository.task_repository import task_repository
+from app.services import all_emp_analytics
+
+EMPLOYEES = [str(180001 + i) for i in range(30)]
+CLIENT_IDS = [str(5000 + i) for i in range(60)]
+START, END = date(2026, 1, 1), date(2026, 1, 31)
+
+
+@pytest.fixture
+async def seeded_db(scratch_db):
+    """Thirty employees with clients, tasks and EOD summaries in January."""
+    await scratch_db.clients.insert_many([
+        {"unolo_client_id": int(client_id), "ID": client_id, "Visible To (*)": EMPLOYEES[i % 30],
+         "Employee ID": EMPLOYEES[i % 30], "Division Name new (*)": f"Area {i % 4}"}
+        for i, client_id in enumerate(CLIENT_IDS)
+    ])
+    await scratch_db.tasks.insert_many([
+        {"taskID": f"t{i}", "employeeID": EMPLOYEES[i % 30], "internalEmpID": f"int-{EMPLOYEES[i % 30]}",
+         "clientID": CLIENT_IDS[i % 60], "checkinTime": datetime(2026, 1, 1 + i % 28, 9, tzinfo=timezone.utc)}
+        for i in range(300)
+    ])
+    await scratch_db.eod_summaries.insert_many([
+        {"employeeID": int(employee), "date": (START + timedelta(days=d)).isoformat(),
+         "attendanceResultCode": 1, "adminCompletedTasks": 2, "distance": 8.5}
+        for employee in EMPLOYEES for d in range(10)
+    ])
+    return scratch_db
+
+
+async def test_all_employees_overview(seeded_db, query_budget, monkeypatch):
+    async def employees_from_unolo():
+        return [{"employeeID": int(e), "empName": f"Employee {e}"} for e in EMPLOYEES]
+
+    monkeypatch.setattr(all_emp_analytics, "get_all_employees", employees_from_unolo)
+
+    with query_budget(1, "all-employees overview"):
+        overview = await all_emp_analytics.get_all_employees_overview(START, END)
+
+    assert overview.total_employees == 30
+    assert overview.total_tasks > 0
+
+
+async def test_client_lookups_for_many_ids(seeded_db, query_budget):
+    with query_budget(1, "task clients"):
+        clients = await client_repository.find_by_unolo_ids(CLIENT_IDS)
+    with query_budget(1, "sync existing clients"):
+        existing = await client_repository.existing_unolo_ids([int(c) for c in CLIENT_IDS] + [9999])
+
+    assert set(clients) == set(CLIENT_IDS)
+    assert len(existing) == 60
+
+
+async def test_batch_employee_breakdowns(seeded_db, query_budget):
+    with query_budget(1, "client areas, batch"):
+        areas = await client_repository.count_clients_by_employees(EMPLOYEES, "Division Name new (*)")
+    with query_budget(1, "area-wise tasks, batch"):
+        area_tasks = await task_repository.aggregate_tasks_area_wise_by_employees(EMPLOYEES, START, END)
+
+    assert set(areas) == set(EMPLOYEES)
+    assert set(area_tasks) == set(EMPLOYEES)
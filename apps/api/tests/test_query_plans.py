@@ -0,0 +1,87 @@
+"""
+Query plans: repository queries must be served by the indexes the models
+declare. Each query runs under no_collscan against a scratch database with
+the indexes from app.index_manager, so a query or index change that falls
+back to a collection scan fails here.
+
+Needs a real mongod at settings.mongodb_url (explain is not in mongomock);
+skipped otherwise.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.repository.client_latest_visit_repository import client_latest_visit_repository
+from app.repository.client_repository import client_repository
+from app.repository.emp_analytics_repository import emp_analytics_repository
+from app.repository.task_repository import task_repository
+
+EMPLOYEE = "180001"
+EMPLOYEES = [EMPLOYEE, "180002"]
+START, END = date(2026, 1, 1), date(2026, 1, 31)
+
+# label -> repository call; ranges ending in the past take the tasks pipelines,
+# ranges reaching today the client_latest_visit view
+QUERIES = {
+    "task list by employee": lambda: task_repository.find_with_filters({"employeeID": EMPLOYEE}, 20, 0),
+    "tasks by employee": lambda: task_repository.find_tasks_by_employee_with_client_filter(EMPLOYEE, START, END),
+    "tasks by employees": lambda: task_repository.find_tasks_by_employees_with_client_filter(EMPLOYEES, START, END),
+    "area-wise tasks": lambda: task_repository.aggregate_tasks_area_wise(START, EMPLOYEE, END),
+    "area-wise tasks, batch": lambda: task_repository.aggregate_tasks_area_wise_by_employees(EMPLOYEES, START, END),
+    "school categories, past range": lambda: task_repository.get_latest_tasks_grouped_by_school_category(
+        EMPLOYEE, START, END),
+    "school categories, current range": lambda: task_repository.get_latest_tasks_grouped_by_school_category(
+        EMPLOYEE, date.today() - timedelta(days=30), date.today()),
+    "school categories, batch": lambda: task_repository.get_latest_tasks_grouped_by_school_category_for_employees(
+        EMPLOYEES, date.today() - timedelta(days=30), date.today()),
+    "overview totals": lambda: task_repository.summarize_tasks_in_date_range(START, END),
+    "tasks per employee": lambda: task_repository.aggregate_tasks_by_employee(START, END),
+    "hot schools, past range": lambda: task_repository.get_hot_schools_by_employee(START, END),
+    "hot schools, current range": lambda: task_repository.get_hot_schools_by_employee(
+        date.today() - timedelta(days=30), date.today()),
+    "employee daily metrics": lambda: emp_analytics_repository.get_employee_daily_metrics(EMPLOYEE, START, END),
+    "employees daily metrics": lambda: emp_analytics_repository.get_employees_daily_metrics(EMPLOYEES, START, END),
+    "present totals": lambda: emp_analytics_repository.aggregate_present_totals_by_employee(START, END),
+    "clients by employee": lambda: client_repository.find_clients_by_employee(EMPLOYEE),
+    "clients grouped by area": lambda: client_repository.aggregate_clients_grouped(EMPLOYEE, "Division Name new (*)"),
+    "client areas, batch": lambda: client_repository.count_clients_by_employees(EMPLOYEES, "Division Name new (*)"),
+    "clients by Unolo ID": lambda: client_repository.find_by_unolo_ids(["5001", "5002"]),
+    "clients not visited": lambda: client_latest_visit_repository.find_not_visited_since(
+        datetime.now(timezone.utc) - timedelta(days=30), employee_id=EMPLOYEE),
+}
+
+
+@pytest.fixture
+async def indexed_db(scratch_db):
+    """The scratch database with a few documents per collection."""
+    now = datetime.now(timezone.utc)
+    await scratch_db.clients.insert_many([
+        {"unolo_client_id": 5000 + i, "ID": str(5000 + i), "Visible To (*)": EMPLOYEES[i % 2],
+         "Employee ID": EMPLOYEES[i % 2], "Client Catagory (*)": "School", "Division Name new (*)": f"Area {i % 3}"}
+        for i in range(20)
+    ])
+    tasks = [
+        {"taskID": f"t{i}", "employeeID": EMPLOYEES[i % 2], "internalEmpID": f"int-{EMPLOYEES[i % 2]}",
+         "clientID": str(5000 + i % 20), "checkinTime": checkin, "date": checkin.date().isoformat(),
+         "school_category": ("Hot", "Cold", "Warm")[i % 3], "specimens_given": i % 4}
+        for i, checkin in enumerate(
+            [datetime(2026, 1, 1 + i % 28, 9, tzinfo=timezone.utc) for i in range(40)]
+            + [now - timedelta(days=i % 20, hours=1) for i in range(40)]
+        )
+    ]
+    await scratch_db.tasks.insert_many([dict(t) for t in tasks])
+    for task in tasks:
+        await client_latest_visit_repository.record_visit(task)
+    await scratch_db.eod_summaries.insert_many([
+        {"employeeID": int(EMPLOYEES[i % 2]), "date": (START + timedelta(days=i // 2)).isoformat(),
+         "adminCompletedTasks": 3, "distance": 12.5}
+        for i in range(40)
+    ])
+    return scratch_db
+
+
+@pytest.mark.parametrize("label", sorted(QUERIES))
+async def test_repository_query_uses_an_index(indexed_db, no_collscan, label):
+    with no_collscan(label):
+        await QUERIES[label]()
@@ -0,0 +1,66 @@
+"""
+Request logging: JSON bodies are logged as a masked prefix, upload bodies
+(multipart, CSV) only by their size.
+"""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware import logging as request_logging
+
+
+class CapturingLogger:
+    def __init__(self):
+        self.entries = []
+
+    def info(self, entry):
+        self.entries.append(entry)
+
+    warning = error = info
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    monkeypatch.setattr(request_logging, "start_log_listener", lambda: None)
+    capturing = CapturingLogger()
+    monkeypatch.setattr(request_logging, "logger", capturing)
+
+    app = FastAPI()
+
+    @app.post("/api/echo")
+    async def echo(request: Request):
+        return {"bytes": len(await request.body())}
+
+    app.add_middleware(request_logging.APILoggingMiddleware)
+    return TestClient(app), capturing.entries
+
+
+def test_json_body_prefix_is_logged_masked(logged):
+    client, entries = logged
+
+    client.post("/api/echo", json={"email": "a@b.c", "password": "hunter2"})
+
+    body = entries[-1]["request_body"]
+    assert "a@b.c" in body and "hunter2" not in body
+
+
+def test_multipart_upload_logs_only_its_size(logged):
+    client, entries = logged
+
+    client.post("/api/echo", files={"file": ("clients.csv", b"Client Name (*),Phone\nSchool 1,98450 12345\n")})
+
+    entry = entries[-1]
+    assert "request_body" not in entry
+    assert entry["request_body_bytes"] > 0
+
+
+def test_csv_body_logs_only_its_size(logged):
+    client, entries = logged
+
+    client.post("/api/echo", content=b"Client Name (*),Phone\nSchool 1,98450 12345\n",
+                headers={"Content-Type": "text/csv; charset=utf-8"})
+
+    entry = entries[-1]
+    assert "request_body" not in entry
+    assert entry["request_body_bytes"] == 43
@@ -0,0 +1,79 @@
+"""
+Token revocation: users.tokens_valid_after rejects older tokens in every worker,
+including tokens this worker has already verified and cached.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.middleware.auth import get_current_user
+from app.schemas.user import UserRole
+from app.utils import security
+
+USER_ID = ObjectId()
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(security, "_token_cache", security.TokenCache(100))
+    monkeypatch.setattr(security, "_valid_after", {})
+
+
+@pytest.fixture
+async def user(mock_db):
+    await mock_db.users.insert_one({"_id": USER_ID, "email": "rep@brinda.com", "role": "sales_rep"})
+    return str(USER_ID)
+
+
+def _token(user_id: str, issued_at: datetime = None) -> str:
+    token = security.create_access_token(
+        user_id=user_id, email="rep@brinda.com", role=UserRole.SALES_REP, full_name="Sales Rep",
+    )
+    if issued_at is None:
+        return token
+    settings = security.get_settings()
+    claims = security.jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    claims["iat"] = int(issued_at.timestamp())
+    return security.jwt.encode(claims, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+
+
+async def _authenticate(token: str):
+    request = SimpleNamespace(state=SimpleNamespace())
+    return await get_current_user(request, HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+async def test_revoked_token_gets_401(user):
+    token = _token(user, datetime.now(timezone.utc) - timedelta(minutes=5))
+    assert (await _authenticate(token)).user_id == user  # verified and cached
+
+    await security.revoke_user_tokens(user)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await _authenticate(token)
+    assert excinfo.value.status_code == 401
+
+
+async def test_revocation_from_another_worker_applies_to_cached_token(user, mock_db):
+    token = _token(user, datetime.now(timezone.utc) - timedelta(minutes=5))
+    await _authenticate(token)
+
+    # Another worker revoked: only the user document changed, this worker's cache still holds the token
+    await mock_db.users.update_one(
+        {"_id": USER_ID}, {"$set": {"tokens_valid_after": datetime.now(timezone.utc).replace(microsecond=0)}}
+    )
+    security._valid_after.clear()  # as after token_revocation_check_seconds
+
+    with pytest.raises(HTTPException) as excinfo:
+        await _authenticate(token)
+    assert excinfo.value.status_code == 401
+
+
+async def test_token_issued_after_revocation_is_accepted(user):
+    await security.revoke_user_tokens(user)
+
+    assert (await _authenticate(_token(user))).user_id == user
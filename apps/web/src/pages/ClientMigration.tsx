@@ -1,28 +1,45 @@
-import { useState } from 'react'
+import { useEffect, useRef, useState } from 'react'
 import * as XLSX from 'xlsx'
-import { clientsApi } from '../services/api'
+import { clientsApi, type ClientImportJob } from '../services/api'
 import './ClientMigration.css'
 
-interface MigrationResult {
-    total_processed: number
-    created_count: number
-    updated_count: number
-    errors: string[]
+const POLL_INTERVAL_MS = 1000
+
+/**
+ * The API imports .csv and .xlsx; legacy .xls workbooks are converted to CSV here
+ */
+async function toUploadFile(file: File): Promise<File> {
+    if (!file.name.toLowerCase().endsWith('.xls')) {
+        return file
+    }
+    const workbook = XLSX.read(await file.arrayBuffer(), { type: 'array' })
+    const csv = XLSX.utils.sheet_to_csv(workbook.Sheets[workbook.SheetNames[0]])
+    return new File([csv], file.name.replace(/\.xls$/i, '.csv'), { type: 'text/csv' })
 }
 
 export default function ClientMigration() {
     const [file, setFile] = useState<File | null>(null)
     const [previewData, setPreviewData] = useState<any[]>([])
     const [isLoading, setIsLoading] = useState(false)
-    const [result, setResult] = useState<MigrationResult | null>(null)
+    const [job, setJob] = useState<ClientImportJob | null>(null)
     const [error, setError] = useState<string | null>(null)
+    const pollTimer = useRef<number | null>(null)
+
+    const stopPolling = () => {
+        if (pollTimer.current !== null) {
+            window.clearTimeout(pollTimer.current)
+            pollTimer.current = null
+        }
+    }
+
+    useEffect(() => stopPolling, [])
 
     const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
         const selectedFile = e.target.files?.[0]
         if (selectedFile) {
             setFile(selectedFile)
             setError(null)
-            setResult(null)
+            setJob(null)
             parseFile(selectedFile)
         }
     }
@@ -32,52 +49,76 @@ export default function ClientMigration() {
         reader.onload = (e) => {
             try {
                 const data = e.target?.result
-                const workbook = XLSX.read(data, { type: 'binary' })
+                // Only the preview is parsed in the browser; sheetRows stops after the first rows
+                const workbook = XLSX.read(data, { type: 'binary', sheetRows: 6 })
                 const sheetName = workbook.SheetNames[0]
                 const sheet = workbook.Sheets[sheetName]
                 const jsonData = XLSX.utils.sheet_to_json(sheet)
                 setPreviewData(jsonData.slice(0, 5)) // Preview first 5 rows
             } catch (err) {
-                setError('Failed to parse file. Please ensure it is a valid Excel file.')
+                setError('Failed to parse file. Please ensure it is a valid Excel or CSV file.')
                 console.error(err)
             }
         }
         reader.readAsBinaryString(file)
     }
 
+    const poll = async (jobId: string) => {
+        try {
+            const current = await clientsApi.getImport(jobId)
+            setJob(current)
+            if (current.status === 'completed' || current.status === 'failed') {
+                if (current.error) {
+                    setError(current.error)
+                }
+                setIsLoading(false)
+                return
+            }
+            pollTimer.current = window.setTimeout(() => poll(jobId), POLL_INTERVAL_MS)
+        } catch (err: any) {
+            setError(err.message || 'Failed to fetch import progress.')
+            setIsLoading(false)
+        }
+    }
+
     const handleUpload = async () => {
         if (!file) return
 
+        stopPolling()
         setIsLoading(true)
         setError(null)
-        setResult(null)
+        setJob(null)
 
-        const reader = new FileReader()
-        reader.onload = async (e) => {
-            try {
-                const data = e.target?.result
-                const workbook = XLSX.read(data, { type: 'binary' })
-                const sheetName = workbook.SheetNames[0]
-                const sheet = workbook.Sheets[sheetName]
-                const jsonData = XLSX.utils.sheet_to_json(sheet)
+        try {
+            const started = await clientsApi.startImport(await toUploadFile(file))
+            await poll(started.job_id)
+        } catch (err: any) {
+            setError(err.message || 'Migration failed. Please try again.')
+            console.error(err)
+            setIsLoading(false)
+        }
+    }
 
-                const response = await clientsApi.migrateClients(jsonData)
-                setResult(response)
-            } catch (err: any) {
-                setError(err.message || 'Migration failed. Please try again.')
-                console.error(err)
-            } finally {
-                setIsLoading(false)
-            }
+    const handleDownloadErrors = async () => {
+        if (!job) return
+        try {
+            const blob = await clientsApi.downloadImportErrors(job.job_id)
+            const url = URL.createObjectURL(blob)
+            const link = document.createElement('a')
+            link.href = url
+            link.download = `import-${job.job_id}-errors.csv`
+            link.click()
+            URL.revokeObjectURL(url)
+        } catch (err: any) {
+            setError(err.message || 'Failed to download the error report.')
         }
-        reader.readAsBinaryString(file)
     }
 
     return (
         <div className="migration-container">
             <h2 className="page-title">Client Data Migration</h2>
             <p className="page-description">
-                Upload an Excel file (.xlsx, .xls) to update or create client records.
+                Upload an Excel or CSV file (.xlsx, .xls, .csv) to update or create client records.
                 <br />
                 Files must contain headers matching the database schema (e.g., "Client Name (*)", "ID").
             </p>
@@ -85,7 +126,7 @@ export default function ClientMigration() {
             <div className="upload-section">
                 <input
                     type="file"
-                    accept=".xlsx, .xls"
+                    accept=".xlsx, .xls, .csv"
                     onChange={handleFileChange}
                     className="file-input"
                     disabled={isLoading}
@@ -95,44 +136,52 @@ export default function ClientMigration() {
                     disabled={!file || isLoading}
                     className="upload-btn"
                 >
-                    {isLoading ? 'Processing...' : 'Migrate Clients'}
+                    {isLoading ? 'Importing...' : 'Migrate Clients'}
                 </button>
             </div>
 
             {error && <div className="error-message">{error}</div>}
 
-            {result && (
+            {job && (
                 <div className="result-section">
-                    <h3>Migration Results</h3>
+                    <h3>
+                        {job.status === 'completed' ? 'Migration Results'
+                            : job.status === 'failed' ? 'Migration Failed'
+                            : job.status === 'queued' ? 'Waiting to start...'
+                            : `Importing... ${Math.round(job.progress * 100)}%`}
+                    </h3>
+                    {job.status !== 'completed' && job.status !== 'failed' && (
+                        <progress className="import-progress" value={job.progress} max={1} />
+                    )}
                     <div className="result-stats">
                         <div className="stat-card">
-                            <span className="stat-value">{result.total_processed}</span>
+                            <span className="stat-value">
+                                {job.processed}{job.total_rows !== null && job.status !== 'completed' ? ` / ${job.total_rows}` : ''}
+                            </span>
                             <span className="stat-label">Total Processed</span>
                         </div>
                         <div className="stat-card success">
-                            <span className="stat-value">{result.created_count}</span>
+                            <span className="stat-value">{job.created_count}</span>
                             <span className="stat-label">Created</span>
                         </div>
                         <div className="stat-card info">
-                            <span className="stat-value">{result.updated_count}</span>
+                            <span className="stat-value">{job.updated_count}</span>
                             <span className="stat-label">Updated</span>
                         </div>
                     </div>
 
-                    {result.errors.length > 0 && (
+                    {job.error_count > 0 && (
                         <div className="error-list">
-                            <h4>Errors ({result.errors.length})</h4>
-                            <ul>
-                                {result.errors.map((err, index) => (
-                                    <li key={index}>{err}</li>
-                                ))}
-                            </ul>
+                            <h4>Errors ({job.error_count})</h4>
+                            <button onClick={handleDownloadErrors} className="upload-btn">
+                                Download error report (CSV)
+                            </button>
                         </div>
                     )}
                 </div>
             )}
 
-            {previewData.length > 0 && !result && (
+            {previewData.length > 0 && !job && (
                 <div className="preview-section">
                     <h3>File Preview (First 5 Rows)</h3>
                     <div className="table-container">
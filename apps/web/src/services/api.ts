@@ -16,7 +16,11 @@ import type {
     TaskAnalyticsResponse,
     AreaWiseTasksResponse,
     SchoolCategoryResponse,
-    AdminOverviewResponse
+    AdminOverviewResponse,
+    EmployeeAnalyticsResponse,
+    EmployeeBatchResponse,
+    TrendInterval,
+    TrendsResponse
 } from '../types/analytics'
 
 const API_BASE = '/api'
@@ -50,8 +54,9 @@ async function request<T>(
 ): Promise<T> {
     const token = getToken()
 
+    // FormData bodies need the browser to set the multipart boundary itself
     const headers: HeadersInit = {
-        'Content-Type': 'application/json',
+        ...(options.body instanceof FormData ? {} : { 'Content-Type': 'application/json' }),
         ...options.headers,
     }
 
@@ -163,7 +168,9 @@ export const clientsApi = {
             errors: string[]
         }>('/clients/', { // Endpoint is now /api/clients/
             method: 'POST',
-            body: JSON.stringify({ clients }),
+            // One client per line; the API streams NDJSON instead of parsing one large body
+            headers: { 'Content-Type': 'application/x-ndjson' },
+            body: clients.map((client) => JSON.stringify(client)).join('\n'),
         }),
 
     getClients: (filters: Record<string, any> = {}) => {
@@ -190,7 +197,45 @@ export const clientsApi = {
             errors: string[]
         }>('/sync/clients', {
             method: 'POST',
+        }),
+
+    startImport: (file: File) => {
+        const body = new FormData()
+        body.append('file', file)
+        return request<{ job_id: string; status: string }>('/clients/imports', {
+            method: 'POST',
+            body,
+        })
+    },
+
+    getImport: (jobId: string) =>
+        request<ClientImportJob>(`/clients/imports/${jobId}`),
+
+    downloadImportErrors: async (jobId: string): Promise<Blob> => {
+        const token = getToken()
+        const response = await fetch(`${API_BASE}/clients/imports/${jobId}/errors`, {
+            headers: token ? { Authorization: `Bearer ${token}` } : {},
         })
+        if (!response.ok) {
+            throw new ApiException(response.status, response.statusText)
+        }
+        return response.blob()
+    },
+}
+
+export interface ClientImportJob {
+    job_id: string
+    status: 'queued' | 'running' | 'completed' | 'failed'
+    filename: string
+    total_rows: number | null
+    processed: number
+    created_count: number
+    updated_count: number
+    error_count: number
+    progress: number
+    error: string | null
+    created_at: string
+    finished_at: string | null
 }
 
 /**
@@ -311,6 +356,16 @@ export const attendanceApi = {
     },
 }
 
+/**
+ * Query string for the batch analytics endpoints (employee_ids is repeated)
+ */
+function batchQuery(start: string, end: string, employeeIds: string[], clientCategory?: string) {
+    const query = new URLSearchParams({ start, end })
+    if (clientCategory) query.set('client_category', clientCategory)
+    employeeIds.forEach(id => query.append('employee_ids', id))
+    return query
+}
+
 /**
  * Analytics API
  */
@@ -364,6 +419,29 @@ export const analyticsApi = {
         if (employeeId) query.set('employee_id', employeeId)
         if (filterType) query.set('filter_type', filterType)
         return request<TaskAnalyticsResponse>(`/analytics/admin/tasks?${query}`)
+    },
+
+    // Batch variants (managers/admins): one request for several employees, keyed by employee ID
+    getTaskAnalyticsBatch: (start: string, end: string, employeeIds: string[], clientCategory?: string) =>
+        request<EmployeeBatchResponse<TaskAnalyticsResponse>>(
+            `/analytics/tasks/batch?${batchQuery(start, end, employeeIds, clientCategory)}`
+        ),
+
+    getAreaWiseTasksBatch: (start: string, end: string, employeeIds: string[], clientCategory?: string) =>
+        request<EmployeeBatchResponse<AreaWiseTasksResponse>>(
+            `/analytics/tasks/area-wise/batch?${batchQuery(start, end, employeeIds, clientCategory)}`
+        ),
+
+    getSchoolCategoryTasksBatch: (start: string, end: string, employeeIds: string[], clientCategory?: string) =>
+        request<EmployeeBatchResponse<SchoolCategoryResponse>>(
+            `/analytics/tasks/school-category/batch?${batchQuery(start, end, employeeIds, clientCategory)}`
+        ),
+
+    getTrends: (start: string, end: string, interval: TrendInterval = 'day', employeeId?: string, compare = false) => {
+        const query = new URLSearchParams({ start, end, interval })
+        if (employeeId) query.set('employee_id', employeeId)
+        if (compare) query.set('compare', 'true')
+        return request<TrendsResponse>(`/analytics/trends?${query}`)
     }
 }
 
@@ -406,7 +484,12 @@ export const empAnalyticsApi = {
         const query = new URLSearchParams({ start, end })
         if (employeeId) query.set('employee_id', employeeId)
         return request<any>(`/emp-analytics/dashboard?${query}`)
-    }
+    },
+
+    getDashboardBatch: (start: string, end: string, employeeIds: string[]) =>
+        request<EmployeeBatchResponse<EmployeeAnalyticsResponse>>(
+            `/emp-analytics/dashboard/batch?${batchQuery(start, end, employeeIds)}`
+        )
 }
 
 export const allEmpAnalyticsApi = {
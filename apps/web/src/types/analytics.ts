@@ -186,3 +186,39 @@ export interface EmployeeAnalyticsResponse {
     avg_break_time_minutes: number
     daily_breakdown: DailyAnalytics[]
 }
+
+/** Batch endpoints: one response per requested employee ID */
+export interface EmployeeBatchResponse<T> {
+    employees: Record<string, T>
+}
+
+export type TrendInterval = 'day' | 'week' | 'month'
+
+export interface TrendTotals {
+    tasks: number
+    hot_schools: number
+    specimens: number
+    distance_km: number
+    present_days: number
+    working_days: number
+    attendance_percentage: number
+}
+
+export interface TrendPoint extends TrendTotals {
+    period_start: string
+}
+
+export interface TrendPeriod {
+    start_date: string
+    end_date: string
+    totals: TrendTotals
+    series: TrendPoint[]
+}
+
+export interface TrendsResponse {
+    interval: TrendInterval
+    employee_id: string | null
+    current: TrendPeriod
+    previous: TrendPeriod | null
+    change: Record<string, number | null> | null
+}